@@ -0,0 +1,99 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Query, Session
+
+from search_service import contains_filter
+
+_DATETIME_TAG = "$dt"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and _DATETIME_TAG in value:
+        return datetime.fromisoformat(str(value[_DATETIME_TAG]))
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor for the sort key of the last row of a page."""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> Tuple[Any, ...]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("cursor size")
+        return tuple(_decode_value(value) for value in values)
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def search_filter(search: Optional[str], *columns):
+    """Case-insensitive substring match over ``columns``; None when ``search`` is blank."""
+    needle = str(search or "").strip()
+    if not needle:
+        return None
+    return contains_filter(needle, *columns)
+
+
+def _plan_rows(db: Session, query: Query) -> Optional[int]:
+    conn = db.connection()
+    compiled = query.statement.compile(dialect=conn.dialect)
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def count_rows(db: Session, query: Query, *, exact: bool = False) -> Tuple[int, bool]:
+    """Row count of ``query`` as (count, is_estimate).
+
+    On Postgres the planner's row estimate is used unless ``exact`` is set, which costs one EXPLAIN
+    instead of a full COUNT(*) over the filtered set.
+    """
+    count_query = query.order_by(None)
+    if not exact and db.get_bind().dialect.name == "postgresql":
+        estimate = _plan_rows(db, count_query)
+        if estimate is not None:
+            return estimate, True
+    return count_query.count(), False
+
+
+def set_page_headers(
+    response,
+    *,
+    total: Optional[int] = None,
+    estimated: bool = False,
+    page_size: Optional[int] = None,
+    next_cursor: Optional[str] = None,
+) -> None:
+    if response is None:
+        return
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Total-Count-Estimated"] = "true" if estimated else "false"
+    if page_size is not None:
+        response.headers["X-Page-Size"] = str(page_size)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
+def next_cursor_for(rows: List[Any], page_size: int, key) -> Optional[str]:
+    if len(rows) < page_size or not rows:
+        return None
+    return encode_cursor(*key(rows[-1]))
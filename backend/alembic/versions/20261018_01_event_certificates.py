@@ -0,0 +1,56 @@
+"""event certificates
+
+Revision ID: 20261018_01
+Revises: 20260504_06
+Create Date: 2026-10-18 09:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_01"
+down_revision = "20260504_06"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    return inspector.has_table(table_name)
+
+
+def upgrade() -> None:
+    if _has_table("event_certificates"):
+        return
+    op.create_table(
+        "event_certificates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("pda_event_id", sa.Integer(), nullable=True),
+        sa.Column("persohub_event_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("registration_id", sa.Integer(), nullable=True),
+        sa.Column("storage_key", sa.String(length=800), nullable=False),
+        sa.Column("generated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["pda_event_id"], ["pda_events.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["persohub_event_id"], ["persohub_events.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("pda_event_id", "user_id", name="uq_event_certificate_pda_event_user"),
+        sa.UniqueConstraint("persohub_event_id", "user_id", name="uq_event_certificate_persohub_event_user"),
+    )
+    op.create_index(op.f("ix_event_certificates_id"), "event_certificates", ["id"], unique=False)
+    op.create_index(op.f("ix_event_certificates_pda_event_id"), "event_certificates", ["pda_event_id"], unique=False)
+    op.create_index(op.f("ix_event_certificates_persohub_event_id"), "event_certificates", ["persohub_event_id"], unique=False)
+    op.create_index(op.f("ix_event_certificates_user_id"), "event_certificates", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    if not _has_table("event_certificates"):
+        return
+    op.drop_index(op.f("ix_event_certificates_user_id"), table_name="event_certificates")
+    op.drop_index(op.f("ix_event_certificates_persohub_event_id"), table_name="event_certificates")
+    op.drop_index(op.f("ix_event_certificates_pda_event_id"), table_name="event_certificates")
+    op.drop_index(op.f("ix_event_certificates_id"), table_name="event_certificates")
+    op.drop_table("event_certificates")
@@ -0,0 +1,43 @@
+"""indexes for admin and event log browsing
+
+Revision ID: 20261018_02
+Revises: 20261018_01
+Create Date: 2026-10-18 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261018_02"
+down_revision: Union[str, Sequence[str], None] = "20261018_01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Superadmin log view: mutating /api requests, newest first, optionally split by action.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_admin_logs_api_mutations_id
+        ON admin_logs (id DESC)
+        WHERE path LIKE '/api/%' AND (method IS NULL OR method NOT IN ('GET', 'HEAD', 'OPTIONS'))
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_admin_logs_action_id ON admin_logs (action, id DESC)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_admin_logs_created_at ON admin_logs (created_at)")
+    for table in ("pda_event_logs", "persohub_event_logs"):
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_slug_id ON {table} (event_slug, id DESC)")
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_slug_action_id ON {table} (event_slug, action, id DESC)")
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_created_at ON {table} (created_at)")
+
+
+def downgrade() -> None:
+    for table in ("pda_event_logs", "persohub_event_logs"):
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_created_at")
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_slug_action_id")
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_slug_id")
+    op.execute("DROP INDEX IF EXISTS ix_admin_logs_created_at")
+    op.execute("DROP INDEX IF EXISTS ix_admin_logs_action_id")
+    op.execute("DROP INDEX IF EXISTS ix_admin_logs_api_mutations_id")
@@ -0,0 +1,53 @@
+"""trigram search and paging indexes for round participants
+
+Revision ID: 20261018_03
+Revises: 20261018_02
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261018_03"
+down_revision: Union[str, Sequence[str], None] = "20261018_02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRGM_INDEXES = (
+    ("ix_users_name_trgm", "users", "name"),
+    ("ix_users_regno_trgm", "users", "regno"),
+    ("ix_users_email_trgm", "users", "email"),
+    ("ix_pda_event_teams_team_name_trgm", "pda_event_teams", "team_name"),
+    ("ix_pda_event_teams_team_code_trgm", "pda_event_teams", "team_code"),
+    ("ix_persohub_event_teams_team_name_trgm", "persohub_event_teams", "team_name"),
+    ("ix_persohub_event_teams_team_code_trgm", "persohub_event_teams", "team_code"),
+)
+
+
+def upgrade() -> None:
+    # Round participant search uses ILIKE '%term%', which only a trigram index can serve.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRGM_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)")
+    for prefix in ("pda", "persohub"):
+        # Paged round participant lists: registrations of one event in id order, optionally active only.
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{prefix}_event_registrations_event_status_id "
+            f"ON {prefix}_event_registrations (event_id, status, id)"
+        )
+        # Panel-scoped lists filter assignments by round and panel.
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{prefix}_event_round_panel_assignments_round_panel "
+            f"ON {prefix}_event_round_panel_assignments (round_id, panel_id)"
+        )
+
+
+def downgrade() -> None:
+    for prefix in ("pda", "persohub"):
+        op.execute(f"DROP INDEX IF EXISTS ix_{prefix}_event_round_panel_assignments_round_panel")
+        op.execute(f"DROP INDEX IF EXISTS ix_{prefix}_event_registrations_event_status_id")
+    for name, _, _ in TRGM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,57 @@
+"""partial unique indexes for attendance scan upserts
+
+Revision ID: 20261018_04
+Revises: 20261018_03
+Create Date: 2026-10-18 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261018_04"
+down_revision: Union[str, Sequence[str], None] = "20261018_03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, key columns, entity column, entity type)
+UPSERT_INDEXES = tuple(
+    item
+    for prefix in ("pda", "persohub")
+    for item in (
+        (f"uq_{prefix}_event_attendance_entity_user", f"{prefix}_event_attendance", ("event_id",), "user_id", "USER"),
+        (f"uq_{prefix}_event_attendance_entity_team", f"{prefix}_event_attendance", ("event_id",), "team_id", "TEAM"),
+        (f"uq_{prefix}_event_score_entity_user", f"{prefix}_event_scores", ("event_id", "round_id"), "user_id", "USER"),
+        (f"uq_{prefix}_event_score_entity_team", f"{prefix}_event_scores", ("event_id", "round_id"), "team_id", "TEAM"),
+    )
+)
+
+
+def upgrade() -> None:
+    # Startup migrations already add most of these (see enforce_pda_event_entity_uniqueness_once);
+    # persohub_event_scores never got them, so duplicates may exist there. Keep the newest row per entity.
+    for name, table, keys, entity_column, entity_type in UPSERT_INDEXES:
+        key_match = " AND ".join(f"older.{key} = newer.{key}" for key in (*keys, entity_column))
+        op.execute(
+            f"""
+            DELETE FROM {table} older
+            USING {table} newer
+            WHERE older.entity_type = '{entity_type}'
+              AND newer.entity_type = '{entity_type}'
+              AND {key_match}
+              AND older.id < newer.id
+            """
+        )
+        columns = ", ".join((*keys, entity_column))
+        op.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table} ({columns}) "
+            f"WHERE entity_type = '{entity_type}' AND {entity_column} IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    # The pda and attendance indexes predate this revision; only the persohub score ones are new.
+    op.execute("DROP INDEX IF EXISTS uq_persohub_event_score_entity_user")
+    op.execute("DROP INDEX IF EXISTS uq_persohub_event_score_entity_team")
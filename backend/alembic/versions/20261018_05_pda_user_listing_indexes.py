@@ -0,0 +1,35 @@
+"""indexes for paged and searchable PDA user and recruitment listings
+
+Revision ID: 20261018_05
+Revises: 20261018_04
+Create Date: 2026-10-18 16:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261018_05"
+down_revision: Union[str, Sequence[str], None] = "20261018_04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # name/regno trigram indexes exist since 20261018_03; user search also matches profile_name.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_profile_name_trgm ON users USING gin (profile_name gin_trgm_ops)")
+    # Keyset order of the admin users list.
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_name_regno ON users (name, regno)")
+    # Keyset order of the recruitment list, which only ever looks at non-members.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_non_member_created_at_id "
+        "ON users (created_at DESC, id DESC) WHERE is_member = false"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_non_member_created_at_id")
+    op.execute("DROP INDEX IF EXISTS ix_users_name_regno")
+    op.execute("DROP INDEX IF EXISTS ix_users_profile_name_trgm")
@@ -0,0 +1,45 @@
+"""trigram and expression indexes for community, hashtag and identifier search
+
+Revision ID: 20261018_06
+Revises: 20261018_05
+Create Date: 2026-10-18 17:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261018_06"
+down_revision: Union[str, Sequence[str], None] = "20261018_05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# users.name/regno/profile_name already have trigram indexes (20261018_03, 20261018_05).
+TRGM_INDEXES = (
+    ("ix_persohub_communities_profile_id_trgm", "persohub_communities", "profile_id"),
+    ("ix_persohub_communities_name_trgm", "persohub_communities", "name"),
+    ("ix_persohub_hashtags_hashtag_text_trgm", "persohub_hashtags", "hashtag_text"),
+)
+
+# identifier_rules compares lower(trim(...)) forms, which plain column indexes cannot serve.
+EXPRESSION_INDEXES = (
+    ("ix_users_regno_normalized", "users", "lower(trim(regno))"),
+    ("ix_users_profile_name_normalized", "users", "lower(trim(profile_name))"),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRGM_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)")
+    for name, table, expression in EXPRESSION_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} (({expression}))")
+
+
+def downgrade() -> None:
+    for name, _, _ in EXPRESSION_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, _, _ in TRGM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,33 @@
+"""recruitment keyset index sorts NULL created_at last
+
+Revision ID: 20261018_07
+Revises: 20261018_06
+Create Date: 2026-10-18 20:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261018_07"
+down_revision: Union[str, Sequence[str], None] = "20261018_06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The recruitment list orders by created_at DESC NULLS LAST; match it so the keyset stays an index scan.
+    op.execute("DROP INDEX IF EXISTS ix_users_non_member_created_at_id")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_non_member_created_at_id "
+        "ON users (created_at DESC NULLS LAST, id DESC) WHERE is_member = false"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_non_member_created_at_id")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_non_member_created_at_id "
+        "ON users (created_at DESC, id DESC) WHERE is_member = false"
+    )
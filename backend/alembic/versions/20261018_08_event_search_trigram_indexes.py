@@ -0,0 +1,36 @@
+"""trigram indexes for the admin event list searches
+
+Revision ID: 20261018_08
+Revises: 20261018_07
+Create Date: 2026-10-18 21:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261018_08"
+down_revision: Union[str, Sequence[str], None] = "20261018_07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Club and CC admin event lists match title/slug/event_code, and the CC list also club names.
+TRGM_INDEXES = (
+    ("ix_persohub_events_title_trgm", "persohub_events", "title"),
+    ("ix_persohub_events_slug_trgm", "persohub_events", "slug"),
+    ("ix_persohub_events_event_code_trgm", "persohub_events", "event_code"),
+    ("ix_persohub_clubs_name_trgm", "persohub_clubs", "name"),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRGM_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    for name, _, _ in TRGM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
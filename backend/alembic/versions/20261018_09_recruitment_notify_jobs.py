@@ -0,0 +1,67 @@
+"""recruitment notify jobs
+
+Revision ID: 20261018_09
+Revises: 20261018_08
+Create Date: 2026-10-18 22:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_09"
+down_revision = "20261018_08"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(table_name: str) -> bool:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    return inspector.has_table(table_name)
+
+
+def upgrade() -> None:
+    if not _has_table("recruitment_notify_jobs"):
+        op.create_table(
+            "recruitment_notify_jobs",
+            sa.Column("id", sa.String(length=32), nullable=False),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("active_slot", sa.String(length=20), nullable=True),
+            sa.Column("requested_by", sa.Integer(), nullable=True),
+            sa.Column("total", sa.Integer(), nullable=False),
+            sa.Column("sent", sa.Integer(), nullable=False),
+            sa.Column("failed", sa.Integer(), nullable=False),
+            sa.Column("skipped", sa.Integer(), nullable=False),
+            sa.Column("error", sa.String(length=300), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+            sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("active_slot"),
+        )
+    if not _has_table("recruitment_notify_recipients"):
+        op.create_table(
+            "recruitment_notify_recipients",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("job_id", sa.String(length=32), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=True),
+            sa.Column("email", sa.String(length=255), nullable=True),
+            sa.Column("name", sa.String(length=255), nullable=True),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("error", sa.String(length=300), nullable=True),
+            sa.ForeignKeyConstraint(["job_id"], ["recruitment_notify_jobs.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(op.f("ix_recruitment_notify_recipients_id"), "recruitment_notify_recipients", ["id"], unique=False)
+        op.create_index(op.f("ix_recruitment_notify_recipients_job_id"), "recruitment_notify_recipients", ["job_id"], unique=False)
+
+
+def downgrade() -> None:
+    if _has_table("recruitment_notify_recipients"):
+        op.drop_index(op.f("ix_recruitment_notify_recipients_job_id"), table_name="recruitment_notify_recipients")
+        op.drop_index(op.f("ix_recruitment_notify_recipients_id"), table_name="recruitment_notify_recipients")
+        op.drop_table("recruitment_notify_recipients")
+    if _has_table("recruitment_notify_jobs"):
+        op.drop_table("recruitment_notify_jobs")
@@ -0,0 +1,304 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from auth import decode_token
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+# A gate scanner re-reading the same badge within this window is acknowledged without touching the DB.
+ATTENDANCE_SCAN_DEDUPE_SECONDS = _int_env("ATTENDANCE_SCAN_DEDUPE_SECONDS", 10)
+ATTENDANCE_SCAN_DEDUPE_MAX_ENTRIES = max(1, _int_env("ATTENDANCE_SCAN_DEDUPE_MAX_ENTRIES", 50000))
+ATTENDANCE_SCAN_BULK_MAX = max(1, _int_env("ATTENDANCE_SCAN_BULK_MAX", 500))
+
+_INSERT_BY_DIALECT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# (entity_type "user"/"team", entity_id, round_id or None for entry-level attendance)
+AttendanceMark = Tuple[str, int, Optional[int]]
+
+
+class RecentScans:
+    """Process-local memory of recently written scans, bounded in both time and size."""
+
+    def __init__(self, window_seconds: int, max_entries: int):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def is_recent(self, key: Hashable) -> bool:
+        if self.window_seconds <= 0:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= now:
+                self._entries.pop(key, None)
+                return False
+            return True
+
+    def remember(self, keys: Iterable[Hashable]) -> None:
+        if self.window_seconds <= 0:
+            return
+        now = time.monotonic()
+        expires_at = now + self.window_seconds
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._entries[key] = expires_at
+            # Entries are kept in expiry order, so expired ones and overflow both come off the front.
+            while self._entries:
+                oldest_key, oldest_expiry = next(iter(self._entries.items()))
+                if oldest_expiry > now and len(self._entries) <= self.max_entries:
+                    break
+                self._entries.pop(oldest_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+recent_scans = RecentScans(ATTENDANCE_SCAN_DEDUPE_SECONDS, ATTENDANCE_SCAN_DEDUPE_MAX_ENTRIES)
+
+
+def scan_dedupe_key(scope: str, event_id: int, mark: AttendanceMark) -> tuple:
+    return (scope, int(event_id), mark[0], int(mark[1]), mark[2])
+
+
+def decode_attendance_qr(token: str, qr_kind: str, event_slug: str) -> Tuple[str, int]:
+    decoded = decode_token(token)
+    if decoded.get("qr") != qr_kind or decoded.get("event_slug") != event_slug:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid QR token")
+    entity_type = decoded.get("entity_type")
+    try:
+        entity_id = int(decoded.get("entity_id"))
+    except (TypeError, ValueError):
+        entity_id = 0
+    if entity_type not in {"user", "team"} or entity_id <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid QR token")
+    return entity_type, entity_id
+
+
+def _insert_for(db: Session):
+    dialect = db.get_bind().dialect.name
+    insert = _INSERT_BY_DIALECT.get(dialect)
+    if insert is None:
+        raise RuntimeError(f"Attendance upsert is not supported on {dialect}")
+    return insert
+
+
+def _entity_predicate(entity_type: str):
+    # Must imply the partial unique index predicate for ON CONFLICT to pick the index.
+    if entity_type == "user":
+        return text("entity_type = 'USER' AND user_id IS NOT NULL")
+    return text("entity_type = 'TEAM' AND team_id IS NOT NULL")
+
+
+def upsert_attendance_marks(
+    db: Session,
+    *,
+    attendance_model,
+    score_model,
+    event_id: int,
+    marks: Iterable[AttendanceMark],
+    marked_by_user_id: Optional[int],
+    marked_at: Optional[Dict[AttendanceMark, datetime]] = None,
+) -> int:
+    """Mark entities present with INSERT .. ON CONFLICT, one statement per table and entity type.
+
+    Entry-level marks (round_id None) go to ``attendance_model``; round-level marks set
+    ``is_present`` on the round's ``score_model`` row, creating an empty score row if needed.
+    Relies on the uq_*_entity_user/team partial unique indexes.
+    Does not commit.
+    """
+    insert = _insert_for(db)
+    entity_enum = attendance_model.__table__.c.entity_type.type.enum_class
+    now = datetime.now(timezone.utc)
+    marked_at = marked_at or {}
+    entry_rows: Dict[str, Dict[int, dict]] = {"user": {}, "team": {}}
+    round_rows: Dict[str, Dict[Tuple[int, int], dict]] = {"user": {}, "team": {}}
+    for mark in marks:
+        entity_type, entity_id, round_id = mark
+        entity_id = int(entity_id)
+        identity = {
+            "event_id": int(event_id),
+            "entity_type": entity_enum.USER if entity_type == "user" else entity_enum.TEAM,
+            "user_id": entity_id if entity_type == "user" else None,
+            "team_id": entity_id if entity_type == "team" else None,
+        }
+        if round_id is None:
+            entry_rows[entity_type][entity_id] = {
+                **identity,
+                "is_present": True,
+                "marked_by_user_id": marked_by_user_id,
+                "marked_at": marked_at.get(mark) or now,
+            }
+        else:
+            round_rows[entity_type][(int(round_id), entity_id)] = {
+                **identity,
+                "round_id": int(round_id),
+                "criteria_scores": {},
+                "total_score": 0.0,
+                "normalized_score": 0.0,
+                "is_present": True,
+            }
+
+    written = 0
+    for entity_type, rows in entry_rows.items():
+        if not rows:
+            continue
+        id_column = attendance_model.user_id if entity_type == "user" else attendance_model.team_id
+        stmt = insert(attendance_model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[attendance_model.event_id, id_column],
+            index_where=_entity_predicate(entity_type),
+            set_={"is_present": True, "marked_by_user_id": stmt.excluded.marked_by_user_id},
+        )
+        db.execute(stmt, list(rows.values()))
+        written += len(rows)
+    for entity_type, rows in round_rows.items():
+        if not rows:
+            continue
+        id_column = score_model.user_id if entity_type == "user" else score_model.team_id
+        stmt = insert(score_model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[score_model.event_id, score_model.round_id, id_column],
+            index_where=_entity_predicate(entity_type),
+            set_={"is_present": True, "updated_at": func.now()},
+        )
+        db.execute(stmt, list(rows.values()))
+        written += len(rows)
+    return written
+
+
+def _scan_result(index: int, result_status: str, mark: Optional[AttendanceMark] = None, detail: Optional[str] = None) -> dict:
+    return {
+        "index": index,
+        "status": result_status,
+        "entity_type": mark[0] if mark else None,
+        "entity_id": mark[1] if mark else None,
+        "round_id": mark[2] if mark else None,
+        "detail": detail,
+    }
+
+
+def mark_scan_batch(
+    db: Session,
+    *,
+    scope: str,
+    qr_kind: str,
+    event,
+    scans: List,
+    round_model,
+    registration_model,
+    attendance_model,
+    score_model,
+    marked_by_user_id: Optional[int],
+) -> Tuple[dict, List[AttendanceMark]]:
+    """Verify, dedupe and upsert a batch of queued scans; returns (response payload, marks written).
+
+    Each scan needs ``token``, ``round_id`` and optional ``scanned_at``. Bad scans are reported per
+    item instead of failing the batch. Does not commit or remember the marks in ``recent_scans``.
+    """
+    if len(scans) > ATTENDANCE_SCAN_BULK_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {ATTENDANCE_SCAN_BULK_MAX} scans can be uploaded at once",
+        )
+    results: List[Optional[dict]] = [None] * len(scans)
+    pending: Dict[AttendanceMark, int] = {}
+    marked_at: Dict[AttendanceMark, datetime] = {}
+    now = datetime.now(timezone.utc)
+    for index, scan in enumerate(scans):
+        try:
+            entity_type, entity_id = decode_attendance_qr(scan.token, qr_kind, event.slug)
+        except HTTPException as exc:
+            results[index] = _scan_result(index, "invalid", detail="Invalid QR token" if exc.status_code == 401 else exc.detail)
+            continue
+        mark = (entity_type, entity_id, int(scan.round_id) if scan.round_id is not None else None)
+        if mark in pending or recent_scans.is_recent(scan_dedupe_key(scope, event.id, mark)):
+            results[index] = _scan_result(index, "duplicate", mark)
+            continue
+        pending[mark] = index
+        scanned_at = getattr(scan, "scanned_at", None)
+        if scanned_at is not None:
+            if scanned_at.tzinfo is None:
+                scanned_at = scanned_at.replace(tzinfo=timezone.utc)
+            # Offline devices keep their own clocks; never record a scan in the future.
+            marked_at[mark] = min(scanned_at, now)
+
+    round_ids = {mark[2] for mark in pending if mark[2] is not None}
+    known_rounds = set()
+    if round_ids:
+        known_rounds = {
+            int(row_id)
+            for (row_id,) in db.query(round_model.id).filter(round_model.event_id == event.id, round_model.id.in_(round_ids)).all()
+        }
+    user_ids = {mark[1] for mark in pending if mark[0] == "user"}
+    team_ids = {mark[1] for mark in pending if mark[0] == "team"}
+    registered = set()
+    if user_ids:
+        registered.update(
+            ("user", int(user_id))
+            for (user_id,) in db.query(registration_model.user_id)
+            .filter(registration_model.event_id == event.id, registration_model.user_id.in_(user_ids))
+            .all()
+        )
+    if team_ids:
+        registered.update(
+            ("team", int(team_id))
+            for (team_id,) in db.query(registration_model.team_id)
+            .filter(registration_model.event_id == event.id, registration_model.team_id.in_(team_ids))
+            .all()
+        )
+
+    accepted: List[AttendanceMark] = []
+    for mark, index in pending.items():
+        if mark[2] is not None and mark[2] not in known_rounds:
+            results[index] = _scan_result(index, "invalid", mark, "Round not found")
+        elif (mark[0], mark[1]) not in registered:
+            results[index] = _scan_result(index, "invalid", mark, "Not registered for this event")
+        else:
+            results[index] = _scan_result(index, "marked", mark)
+            accepted.append(mark)
+    if accepted:
+        upsert_attendance_marks(
+            db,
+            attendance_model=attendance_model,
+            score_model=score_model,
+            event_id=event.id,
+            marks=accepted,
+            marked_by_user_id=marked_by_user_id,
+            marked_at=marked_at,
+        )
+
+    counts = {"marked": 0, "duplicate": 0, "invalid": 0}
+    for item in results:
+        counts[item["status"]] += 1
+    payload = {
+        "marked": counts["marked"],
+        "duplicates": counts["duplicate"],
+        "invalid": counts["invalid"],
+        "results": results,
+    }
+    return payload, accepted
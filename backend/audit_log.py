@@ -0,0 +1,133 @@
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+AUDIT_LOG_ASYNC = str(os.environ.get("AUDIT_LOG_ASYNC", "1")).strip().lower() not in {"0", "false", "no", "off"}
+AUDIT_LOG_QUEUE_SIZE = max(1, _int_env("AUDIT_LOG_QUEUE_SIZE", 10000))
+AUDIT_LOG_BATCH_SIZE = max(1, _int_env("AUDIT_LOG_BATCH_SIZE", 200))
+AUDIT_LOG_FLUSH_INTERVAL_MS = max(10, _int_env("AUDIT_LOG_FLUSH_INTERVAL_MS", 500))
+
+_STOP = object()
+_queue: "queue.Queue" = queue.Queue(maxsize=AUDIT_LOG_QUEUE_SIZE)
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _write_batch(batch: List[Tuple[type, dict]]) -> None:
+    grouped: Dict[type, List[dict]] = {}
+    for model, values in batch:
+        grouped.setdefault(model, []).append(values)
+    db = SessionLocal()
+    try:
+        for model, rows in grouped.items():
+            db.execute(insert(model), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to write %s audit log rows", len(batch))
+    finally:
+        db.close()
+
+
+def _writer_loop() -> None:
+    flush_interval = AUDIT_LOG_FLUSH_INTERVAL_MS / 1000.0
+    stopping = False
+    while not stopping:
+        batch: List[Tuple[type, dict]] = []
+        deadline = None
+        while len(batch) < AUDIT_LOG_BATCH_SIZE:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = _queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stopping = True
+                break
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + flush_interval
+        if batch:
+            _write_batch(batch)
+            for _ in batch:
+                _queue.task_done()
+        if stopping:
+            _queue.task_done()
+
+
+def _ensure_writer() -> None:
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name="audit-log-writer", daemon=True)
+            _writer.start()
+
+
+def enqueue_audit_record(model: type, values: dict) -> bool:
+    """Queue one log row for the background writer; False means the caller must write it itself."""
+    if not AUDIT_LOG_ASYNC:
+        return False
+    row = dict(values)
+    # Stamp now so batching delay does not shift the recorded time.
+    row.setdefault("created_at", datetime.now(timezone.utc))
+    _ensure_writer()
+    try:
+        _queue.put_nowait((model, row))
+    except queue.Full:
+        logger.warning("Audit log queue full; writing %s synchronously", getattr(model, "__tablename__", model))
+        return False
+    return True
+
+
+def audit_queue_depth() -> int:
+    return _queue.qsize()
+
+
+def flush_audit_log(timeout: float = 10.0) -> bool:
+    """Block until everything queued so far has been written (or ``timeout`` passes)."""
+    if _writer is None or not _writer.is_alive():
+        return _queue.empty()
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return not _queue.unfinished_tasks
+
+
+def shutdown_audit_writer(timeout: float = 10.0) -> None:
+    global _writer
+    writer = _writer
+    if writer is None or not writer.is_alive():
+        return
+    try:
+        _queue.put(_STOP, timeout=timeout)
+    except queue.Full:
+        logger.error("Audit log queue still full at shutdown; pending rows may be lost")
+        return
+    writer.join(timeout=timeout)
+    with _writer_lock:
+        if _writer is writer and not writer.is_alive():
+            _writer = None
@@ -2,16 +2,18 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-import bcrypt
-import hashlib
 import os
+import uuid
 from dotenv import load_dotenv
 from pathlib import Path
 from database import get_db
 from models import PdaUser
+from principal_cache import token_cache_id
+from jwt_verify import verify_jwt
+from password_hashing import check_password, hash_password
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -44,26 +46,11 @@ security = HTTPBearer()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    try:
-        pw_bytes = plain_password.encode('utf-8')
-    except Exception:
-        pw_bytes = str(plain_password).encode('utf-8')
-    digest = hashlib.sha256(pw_bytes).digest()
-    try:
-        return bcrypt.checkpw(digest, hashed_password.encode('utf-8'))
-    except ValueError:
-        return False
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    # Always pre-hash password with SHA-256, then bcrypt the digest
-    try:
-        pw_bytes = password.encode('utf-8')
-    except Exception:
-        pw_bytes = str(password).encode('utf-8')
-    digest = hashlib.sha256(pw_bytes).digest()
-    hashed = bcrypt.hashpw(digest, bcrypt.gensalt())
-    return hashed.decode('utf-8')
+    return hash_password(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -72,7 +59,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -87,7 +74,7 @@ def create_refresh_token(data: dict) -> str:
 
 def decode_token(token: str) -> dict:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = verify_jwt(token, SECRET_KEY, ALGORITHM)
         return payload
     except JWTError:
         raise HTTPException(
@@ -98,6 +85,7 @@ def decode_token(token: str) -> dict:
 
 
 async def get_current_pda_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> PdaUser:
@@ -130,6 +118,10 @@ async def get_current_pda_user(
             detail="User not found"
         )
 
+    request.state.auth_token_id = token_cache_id(payload, token)
+    request.state.pda_user = user
+    # Plain copy for code that runs after the request session is gone (audit middleware).
+    request.state.auth_actor = {"id": user.id, "regno": user.regno, "name": user.name}
     return user
 
 
@@ -3,9 +3,31 @@ from __future__ import annotations
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from sqlalchemy import and_, or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from models import Badge, BadgeAssignment, PdaEvent, PersohubEvent
+from models import (
+    Badge,
+    BadgeAssignment,
+    PdaEvent,
+    PdaEventRegistration,
+    PdaEventTeam,
+    PdaEventTeamMember,
+    PdaUser,
+    PersohubEvent,
+    PersohubEventRegistration,
+    PersohubEventTeam,
+    PersohubEventTeamMember,
+)
+
+BADGE_TARGET_COLUMNS = {
+    "user": "user_id",
+    "pda_team": "pda_team_id",
+    "persohub_team": "persohub_team_id",
+}
+_INSERT_BY_DIALECT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+# Rows per INSERT; six bound parameters each keeps a chunk well under driver parameter limits.
+BULK_BADGE_CHUNK_SIZE = 1000
 
 
 def _clean_text(value: Optional[str]) -> str:
@@ -98,6 +120,138 @@ def create_badge_assignment(
     return row
 
 
+def find_missing_badge_targets(
+    db: Session,
+    target_type: str,
+    target_ids: Iterable[int],
+    *,
+    event_id: Optional[int] = None,
+) -> List[int]:
+    """Return the requested target ids that do not exist (or, for teams, are not in ``event_id``)."""
+    ids = sorted({int(item) for item in target_ids if item is not None})
+    if not ids:
+        return []
+    if target_type == "user":
+        q = db.query(PdaUser.id).filter(PdaUser.id.in_(ids))
+    elif target_type == "pda_team":
+        q = db.query(PdaEventTeam.id).filter(PdaEventTeam.id.in_(ids))
+        if event_id is not None:
+            q = q.filter(PdaEventTeam.event_id == event_id)
+    elif target_type == "persohub_team":
+        q = db.query(PersohubEventTeam.id).filter(PersohubEventTeam.id.in_(ids))
+        if event_id is not None:
+            q = q.filter(PersohubEventTeam.event_id == event_id)
+    else:
+        raise ValueError(f"Unknown badge target type: {target_type}")
+    found = {int(row[0]) for row in q.all()}
+    return [item for item in ids if item not in found]
+
+
+def find_unregistered_badge_targets(
+    db: Session,
+    platform: str,
+    target_type: str,
+    target_ids: Iterable[int],
+    *,
+    event_id: int,
+) -> List[int]:
+    """Return the requested users or teams with no registration in ``event_id``.
+
+    A user also counts as registered through a registered team they belong to.
+    """
+    if platform == "pda":
+        registration, member = PdaEventRegistration, PdaEventTeamMember
+    elif platform == "persohub":
+        registration, member = PersohubEventRegistration, PersohubEventTeamMember
+    else:
+        raise ValueError(f"Unknown platform: {platform}")
+    ids = sorted({int(item) for item in target_ids if item is not None})
+    if not ids:
+        return []
+    if target_type == "user":
+        direct = db.query(registration.user_id).filter(registration.event_id == event_id, registration.user_id.in_(ids))
+        via_team = (
+            db.query(member.user_id)
+            .join(registration, registration.team_id == member.team_id)
+            .filter(registration.event_id == event_id, member.user_id.in_(ids))
+        )
+        q = direct.union(via_team)
+    elif target_type in {"pda_team", "persohub_team"}:
+        q = db.query(registration.team_id).filter(registration.event_id == event_id, registration.team_id.in_(ids))
+    else:
+        raise ValueError(f"Unknown badge target type: {target_type}")
+    found = {int(row[0]) for row in q.all()}
+    return [item for item in ids if item not in found]
+
+
+def bulk_create_badge_assignments(
+    db: Session,
+    *,
+    badge_id: int,
+    target_type: str,
+    target_ids: Iterable[int],
+    pda_event_id: Optional[int] = None,
+    persohub_event_id: Optional[int] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> List[int]:
+    """Assign one badge to many targets with one INSERT per chunk, skipping existing assignments.
+
+    Returns the ids of newly created rows only; targets that already hold the
+    badge in the same event context are left untouched (uq_badge_assignments_identity).
+    """
+    target_column = BADGE_TARGET_COLUMNS.get(target_type)
+    if target_column is None:
+        raise ValueError(f"Unknown badge target type: {target_type}")
+    if pda_event_id is not None and persohub_event_id is not None:
+        raise ValueError("At most one event context is allowed")
+    ids = list(dict.fromkeys(int(item) for item in target_ids if item is not None))
+    if not ids:
+        return []
+    dialect = db.get_bind().dialect.name
+    insert = _INSERT_BY_DIALECT.get(dialect)
+    if insert is None:
+        raise RuntimeError(f"Bulk badge assignment is not supported on {dialect}")
+    created: List[int] = []
+    for start in range(0, len(ids), BULK_BADGE_CHUNK_SIZE):
+        values = [
+            {
+                "badge_id": int(badge_id),
+                target_column: target_id,
+                "pda_event_id": pda_event_id,
+                "persohub_event_id": persohub_event_id,
+                "meta": dict(meta or {}),
+            }
+            for target_id in ids[start:start + BULK_BADGE_CHUNK_SIZE]
+        ]
+        statement = insert(BadgeAssignment).values(values).on_conflict_do_nothing().returning(BadgeAssignment.id)
+        created.extend(int(row[0]) for row in db.execute(statement).fetchall())
+    return created
+
+
+def find_badge_assignment(
+    db: Session,
+    *,
+    badge_id: int,
+    target_type: str,
+    target_id: int,
+    pda_event_id: Optional[int] = None,
+    persohub_event_id: Optional[int] = None,
+) -> Optional[BadgeAssignment]:
+    """The assignment matching uq_badge_assignments_identity, if any."""
+    target_column = BADGE_TARGET_COLUMNS.get(target_type)
+    if target_column is None:
+        raise ValueError(f"Unknown badge target type: {target_type}")
+    q = db.query(BadgeAssignment).filter(
+        BadgeAssignment.badge_id == int(badge_id),
+        BadgeAssignment.pda_event_id == pda_event_id,
+        BadgeAssignment.persohub_event_id == persohub_event_id,
+    )
+    for column in BADGE_TARGET_COLUMNS.values():
+        value = int(target_id) if column == target_column else None
+        q = q.filter(getattr(BadgeAssignment, column) == value)
+    return q.first()
+
+
 def list_event_badges(db: Session, *, platform: str, event_id: int) -> List[Tuple[BadgeAssignment, Badge]]:
     q = db.query(BadgeAssignment, Badge).join(Badge, Badge.id == BadgeAssignment.badge_id)
     if platform == "pda":
@@ -0,0 +1,385 @@
+import hashlib
+import hmac
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from models import EventCertificate
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+TEMPLATE_DIR = ROOT_DIR / "templates"
+# Relative image names in the certificate template resolve here, e.g. the official logos in uploads/.
+TEMPLATE_ASSET_DIRS = (TEMPLATE_DIR, ROOT_DIR / "uploads")
+TEMPLATE_NAME = "pdacert.html"
+CERTIFICATE_DIR = Path(os.environ.get("CERTIFICATE_DIR", str(ROOT_DIR / "generated_certificates")))
+CERTIFICATE_KEY_PREFIX = "certificates"
+DOWNLOAD_PATH = "/api/certificates/download"
+
+_RENDER_WORKERS_DEFAULT = 4
+_LINK_TTL_SECONDS_DEFAULT = 3600
+
+_PLATFORM_TABLES = {
+    "pda": {
+        "registrations": "pda_event_registrations",
+        "team_members": "pda_event_team_members",
+        "scores": "pda_event_scores",
+        "attendance": "pda_event_attendance",
+        "event_column": "pda_event_id",
+    },
+    "persohub": {
+        "registrations": "persohub_event_registrations",
+        "team_members": "persohub_event_team_members",
+        "scores": "persohub_event_scores",
+        "attendance": "persohub_event_attendance",
+        "event_column": "persohub_event_id",
+    },
+}
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _platform_tables(platform: str) -> Dict[str, str]:
+    tables = _PLATFORM_TABLES.get(platform)
+    if not tables:
+        raise ValueError(f"Unsupported certificate platform: {platform}")
+    return tables
+
+
+def list_certificate_recipients(db: Session, *, platform: str, event_id: int) -> List[Dict[str, Any]]:
+    """One row per person (team registrations fan out to members) with attendance-based eligibility.
+
+    Mirrors `_resolve_attendance_metrics`: round-level score rows win, entry-level attendance is the fallback.
+    """
+    tables = _platform_tables(platform)
+    rows = db.execute(
+        text(
+            f"""
+            WITH score_user AS (
+                SELECT user_id,
+                       COUNT(*) AS round_rows,
+                       COUNT(DISTINCT round_id) FILTER (WHERE is_present) AS present_rounds
+                FROM {tables["scores"]}
+                WHERE event_id = :event_id AND user_id IS NOT NULL
+                GROUP BY user_id
+            ),
+            score_team AS (
+                SELECT team_id,
+                       COUNT(*) AS round_rows,
+                       COUNT(DISTINCT round_id) FILTER (WHERE is_present) AS present_rounds
+                FROM {tables["scores"]}
+                WHERE event_id = :event_id AND team_id IS NOT NULL
+                GROUP BY team_id
+            ),
+            attendance_user AS (
+                SELECT user_id, COUNT(*) FILTER (WHERE is_present) AS present_entries
+                FROM {tables["attendance"]}
+                WHERE event_id = :event_id AND user_id IS NOT NULL
+                GROUP BY user_id
+            ),
+            attendance_team AS (
+                SELECT team_id, COUNT(*) FILTER (WHERE is_present) AS present_entries
+                FROM {tables["attendance"]}
+                WHERE event_id = :event_id AND team_id IS NOT NULL
+                GROUP BY team_id
+            )
+            SELECT r.id AS registration_id,
+                   r.team_id AS team_id,
+                   CAST(r.status AS TEXT) AS registration_status,
+                   u.id AS user_id,
+                   u.name AS name,
+                   u.regno AS regno,
+                   COALESCE(su.round_rows, st.round_rows, 0) AS round_rows,
+                   COALESCE(su.present_rounds, st.present_rounds, 0) AS present_rounds,
+                   COALESCE(au.present_entries, at.present_entries, 0) AS present_entries
+            FROM {tables["registrations"]} r
+            LEFT JOIN {tables["team_members"]} tm
+                ON r.user_id IS NULL AND tm.team_id = r.team_id
+            JOIN users u ON u.id = COALESCE(r.user_id, tm.user_id)
+            LEFT JOIN score_user su ON r.user_id IS NOT NULL AND su.user_id = r.user_id
+            LEFT JOIN score_team st ON r.user_id IS NULL AND st.team_id = r.team_id
+            LEFT JOIN attendance_user au ON r.user_id IS NOT NULL AND au.user_id = r.user_id
+            LEFT JOIN attendance_team at ON r.user_id IS NULL AND at.team_id = r.team_id
+            WHERE r.event_id = :event_id
+            ORDER BY r.id ASC, u.id ASC
+            """
+        ),
+        {"event_id": int(event_id)},
+    ).mappings().all()
+
+    recipients: List[Dict[str, Any]] = []
+    for row in rows:
+        if int(row["round_rows"] or 0) > 0:
+            attended = int(row["present_rounds"] or 0) > 0
+        else:
+            attended = int(row["present_entries"] or 0) > 0
+        eligible = attended
+        if platform == "persohub":
+            eligible = eligible and str(row["registration_status"] or "").strip().upper() == "ACTIVE"
+        recipients.append(
+            {
+                "registration_id": int(row["registration_id"]),
+                "team_id": row["team_id"],
+                "user_id": int(row["user_id"]),
+                "name": str(row["name"] or ""),
+                "regno": str(row["regno"] or ""),
+                "eligible": bool(eligible),
+            }
+        )
+    return recipients
+
+
+def _academic_year(event: Any) -> str:
+    start_date = getattr(event, "start_date", None)
+    if not start_date:
+        return ""
+    year = int(start_date.year)
+    if int(start_date.month) >= 6:
+        return f"{year}-{year + 1}"
+    return f"{year - 1}-{year}"
+
+
+def build_certificate_context(event: Any, recipient: Dict[str, Any]) -> Dict[str, str]:
+    title = str(getattr(event, "title", "") or "").strip()
+    event_code = str(getattr(event, "event_code", "") or "").strip()
+    achievement = f"For active participation in {title}"
+    if event_code:
+        achievement = f"{achievement} ({event_code})"
+    return {
+        "recipient_name": str(recipient.get("name") or "").upper(),
+        "achievement_text": achievement,
+        "academic_year": _academic_year(event),
+    }
+
+
+@lru_cache(maxsize=1)
+def _certificate_template():
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    environment = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=select_autoescape(enabled_extensions=("html", "xml")),
+    )
+    return environment.get_template(TEMPLATE_NAME)
+
+
+def _render_worker_init() -> None:
+    # Compile the template once per worker process instead of once per certificate.
+    _certificate_template()
+
+
+def _resolve_template_asset(uri: str, rel: Optional[str] = None) -> str:
+    """xhtml2pdf link_callback: map the template's bare image names to files shipped with the backend."""
+    if ":" in uri:
+        return uri
+    name = Path(uri).name
+    for directory in TEMPLATE_ASSET_DIRS:
+        candidate = directory / name
+        if candidate.is_file():
+            return str(candidate)
+    return uri
+
+
+def render_certificate_pdf(context: Dict[str, str]) -> bytes:
+    from xhtml2pdf import pisa
+
+    html_content = _certificate_template().render(**context)
+    output = io.BytesIO()
+    result = pisa.CreatePDF(src=html_content, dest=output, encoding="utf-8", link_callback=_resolve_template_asset)
+    if getattr(result, "err", 0):
+        raise RuntimeError("Failed to render certificate PDF")
+    return output.getvalue()
+
+
+def certificate_storage_key(*, platform: str, event_slug: str, user_id: int) -> str:
+    return f"{CERTIFICATE_KEY_PREFIX}/{platform}/{event_slug}/{int(user_id)}.pdf"
+
+
+def _store_certificate(key: str, data: bytes) -> None:
+    from utils import S3_BUCKET_NAME, S3_CLIENT
+
+    if S3_CLIENT and S3_BUCKET_NAME:
+        S3_CLIENT.put_object(Bucket=S3_BUCKET_NAME, Key=key, Body=data, ContentType="application/pdf")
+        return
+    path = CERTIFICATE_DIR / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".pdf.tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+def _render_and_store(job: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        pdf_bytes = render_certificate_pdf(job["context"])
+        _store_certificate(job["storage_key"], pdf_bytes)
+        return {**job, "ok": True}
+    except Exception as exc:
+        return {**job, "ok": False, "error": str(exc)}
+
+
+def render_certificates(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not jobs:
+        return []
+    workers = min(_int_env("CERTIFICATE_RENDER_WORKERS", _RENDER_WORKERS_DEFAULT), len(jobs))
+    if workers <= 1:
+        return [_render_and_store(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_render_worker_init,
+    ) as pool:
+        return list(pool.map(_render_and_store, jobs, chunksize=chunksize))
+
+
+def _record_certificates(db: Session, *, platform: str, event_id: int, results: List[Dict[str, Any]]) -> int:
+    column = _platform_tables(platform)["event_column"]
+    rows = [
+        {
+            "event_id": int(event_id),
+            "user_id": int(item["user_id"]),
+            "registration_id": item.get("registration_id"),
+            "storage_key": item["storage_key"],
+        }
+        for item in results
+        if item.get("ok")
+    ]
+    if not rows:
+        return 0
+    db.execute(
+        text(
+            f"""
+            INSERT INTO event_certificates ({column}, user_id, registration_id, storage_key, generated_at)
+            VALUES (:event_id, :user_id, :registration_id, :storage_key, now())
+            ON CONFLICT ({column}, user_id) DO UPDATE
+            SET registration_id = EXCLUDED.registration_id,
+                storage_key = EXCLUDED.storage_key,
+                generated_at = now()
+            """
+        ),
+        rows,
+    )
+    db.commit()
+    return len(rows)
+
+
+def generated_certificate_user_ids(db: Session, *, platform: str, event_id: int) -> set:
+    column = getattr(EventCertificate, _platform_tables(platform)["event_column"])
+    rows = db.query(EventCertificate.user_id).filter(column == int(event_id)).all()
+    return {int(row.user_id) for row in rows}
+
+
+def plan_certificate_jobs(
+    db: Session,
+    *,
+    platform: str,
+    event: Any,
+    force: bool = False,
+) -> Dict[str, Any]:
+    recipients = list_certificate_recipients(db, platform=platform, event_id=int(event.id))
+    eligible = [item for item in recipients if item["eligible"]]
+    existing = set() if force else generated_certificate_user_ids(db, platform=platform, event_id=int(event.id))
+    jobs: List[Dict[str, Any]] = []
+    seen_user_ids = set()
+    for recipient in eligible:
+        user_id = int(recipient["user_id"])
+        if user_id in existing or user_id in seen_user_ids:
+            continue
+        seen_user_ids.add(user_id)
+        jobs.append(
+            {
+                "user_id": user_id,
+                "registration_id": recipient["registration_id"],
+                "storage_key": certificate_storage_key(platform=platform, event_slug=event.slug, user_id=user_id),
+                "context": build_certificate_context(event, recipient),
+            }
+        )
+    return {
+        "registrations": len({item["registration_id"] for item in recipients}),
+        "eligible": len(eligible),
+        "already_generated": len(existing),
+        "jobs": jobs,
+    }
+
+
+def run_certificate_batch(platform: str, event_id: int, jobs: List[Dict[str, Any]]) -> None:
+    from database import SessionLocal
+
+    started = time.perf_counter()
+    results = render_certificates(jobs)
+    failed = [item for item in results if not item.get("ok")]
+    db = SessionLocal()
+    try:
+        stored = _record_certificates(db, platform=platform, event_id=event_id, results=results)
+    finally:
+        db.close()
+    logger.info(
+        "Certificate batch for %s event %s: %s stored, %s failed in %.1fs",
+        platform,
+        event_id,
+        stored,
+        len(failed),
+        time.perf_counter() - started,
+    )
+    for item in failed[:10]:
+        logger.warning("Certificate render failed for user %s: %s", item.get("user_id"), item.get("error"))
+
+
+def get_event_certificate(db: Session, *, platform: str, event_id: int, user_id: int) -> Optional[EventCertificate]:
+    column = getattr(EventCertificate, _platform_tables(platform)["event_column"])
+    return (
+        db.query(EventCertificate)
+        .filter(column == int(event_id), EventCertificate.user_id == int(user_id))
+        .first()
+    )
+
+
+def _download_signature(key: str, expires: int) -> str:
+    from auth import SECRET_KEY
+
+    message = f"{key}:{int(expires)}".encode("utf-8")
+    return hmac.new(SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def certificate_download_url(key: str, expires_in: Optional[int] = None) -> str:
+    from utils import S3_BUCKET_NAME, S3_CLIENT, _generate_presigned_get_url_for_key
+
+    ttl = expires_in or _int_env("CERTIFICATE_LINK_TTL_SECONDS", _LINK_TTL_SECONDS_DEFAULT)
+    if S3_CLIENT and S3_BUCKET_NAME:
+        return _generate_presigned_get_url_for_key(key, expires_in=ttl)
+    expires = int(time.time()) + int(ttl)
+    query = urlencode({"key": key, "expires": expires, "signature": _download_signature(key, expires)})
+    return f"{DOWNLOAD_PATH}?{query}"
+
+
+def resolve_signed_certificate_path(key: str, expires: int, signature: str) -> Path:
+    if int(expires) < int(time.time()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Download link expired")
+    if not hmac.compare_digest(_download_signature(key, expires), str(signature or "")):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid download link")
+    base_dir = CERTIFICATE_DIR.resolve()
+    path = (base_dir / key).resolve()
+    if base_dir not in path.parents or not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Certificate not found")
+    return path
@@ -1,23 +1,172 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+import logging
 import os
 from dotenv import load_dotenv
 from pathlib import Path
 
+from metrics import TimedQueuePool
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
 DATABASE_URL = os.environ.get('DATABASE_URL')
+# Optional replica for public read endpoints; falls back to the primary.
+DATABASE_READ_URL = os.environ.get('DATABASE_READ_URL') or None
+
+DB_POOL_SIZE = _int_env('DB_POOL_SIZE', 10)
+DB_MAX_OVERFLOW = _int_env('DB_MAX_OVERFLOW', 20)
+DB_POOL_TIMEOUT_SECONDS = _int_env('DB_POOL_TIMEOUT_SECONDS', 30)
+DB_POOL_RECYCLE_SECONDS = _int_env('DB_POOL_RECYCLE_SECONDS', 1800)
+# 0 leaves the server default (no timeout).
+DB_STATEMENT_TIMEOUT_MS = _int_env('DB_STATEMENT_TIMEOUT_MS', 0)
+DB_READ_STATEMENT_TIMEOUT_MS = _int_env('DB_READ_STATEMENT_TIMEOUT_MS', DB_STATEMENT_TIMEOUT_MS)
+DB_READ_POOL_SIZE = _int_env('DB_READ_POOL_SIZE', DB_POOL_SIZE)
+DB_READ_MAX_OVERFLOW = _int_env('DB_READ_MAX_OVERFLOW', DB_MAX_OVERFLOW)
+
+
+def _engine_kwargs(pool_size: int, max_overflow: int) -> dict:
+    return {
+        "pool_pre_ping": True,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS or -1,
+    }
+
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_size=10, max_overflow=20)
+def _psycopg_connect_args(statement_timeout_ms: int) -> dict:
+    if not statement_timeout_ms:
+        return {}
+    return {"options": f"-c statement_timeout={int(statement_timeout_ms)}"}
+
+
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=TimedQueuePool,
+    connect_args=_psycopg_connect_args(DB_STATEMENT_TIMEOUT_MS),
+    **_engine_kwargs(DB_POOL_SIZE, DB_MAX_OVERFLOW),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+if DATABASE_READ_URL:
+    read_engine = create_engine(
+        DATABASE_READ_URL,
+        poolclass=TimedQueuePool,
+        connect_args=_psycopg_connect_args(DB_READ_STATEMENT_TIMEOUT_MS),
+        **_engine_kwargs(DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW),
+    )
+    # read_only lets shared helpers skip opportunistic writes a replica would reject.
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine, info={"read_only": True})
+else:
+    read_engine = engine
+    ReadSessionLocal = SessionLocal
+
 Base = declarative_base()
 
+
+def _async_database_url(url):
+    if not url:
+        return url
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+# Opt-in: async routes fall back to the sync pool on the threadpool until this is enabled.
+ASYNC_DB_ENABLED = str(os.environ.get('ASYNC_DB_ENABLED', '0')).strip().lower() in {'1', 'true', 'yes', 'on'}
+# asyncpg does not understand libpq query options (e.g. sslmode); set this when the URL uses them.
+ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL') or _async_database_url(DATABASE_READ_URL or DATABASE_URL)
+
+def _make_async_sessionmaker(url):
+    """Build the asyncpg engine and its session factory; raises ImportError without asyncpg."""
+    async_connect_args = {}
+    if DB_READ_STATEMENT_TIMEOUT_MS:
+        async_connect_args = {"server_settings": {"statement_timeout": str(int(DB_READ_STATEMENT_TIMEOUT_MS))}}
+    new_engine = create_async_engine(
+        url,
+        connect_args=async_connect_args,
+        **_engine_kwargs(DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW),
+    )
+    factory = async_sessionmaker(
+        new_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+        info={"read_only": bool(DATABASE_READ_URL)},
+    )
+    return new_engine, factory
+
+
+async_engine = None
+AsyncSessionLocal = None
+if ASYNC_DB_ENABLED:
+    try:
+        async_engine, AsyncSessionLocal = _make_async_sessionmaker(ASYNC_DATABASE_URL)
+    except ImportError:
+        logger.warning("ASYNC_DB_ENABLED is set but asyncpg is not installed; async routes use the sync pool")
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Session for read-only endpoints; uses DATABASE_READ_URL when configured."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _call_with_session(fn, args, kwargs):
+    db = ReadSessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+class ThreadpoolSession:
+    """Stands in for AsyncSession when the async engine is off."""
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(_call_with_session, fn, args, kwargs)
+
+
+async def get_async_db():
+    """Yield an object whose ``run_sync(fn, ...)`` calls ``fn(session, ...)`` for read routes: on the asyncpg
+    engine when enabled, otherwise on the threadpool with a read session."""
+    if AsyncSessionLocal is None:
+        yield ThreadpoolSession()
+        return
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def dispose_async_engine():
+    if async_engine is not None:
+        await async_engine.dispose()
@@ -11,6 +11,7 @@ logger = logging.getLogger(__name__)
 
 _ASYNC_WORKERS_DEFAULT = 4
 _SMTP_TIMEOUT_DEFAULT = 20
+_BATCH_MAX_MESSAGES_DEFAULT = 100
 
 
 def _int_env(name: str, default: int) -> int:
@@ -70,31 +71,41 @@ def _load_smtp(prefix: str) -> Optional[SMTPConfig]:
     )
 
 
-def _send_via_config(config: SMTPConfig, to_email: str, subject: str, html: str, text: str) -> None:
-    smtp_timeout_seconds = _int_env("SMTP_TIMEOUT_SECONDS", _SMTP_TIMEOUT_DEFAULT)
+def _build_message(config: SMTPConfig, to_email: str, subject: str, html: str, text: str) -> EmailMessage:
     message = EmailMessage()
     message["From"] = config.sender
     message["To"] = to_email
     message["Subject"] = subject
     message.set_content(text)
     message.add_alternative(html, subtype="html")
+    return message
+
 
+def _open_smtp(config: SMTPConfig):
+    smtp_timeout_seconds = _int_env("SMTP_TIMEOUT_SECONDS", _SMTP_TIMEOUT_DEFAULT)
     if config.use_ssl:
         context = ssl.create_default_context()
-        with smtplib.SMTP_SSL(config.host, config.port, context=context, timeout=smtp_timeout_seconds) as server:
-            if config.user and config.password:
-                server.login(config.user, config.password)
-            server.send_message(message)
-        return
-
-    with smtplib.SMTP(config.host, config.port, timeout=smtp_timeout_seconds) as server:
-        server.ehlo()
-        if config.use_tls:
-            context = ssl.create_default_context()
-            server.starttls(context=context)
+        server = smtplib.SMTP_SSL(config.host, config.port, context=context, timeout=smtp_timeout_seconds)
+    else:
+        server = smtplib.SMTP(config.host, config.port, timeout=smtp_timeout_seconds)
+    try:
+        if not config.use_ssl:
             server.ehlo()
+            if config.use_tls:
+                context = ssl.create_default_context()
+                server.starttls(context=context)
+                server.ehlo()
         if config.user and config.password:
             server.login(config.user, config.password)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def _send_via_config(config: SMTPConfig, to_email: str, subject: str, html: str, text: str) -> None:
+    message = _build_message(config, to_email, subject, html, text)
+    with _open_smtp(config) as server:
         server.send_message(message)
 
 
@@ -129,6 +140,91 @@ def send_bulk_email(to_email: str, subject: str, html: str, text: str) -> None:
         send_email(to_email, subject, html, text)
 
 
+class SMTPUnavailable(RuntimeError):
+    """Every configured SMTP server has failed, so the rest of a batch cannot be delivered."""
+
+
+class SMTPBatch:
+    """Sends a run of messages over kept-open SMTP connections instead of one connection per message.
+
+    Servers are tried in bulk, primary, secondary order; a server that fails is skipped for the rest
+    of the batch. Connections are recycled after SMTP_BATCH_MAX_MESSAGES messages because most
+    providers cap messages per session.
+    """
+
+    def __init__(self, prefixes=("SMTP_BULK", "SMTP_PRIMARY", "SMTP_SECONDARY")):
+        self.configs = [config for config in (_load_smtp(prefix) for prefix in prefixes) if config]
+        self.max_messages = _int_env("SMTP_BATCH_MAX_MESSAGES", _BATCH_MAX_MESSAGES_DEFAULT)
+        self._server = None
+        self._server_index: Optional[int] = None
+        self._sent_on_server = 0
+        self._failed_indexes = set()
+
+    def __enter__(self) -> "SMTPBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _disconnect(self) -> None:
+        server, self._server, self._server_index = self._server, None, None
+        self._sent_on_server = 0
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _send_on(self, index: int, message: EmailMessage) -> None:
+        if self._server_index != index or self._sent_on_server >= self.max_messages:
+            self._disconnect()
+            self._server = _open_smtp(self.configs[index])
+            self._server_index = index
+        try:
+            self._server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Kept-open connections get dropped by idle timeouts; retry once on a fresh one.
+            self._disconnect()
+            self._server = _open_smtp(self.configs[index])
+            self._server_index = index
+            self._server.send_message(message)
+        self._sent_on_server += 1
+
+    def send(self, to_email: str, subject: str, html: str, text: str) -> None:
+        if not self.configs:
+            raise SMTPUnavailable("SMTP_PRIMARY configuration missing")
+        last_exc: Optional[Exception] = None
+        for index, config in enumerate(self.configs):
+            if index in self._failed_indexes:
+                continue
+            message = _build_message(config, to_email, subject, html, text)
+            try:
+                self._send_on(index, message)
+                return
+            except smtplib.SMTPRecipientsRefused:
+                # The address is bad, not the server.
+                raise
+            except Exception as exc:
+                logger.warning("SMTP server %s failed during batch, trying next: %s", config.host, exc)
+                self._failed_indexes.add(index)
+                self._disconnect()
+                last_exc = exc
+        if last_exc is None:
+            raise SMTPUnavailable("All SMTP servers failed earlier in this batch")
+        raise SMTPUnavailable(f"All SMTP servers failed: {last_exc}")
+
+    def close(self) -> None:
+        self._disconnect()
+
+
+def email_queue_depth() -> int:
+    return _EMAIL_EXECUTOR._work_queue.qsize()
+
+
 def send_email_async(to_email: str, subject: str, html: str, text: str) -> None:
     def _send_safe() -> None:
         try:
@@ -0,0 +1,128 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from jose import JWTError, jwt
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+# 0 disables caching; tokens are only ever cached until their own exp.
+JWT_VERIFY_CACHE_SIZE = _int_env("JWT_VERIFY_CACHE_SIZE", 4096)
+
+# Tokens carrying claims python-jose validates with extra rules go down the jose path.
+_JOSE_ONLY_CLAIMS = frozenset({"aud", "iat", "nbf", "iss", "at_hash"})
+
+_cache: "OrderedDict[str, Tuple[dict, Optional[float]]]" = OrderedDict()
+_lock = threading.Lock()
+_stats: Dict[str, int] = {
+    "cache_hits": 0,
+    "cache_misses": 0,
+    "hmac_fast_path": 0,
+    "jose_fallback": 0,
+    "failures": 0,
+}
+
+
+def _bump(name: str) -> None:
+    with _lock:
+        _stats[name] += 1
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _verify_hs256(token: str, secret: str) -> Optional[dict]:
+    """Verify a plain HS256 token directly; None means "let jose decide" (unusual header or claims)."""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        signature = _b64decode(signature_b64)
+    except (ValueError, TypeError):
+        raise JWTError("Malformed token")
+    if not isinstance(header, dict) or header.get("alg") != "HS256" or set(header) - {"alg", "typ"}:
+        return None
+    signing_input = token.rsplit(".", 1)[0].encode("utf-8")
+    expected = hmac.new(secret.encode("utf-8"), signing_input, hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise JWTError("Signature verification failed")
+    try:
+        payload = json.loads(_b64decode(payload_b64))
+    except (ValueError, TypeError):
+        raise JWTError("Invalid payload")
+    if not isinstance(payload, dict) or _JOSE_ONLY_CLAIMS.intersection(payload):
+        return None
+    for claim in ("sub", "jti"):
+        if claim in payload and not isinstance(payload[claim], str):
+            raise JWTError(f"Invalid claim: {claim} must be a string")
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)) or isinstance(exp, bool):
+            return None
+        if exp < time.time():
+            raise JWTError("Signature has expired")
+    return payload
+
+
+def verify_jwt(token: str, secret: str, algorithm: str) -> dict:
+    """Return the verified payload or raise ``JWTError``. Results are cached by token hash until ``exp``."""
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest() if JWT_VERIFY_CACHE_SIZE else None
+    if key is not None:
+        with _lock:
+            cached = _cache.get(key)
+            if cached is not None:
+                payload, exp = cached
+                if exp is None or exp > time.time():
+                    _cache.move_to_end(key)
+                    _stats["cache_hits"] += 1
+                    return dict(payload)
+                del _cache[key]
+            _stats["cache_misses"] += 1
+
+    try:
+        payload = _verify_hs256(token, secret) if algorithm == "HS256" else None
+        if payload is None:
+            _bump("jose_fallback")
+            payload = jwt.decode(token, secret, algorithms=[algorithm])
+        else:
+            _bump("hmac_fast_path")
+    except JWTError:
+        _bump("failures")
+        raise
+
+    if key is not None:
+        exp = payload.get("exp")
+        with _lock:
+            _cache[key] = (dict(payload), float(exp) if isinstance(exp, (int, float)) else None)
+            _cache.move_to_end(key)
+            while len(_cache) > JWT_VERIFY_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return payload
+
+
+def jwt_verify_stats() -> Dict[str, int]:
+    with _lock:
+        stats = dict(_stats)
+        stats["cache_size"] = len(_cache)
+    return stats
+
+
+def clear_jwt_cache() -> None:
+    with _lock:
+        _cache.clear()
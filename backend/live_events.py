@@ -0,0 +1,393 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from jose import jwt
+
+from auth import ALGORITHM, SECRET_KEY, decode_token
+
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+# "memory" delivers within this process only; "redis" fans out across workers through Redis pub/sub.
+LIVE_EVENTS_BACKEND = str(os.environ.get("LIVE_EVENTS_BACKEND", "memory")).strip().lower()
+LIVE_EVENTS_REDIS_URL = os.environ.get("LIVE_EVENTS_REDIS_URL") or "redis://localhost:6379/0"
+LIVE_EVENTS_CHANNEL_PREFIX = os.environ.get("LIVE_EVENTS_CHANNEL_PREFIX") or "live:"
+# Publishing runs inside request handlers, so an unreachable Redis must fail fast rather than hang them.
+LIVE_EVENTS_REDIS_TIMEOUT_MS = max(1, _int_env("LIVE_EVENTS_REDIS_TIMEOUT_MS", 500))
+LIVE_EVENTS_QUEUE_SIZE = max(1, _int_env("LIVE_EVENTS_QUEUE_SIZE", 256))
+# Recent events kept per channel so reconnecting clients can resume from Last-Event-ID.
+LIVE_EVENTS_REPLAY_SIZE = _int_env("LIVE_EVENTS_REPLAY_SIZE", 200)
+LIVE_EVENTS_KEEPALIVE_SECONDS = max(1, _int_env("LIVE_EVENTS_KEEPALIVE_SECONDS", 15))
+LIVE_STREAM_TICKET_SECONDS = max(10, _int_env("LIVE_STREAM_TICKET_SECONDS", 120))
+
+LIVE_STREAM_TOKEN_TYPE = "live_stream"
+RESYNC_EVENT = "resync"
+
+_NODE_ID = uuid.uuid4().hex[:8]
+_sequence = itertools.count(1)
+
+
+def live_channel(scope: str, slug: str) -> str:
+    return f"{scope}:{slug}"
+
+
+class LiveSubscription:
+    """One connected stream. Messages are pushed from any thread and read on the stream's event loop."""
+
+    def __init__(self, channel: str, loop: asyncio.AbstractEventLoop, round_id: Optional[int] = None):
+        self.channel = channel
+        self.round_id = round_id
+        self.loop = loop
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=LIVE_EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def wants(self, message: dict) -> bool:
+        message_round = message.get("round_id")
+        return self.round_id is None or message_round is None or int(message_round) == int(self.round_id)
+
+    def _push(self, message: dict) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A slow client lost deltas; it must refetch, so drop the backlog and tell it once.
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_resync_message(self.channel, "overflow"))
+
+    async def get(self) -> dict:
+        message = await self.queue.get()
+        if message.get("type") == RESYNC_EVENT:
+            self.overflowed = False
+        return message
+
+
+def _resync_message(channel: str, reason: str) -> dict:
+    return {"id": None, "type": RESYNC_EVENT, "channel": channel, "data": {"reason": reason}}
+
+
+class LiveEventBroker:
+    """In-process fan-out of live event messages to stream subscriptions."""
+
+    def __init__(self, replay_size: int = LIVE_EVENTS_REPLAY_SIZE):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, Set[LiveSubscription]] = {}
+        self._replay: Dict[str, Deque[dict]] = {}
+        self._replay_size = replay_size
+
+    def subscribe(self, channel: str, *, round_id: Optional[int] = None, last_event_id: Optional[str] = None) -> LiveSubscription:
+        subscription = LiveSubscription(channel, asyncio.get_running_loop(), round_id=round_id)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+            backlog = list(self._replay.get(channel) or ())
+        if last_event_id:
+            ids = [message.get("id") for message in backlog]
+            if last_event_id in ids:
+                for message in backlog[ids.index(last_event_id) + 1:]:
+                    if subscription.wants(message):
+                        subscription._push(message)
+            else:
+                subscription._push(_resync_message(channel, "replay_unavailable"))
+        return subscription
+
+    def unsubscribe(self, subscription: LiveSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    self._subscriptions.pop(subscription.channel, None)
+
+    def deliver(self, message: dict) -> None:
+        channel = str(message.get("channel") or "")
+        with self._lock:
+            if self._replay_size:
+                backlog = self._replay.get(channel)
+                if backlog is None:
+                    backlog = self._replay[channel] = deque(maxlen=self._replay_size)
+                backlog.append(message)
+            subscribers = list(self._subscriptions.get(channel) or ())
+        for subscription in subscribers:
+            if not subscription.wants(message):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._push, message)
+            except RuntimeError:
+                # The stream's loop is gone (worker shutting down).
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(items) for items in self._subscriptions.values())
+
+
+class MemoryLiveBackend:
+    """Single-process backend: publishing delivers straight to the local broker."""
+
+    name = "memory"
+
+    def __init__(self, broker: LiveEventBroker):
+        self.broker = broker
+
+    def publish(self, message: dict) -> None:
+        self.broker.deliver(message)
+
+    def start(self) -> None:
+        return None
+
+    def stop(self) -> None:
+        return None
+
+
+class RedisLiveBackend:
+    """Multi-worker backend: publishes to Redis and relays every worker's messages to the local broker.
+
+    Needs the optional ``redis`` package (backend/requirements-redis.txt).
+    """
+
+    name = "redis"
+
+    def __init__(self, broker: LiveEventBroker, url: str, prefix: str = LIVE_EVENTS_CHANNEL_PREFIX):
+        import redis
+
+        self.broker = broker
+        self.prefix = prefix
+        timeout = LIVE_EVENTS_REDIS_TIMEOUT_MS / 1000.0
+        self.client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        # The listener blocks in get_message() with its own timeout, so only its connect is bounded.
+        self.listen_client = redis.Redis.from_url(url, socket_connect_timeout=timeout)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, message: dict) -> None:
+        try:
+            self.client.publish(f"{self.prefix}{message['channel']}", json.dumps(message, default=str))
+        except Exception as exc:
+            # Other workers miss this message, but streams on this worker still get it. A publish
+            # that timed out after reaching Redis can arrive twice; deltas carry full values, so
+            # clients just apply the same state again.
+            logger.warning("Live events Redis publish failed (%s); delivering in-process only", exc)
+            self.broker.deliver(message)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="live-events-redis", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            pubsub = self.listen_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(f"{self.prefix}*")
+                while not self._stop.is_set():
+                    item = pubsub.get_message(timeout=1.0)
+                    if not item:
+                        continue
+                    try:
+                        self.broker.deliver(json.loads(item["data"]))
+                    except (TypeError, ValueError):
+                        logger.warning("Dropping malformed live event from Redis")
+            except Exception:
+                logger.exception("Live events Redis listener failed; reconnecting")
+                self._stop.wait(2.0)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+
+broker = LiveEventBroker()
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _build_backend():
+    if LIVE_EVENTS_BACKEND == "redis":
+        try:
+            return RedisLiveBackend(broker, LIVE_EVENTS_REDIS_URL)
+        except ImportError:
+            logger.warning("LIVE_EVENTS_BACKEND=redis but the redis package is not installed; using in-process delivery")
+    return MemoryLiveBackend(broker)
+
+
+def get_live_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _build_backend()
+            _backend.start()
+        return _backend
+
+
+def set_live_backend(backend) -> None:
+    """Swap the pub/sub backend (any object with publish/start/stop)."""
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+    if previous is not None and previous is not backend:
+        previous.stop()
+    backend.start()
+
+
+def subscribe_live(
+    scope: str,
+    slug: str,
+    *,
+    round_id: Optional[int] = None,
+    last_event_id: Optional[str] = None,
+) -> LiveSubscription:
+    # Starting the backend here matters for Redis: a worker that only serves streams still has to listen.
+    get_live_backend()
+    return broker.subscribe(live_channel(scope, slug), round_id=round_id, last_event_id=last_event_id)
+
+
+def shutdown_live_events() -> None:
+    global _backend
+    with _backend_lock:
+        backend, _backend = _backend, None
+    if backend is not None:
+        backend.stop()
+
+
+def publish_live_event(
+    scope: str,
+    slug: str,
+    event_type: str,
+    data: Optional[Dict[str, Any]] = None,
+    *,
+    round_id: Optional[int] = None,
+) -> None:
+    """Broadcast a delta to ``scope``/``slug`` streams. Call after commit; failures are logged, never raised."""
+    message = {
+        "id": f"{int(time.time() * 1000)}-{_NODE_ID}-{next(_sequence)}",
+        "type": event_type,
+        "channel": live_channel(scope, slug),
+        "event_slug": slug,
+        "round_id": int(round_id) if round_id is not None else None,
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "data": data or {},
+    }
+    try:
+        get_live_backend().publish(message)
+    except Exception:
+        logger.exception("Failed to publish live event %s for %s", event_type, message["channel"])
+
+
+def score_delta_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Compact score rows (as passed to bulk_upsert_scores) for a ``scores_saved`` message."""
+    deltas = []
+    for row in rows:
+        entity_type = str(row.get("entity_type") or "").lower()
+        entity_id = row.get("user_id") if entity_type == "user" else row.get("team_id")
+        deltas.append(
+            {
+                "entity_type": entity_type,
+                "entity_id": int(entity_id) if entity_id is not None else None,
+                "criteria_scores": row.get("scores") or {},
+                "total_score": float(row.get("total") or 0.0),
+                "is_present": bool(row.get("is_present")),
+            }
+        )
+    return deltas
+
+
+def attendance_mark_groups(marks: Iterable[Tuple[str, int, Optional[int]]]) -> List[Tuple[Optional[int], Dict[str, Any]]]:
+    """Group (entity_type, entity_id, round_id) marks into one ``attendance_marked`` payload per round."""
+    groups: Dict[Optional[int], List[Dict[str, Any]]] = {}
+    for entity_type, entity_id, round_id in marks:
+        groups.setdefault(round_id, []).append({"entity_type": entity_type, "entity_id": int(entity_id)})
+    return [
+        (round_id, {"entries": entries, "is_present": True, "level": "entry" if round_id is None else "round"})
+        for round_id, entries in groups.items()
+    ]
+
+
+def create_live_stream_ticket(scope: str, slug: str, user_regno: str) -> Dict[str, Any]:
+    """Short-lived token for EventSource, which cannot send an Authorization header."""
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=LIVE_STREAM_TICKET_SECONDS)
+    token = jwt.encode(
+        {
+            "sub": user_regno,
+            "type": LIVE_STREAM_TOKEN_TYPE,
+            "live_scope": scope,
+            "event_slug": slug,
+            "exp": expires_at,
+            "jti": uuid.uuid4().hex,
+        },
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+    return {"ticket": token, "expires_at": expires_at.isoformat(), "channel": live_channel(scope, slug)}
+
+
+def verify_live_stream_ticket(ticket: str, scope: str, slug: str) -> dict:
+    payload = decode_token(ticket)
+    if (
+        payload.get("type") != LIVE_STREAM_TOKEN_TYPE
+        or payload.get("live_scope") != scope
+        or payload.get("event_slug") != slug
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid live stream ticket")
+    return payload
+
+
+def format_sse(message: dict) -> str:
+    lines = []
+    if message.get("id"):
+        lines.append(f"id: {message['id']}")
+    lines.append(f"event: {message.get('type') or 'message'}")
+    lines.append(f"data: {json.dumps(message, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def live_event_stream(subscription: LiveSubscription, is_disconnected):
+    """SSE body for a subscription; ``is_disconnected`` is ``request.is_disconnected``."""
+    try:
+        yield f"retry: 3000\nevent: ready\ndata: {json.dumps({'channel': subscription.channel})}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), timeout=LIVE_EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(message)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def live_subscriber_count() -> int:
+    return broker.subscriber_count()
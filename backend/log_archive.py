@@ -0,0 +1,90 @@
+import gzip
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from models import AdminLog, PdaEventLog, PersohubEventLog
+from utils import S3_BUCKET_NAME, S3_CLIENT
+
+logger = logging.getLogger(__name__)
+
+LOG_TABLES = ("admin_logs", "pda_event_logs", "persohub_event_logs")
+_LOG_MODELS = {model.__tablename__: model for model in (AdminLog, PdaEventLog, PersohubEventLog)}
+LOG_ARCHIVE_PREFIX = "log-archive"
+LOG_ARCHIVE_DIR = Path(os.environ.get("LOG_ARCHIVE_DIR") or (Path(__file__).parent / "log_archive"))
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _store_archive(key: str, payload: bytes) -> str:
+    if S3_CLIENT and S3_BUCKET_NAME:
+        S3_CLIENT.put_object(Bucket=S3_BUCKET_NAME, Key=key, Body=payload, ContentType="application/gzip")
+        return f"s3://{S3_BUCKET_NAME}/{key}"
+    path = LOG_ARCHIVE_DIR / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(payload)
+    return str(path)
+
+
+def archive_log_table(
+    db: Session,
+    table_name: str,
+    *,
+    older_than_days: int = 90,
+    chunk_size: int = 5000,
+    apply: bool = False,
+    now: Optional[datetime] = None,
+) -> Dict[str, object]:
+    """Move rows older than the cutoff into gzip JSONL files, one file per chunk, oldest first.
+
+    Each chunk is stored before its rows are deleted, so an interrupted run can at
+    worst archive a chunk twice; it never drops rows. Without ``apply`` only counts.
+    """
+    if table_name not in LOG_TABLES:
+        raise ValueError(f"Not a log table: {table_name}")
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=int(older_than_days))
+    summary: Dict[str, object] = {"table": table_name, "cutoff": cutoff.isoformat(), "archived": 0, "files": []}
+    table = _LOG_MODELS[table_name].__table__
+    if not apply:
+        summary["archived"] = int(
+            db.execute(select(func.count()).select_from(table).where(table.c.created_at < cutoff)).scalar() or 0
+        )
+        return summary
+
+    while True:
+        rows = (
+            db.execute(
+                select(table).where(table.c.created_at < cutoff).order_by(table.c.id.asc()).limit(int(chunk_size))
+            )
+            .mappings()
+            .all()
+        )
+        if not rows:
+            break
+        ids: List[int] = [int(row["id"]) for row in rows]
+        body = "\n".join(json.dumps(dict(row), default=_json_default) for row in rows) + "\n"
+        first_created = rows[0]["created_at"]
+        month = first_created.strftime("%Y-%m") if first_created else "unknown"
+        key = f"{LOG_ARCHIVE_PREFIX}/{table_name}/{month}/{ids[0]:012d}-{ids[-1]:012d}.jsonl.gz"
+        location = _store_archive(key, gzip.compress(body.encode("utf-8")))
+        db.execute(delete(table).where(table.c.id.in_(ids)))
+        db.commit()
+        summary["archived"] = int(summary["archived"]) + len(ids)
+        summary["files"].append(location)
+        logger.info("Archived %s rows from %s to %s", len(ids), table_name, location)
+        if len(rows) < chunk_size:
+            break
+    return summary
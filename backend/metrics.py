@@ -0,0 +1,249 @@
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+# 0 disables slow-request traces; statements are only kept while a trace is possible.
+METRICS_SLOW_REQUEST_MS = _int_env("METRICS_SLOW_REQUEST_MS", 0)
+METRICS_TRACE_MAX_STATEMENTS = max(1, _int_env("METRICS_TRACE_MAX_STATEMENTS", 50))
+
+# Warn when one request runs the same statement shape this many times (N+1 detector); 0 disables.
+SQL_REPEAT_WARN_THRESHOLD = _int_env("SQL_REPEAT_WARN_THRESHOLD", 0)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def copy(self) -> "_Histogram":
+        clone = _Histogram(self.buckets)
+        clone.counts, clone.total, clone.count = list(self.counts), self.total, self.count
+        return clone
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.buckets, value)
+        if idx < len(self.counts):
+            self.counts[idx] += 1
+        self.total += value
+        self.count += 1
+
+
+_PARAM_RE = re.compile(r"%\(\w+\)s|(?<!:):\w+|\$\d+|\?")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_VALUE_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def statement_fingerprint(statement: str) -> str:
+    """Collapse parameters, literals and expanded IN lists so per-row variants of a query compare equal."""
+    shape = _PARAM_RE.sub("?", " ".join(str(statement).split()))
+    shape = _LITERAL_RE.sub("?", shape)
+    return _VALUE_LIST_RE.sub("(?...)", shape)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "statements", "shapes")
+
+    def __init__(self, track_shapes: bool = False):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: List[Tuple[str, float]] = []
+        self.shapes: Optional[Dict[str, int]] = {} if track_shapes else None
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        if not self.shapes:
+            return []
+        repeated = [(shape, count) for shape, count in self.shapes.items() if count >= threshold]
+        return sorted(repeated, key=lambda item: -item[1])
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_lock = threading.Lock()
+_latency: Dict[Tuple[str, str, str], _Histogram] = {}
+_route_db: Dict[Tuple[str, str], List[float]] = {}
+_pool_wait = _Histogram(POOL_WAIT_BUCKETS)
+_sql_totals = {"queries": 0, "db_seconds": 0.0}
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def begin_request() -> Tuple[RequestStats, object]:
+    stats = RequestStats(track_shapes=bool(SQL_REPEAT_WARN_THRESHOLD))
+    return stats, _current.set(stats)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def capture_queries():
+    """Count statements (and their shapes) run inside the block, e.g. to hold a handler to a query budget."""
+    stats = RequestStats(track_shapes=True)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def record_request(method: str, route: str, status_code: int, seconds: float, stats: RequestStats) -> None:
+    status_class = f"{int(status_code) // 100}xx"
+    with _lock:
+        hist = _latency.get((method, route, status_class))
+        if hist is None:
+            hist = _latency[(method, route, status_class)] = _Histogram(LATENCY_BUCKETS)
+        hist.observe(seconds)
+        totals = _route_db.setdefault((method, route), [0, 0.0])
+        totals[0] += stats.queries
+        totals[1] += stats.db_seconds
+    if SQL_REPEAT_WARN_THRESHOLD:
+        for shape, count in stats.repeated_shapes(SQL_REPEAT_WARN_THRESHOLD):
+            logger.warning("Possible N+1 in %s %s: %sx %s", method, route, count, shape[:500])
+    if METRICS_SLOW_REQUEST_MS and seconds * 1000 >= METRICS_SLOW_REQUEST_MS:
+        lines = [f"  {duration * 1000:.1f}ms {statement}" for statement, duration in stats.statements]
+        logger.warning(
+            "Slow request %s %s -> %s in %.1fms (%s queries, %.1fms in DB)\n%s",
+            method,
+            route,
+            status_code,
+            seconds * 1000,
+            stats.queries,
+            stats.db_seconds * 1000,
+            "\n".join(lines),
+        )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    with _lock:
+        _sql_totals["queries"] += 1
+        _sql_totals["db_seconds"] += elapsed
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.db_seconds += elapsed
+    if stats.shapes is not None:
+        shape = statement_fingerprint(statement)
+        stats.shapes[shape] = stats.shapes.get(shape, 0) + 1
+    if METRICS_SLOW_REQUEST_MS and len(stats.statements) < METRICS_TRACE_MAX_STATEMENTS:
+        stats.statements.append((" ".join(statement.split())[:500], elapsed))
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a free connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            with _lock:
+                _pool_wait.observe(elapsed)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(lines: List[str], name: str, labels: str, hist: _Histogram) -> None:
+    cumulative = 0
+    prefix = f"{labels}," if labels else ""
+    for bound, count in zip(hist.buckets, hist.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {hist.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {hist.total:.6f}")
+    lines.append(f"{name}_count{suffix} {hist.count}")
+
+
+def render_prometheus(gauges: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+    """Prometheus text exposition; ``gauges`` maps metric name -> {source label: value}."""
+    lines: List[str] = []
+    with _lock:
+        latency = sorted((key, hist.copy()) for key, hist in _latency.items())
+        route_db = sorted((key, tuple(values)) for key, values in _route_db.items())
+        sql_totals = dict(_sql_totals)
+        pool_wait = _pool_wait.copy()
+
+    lines.append("# HELP http_request_duration_seconds Request latency by route template.")
+    lines.append("# TYPE http_request_duration_seconds histogram")
+    for (method, route, status_class), hist in latency:
+        labels = f'method="{_escape(method)}",route="{_escape(route)}",status="{status_class}"'
+        _render_histogram(lines, "http_request_duration_seconds", labels, hist)
+
+    lines.append("# HELP http_request_db_queries_total SQL statements executed while serving the route.")
+    lines.append("# TYPE http_request_db_queries_total counter")
+    for (method, route), (queries, _) in route_db:
+        lines.append(f'http_request_db_queries_total{{method="{_escape(method)}",route="{_escape(route)}"}} {int(queries)}')
+    lines.append("# HELP http_request_db_seconds_total Time spent in SQL while serving the route.")
+    lines.append("# TYPE http_request_db_seconds_total counter")
+    for (method, route), (_, seconds) in route_db:
+        lines.append(f'http_request_db_seconds_total{{method="{_escape(method)}",route="{_escape(route)}"}} {seconds:.6f}')
+
+    lines.append("# TYPE db_queries_total counter")
+    lines.append(f"db_queries_total {sql_totals['queries']}")
+    lines.append("# TYPE db_query_seconds_total counter")
+    lines.append(f"db_query_seconds_total {sql_totals['db_seconds']:.6f}")
+    lines.append("# HELP db_pool_checkout_wait_seconds Time waiting for a pooled connection.")
+    lines.append("# TYPE db_pool_checkout_wait_seconds histogram")
+    _render_histogram(lines, "db_pool_checkout_wait_seconds", "", pool_wait)
+
+    for name, values in sorted((gauges or {}).items()):
+        lines.append(f"# TYPE {name} gauge")
+        for source, value in sorted(values.items()):
+            lines.append(f'{name}{{source="{_escape(source)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    global _pool_wait
+    with _lock:
+        _latency.clear()
+        _route_db.clear()
+        _pool_wait = _Histogram(POOL_WAIT_BUCKETS)
+        _sql_totals.update({"queries": 0, "db_seconds": 0.0})
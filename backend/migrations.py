@@ -1,12 +1,18 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import json
+import logging
+import os
 import re
 import secrets
+import time
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from models import PdaTeam, PdaUser, PdaAdmin
 from auth import get_password_hash
 from persohub_service import ensure_default_persohub_setup, ensure_primary_communities, sync_persohub_event_posts
+from schema_introspection import schema_snapshot
+
+logger = logging.getLogger(__name__)
 
 TEAM_MAP: Dict[str, Tuple[str, str]] = {
     "Chairperson": ("Executive", "Chairperson"),
@@ -23,77 +29,25 @@ TEAM_MAP: Dict[str, Tuple[str, str]] = {
 }
 
 
+# Introspection reads one cached catalog snapshot per engine; DDL issued through it invalidates the snapshot.
 def _table_exists(conn, table_name: str) -> bool:
-    result = conn.execute(
-        text(
-            """
-            SELECT 1 FROM information_schema.tables
-            WHERE table_name = :table
-            """
-        ),
-        {"table": table_name}
-    ).fetchone()
-    return bool(result)
+    return schema_snapshot(conn).has_table(table_name)
 
 
 def _column_exists(conn, table_name: str, column_name: str) -> bool:
-    result = conn.execute(
-        text(
-            """
-            SELECT 1 FROM information_schema.columns
-            WHERE table_name = :table AND column_name = :column
-            """
-        ),
-        {"table": table_name, "column": column_name}
-    ).fetchone()
-    return bool(result)
+    return schema_snapshot(conn).has_column(table_name, column_name)
 
 
 def _column_udt_name(conn, table_name: str, column_name: str) -> Optional[str]:
-    result = conn.execute(
-        text(
-            """
-            SELECT udt_name
-            FROM information_schema.columns
-            WHERE table_schema = current_schema()
-              AND table_name = :table
-              AND column_name = :column
-            """
-        ),
-        {"table": table_name, "column": column_name},
-    ).fetchone()
-    return str(result[0]) if result and result[0] else None
+    return schema_snapshot(conn).column_type(table_name, column_name)
 
 
 def _index_exists(conn, index_name: str) -> bool:
-    result = conn.execute(
-        text(
-            """
-            SELECT 1
-            FROM pg_indexes
-            WHERE schemaname = current_schema()
-              AND indexname = :index_name
-            """
-        ),
-        {"index_name": index_name},
-    ).fetchone()
-    return bool(result)
+    return schema_snapshot(conn).has_index(index_name)
 
 
 def _constraint_exists(conn, table_name: str, constraint_name: str) -> bool:
-    result = conn.execute(
-        text(
-            """
-            SELECT 1
-            FROM information_schema.table_constraints
-            WHERE table_schema = current_schema()
-              AND table_name = :table_name
-              AND constraint_name = :constraint_name
-            """
-        ),
-        {"table_name": table_name, "constraint_name": constraint_name},
-    ).fetchone()
-    return bool(result)
+    return schema_snapshot(conn).has_constraint(table_name, constraint_name)
 
 
 def _quote_ident(identifier: str) -> str:
@@ -111,6 +65,144 @@ def _table_row_count(conn, table_name: str) -> int:
     )
 
 
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+BACKFILL_CHUNK_SIZE = max(1, _int_env("MIGRATION_BACKFILL_CHUNK_SIZE", 5000))
+BACKFILL_DRY_RUN = str(os.environ.get("MIGRATION_BACKFILL_DRY_RUN", "")).strip().lower() in {"1", "true", "yes", "on"}
+BACKFILL_PROGRESS_PREFIX = "progress:"
+
+
+def _get_config_marker(conn, key: str) -> Optional[str]:
+    row = conn.execute(text("SELECT value FROM system_config WHERE key = :key"), {"key": key}).fetchone()
+    return str(row[0]) if row else None
+
+
+def _set_config_marker(conn, key: str, value: str) -> None:
+    conn.execute(
+        text(
+            """
+            INSERT INTO system_config (key, value)
+            VALUES (:key, :value)
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+            """
+        ),
+        {"key": key, "value": value},
+    )
+
+
+def _run_in_transaction(engine, statements: Sequence[str], params: dict, *, dry_run: bool, marker: Optional[Tuple[str, str]] = None) -> int:
+    rows = 0
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            for statement in statements:
+                result = conn.execute(text(statement), params)
+                rows += max(int(result.rowcount or 0), 0)
+            if dry_run:
+                trans.rollback()
+            else:
+                if marker is not None:
+                    _set_config_marker(conn, *marker)
+                trans.commit()
+        except Exception:
+            trans.rollback()
+            raise
+    return rows
+
+
+def run_backfill(
+    engine,
+    marker_key: str,
+    *,
+    bounds_sql: str,
+    chunk_sql: Sequence[str],
+    applicable: Optional[Callable] = None,
+    finalize_sql: Sequence[str] = (),
+    chunk_size: Optional[int] = None,
+    dry_run: Optional[bool] = None,
+) -> dict:
+    """Run a data backfill in id-range chunks, each committed in its own transaction.
+
+    ``bounds_sql`` selects (min, max) of the driving id; each ``chunk_sql`` statement gets
+    ``:start_id`` (inclusive) and ``:end_id`` (exclusive). After every chunk the next start id is
+    stored in system_config as ``progress:<id>`` so an interrupted run resumes there.
+    ``finalize_sql`` (cleanup, DDL) runs once after the last chunk, together with the ``done`` marker.
+    A dry run executes and times every chunk, rolls each one back and records nothing.
+    """
+    chunk_size = max(1, int(chunk_size or BACKFILL_CHUNK_SIZE))
+    dry_run = BACKFILL_DRY_RUN if dry_run is None else bool(dry_run)
+    report = {"marker": marker_key, "status": "skipped", "dry_run": dry_run, "chunks": 0, "rows": 0, "seconds": 0.0}
+    started = time.monotonic()
+    with engine.begin() as conn:
+        if not _table_exists(conn, "system_config"):
+            return report
+        marker = _get_config_marker(conn, marker_key)
+        if marker == "done":
+            report["status"] = "done"
+            return report
+        if applicable is not None and not applicable(conn):
+            if not dry_run:
+                _set_config_marker(conn, marker_key, "done")
+            report["status"] = "not_applicable"
+            return report
+        low, high = conn.execute(text(bounds_sql)).fetchone() or (None, None)
+
+    start_id = int(low) if low is not None else None
+    if start_id is not None and marker and marker.startswith(BACKFILL_PROGRESS_PREFIX) and not dry_run:
+        start_id = max(start_id, int(marker[len(BACKFILL_PROGRESS_PREFIX):]))
+    while start_id is not None and start_id <= int(high):
+        end_id = start_id + chunk_size
+        chunk_started = time.monotonic()
+        rows = _run_in_transaction(
+            engine,
+            chunk_sql,
+            {"start_id": start_id, "end_id": end_id},
+            dry_run=dry_run,
+            marker=(marker_key, f"{BACKFILL_PROGRESS_PREFIX}{end_id}"),
+        )
+        report["chunks"] += 1
+        report["rows"] += rows
+        logger.info(
+            "Backfill %s ids [%s, %s): %s rows in %.3fs%s",
+            marker_key,
+            start_id,
+            end_id,
+            rows,
+            time.monotonic() - chunk_started,
+            " (dry run)" if dry_run else "",
+        )
+        start_id = end_id
+
+    report["rows"] += _run_in_transaction(engine, finalize_sql, {}, dry_run=dry_run, marker=(marker_key, "done"))
+    report["status"] = "dry_run" if dry_run else "completed"
+    report["seconds"] = round(time.monotonic() - started, 3)
+    return report
+
+
+def _run_backfill_steps(engine, marker_key: str, steps: Sequence[Tuple[str, dict]], *, chunk_size=None, dry_run=None) -> List[dict]:
+    """Run several backfills under one legacy ``marker_key``; each step keeps its own progress marker."""
+    with engine.begin() as conn:
+        if not _table_exists(conn, "system_config") or _get_config_marker(conn, marker_key) == "done":
+            return []
+    reports = [
+        run_backfill(engine, f"{marker_key}:{name}", chunk_size=chunk_size, dry_run=dry_run, **spec)
+        for name, spec in steps
+    ]
+    if not (BACKFILL_DRY_RUN if dry_run is None else dry_run):
+        with engine.begin() as conn:
+            _set_config_marker(conn, marker_key, "done")
+    return reports
+
+
 def ensure_pda_users_table(engine):
     with engine.begin() as conn:
         conn.execute(
@@ -3098,258 +3190,145 @@ def backfill_pda_event_round_count_once(engine):
         )
 
 
-def backfill_persohub_event_round_numbers_once(engine):
-    marker_key = "migration_backfill_persohub_event_round_numbers_v1"
-    with engine.begin() as conn:
-        if not _table_exists(conn, "system_config"):
-            return
-
-        marker_exists = bool(
-            conn.execute(
-                text("SELECT 1 FROM system_config WHERE key = :key"),
-                {"key": marker_key},
-            ).fetchone()
-        )
-        if marker_exists:
-            return
-
-        if _table_exists(conn, "persohub_events") and _table_exists(conn, "persohub_event_rounds"):
-            event_rows = conn.execute(
-                text("SELECT id FROM persohub_events ORDER BY id ASC")
-            ).fetchall()
-            for row in event_rows:
-                _normalize_persohub_event_round_numbers_conn(conn, int(row.id))
-
-        conn.execute(
-            text(
-                """
-                INSERT INTO system_config (key, value)
-                VALUES (:key, 'done')
-                ON CONFLICT (key) DO UPDATE SET value = 'done'
-                """
-            ),
-            {"key": marker_key},
+def backfill_persohub_event_round_numbers_once(engine, *, chunk_size=None, dry_run=None):
+    def applicable(conn) -> bool:
+        return all(
+            _table_exists(conn, table)
+            for table in ("persohub_events", "persohub_event_rounds", "persohub_event_registrations")
         )
 
-
-def _mapped_persohub_round_boundary(old_round_nos: List[int], round_no_value: Optional[int]) -> Optional[int]:
-    parsed = int(round_no_value or 0) or None
-    if parsed is None:
-        return None
-    return int(sum(1 for round_no in old_round_nos if int(round_no) < parsed) + 1)
-
-
-def _normalize_persohub_event_round_numbers_conn(conn, event_id: int) -> bool:
-    round_rows = conn.execute(
-        text(
-            """
-            SELECT id, round_no
-            FROM persohub_event_rounds
-            WHERE event_id = :event_id
-            ORDER BY round_no ASC, id ASC
-            """
-        ),
-        {"event_id": event_id},
-    ).fetchall()
-    if not round_rows:
-        return False
-
-    old_round_nos = [int(row.round_no) for row in round_rows]
-    target_round_nos = {int(row.id): index for index, row in enumerate(round_rows, start=1)}
-    changed_round_ids = [
-        int(row.id)
-        for row in round_rows
-        if int(row.round_no) != int(target_round_nos[int(row.id)])
-    ]
-    round_numbers_changed = bool(changed_round_ids)
-
-    if round_numbers_changed:
-        for round_id in changed_round_ids:
-            conn.execute(
-                text(
-                    """
-                    UPDATE persohub_event_rounds
-                    SET round_no = :temp_round_no
-                    WHERE id = :round_id
-                    """
-                ),
-                {"temp_round_no": -int(round_id), "round_id": int(round_id)},
-            )
-        for row in round_rows:
-            conn.execute(
-                text(
-                    """
-                    UPDATE persohub_event_rounds
-                    SET round_no = :round_no
-                    WHERE id = :round_id
-                    """
-                ),
-                {"round_no": int(target_round_nos[int(row.id)]), "round_id": int(row.id)},
-            )
-
-    registration_rows = conn.execute(
-        text(
+    return run_backfill(
+        engine,
+        "migration_backfill_persohub_event_round_numbers_v1",
+        applicable=applicable,
+        bounds_sql="SELECT MIN(id), MAX(id) FROM persohub_events",
+        chunk_sql=(
+            # Registration boundaries first, while rounds still carry their old numbers:
+            # a boundary N becomes 1 + the number of rounds numbered below N.
             """
-            SELECT id, wildcard_start_round_no, eliminated_round_no
-            FROM persohub_event_registrations
-            WHERE event_id = :event_id
+            UPDATE persohub_event_registrations reg
+            SET wildcard_start_round_no = mapped.wildcard_start_round_no,
+                eliminated_round_no = mapped.eliminated_round_no
+            FROM (
+                SELECT
+                    r.id,
+                    CASE WHEN COALESCE(r.wildcard_start_round_no, 0) = 0 THEN NULL ELSE (
+                        SELECT COUNT(*) + 1
+                        FROM persohub_event_rounds er
+                        WHERE er.event_id = r.event_id AND er.round_no < r.wildcard_start_round_no
+                    ) END AS wildcard_start_round_no,
+                    CASE WHEN COALESCE(r.eliminated_round_no, 0) = 0 THEN NULL ELSE (
+                        SELECT COUNT(*) + 1
+                        FROM persohub_event_rounds er
+                        WHERE er.event_id = r.event_id AND er.round_no < r.eliminated_round_no
+                    ) END AS eliminated_round_no
+                FROM persohub_event_registrations r
+                WHERE r.event_id >= :start_id AND r.event_id < :end_id
+                  AND (r.wildcard_start_round_no IS NOT NULL OR r.eliminated_round_no IS NOT NULL)
+                  AND EXISTS (SELECT 1 FROM persohub_event_rounds er WHERE er.event_id = r.event_id)
+            ) mapped
+            WHERE reg.id = mapped.id
               AND (
-                wildcard_start_round_no IS NOT NULL
-                OR eliminated_round_no IS NOT NULL
+                reg.wildcard_start_round_no IS DISTINCT FROM mapped.wildcard_start_round_no
+                OR reg.eliminated_round_no IS DISTINCT FROM mapped.eliminated_round_no
               )
+            """,
+            # Renumber rounds 1..n per event through negative values so (event_id, round_no) stays unique.
             """
+            UPDATE persohub_event_rounds r
+            SET round_no = -ranked.target_round_no
+            FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY event_id ORDER BY round_no ASC, id ASC) AS target_round_no
+                FROM persohub_event_rounds
+                WHERE event_id >= :start_id AND event_id < :end_id
+            ) ranked
+            WHERE r.id = ranked.id
+              AND r.round_no <> ranked.target_round_no
+            """,
+            """
+            UPDATE persohub_event_rounds
+            SET round_no = -round_no
+            WHERE event_id >= :start_id AND event_id < :end_id
+              AND round_no < 0
+            """,
         ),
-        {"event_id": event_id},
-    ).fetchall()
-    registration_changed = False
-    for row in registration_rows:
-        current_start_round_no = int(row.wildcard_start_round_no or 0) or None
-        mapped_start_round_no = _mapped_persohub_round_boundary(old_round_nos, current_start_round_no)
-        current_eliminated_round_no = int(row.eliminated_round_no or 0) or None
-        mapped_eliminated_round_no = _mapped_persohub_round_boundary(old_round_nos, current_eliminated_round_no)
-        if mapped_start_round_no != current_start_round_no or mapped_eliminated_round_no != current_eliminated_round_no:
-            conn.execute(
-                text(
-                    """
-                    UPDATE persohub_event_registrations
-                    SET wildcard_start_round_no = :wildcard_start_round_no,
-                        eliminated_round_no = :eliminated_round_no
-                    WHERE id = :registration_id
-                    """
-                ),
-                {
-                    "wildcard_start_round_no": mapped_start_round_no,
-                    "eliminated_round_no": mapped_eliminated_round_no,
-                    "registration_id": int(row.id),
-                },
-            )
-            registration_changed = True
-
-    return bool(round_numbers_changed or registration_changed)
-
-
-def backfill_persohub_event_eliminated_round_once(engine):
-    marker_key = "migration_backfill_persohub_event_eliminated_round_v1"
-    with engine.begin() as conn:
-        if not _table_exists(conn, "system_config"):
-            return
-        if not _table_exists(conn, "persohub_event_registrations"):
-            return
-        if not _column_exists(conn, "persohub_event_registrations", "eliminated_round_no"):
-            return
-
-        marker_exists = bool(
-            conn.execute(
-                text("SELECT 1 FROM system_config WHERE key = :key"),
-                {"key": marker_key},
-            ).fetchone()
-        )
-        if marker_exists:
-            return
-
-        if _table_exists(conn, "persohub_events") and _table_exists(conn, "persohub_event_rounds"):
-            event_rows = conn.execute(text("SELECT id FROM persohub_events ORDER BY id ASC")).fetchall()
-            for event_row in event_rows:
-                event_id = int(event_row.id)
-                round_rows = conn.execute(
-                    text(
-                        """
-                        SELECT id, round_no, state
-                        FROM persohub_event_rounds
-                        WHERE event_id = :event_id
-                        ORDER BY round_no ASC, id ASC
-                        """
-                    ),
-                    {"event_id": event_id},
-                ).fetchall()
-                if not round_rows:
-                    continue
-                round_nos = [int(row.round_no) for row in round_rows]
-                earliest_revealed_or_completed = next(
-                    (
-                        int(row.round_no)
-                        for row in round_rows
-                        if str(row.state or "").split(".")[-1].lower() in {"completed", "reveal"}
-                    ),
-                    None,
-                )
-                max_round_no_plus_one = int(max(round_nos) + 1)
+        chunk_size=chunk_size,
+        dry_run=dry_run,
+    )
 
-                registration_rows = conn.execute(
-                    text(
-                        """
-                        SELECT id, entity_type, user_id, team_id
-                        FROM persohub_event_registrations
-                        WHERE event_id = :event_id
-                          AND status = 'ELIMINATED'
-                          AND eliminated_round_no IS NULL
-                        ORDER BY id ASC
-                        """
-                    ),
-                    {"event_id": event_id},
-                ).fetchall()
-                for registration_row in registration_rows:
-                    entity_type = str(registration_row.entity_type or "").upper()
-                    score_rows = conn.execute(
-                        text(
-                            """
-                            SELECT r.round_no,
-                                   COALESCE(s.normalized_score, 0) AS normalized_score,
-                                   COALESCE(s.total_score, 0) AS total_score,
-                                   COALESCE(s.is_present, FALSE) AS is_present
-                            FROM persohub_event_scores s
-                            JOIN persohub_event_rounds r ON r.id = s.round_id
-                            WHERE s.event_id = :event_id
-                              AND s.entity_type = :entity_type
-                              AND (
-                                (:entity_type = 'USER' AND s.user_id = :user_id)
-                                OR
-                                (:entity_type = 'TEAM' AND s.team_id = :team_id)
-                              )
-                            ORDER BY r.round_no ASC, r.id ASC
-                            """
-                        ),
-                        {
-                            "event_id": event_id,
-                            "entity_type": entity_type,
-                            "user_id": registration_row.user_id,
-                            "team_id": registration_row.team_id,
-                        },
-                    ).fetchall()
-                    last_active_round_no = None
-                    for score_row in score_rows:
-                        if bool(score_row.is_present) or float(score_row.normalized_score or 0) > 0 or float(score_row.total_score or 0) > 0:
-                            last_active_round_no = int(score_row.round_no)
-                    if last_active_round_no is not None:
-                        next_round_no = next((round_no for round_no in round_nos if round_no > last_active_round_no), None)
-                        eliminated_round_no = int(next_round_no or max_round_no_plus_one)
-                    else:
-                        eliminated_round_no = int(earliest_revealed_or_completed or (round_nos[0] if round_nos else 1))
 
-                    conn.execute(
-                        text(
-                            """
-                            UPDATE persohub_event_registrations
-                            SET eliminated_round_no = :eliminated_round_no
-                            WHERE id = :registration_id
-                            """
-                        ),
-                        {
-                            "eliminated_round_no": eliminated_round_no,
-                            "registration_id": int(registration_row.id),
-                        },
-                    )
-
-        conn.execute(
-            text(
-                """
-                INSERT INTO system_config (key, value)
-                VALUES (:key, 'done')
-                ON CONFLICT (key) DO UPDATE SET value = 'done'
-                """
-            ),
-            {"key": marker_key},
-        )
+def backfill_persohub_event_eliminated_round_once(engine, *, chunk_size=None, dry_run=None):
+    def applicable(conn) -> bool:
+        return (
+            _table_exists(conn, "persohub_event_registrations")
+            and _column_exists(conn, "persohub_event_registrations", "eliminated_round_no")
+            and _table_exists(conn, "persohub_events")
+            and _table_exists(conn, "persohub_event_rounds")
+            and _table_exists(conn, "persohub_event_scores")
+        )
+
+    # An eliminated entity drops out in the round after its last round with any activity; with no
+    # activity, at the first completed/revealed round, else the first round. Events without rounds are skipped.
+    return run_backfill(
+        engine,
+        "migration_backfill_persohub_event_eliminated_round_v1",
+        applicable=applicable,
+        bounds_sql="SELECT MIN(id), MAX(id) FROM persohub_event_registrations WHERE status = 'ELIMINATED' AND eliminated_round_no IS NULL",
+        chunk_sql=(
+            """
+            UPDATE persohub_event_registrations reg
+            SET eliminated_round_no = computed.eliminated_round_no
+            FROM (
+                SELECT
+                    r.id,
+                    CASE
+                        WHEN activity.last_active_round_no IS NOT NULL THEN COALESCE(
+                            (
+                                SELECT MIN(er.round_no)
+                                FROM persohub_event_rounds er
+                                WHERE er.event_id = r.event_id AND er.round_no > activity.last_active_round_no
+                            ),
+                            (SELECT MAX(er.round_no) + 1 FROM persohub_event_rounds er WHERE er.event_id = r.event_id)
+                        )
+                        ELSE COALESCE(
+                            (
+                                SELECT MIN(er.round_no)
+                                FROM persohub_event_rounds er
+                                WHERE er.event_id = r.event_id
+                                  AND LOWER(CAST(er.state AS TEXT)) IN ('completed', 'reveal')
+                            ),
+                            (SELECT MIN(er.round_no) FROM persohub_event_rounds er WHERE er.event_id = r.event_id)
+                        )
+                    END AS eliminated_round_no
+                FROM persohub_event_registrations r
+                LEFT JOIN LATERAL (
+                    SELECT MAX(er.round_no) AS last_active_round_no
+                    FROM persohub_event_scores s
+                    JOIN persohub_event_rounds er ON er.id = s.round_id
+                    WHERE s.event_id = r.event_id
+                      AND s.entity_type = r.entity_type
+                      AND (
+                        (r.entity_type = 'USER' AND s.user_id = r.user_id)
+                        OR
+                        (r.entity_type = 'TEAM' AND s.team_id = r.team_id)
+                      )
+                      AND (
+                        COALESCE(s.is_present, FALSE)
+                        OR COALESCE(s.normalized_score, 0) > 0
+                        OR COALESCE(s.total_score, 0) > 0
+                      )
+                ) activity ON TRUE
+                WHERE r.id >= :start_id AND r.id < :end_id
+                  AND r.status = 'ELIMINATED'
+                  AND r.eliminated_round_no IS NULL
+            ) computed
+            WHERE reg.id = computed.id
+              AND computed.eliminated_round_no IS NOT NULL
+            """,
+        ),
+        chunk_size=chunk_size,
+        dry_run=dry_run,
+    )
 
 
 def resolve_user_identifier_collisions_once(engine):
@@ -3420,447 +3399,170 @@ def resolve_user_identifier_collisions_once(engine):
         )
 
 
-def enforce_pda_event_entity_uniqueness_once(engine):
-    marker_key = "migration_enforce_pda_event_entity_uniqueness_v1"
-    with engine.begin() as conn:
-        if not _table_exists(conn, "system_config"):
-            return
+def _dedupe_keep_latest_sql(table: str, partition_columns: str, entity_type: str, entity_column: str, *, chunked: bool) -> str:
+    # Partitions always include event_id, so event id ranges split the work without splitting a partition.
+    chunk_filter = "AND event_id >= :start_id AND event_id < :end_id" if chunked else ""
+    return f"""
+        WITH ranked AS (
+            SELECT
+                id,
+                ROW_NUMBER() OVER (
+                    PARTITION BY {partition_columns}
+                    ORDER BY id DESC
+                ) AS rn
+            FROM {table}
+            WHERE entity_type = '{entity_type}' AND {entity_column} IS NOT NULL
+              {chunk_filter}
+        )
+        DELETE FROM {table} t
+        USING ranked r
+        WHERE t.id = r.id
+          AND r.rn > 1
+        """
+
+
+def _entry_attendance_index_sql(prefix: str) -> Tuple[str, str]:
+    return (
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_{prefix}_event_attendance_entity_user
+        ON {prefix}_event_attendance(event_id, user_id)
+        WHERE entity_type = 'USER' AND user_id IS NOT NULL
+        """,
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_{prefix}_event_attendance_entity_team
+        ON {prefix}_event_attendance(event_id, team_id)
+        WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
+        """,
+    )
 
-        marker_exists = bool(
-            conn.execute(
-                text("SELECT 1 FROM system_config WHERE key = :key"),
-                {"key": marker_key},
-            ).fetchone()
-        )
-        if marker_exists:
-            return
 
-        if _table_exists(conn, "pda_event_scores"):
-            # Keep latest row by id per logical entity key.
-            conn.execute(
-                text(
-                    """
-                    WITH ranked AS (
-                        SELECT
-                            id,
-                            ROW_NUMBER() OVER (
-                                PARTITION BY event_id, round_id, entity_type, user_id
-                                ORDER BY id DESC
-                            ) AS rn
-                        FROM pda_event_scores
-                        WHERE entity_type = 'USER' AND user_id IS NOT NULL
-                    )
-                    DELETE FROM pda_event_scores s
-                    USING ranked r
-                    WHERE s.id = r.id
-                      AND r.rn > 1
-                    """
-                )
-            )
-            conn.execute(
-                text(
-                    """
-                    WITH ranked AS (
-                        SELECT
-                            id,
-                            ROW_NUMBER() OVER (
-                                PARTITION BY event_id, round_id, entity_type, team_id
-                                ORDER BY id DESC
-                            ) AS rn
-                        FROM pda_event_scores
-                        WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
-                    )
-                    DELETE FROM pda_event_scores s
-                    USING ranked r
-                    WHERE s.id = r.id
-                      AND r.rn > 1
-                    """
-                )
-            )
-            if _constraint_exists(conn, "pda_event_scores", "uq_pda_event_score_entity"):
-                conn.execute(text("ALTER TABLE pda_event_scores DROP CONSTRAINT uq_pda_event_score_entity"))
-            conn.execute(
-                text(
+def enforce_pda_event_entity_uniqueness_once(engine, *, chunk_size=None, dry_run=None):
+    with engine.begin() as conn:
+        attendance_has_round = _table_exists(conn, "pda_event_attendance") and _column_exists(conn, "pda_event_attendance", "round_id")
+    attendance_partition = "event_id, round_id, entity_type" if attendance_has_round else "event_id, entity_type"
+    # Keep latest row by id per logical entity key.
+    steps = (
+        (
+            "scores",
+            {
+                "applicable": lambda conn: _table_exists(conn, "pda_event_scores"),
+                "bounds_sql": "SELECT MIN(event_id), MAX(event_id) FROM pda_event_scores",
+                "chunk_sql": (
+                    _dedupe_keep_latest_sql("pda_event_scores", "event_id, round_id, entity_type, user_id", "USER", "user_id", chunked=True),
+                    _dedupe_keep_latest_sql("pda_event_scores", "event_id, round_id, entity_type, team_id", "TEAM", "team_id", chunked=True),
+                ),
+                "finalize_sql": (
+                    "ALTER TABLE pda_event_scores DROP CONSTRAINT IF EXISTS uq_pda_event_score_entity",
                     """
                     CREATE UNIQUE INDEX IF NOT EXISTS uq_pda_event_score_entity_user
                     ON pda_event_scores(event_id, round_id, user_id)
                     WHERE entity_type = 'USER' AND user_id IS NOT NULL
-                    """
-                )
-            )
-            conn.execute(
-                text(
+                    """,
                     """
                     CREATE UNIQUE INDEX IF NOT EXISTS uq_pda_event_score_entity_team
                     ON pda_event_scores(event_id, round_id, team_id)
                     WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
-                    """
-                )
-            )
-
-        if _table_exists(conn, "pda_event_attendance"):
-            attendance_has_round = _column_exists(conn, "pda_event_attendance", "round_id")
-            # Keep latest row by id per logical entity key.
-            if attendance_has_round:
-                conn.execute(
-                    text(
-                        """
-                        WITH ranked AS (
-                            SELECT
-                                id,
-                                ROW_NUMBER() OVER (
-                                    PARTITION BY event_id, round_id, entity_type, user_id
-                                    ORDER BY id DESC
-                                ) AS rn
-                            FROM pda_event_attendance
-                            WHERE entity_type = 'USER' AND user_id IS NOT NULL
-                        )
-                        DELETE FROM pda_event_attendance a
-                        USING ranked r
-                        WHERE a.id = r.id
-                          AND r.rn > 1
-                        """
-                    )
-                )
-                conn.execute(
-                    text(
-                        """
-                        WITH ranked AS (
-                            SELECT
-                                id,
-                                ROW_NUMBER() OVER (
-                                    PARTITION BY event_id, round_id, entity_type, team_id
-                                    ORDER BY id DESC
-                                ) AS rn
-                            FROM pda_event_attendance
-                            WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
-                        )
-                        DELETE FROM pda_event_attendance a
-                        USING ranked r
-                        WHERE a.id = r.id
-                          AND r.rn > 1
-                        """
-                    )
-                )
-            else:
-                conn.execute(
-                    text(
-                        """
-                        WITH ranked AS (
-                            SELECT
-                                id,
-                                ROW_NUMBER() OVER (
-                                    PARTITION BY event_id, entity_type, user_id
-                                    ORDER BY id DESC
-                                ) AS rn
-                            FROM pda_event_attendance
-                            WHERE entity_type = 'USER' AND user_id IS NOT NULL
-                        )
-                        DELETE FROM pda_event_attendance a
-                        USING ranked r
-                        WHERE a.id = r.id
-                          AND r.rn > 1
-                        """
-                    )
-                )
-                conn.execute(
-                    text(
-                        """
-                        WITH ranked AS (
-                            SELECT
-                                id,
-                                ROW_NUMBER() OVER (
-                                    PARTITION BY event_id, entity_type, team_id
-                                    ORDER BY id DESC
-                                ) AS rn
-                            FROM pda_event_attendance
-                            WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
-                        )
-                        DELETE FROM pda_event_attendance a
-                        USING ranked r
-                        WHERE a.id = r.id
-                          AND r.rn > 1
-                        """
-                    )
-                )
-            if _constraint_exists(conn, "pda_event_attendance", "uq_pda_event_attendance_entity"):
-                conn.execute(text("ALTER TABLE pda_event_attendance DROP CONSTRAINT uq_pda_event_attendance_entity"))
-            conn.execute(
-                text(
-                    """
-                    CREATE UNIQUE INDEX IF NOT EXISTS uq_pda_event_attendance_entity_user
-                    ON pda_event_attendance(event_id, user_id)
-                    WHERE entity_type = 'USER' AND user_id IS NOT NULL
-                    """
-                )
-            )
-            conn.execute(
-                text(
-                    """
-                    CREATE UNIQUE INDEX IF NOT EXISTS uq_pda_event_attendance_entity_team
-                    ON pda_event_attendance(event_id, team_id)
-                    WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
-                    """
-                )
-            )
-
-        conn.execute(
-            text(
-                """
-                INSERT INTO system_config (key, value)
-                VALUES (:key, 'done')
-                ON CONFLICT (key) DO UPDATE SET value = 'done'
-                """
-            ),
-            {"key": marker_key},
-        )
-
+                    """,
+                ),
+            },
+        ),
+        (
+            "attendance",
+            {
+                "applicable": lambda conn: _table_exists(conn, "pda_event_attendance"),
+                "bounds_sql": "SELECT MIN(event_id), MAX(event_id) FROM pda_event_attendance",
+                "chunk_sql": (
+                    _dedupe_keep_latest_sql("pda_event_attendance", f"{attendance_partition}, user_id", "USER", "user_id", chunked=True),
+                    _dedupe_keep_latest_sql("pda_event_attendance", f"{attendance_partition}, team_id", "TEAM", "team_id", chunked=True),
+                ),
+                "finalize_sql": (
+                    "ALTER TABLE pda_event_attendance DROP CONSTRAINT IF EXISTS uq_pda_event_attendance_entity",
+                    *_entry_attendance_index_sql("pda"),
+                ),
+            },
+        ),
+    )
+    return _run_backfill_steps(
+        engine,
+        "migration_enforce_pda_event_entity_uniqueness_v1",
+        steps,
+        chunk_size=chunk_size,
+        dry_run=dry_run,
+    )
 
-def migrate_event_attendance_to_entry_scope_once(engine):
-    marker_key = "migration_event_attendance_entry_scope_v1"
-    with engine.begin() as conn:
-        if not _table_exists(conn, "system_config"):
-            return
 
-        marker_exists = bool(
-            conn.execute(
-                text("SELECT 1 FROM system_config WHERE key = :key"),
-                {"key": marker_key},
-            ).fetchone()
-        )
-        if marker_exists:
-            return
-
-        if _table_exists(conn, "pda_event_attendance") and _column_exists(conn, "pda_event_attendance", "round_id"):
-            conn.execute(
-                text(
-                    """
-                    UPDATE pda_event_scores s
-                    SET is_present = a.is_present
-                    FROM pda_event_attendance a
-                    WHERE a.round_id IS NOT NULL
-                      AND a.event_id = s.event_id
-                      AND a.round_id = s.round_id
-                      AND a.entity_type = s.entity_type
-                      AND (
-                        (a.entity_type = 'USER' AND a.user_id IS NOT NULL AND a.user_id = s.user_id)
-                        OR
-                        (a.entity_type = 'TEAM' AND a.team_id IS NOT NULL AND a.team_id = s.team_id)
-                      )
-                    """
-                )
-            )
-            conn.execute(
-                text(
-                    """
-                    INSERT INTO pda_event_scores (
-                        event_id, round_id, entity_type, user_id, team_id,
-                        criteria_scores, total_score, normalized_score, is_present
-                    )
-                    SELECT
-                        a.event_id, a.round_id, a.entity_type, a.user_id, a.team_id,
-                        '{}'::jsonb, 0, 0, a.is_present
-                    FROM pda_event_attendance a
-                    LEFT JOIN pda_event_scores s
-                      ON s.event_id = a.event_id
-                     AND s.round_id = a.round_id
-                     AND s.entity_type = a.entity_type
-                     AND (
-                        (a.entity_type = 'USER' AND a.user_id IS NOT NULL AND s.user_id = a.user_id)
-                        OR
-                        (a.entity_type = 'TEAM' AND a.team_id IS NOT NULL AND s.team_id = a.team_id)
-                     )
-                    WHERE a.round_id IS NOT NULL
-                      AND s.id IS NULL
-                    """
-                )
-            )
-            conn.execute(text("DELETE FROM pda_event_attendance WHERE round_id IS NOT NULL"))
-            conn.execute(
-                text(
-                    """
-                    WITH ranked AS (
-                        SELECT
-                            id,
-                            ROW_NUMBER() OVER (
-                                PARTITION BY event_id, entity_type, user_id
-                                ORDER BY id DESC
-                            ) AS rn
-                        FROM pda_event_attendance
-                        WHERE entity_type = 'USER' AND user_id IS NOT NULL
-                    )
-                    DELETE FROM pda_event_attendance a
-                    USING ranked r
-                    WHERE a.id = r.id
-                      AND r.rn > 1
-                    """
-                )
-            )
-            conn.execute(
-                text(
-                    """
-                    WITH ranked AS (
-                        SELECT
-                            id,
-                            ROW_NUMBER() OVER (
-                                PARTITION BY event_id, entity_type, team_id
-                                ORDER BY id DESC
-                            ) AS rn
-                        FROM pda_event_attendance
-                        WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
-                    )
-                    DELETE FROM pda_event_attendance a
-                    USING ranked r
-                    WHERE a.id = r.id
-                      AND r.rn > 1
-                    """
-                )
-            )
-            conn.execute(text("DROP INDEX IF EXISTS idx_pda_event_attendance_event_round"))
-            conn.execute(text("DROP INDEX IF EXISTS uq_pda_event_attendance_entity_user"))
-            conn.execute(text("DROP INDEX IF EXISTS uq_pda_event_attendance_entity_team"))
-            if _constraint_exists(conn, "pda_event_attendance", "uq_pda_event_attendance_entity"):
-                conn.execute(text("ALTER TABLE pda_event_attendance DROP CONSTRAINT uq_pda_event_attendance_entity"))
-            conn.execute(text("ALTER TABLE pda_event_attendance DROP COLUMN IF EXISTS round_id"))
-            conn.execute(
-                text(
-                    """
-                    CREATE UNIQUE INDEX IF NOT EXISTS uq_pda_event_attendance_entity_user
-                    ON pda_event_attendance(event_id, user_id)
-                    WHERE entity_type = 'USER' AND user_id IS NOT NULL
-                    """
-                )
-            )
-            conn.execute(
-                text(
-                    """
-                    CREATE UNIQUE INDEX IF NOT EXISTS uq_pda_event_attendance_entity_team
-                    ON pda_event_attendance(event_id, team_id)
-                    WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
-                    """
-                )
-            )
+def _attendance_entry_scope_step(prefix: str) -> dict:
+    latest_round_attendance = f"""
+        SELECT DISTINCT ON (event_id, round_id, entity_type, user_id, team_id)
+            event_id, round_id, entity_type, user_id, team_id, is_present
+        FROM {prefix}_event_attendance
+        WHERE id >= :start_id AND id < :end_id
+          AND round_id IS NOT NULL
+        ORDER BY event_id, round_id, entity_type, user_id, team_id, id DESC
+    """
+    return {
+        "applicable": lambda conn: _table_exists(conn, f"{prefix}_event_attendance")
+        and _column_exists(conn, f"{prefix}_event_attendance", "round_id"),
+        "bounds_sql": f"SELECT MIN(id), MAX(id) FROM {prefix}_event_attendance WHERE round_id IS NOT NULL",
+        # Round-level attendance moves onto the round's score row. Duplicate attendance rows for one
+        # entity and round collapse to the latest one, so chunk boundaries never change the outcome.
+        "chunk_sql": (
+            f"""
+            UPDATE {prefix}_event_scores s
+            SET is_present = a.is_present
+            FROM ({latest_round_attendance}) a
+            WHERE a.event_id = s.event_id
+              AND a.round_id = s.round_id
+              AND a.entity_type = s.entity_type
+              AND (
+                (a.entity_type = 'USER' AND a.user_id IS NOT NULL AND a.user_id = s.user_id)
+                OR
+                (a.entity_type = 'TEAM' AND a.team_id IS NOT NULL AND a.team_id = s.team_id)
+              )
+            """,
+            f"""
+            INSERT INTO {prefix}_event_scores (
+                event_id, round_id, entity_type, user_id, team_id,
+                criteria_scores, total_score, normalized_score, is_present
+            )
+            SELECT
+                a.event_id, a.round_id, a.entity_type, a.user_id, a.team_id,
+                '{{}}'::jsonb, 0, 0, a.is_present
+            FROM ({latest_round_attendance}) a
+            LEFT JOIN {prefix}_event_scores s
+              ON s.event_id = a.event_id
+             AND s.round_id = a.round_id
+             AND s.entity_type = a.entity_type
+             AND (
+                (a.entity_type = 'USER' AND a.user_id IS NOT NULL AND s.user_id = a.user_id)
+                OR
+                (a.entity_type = 'TEAM' AND a.team_id IS NOT NULL AND s.team_id = a.team_id)
+             )
+            WHERE s.id IS NULL
+            """,
+        ),
+        "finalize_sql": (
+            f"DELETE FROM {prefix}_event_attendance WHERE round_id IS NOT NULL",
+            _dedupe_keep_latest_sql(f"{prefix}_event_attendance", "event_id, entity_type, user_id", "USER", "user_id", chunked=False),
+            _dedupe_keep_latest_sql(f"{prefix}_event_attendance", "event_id, entity_type, team_id", "TEAM", "team_id", chunked=False),
+            f"DROP INDEX IF EXISTS idx_{prefix}_event_attendance_event_round",
+            f"DROP INDEX IF EXISTS uq_{prefix}_event_attendance_entity_user",
+            f"DROP INDEX IF EXISTS uq_{prefix}_event_attendance_entity_team",
+            f"ALTER TABLE {prefix}_event_attendance DROP CONSTRAINT IF EXISTS uq_{prefix}_event_attendance_entity",
+            f"ALTER TABLE {prefix}_event_attendance DROP COLUMN IF EXISTS round_id",
+            *_entry_attendance_index_sql(prefix),
+        ),
+    }
 
-        if _table_exists(conn, "persohub_event_attendance") and _column_exists(conn, "persohub_event_attendance", "round_id"):
-            conn.execute(
-                text(
-                    """
-                    UPDATE persohub_event_scores s
-                    SET is_present = a.is_present
-                    FROM persohub_event_attendance a
-                    WHERE a.round_id IS NOT NULL
-                      AND a.event_id = s.event_id
-                      AND a.round_id = s.round_id
-                      AND a.entity_type = s.entity_type
-                      AND (
-                        (a.entity_type = 'USER' AND a.user_id IS NOT NULL AND a.user_id = s.user_id)
-                        OR
-                        (a.entity_type = 'TEAM' AND a.team_id IS NOT NULL AND a.team_id = s.team_id)
-                      )
-                    """
-                )
-            )
-            conn.execute(
-                text(
-                    """
-                    INSERT INTO persohub_event_scores (
-                        event_id, round_id, entity_type, user_id, team_id,
-                        criteria_scores, total_score, normalized_score, is_present
-                    )
-                    SELECT
-                        a.event_id, a.round_id, a.entity_type, a.user_id, a.team_id,
-                        '{}'::jsonb, 0, 0, a.is_present
-                    FROM persohub_event_attendance a
-                    LEFT JOIN persohub_event_scores s
-                      ON s.event_id = a.event_id
-                     AND s.round_id = a.round_id
-                     AND s.entity_type = a.entity_type
-                     AND (
-                        (a.entity_type = 'USER' AND a.user_id IS NOT NULL AND s.user_id = a.user_id)
-                        OR
-                        (a.entity_type = 'TEAM' AND a.team_id IS NOT NULL AND s.team_id = a.team_id)
-                     )
-                    WHERE a.round_id IS NOT NULL
-                      AND s.id IS NULL
-                    """
-                )
-            )
-            conn.execute(text("DELETE FROM persohub_event_attendance WHERE round_id IS NOT NULL"))
-            conn.execute(
-                text(
-                    """
-                    WITH ranked AS (
-                        SELECT
-                            id,
-                            ROW_NUMBER() OVER (
-                                PARTITION BY event_id, entity_type, user_id
-                                ORDER BY id DESC
-                            ) AS rn
-                        FROM persohub_event_attendance
-                        WHERE entity_type = 'USER' AND user_id IS NOT NULL
-                    )
-                    DELETE FROM persohub_event_attendance a
-                    USING ranked r
-                    WHERE a.id = r.id
-                      AND r.rn > 1
-                    """
-                )
-            )
-            conn.execute(
-                text(
-                    """
-                    WITH ranked AS (
-                        SELECT
-                            id,
-                            ROW_NUMBER() OVER (
-                                PARTITION BY event_id, entity_type, team_id
-                                ORDER BY id DESC
-                            ) AS rn
-                        FROM persohub_event_attendance
-                        WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
-                    )
-                    DELETE FROM persohub_event_attendance a
-                    USING ranked r
-                    WHERE a.id = r.id
-                      AND r.rn > 1
-                    """
-                )
-            )
-            conn.execute(text("DROP INDEX IF EXISTS idx_persohub_event_attendance_event_round"))
-            conn.execute(text("DROP INDEX IF EXISTS uq_persohub_event_attendance_entity_user"))
-            conn.execute(text("DROP INDEX IF EXISTS uq_persohub_event_attendance_entity_team"))
-            if _constraint_exists(conn, "persohub_event_attendance", "uq_persohub_event_attendance_entity"):
-                conn.execute(text("ALTER TABLE persohub_event_attendance DROP CONSTRAINT uq_persohub_event_attendance_entity"))
-            conn.execute(text("ALTER TABLE persohub_event_attendance DROP COLUMN IF EXISTS round_id"))
-            conn.execute(
-                text(
-                    """
-                    CREATE UNIQUE INDEX IF NOT EXISTS uq_persohub_event_attendance_entity_user
-                    ON persohub_event_attendance(event_id, user_id)
-                    WHERE entity_type = 'USER' AND user_id IS NOT NULL
-                    """
-                )
-            )
-            conn.execute(
-                text(
-                    """
-                    CREATE UNIQUE INDEX IF NOT EXISTS uq_persohub_event_attendance_entity_team
-                    ON persohub_event_attendance(event_id, team_id)
-                    WHERE entity_type = 'TEAM' AND team_id IS NOT NULL
-                    """
-                )
-            )
 
-        conn.execute(
-            text(
-                """
-                INSERT INTO system_config (key, value)
-                VALUES (:key, 'done')
-                ON CONFLICT (key) DO UPDATE SET value = 'done'
-                """
-            ),
-            {"key": marker_key},
-        )
+def migrate_event_attendance_to_entry_scope_once(engine, *, chunk_size=None, dry_run=None):
+    return _run_backfill_steps(
+        engine,
+        "migration_event_attendance_entry_scope_v1",
+        (("pda", _attendance_entry_scope_step("pda")), ("persohub", _attendance_entry_scope_step("persohub"))),
+        chunk_size=chunk_size,
+        dry_run=dry_run,
+    )
 
 
 def ensure_persohub_tables(engine):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Float, Date, Time, Enum as SQLEnum, ForeignKey, Text, JSON, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Float, Date, Time, Enum as SQLEnum, ForeignKey, Text, JSON, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -135,6 +135,37 @@ class SystemConfig(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 
+class RecruitmentNotifyJob(Base):
+    __tablename__ = "recruitment_notify_jobs"
+
+    id = Column(String(32), primary_key=True)
+    status = Column(String(20), nullable=False, default="queued")
+    # "recruitment" while queued/running, NULL once finished: the unique constraint allows one live job.
+    active_slot = Column(String(20), nullable=True, unique=True)
+    requested_by = Column(Integer, nullable=True)
+    total = Column(Integer, nullable=False, default=0)
+    sent = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    error = Column(String(300), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class RecruitmentNotifyRecipient(Base):
+    __tablename__ = "recruitment_notify_recipients"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(32), ForeignKey("recruitment_notify_jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, nullable=True)
+    email = Column(String(255), nullable=True)
+    name = Column(String(255), nullable=True)
+    status = Column(String(20), nullable=False, default="pending")
+    error = Column(String(300), nullable=True)
+
+
 class PdaItem(Base):
     __tablename__ = "pda_items"
 
@@ -295,6 +326,35 @@ class BadgeAssignment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        Index(
+            "uq_badge_assignments_identity",
+            badge_id,
+            func.coalesce(user_id, 0),
+            func.coalesce(pda_team_id, 0),
+            func.coalesce(persohub_team_id, 0),
+            func.coalesce(pda_event_id, 0),
+            func.coalesce(persohub_event_id, 0),
+            unique=True,
+        ),
+    )
+
+
+class EventCertificate(Base):
+    __tablename__ = "event_certificates"
+    __table_args__ = (
+        UniqueConstraint("pda_event_id", "user_id", name="uq_event_certificate_pda_event_user"),
+        UniqueConstraint("persohub_event_id", "user_id", name="uq_event_certificate_persohub_event_user"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    pda_event_id = Column(Integer, ForeignKey("pda_events.id", ondelete="CASCADE"), nullable=True, index=True)
+    persohub_event_id = Column(Integer, ForeignKey("persohub_events.id", ondelete="CASCADE"), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    registration_id = Column(Integer, nullable=True)
+    storage_key = Column(String(800), nullable=False)
+    generated_at = Column(DateTime(timezone=True), server_default=func.now())
+
 
 class PdaEvent(Base):
     __tablename__ = "pda_events"
@@ -469,6 +529,9 @@ class PdaEventAttendance(Base):
             "team_id",
             name="uq_pda_event_attendance_entity",
         ),
+        # NULLs are distinct in the constraint above; these partial indexes are what enforce uniqueness.
+        Index("uq_pda_event_attendance_entity_user", "event_id", "user_id", unique=True, postgresql_where=text("entity_type = 'USER' AND user_id IS NOT NULL"), sqlite_where=text("entity_type = 'USER' AND user_id IS NOT NULL")),
+        Index("uq_pda_event_attendance_entity_team", "event_id", "team_id", unique=True, postgresql_where=text("entity_type = 'TEAM' AND team_id IS NOT NULL"), sqlite_where=text("entity_type = 'TEAM' AND team_id IS NOT NULL")),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -492,6 +555,8 @@ class PdaEventScore(Base):
             "team_id",
             name="uq_pda_event_score_entity",
         ),
+        Index("uq_pda_event_score_entity_user", "event_id", "round_id", "user_id", unique=True, postgresql_where=text("entity_type = 'USER' AND user_id IS NOT NULL"), sqlite_where=text("entity_type = 'USER' AND user_id IS NOT NULL")),
+        Index("uq_pda_event_score_entity_team", "event_id", "round_id", "team_id", unique=True, postgresql_where=text("entity_type = 'TEAM' AND team_id IS NOT NULL"), sqlite_where=text("entity_type = 'TEAM' AND team_id IS NOT NULL")),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -905,6 +970,9 @@ class PersohubEventAttendance(Base):
             "team_id",
             name="uq_persohub_event_attendance_entity",
         ),
+        # NULLs are distinct in the constraint above; these partial indexes are what enforce uniqueness.
+        Index("uq_persohub_event_attendance_entity_user", "event_id", "user_id", unique=True, postgresql_where=text("entity_type = 'USER' AND user_id IS NOT NULL"), sqlite_where=text("entity_type = 'USER' AND user_id IS NOT NULL")),
+        Index("uq_persohub_event_attendance_entity_team", "event_id", "team_id", unique=True, postgresql_where=text("entity_type = 'TEAM' AND team_id IS NOT NULL"), sqlite_where=text("entity_type = 'TEAM' AND team_id IS NOT NULL")),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -928,6 +996,8 @@ class PersohubEventScore(Base):
             "team_id",
             name="uq_persohub_event_score_entity",
         ),
+        Index("uq_persohub_event_score_entity_user", "event_id", "round_id", "user_id", unique=True, postgresql_where=text("entity_type = 'USER' AND user_id IS NOT NULL"), sqlite_where=text("entity_type = 'USER' AND user_id IS NOT NULL")),
+        Index("uq_persohub_event_score_entity_team", "event_id", "round_id", "team_id", unique=True, postgresql_where=text("entity_type = 'TEAM' AND team_id IS NOT NULL"), sqlite_where=text("entity_type = 'TEAM' AND team_id IS NOT NULL")),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional
+
+import bcrypt
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+BCRYPT_ROUNDS = min(31, max(4, _int_env("BCRYPT_ROUNDS", 12)))
+PASSWORD_HASH_WORKERS = max(1, _int_env("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+# bcrypt releases the GIL, so threads are enough unless hashing has to be isolated from the API process.
+PASSWORD_HASH_USE_PROCESSES = str(os.environ.get("PASSWORD_HASH_USE_PROCESSES", "0")).strip().lower() in {"1", "true", "yes", "on"}
+# Jobs running + waiting; beyond this, logins are shed with 429 instead of queueing without bound.
+PASSWORD_HASH_MAX_PENDING = max(1, _int_env("PASSWORD_HASH_MAX_PENDING", PASSWORD_HASH_WORKERS * 8))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = max(1, _int_env("PASSWORD_HASH_RETRY_AFTER_SECONDS", 2))
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+_state_lock = threading.Lock()
+_pending = 0
+_stats: Dict[str, int] = {"completed": 0, "rejected": 0, "max_pending_seen": 0}
+
+
+def _prehash(password: str) -> bytes:
+    try:
+        pw_bytes = password.encode("utf-8")
+    except Exception:
+        pw_bytes = str(password).encode("utf-8")
+    return hashlib.sha256(pw_bytes).digest()
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    # Always pre-hash password with SHA-256, then bcrypt the digest
+    return bcrypt.hashpw(_prehash(password), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(_prehash(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:
+        return False
+
+
+def password_needs_rehash(hashed_password: Optional[str]) -> bool:
+    """True when the stored bcrypt hash uses a different cost than BCRYPT_ROUNDS."""
+    parts = str(hashed_password or "").split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return False
+    return int(parts[2]) != BCRYPT_ROUNDS
+
+
+def _get_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if PASSWORD_HASH_USE_PROCESSES:
+                _executor = ProcessPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+        return _executor
+
+
+def _reserve() -> None:
+    global _pending
+    with _state_lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            _stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many sign-in attempts right now; please retry shortly",
+                headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+            )
+        _pending += 1
+        _stats["max_pending_seen"] = max(_stats["max_pending_seen"], _pending)
+
+
+def _release() -> None:
+    global _pending
+    with _state_lock:
+        _pending -= 1
+        _stats["completed"] += 1
+
+
+def _run(fn, *args):
+    _reserve()
+    try:
+        return _get_executor().submit(fn, *args).result()
+    finally:
+        _release()
+
+
+async def _run_async(fn, *args):
+    # Awaiting the executor future keeps the queue wait and the bcrypt time off the request threadpool.
+    _reserve()
+    try:
+        return await asyncio.wrap_future(_get_executor().submit(fn, *args))
+    finally:
+        _release()
+
+
+def verify_password_pooled(plain_password: str, hashed_password: str) -> bool:
+    return bool(_run(check_password, plain_password, hashed_password))
+
+
+def hash_password_pooled(password: str) -> str:
+    return _run(hash_password, password, BCRYPT_ROUNDS)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return bool(await _run_async(check_password, plain_password, hashed_password))
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_async(hash_password, password, BCRYPT_ROUNDS)
+
+
+def password_hash_stats() -> Dict[str, int]:
+    with _state_lock:
+        stats = dict(_stats)
+        stats["pending"] = _pending
+    stats["workers"] = PASSWORD_HASH_WORKERS
+    stats["max_pending"] = PASSWORD_HASH_MAX_PENDING
+    return stats
+
+
+def shutdown_password_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
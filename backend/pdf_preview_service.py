@@ -0,0 +1,235 @@
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+
+from utils import S3_BUCKET_NAME, S3_CLIENT, _build_s3_url
+
+try:
+    import pypdfium2 as pdfium
+except Exception:  # pragma: no cover
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+PDF_PREVIEW_MAX_PAGES = 20
+PDF_PREVIEW_RENDER_SCALE = 1.5
+PDF_PREVIEW_WEBP_QUALITY = 84
+PDF_PREVIEW_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MANIFEST_NAME = "manifest.json"
+
+_RENDER_WORKERS_DEFAULT = min(4, os.cpu_count() or 1)
+_UPLOAD_WORKERS_DEFAULT = 8
+_WEBP_METHOD_DEFAULT = 4
+_MEMORY_CACHE_SIZE = 256
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+_RENDER_POOL: Optional[ProcessPoolExecutor] = None
+_RENDER_POOL_LOCK = threading.Lock()
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(1, _int_env("PDF_PREVIEW_UPLOAD_WORKERS", _UPLOAD_WORKERS_DEFAULT)),
+    thread_name_prefix="pdf-preview-upload",
+)
+
+# (source key, content hash, page limit) -> preview URLs, so repeated requests skip even the S3 manifest read.
+_PREVIEW_CACHE: "OrderedDict[str, List[str]]" = OrderedDict()
+_PREVIEW_CACHE_LOCK = threading.Lock()
+
+
+def _render_pool() -> Optional[ProcessPoolExecutor]:
+    global _RENDER_POOL
+    workers = _int_env("PDF_PREVIEW_RENDER_WORKERS", _RENDER_WORKERS_DEFAULT)
+    if workers <= 1:
+        return None
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is None:
+            _RENDER_POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _RENDER_POOL
+
+
+def preview_upload_queue_depth() -> int:
+    return _UPLOAD_EXECUTOR._work_queue.qsize()
+
+
+def shutdown_preview_executors() -> None:
+    global _RENDER_POOL
+    with _RENDER_POOL_LOCK:
+        if _RENDER_POOL is not None:
+            _RENDER_POOL.shutdown(wait=False, cancel_futures=True)
+            _RENDER_POOL = None
+    _UPLOAD_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
+
+def render_pdf_page(pdf_path: str, page_index: int, scale: float = PDF_PREVIEW_RENDER_SCALE) -> bytes:
+    doc = pdfium.PdfDocument(pdf_path)
+    page = None
+    bitmap = None
+    pil_image = None
+    output = BytesIO()
+    try:
+        page = doc[page_index]
+        bitmap = page.render(scale=scale)
+        pil_image = bitmap.to_pil()
+        pil_image.save(
+            output,
+            format="WEBP",
+            quality=PDF_PREVIEW_WEBP_QUALITY,
+            method=_int_env("PDF_PREVIEW_WEBP_METHOD", _WEBP_METHOD_DEFAULT),
+        )
+        return output.getvalue()
+    finally:
+        output.close()
+        if pil_image is not None:
+            try:
+                pil_image.close()
+            except Exception:
+                pass
+        if bitmap is not None and hasattr(bitmap, "close"):
+            try:
+                bitmap.close()
+            except Exception:
+                pass
+        if page is not None and hasattr(page, "close"):
+            try:
+                page.close()
+            except Exception:
+                pass
+        doc.close()
+
+
+def render_pdf_preview_images(pdf_path: str, max_pages: int) -> List[bytes]:
+    if not pdfium:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="PDF preview dependency missing (install pypdfium2)",
+        )
+    try:
+        doc = pdfium.PdfDocument(pdf_path)
+        page_count = len(doc)
+        doc.close()
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid PDF file") from exc
+
+    target_pages = min(max_pages, PDF_PREVIEW_MAX_PAGES, page_count)
+    if target_pages <= 0:
+        return []
+    pool = _render_pool() if target_pages > 1 else None
+    if pool is None:
+        return [render_pdf_page(pdf_path, idx) for idx in range(target_pages)]
+    futures = [pool.submit(render_pdf_page, pdf_path, idx) for idx in range(target_pages)]
+    return [future.result() for future in futures]
+
+
+def _cache_get(cache_key: str) -> Optional[List[str]]:
+    with _PREVIEW_CACHE_LOCK:
+        urls = _PREVIEW_CACHE.get(cache_key)
+        if urls is not None:
+            _PREVIEW_CACHE.move_to_end(cache_key)
+        return list(urls) if urls is not None else None
+
+
+def _cache_put(cache_key: str, urls: List[str]) -> None:
+    with _PREVIEW_CACHE_LOCK:
+        _PREVIEW_CACHE[cache_key] = list(urls)
+        _PREVIEW_CACHE.move_to_end(cache_key)
+        while len(_PREVIEW_CACHE) > _MEMORY_CACHE_SIZE:
+            _PREVIEW_CACHE.popitem(last=False)
+
+
+def _read_manifest(manifest_key: str) -> Optional[List[str]]:
+    try:
+        obj = S3_CLIENT.get_object(Bucket=S3_BUCKET_NAME, Key=manifest_key)
+        payload = json.loads(obj["Body"].read())
+    except Exception:
+        return None
+    page_keys = payload.get("page_keys") if isinstance(payload, dict) else None
+    if not isinstance(page_keys, list):
+        return None
+    return [str(key) for key in page_keys]
+
+
+def _upload_preview(key: str, data: bytes) -> None:
+    S3_CLIENT.put_object(
+        Bucket=S3_BUCKET_NAME,
+        Key=key,
+        Body=data,
+        ContentType="image/webp",
+        CacheControl=PDF_PREVIEW_CACHE_CONTROL,
+    )
+
+
+def generate_pdf_previews(source_key: str, preview_prefix: str, max_pages: int) -> List[str]:
+    """Render, upload and return preview URLs for an S3 PDF, reusing earlier output for the same content."""
+    if not S3_CLIENT or not S3_BUCKET_NAME:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="S3 not configured")
+    try:
+        head = S3_CLIENT.head_object(Bucket=S3_BUCKET_NAME, Key=source_key)
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to read source PDF") from exc
+
+    content_hash = str(head.get("ETag") or "").strip('"').replace("-", "")[:32] or "nohash"
+    page_limit = min(int(max_pages), PDF_PREVIEW_MAX_PAGES)
+    source_stem = Path(source_key).stem
+    output_prefix = f"{preview_prefix.rstrip('/')}/{source_stem}-{content_hash}-p{page_limit}"
+    manifest_key = f"{output_prefix}/{MANIFEST_NAME}"
+    cache_key = f"{source_key}|{content_hash}|{page_limit}"
+
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    existing_keys = _read_manifest(manifest_key)
+    if existing_keys is not None:
+        urls = [_build_s3_url(key) for key in existing_keys]
+        _cache_put(cache_key, urls)
+        return urls
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        try:
+            S3_CLIENT.download_fileobj(S3_BUCKET_NAME, source_key, tmp)
+            tmp.flush()
+        except Exception as exc:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to read source PDF") from exc
+        images = render_pdf_preview_images(tmp.name, max_pages=page_limit)
+
+    page_keys = [f"{output_prefix}/page_{idx:03d}.webp" for idx in range(1, len(images) + 1)]
+    uploads = [_UPLOAD_EXECUTOR.submit(_upload_preview, key, data) for key, data in zip(page_keys, images)]
+    try:
+        for future in uploads:
+            future.result()
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to upload preview image") from exc
+
+    # The manifest is written last so a partially uploaded run is never treated as cached.
+    try:
+        S3_CLIENT.put_object(
+            Bucket=S3_BUCKET_NAME,
+            Key=manifest_key,
+            Body=json.dumps({"source_key": source_key, "content_hash": content_hash, "page_keys": page_keys}).encode("utf-8"),
+            ContentType="application/json",
+        )
+    except Exception:
+        logger.warning("Failed to write PDF preview manifest for %s", source_key)
+
+    urls = [_build_s3_url(key) for key in page_keys]
+    _cache_put(cache_key, urls)
+    return urls
@@ -1359,8 +1359,17 @@ def build_public_round_card(round_row: PersohubEventRound) -> dict:
     }
 
 
-def build_participant_results_payload(db: Session, event: PersohubEvent, *, entity_type: str, entity_id: int) -> dict:
-    round_rows = _event_rounds(db, event.id)
+def build_participant_results_payload(
+    db: Session,
+    event: PersohubEvent,
+    *,
+    entity_type: str,
+    entity_id: int,
+    round_rows: Optional[List[PersohubEventRound]] = None,
+) -> dict:
+    """``round_rows`` lets callers building several payloads for one event load its rounds once."""
+    if round_rows is None:
+        round_rows = _event_rounds(db, event.id)
     rounds = []
     for round_row in round_rows:
         if not bool(getattr(round_row, "results_published", False)):
@@ -1,9 +1,10 @@
 import json
 import re
 import secrets
-from typing import List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 
-from sqlalchemy import text
+from sqlalchemy import case, select, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from models import (
@@ -23,9 +24,11 @@ from models import (
     PersohubSympo,
     PersohubSympoEvent,
 )
+from typeahead_index import note_hashtag_count_changes
 
 PROFILE_RE = re.compile(r"[^a-z0-9_]+")
 HASHTAG_RE = re.compile(r"(?<!\w)#([A-Za-z0-9_-]{1,80})")
+_INSERT_BY_DIALECT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
 DEFAULT_PERSOHUB_COMMUNITIES = [
     {"name": "PDA Design Team", "profile_id": "designteam", "team": "Design"},
@@ -370,33 +373,90 @@ def _parse_event_poster_assets(poster_url: Optional[str]) -> List[dict]:
     return [{"url": raw, "aspect_ratio": None}]
 
 
-def _sync_post_hashtags_only(db: Session, post: PersohubPost) -> None:
-    hashtag_values = set(extract_hashtags(post.description))
+def _insert_for(db: Session):
+    dialect = db.get_bind().dialect.name
+    insert = _INSERT_BY_DIALECT.get(dialect)
+    if insert is None:
+        raise RuntimeError(f"Hashtag upsert is not supported on {dialect}")
+    return insert
 
-    existing_links = (
-        db.query(PersohubPostHashtag, PersohubHashtag)
-        .join(PersohubHashtag, PersohubPostHashtag.hashtag_id == PersohubHashtag.id)
-        .filter(PersohubPostHashtag.post_id == post.id)
-        .all()
+
+def adjust_hashtag_counts(db: Session, deltas: Dict[int, int], texts: Optional[Dict[int, str]] = None) -> None:
+    """Apply ``count = count + delta`` per hashtag id in SQL, never going below zero."""
+    hashtags = PersohubHashtag.__table__
+    by_delta: Dict[int, List[int]] = {}
+    for hashtag_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(int(delta), []).append(int(hashtag_id))
+    for delta, hashtag_ids in by_delta.items():
+        new_count = hashtags.c.count + delta
+        db.execute(
+            hashtags.update()
+            .where(hashtags.c.id.in_(hashtag_ids))
+            .values(count=case((new_count > 0, new_count), else_=0))
+        )
+    note_hashtag_count_changes(db, deltas, texts)
+
+
+def sync_post_hashtags(db: Session, post_id: int, hashtag_values: Iterable[str]) -> None:
+    """Make the post's hashtag links match ``hashtag_values`` with set-based statements.
+
+    Counts move only for links this call actually inserted or deleted, so concurrent saves of
+    posts sharing a tag cannot lose updates.
+    """
+    post_id = int(post_id)
+    wanted = {str(value) for value in hashtag_values if value}
+    links = PersohubPostHashtag.__table__
+    hashtags = PersohubHashtag.__table__
+    current = dict(
+        db.execute(
+            select(hashtags.c.hashtag_text, hashtags.c.id)
+            .select_from(links.join(hashtags, links.c.hashtag_id == hashtags.c.id))
+            .where(links.c.post_id == post_id)
+        ).all()
     )
-    existing = {tag.hashtag_text: (link, tag) for link, tag in existing_links}
+    deltas: Dict[int, int] = {}
+    texts: Dict[int, str] = {}
+
+    stale_ids = [hashtag_id for text_value, hashtag_id in current.items() if text_value not in wanted]
+    if stale_ids:
+        removed = db.execute(
+            links.delete()
+            .where(links.c.post_id == post_id, links.c.hashtag_id.in_(stale_ids))
+            .returning(links.c.hashtag_id)
+        ).scalars().all()
+        for hashtag_id in removed:
+            deltas[int(hashtag_id)] = deltas.get(int(hashtag_id), 0) - 1
+
+    missing = sorted(wanted - set(current))
+    if missing:
+        insert = _insert_for(db)
+        db.execute(
+            insert(hashtags)
+            .values([{"hashtag_text": value, "count": 0} for value in missing])
+            .on_conflict_do_nothing(index_elements=[hashtags.c.hashtag_text])
+        )
+        texts = {
+            int(hashtag_id): text_value
+            for hashtag_id, text_value in db.execute(
+                select(hashtags.c.id, hashtags.c.hashtag_text).where(hashtags.c.hashtag_text.in_(missing))
+            ).all()
+        }
+        added = db.execute(
+            insert(links)
+            .values([{"post_id": post_id, "hashtag_id": hashtag_id} for hashtag_id in texts])
+            .on_conflict_do_nothing(index_elements=[links.c.post_id, links.c.hashtag_id])
+            .returning(links.c.hashtag_id)
+        ).scalars().all()
+        for hashtag_id in added:
+            deltas[int(hashtag_id)] = deltas.get(int(hashtag_id), 0) + 1
+
+    if deltas:
+        adjust_hashtag_counts(db, deltas, texts)
 
-    for hashtag_text, (link, tag) in existing.items():
-        if hashtag_text in hashtag_values:
-            continue
-        db.delete(link)
-        tag.count = max(0, int(tag.count or 0) - 1)
 
-    for hashtag_text in sorted(hashtag_values):
-        if hashtag_text in existing:
-            continue
-        tag = db.query(PersohubHashtag).filter(PersohubHashtag.hashtag_text == hashtag_text).first()
-        if not tag:
-            tag = PersohubHashtag(hashtag_text=hashtag_text, count=0)
-            db.add(tag)
-            db.flush()
-        tag.count = int(tag.count or 0) + 1
-        db.add(PersohubPostHashtag(post_id=post.id, hashtag_id=tag.id))
+def _sync_post_hashtags_only(db: Session, post: PersohubPost) -> None:
+    sync_post_hashtags(db, post.id, extract_hashtags(post.description))
 
 
 def _build_event_post_description(event: PersohubEvent, sympo_name: Optional[str]) -> str:
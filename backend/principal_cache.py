@@ -0,0 +1,122 @@
+import copy
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import PdaAdmin, PdaTeam, PersohubAdmin, PersohubClub, PersohubClubAdmin, PersohubCommunity
+
+# Rows whose changes can alter what a token is allowed to do (or what its principal carries,
+# like the PDA team). Any commit touching one of them bumps the permission version, which
+# retires every cached principal at once.
+PERMISSION_MODELS = (PdaAdmin, PdaTeam, PersohubAdmin, PersohubClub, PersohubClubAdmin, PersohubCommunity)
+
+_CACHE_MAX_ENTRIES = 4096
+
+
+def _float_env(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+# Disabled by default. The version counter is per process, so with several workers a
+# governance change made elsewhere is only picked up once entries here expire.
+PRINCIPAL_CACHE_TTL_SECONDS = _float_env("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", 0.0)
+
+_lock = threading.Lock()
+_permission_version = 0
+_cache: "OrderedDict[Tuple[str, str, int], Tuple[float, Any]]" = OrderedDict()
+
+
+def token_cache_id(payload: dict, token: str) -> str:
+    jti = str(payload.get("jti") or "").strip()
+    if jti:
+        return jti
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def permission_version() -> int:
+    return _permission_version
+
+
+def bump_permission_version() -> int:
+    global _permission_version
+    with _lock:
+        _permission_version += 1
+        _cache.clear()
+        return _permission_version
+
+
+def get_cached_principal(token_id: Optional[str], scope: str) -> Optional[Any]:
+    if PRINCIPAL_CACHE_TTL_SECONDS <= 0 or not token_id:
+        return None
+    key = (token_id, scope, _permission_version)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            _cache.pop(key, None)
+            return None
+        _cache.move_to_end(key)
+    return copy.deepcopy(value)
+
+
+def cache_principal(token_id: Optional[str], scope: str, value: Any, *, version: Optional[int] = None) -> None:
+    """Store a resolved principal; pass the version read before resolving to avoid caching stale grants."""
+    if PRINCIPAL_CACHE_TTL_SECONDS <= 0 or not token_id:
+        return
+    resolved_version = _permission_version if version is None else int(version)
+    with _lock:
+        if resolved_version != _permission_version:
+            return
+        key = (token_id, scope, resolved_version)
+        _cache[key] = (time.monotonic() + PRINCIPAL_CACHE_TTL_SECONDS, copy.deepcopy(value))
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def clear_principal_cache() -> None:
+    with _lock:
+        _cache.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_permission_changes(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, PERMISSION_MODELS):
+            session.info["permissions_changed"] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_permission_changes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, PERMISSION_MODELS):
+        orm_execute_state.session.info["permissions_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_permission_commit(session: Session) -> None:
+    if session.info.pop("permissions_changed", False):
+        bump_permission_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_permission_flag(session: Session) -> None:
+    session.info.pop("permissions_changed", None)
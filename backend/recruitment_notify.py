@@ -0,0 +1,230 @@
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from email_templates import build_recruitment_review_email
+from emailer import SMTPBatch, SMTPUnavailable
+from models import RecruitmentNotifyJob, RecruitmentNotifyRecipient
+
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+# Finished jobs stay queryable until this many newer jobs exist.
+RECRUITMENT_NOTIFY_JOB_HISTORY = _int_env("RECRUITMENT_NOTIFY_JOB_HISTORY", 20)
+# A live job whose worker has not reported progress for this long is treated as dead (e.g. a restart).
+RECRUITMENT_NOTIFY_STALE_SECONDS = _int_env("RECRUITMENT_NOTIFY_STALE_SECONDS", 900)
+
+ACTIVE_SLOT = "recruitment"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _snapshot(db: Session, job: RecruitmentNotifyJob) -> dict:
+    recipients = (
+        db.query(RecruitmentNotifyRecipient)
+        .filter(RecruitmentNotifyRecipient.job_id == job.id)
+        .order_by(RecruitmentNotifyRecipient.id.asc())
+        .all()
+    )
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "requested_by": job.requested_by,
+        "created_at": _iso(job.created_at),
+        "started_at": _iso(job.started_at),
+        "finished_at": _iso(job.finished_at),
+        "total": job.total,
+        "sent": job.sent,
+        "failed": job.failed,
+        "skipped": job.skipped,
+        "processed": job.sent + job.failed + job.skipped,
+        "error": job.error,
+        "recipients": [
+            {"user_id": item.user_id, "email": item.email, "status": item.status, "error": item.error}
+            for item in recipients
+        ],
+    }
+
+
+def _release_stale_job(db: Session) -> None:
+    cutoff = _now() - timedelta(seconds=RECRUITMENT_NOTIFY_STALE_SECONDS)
+    released = db.execute(
+        update(RecruitmentNotifyJob)
+        .where(RecruitmentNotifyJob.active_slot == ACTIVE_SLOT, RecruitmentNotifyJob.heartbeat_at < cutoff)
+        .values(status="failed", active_slot=None, error="Abandoned by its worker", finished_at=_now())
+    ).rowcount
+    if released:
+        db.commit()
+
+
+def _prune_history(db: Session) -> None:
+    keep_ids = [
+        job_id
+        for (job_id,) in db.query(RecruitmentNotifyJob.id)
+        .order_by(RecruitmentNotifyJob.created_at.desc(), RecruitmentNotifyJob.id.desc())
+        .limit(RECRUITMENT_NOTIFY_JOB_HISTORY)
+    ]
+    old_ids = [
+        job_id
+        for (job_id,) in db.query(RecruitmentNotifyJob.id).filter(
+            RecruitmentNotifyJob.active_slot.is_(None), RecruitmentNotifyJob.id.notin_(keep_ids)
+        )
+    ]
+    if old_ids:
+        db.query(RecruitmentNotifyRecipient).filter(RecruitmentNotifyRecipient.job_id.in_(old_ids)).delete(synchronize_session=False)
+        db.query(RecruitmentNotifyJob).filter(RecruitmentNotifyJob.id.in_(old_ids)).delete(synchronize_session=False)
+
+
+def create_notify_job(db: Session, recipients: Iterable[dict], *, requested_by: Optional[int] = None) -> Optional[dict]:
+    """Store a queued job for ``recipients`` (dicts with user_id, email, name) and return its snapshot.
+
+    Returns None when another job is already queued or running on any worker; the
+    ``active_slot`` unique constraint makes that check race-free. Commits.
+    """
+    _release_stale_job(db)
+    now = _now()
+    job = RecruitmentNotifyJob(
+        id=uuid.uuid4().hex,
+        status="queued",
+        active_slot=ACTIVE_SLOT,
+        requested_by=requested_by,
+        total=0,
+        sent=0,
+        failed=0,
+        skipped=0,
+        created_at=now,
+        heartbeat_at=now,
+    )
+    rows = [
+        RecruitmentNotifyRecipient(
+            job_id=job.id,
+            user_id=item.get("user_id"),
+            email=item.get("email"),
+            name=item.get("name"),
+            status="pending",
+        )
+        for item in recipients
+    ]
+    job.total = len(rows)
+    db.add(job)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        return None
+    db.add_all(rows)
+    _prune_history(db)
+    db.commit()
+    return _snapshot(db, job)
+
+
+def get_notify_job(db: Session, job_id: str) -> Optional[dict]:
+    job = db.get(RecruitmentNotifyJob, job_id)
+    if job is None:
+        return None
+    db.refresh(job)
+    return _snapshot(db, job)
+
+
+def active_notify_job(db: Session) -> Optional[dict]:
+    """Snapshot of the queued or running job, whichever worker accepted it."""
+    _release_stale_job(db)
+    job = db.query(RecruitmentNotifyJob).filter(RecruitmentNotifyJob.active_slot == ACTIVE_SLOT).first()
+    return _snapshot(db, job) if job else None
+
+
+def _finish_recipient(db: Session, job_id: str, recipient: RecruitmentNotifyRecipient, recipient_status: str, error: Optional[str] = None) -> None:
+    recipient.status = recipient_status
+    recipient.error = error
+    counter = getattr(RecruitmentNotifyJob, recipient_status)
+    db.execute(
+        update(RecruitmentNotifyJob)
+        .where(RecruitmentNotifyJob.id == job_id)
+        .values({counter: counter + 1, RecruitmentNotifyJob.heartbeat_at: _now()})
+    )
+    db.commit()
+
+
+def _finish_job(db: Session, job_id: str, job_status: str, error: Optional[str] = None) -> None:
+    db.execute(
+        update(RecruitmentNotifyJob)
+        .where(RecruitmentNotifyJob.id == job_id)
+        .values(status=job_status, error=error, active_slot=None, finished_at=_now(), heartbeat_at=_now())
+    )
+    db.commit()
+
+
+def run_notify_job(db: Session, job_id: str, recruit_url: str, batch_factory=SMTPBatch) -> Optional[dict]:
+    """Send the job's mails and return its final snapshot (None when it was not queued).
+
+    Progress is committed per recipient so any worker can report it.
+    """
+    claimed = db.execute(
+        update(RecruitmentNotifyJob)
+        .where(RecruitmentNotifyJob.id == job_id, RecruitmentNotifyJob.status == "queued")
+        .values(status="running", started_at=_now(), heartbeat_at=_now())
+    ).rowcount
+    db.commit()
+    if not claimed:
+        return None
+    recipients = (
+        db.query(RecruitmentNotifyRecipient)
+        .filter(RecruitmentNotifyRecipient.job_id == job_id, RecruitmentNotifyRecipient.status == "pending")
+        .order_by(RecruitmentNotifyRecipient.id.asc())
+        .all()
+    )
+    try:
+        with batch_factory() as batch:
+            for recipient in recipients:
+                if not recipient.email:
+                    _finish_recipient(db, job_id, recipient, "skipped", "No email address")
+                    continue
+                subject, html, text = build_recruitment_review_email(name=recipient.name, whatsapp_url=recruit_url)
+                try:
+                    batch.send(recipient.email, subject, html, text)
+                except SMTPUnavailable:
+                    # No server left: stop here and leave the rest pending rather than failing each one.
+                    raise
+                except Exception as exc:
+                    _finish_recipient(db, job_id, recipient, "failed", str(exc)[:300])
+                    continue
+                _finish_recipient(db, job_id, recipient, "sent")
+    except Exception as exc:
+        logger.exception("Recruitment notify job %s aborted", job_id)
+        db.rollback()
+        _finish_job(db, job_id, "failed", str(exc)[:300])
+        return get_notify_job(db, job_id)
+    _finish_job(db, job_id, "completed")
+    job = get_notify_job(db, job_id)
+    logger.info(
+        "Recruitment notify job %s: %s sent, %s failed, %s skipped of %s",
+        job_id,
+        job["sent"],
+        job["failed"],
+        job["skipped"],
+        job["total"],
+    )
+    return job
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from typing import Dict, Iterable, Optional
 
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
 from models import PdaResume, PdaUser
@@ -34,6 +35,27 @@ def clear_legacy_recruitment_json(user: PdaUser) -> None:
         user.json_content = payload
 
 
+def _json_is_true(dialect_name: str, payload, key: str):
+    # Only a JSON ``true`` counts, as in ``_build_recruitment_state``. Legacy strings such as "true"
+    # or "1" must not match, and nothing is cast, so one odd value cannot fail the whole listing.
+    if dialect_name == "sqlite":
+        return func.coalesce(func.json_type(payload, f"$.{key}"), "") == "true"
+    return and_(
+        func.coalesce(func.json_typeof(payload[key]), "") == "boolean",
+        func.coalesce(payload[key].as_string(), "") == "true",
+    )
+
+
+def recruitment_applied_filter(db: Session):
+    """SQL form of the ``is_applied`` rule in ``_build_recruitment_state``; never NULL, so it negates cleanly."""
+    payload = PdaUser.json_content
+    return or_(
+        _json_is_true(db.get_bind().dialect.name, payload, "is_applied"),
+        func.coalesce(func.trim(payload["preferred_team_1"].as_string()), "") != "",
+        func.coalesce(func.trim(payload["preferred_team"].as_string()), "") != "",
+    )
+
+
 def get_recruitment_resume(db: Session, user_id: int) -> Optional[PdaResume]:
     return db.query(PdaResume).filter(PdaResume.user_id == user_id).first()
 
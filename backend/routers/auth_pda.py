@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from time_utils import ensure_timezone, now_tz
@@ -29,7 +30,8 @@ from schemas import (
     PdaForgotPasswordRequest,
     ResetPasswordRequest
 )
-from auth import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
+from auth import create_access_token, create_refresh_token, decode_token
+from password_hashing import hash_password_async, password_needs_rehash, verify_password_async
 from security import require_pda_user
 from utils import _upload_to_s3, _generate_presigned_put_url
 from email_workflows import issue_verification, verify_email_token, issue_password_reset, reset_password_with_token
@@ -120,8 +122,7 @@ def _issue_inline_password_reset(db: Session, user: PdaUser) -> str:
     return token
 
 
-@router.post("/auth/register")
-def pda_register(user_data: PdaUserRegister, db: Session = Depends(get_db)):
+def _check_registration_available(db: Session, user_data: PdaUserRegister) -> Optional[str]:
     existing = db.query(PdaUser).filter(
         (PdaUser.regno == user_data.regno) | (PdaUser.email == user_data.email)
     ).first()
@@ -142,11 +143,19 @@ def pda_register(user_data: PdaUserRegister, db: Session = Depends(get_db)):
         ).first()
         if community_conflict:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profile name reserved by community")
+    return desired_profile_name
+
 
+def _create_registered_user(
+    db: Session,
+    user_data: PdaUserRegister,
+    desired_profile_name: Optional[str],
+    hashed_password: str,
+):
     new_user = PdaUser(
         regno=user_data.regno,
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=hashed_password,
         name=user_data.name,
         profile_name=desired_profile_name or generate_unique_profile_name(db, user_data.name),
         dob=user_data.dob,
@@ -181,6 +190,14 @@ def pda_register(user_data: PdaUserRegister, db: Session = Depends(get_db)):
     )
 
 
+# The password routes are async so bcrypt is awaited on the hashing pool; DB work still runs on the threadpool.
+@router.post("/auth/register")
+async def pda_register(user_data: PdaUserRegister, db: Session = Depends(get_db)):
+    desired_profile_name = await run_in_threadpool(_check_registration_available, db, user_data)
+    hashed_password = await hash_password_async(user_data.password)
+    return await run_in_threadpool(_create_registered_user, db, user_data, desired_profile_name, hashed_password)
+
+
 @router.post("/pda/recruitment/apply", response_model=PdaUserResponse)
 def apply_for_pda_recruitment(
     payload: PdaRecruitmentApplyRequest,
@@ -236,9 +253,7 @@ def update_pda_recruitment_resume(
     return _build_pda_user_response(db, user)
 
 
-@router.post("/auth/login", response_model=PdaTokenResponse)
-def pda_login(login_data: PdaUserLogin, db: Session = Depends(get_db)):
-    identifier = str(login_data.regno or "").strip()
+def _find_login_user(db: Session, identifier: str) -> Optional[PdaUser]:
     user = db.query(PdaUser).filter(PdaUser.regno == identifier).first()
     if not user:
         normalized_identifier = identifier.lower()
@@ -248,14 +263,16 @@ def pda_login(login_data: PdaUserLogin, db: Session = Depends(get_db)):
             .filter(func.lower(PdaUser.profile_name) == normalized_identifier)
             .first()
         )
-    if not user or not verify_password(login_data.password, user.hashed_password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    if os.environ.get("EMAIL_VERIFY_REQUIRED", "false").lower() == "true" and not user.email_verified:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Email not verified")
+    return user
+
+
+def _complete_pda_login(db: Session, user: PdaUser, reset_required: bool, new_hash: Optional[str]):
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
 
     access_token = create_access_token({"sub": user.regno, "user_type": "pda"})
     refresh_token = create_refresh_token({"sub": user.regno, "user_type": "pda"})
-    reset_required = verify_password("password", user.hashed_password)
     reset_token = _issue_inline_password_reset(db, user) if reset_required else None
     return PdaTokenResponse(
         access_token=access_token,
@@ -266,6 +283,22 @@ def pda_login(login_data: PdaUserLogin, db: Session = Depends(get_db)):
     )
 
 
+@router.post("/auth/login", response_model=PdaTokenResponse)
+async def pda_login(login_data: PdaUserLogin, db: Session = Depends(get_db)):
+    identifier = str(login_data.regno or "").strip()
+    user = await run_in_threadpool(_find_login_user, db, identifier)
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if os.environ.get("EMAIL_VERIFY_REQUIRED", "false").lower() == "true" and not user.email_verified:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Email not verified")
+    new_hash = None
+    if password_needs_rehash(user.hashed_password):
+        new_hash = await hash_password_async(login_data.password)
+    # The submitted password just matched, so no second bcrypt is needed to detect the default one.
+    reset_required = login_data.password == "password"
+    return await run_in_threadpool(_complete_pda_login, db, user, reset_required, new_hash)
+
+
 @router.post("/auth/refresh", response_model=PdaTokenResponse)
 def pda_refresh(request: RefreshTokenRequest, db: Session = Depends(get_db)):
     payload = decode_token(request.refresh_token)
@@ -396,31 +429,36 @@ def forgot_pda_password(payload: PdaForgotPasswordRequest, db: Session = Depends
     return {"status": "ok"}
 
 
+def _store_password_hash(db: Session, user: PdaUser, hashed_password: str) -> None:
+    user.hashed_password = hashed_password
+    db.commit()
+
+
 @router.post("/auth/password/reset")
-def reset_pda_password(payload: ResetPasswordRequest, db: Session = Depends(get_db)):
+async def reset_pda_password(payload: ResetPasswordRequest, db: Session = Depends(get_db)):
     if payload.new_password != payload.confirm_password:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New password and confirm password do not match")
-    user = reset_password_with_token(db, PdaUser, payload.token)
+    user = await run_in_threadpool(reset_password_with_token, db, PdaUser, payload.token)
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired token")
-    user.hashed_password = get_password_hash(payload.new_password)
-    db.commit()
+    hashed_password = await hash_password_async(payload.new_password)
+    await run_in_threadpool(_store_password_hash, db, user, hashed_password)
     return {"status": "ok"}
 
 
 @router.post("/me/change-password", response_model=PdaPasswordChangeResponse)
-def change_pda_password(
+async def change_pda_password(
     payload: PdaPasswordChangeRequest,
     user: PdaUser = Depends(require_pda_user),
     db: Session = Depends(get_db)
 ):
-    if not verify_password(payload.old_password, user.hashed_password):
+    if not await verify_password_async(payload.old_password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Old password is incorrect")
     if payload.new_password != payload.confirm_password:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New password and confirm password do not match")
 
-    user.hashed_password = get_password_hash(payload.new_password)
-    db.commit()
+    hashed_password = await hash_password_async(payload.new_password)
+    await run_in_threadpool(_store_password_hash, db, user, hashed_password)
     return PdaPasswordChangeResponse(status="ok")
 
 
@@ -1,16 +1,14 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Request, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Request, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
 from typing import Dict, List, Optional, Tuple
-import os
 import io
 import csv
-from io import BytesIO
-from pathlib import Path
 from fastapi.responses import StreamingResponse
 from openpyxl import Workbook
 
+from admin_listing import count_rows, decode_cursor, next_cursor_for, search_filter, set_page_headers
 from database import get_db, SessionLocal
 from badge_service import delete_badges_for_pda_teams, delete_badges_for_user
 from models import (
@@ -52,26 +50,19 @@ from security import require_pda_home_admin, require_superadmin
 from utils import (
     S3_BUCKET_NAME,
     S3_CLIENT,
-    _build_s3_url,
     _extract_s3_key_from_url,
     _generate_presigned_put_url,
     _upload_to_s3,
     log_admin_action,
 )
 from auth import get_password_hash
-from recruitment_state import get_recruitment_state, get_recruitment_state_map
+from recruitment_state import get_recruitment_state, get_recruitment_state_map, recruitment_applied_filter
+from pdf_preview_service import generate_pdf_previews
 from persohub_service import is_profile_name_valid, generate_unique_profile_name
 from identifier_rules import ensure_no_identifier_collision
 
-try:
-    import pypdfium2 as pdfium
-except Exception:  # pragma: no cover
-    pdfium = None
-
 router = APIRouter()
 
-PDF_PREVIEW_MAX_PAGES = 20
-PDF_PREVIEW_RENDER_SCALE = 1.5
 DEFAULT_COLLEGE = "MIT"
 ADMIN_LIST_MAX_PAGE_SIZE = 100
 
@@ -81,53 +72,6 @@ def _normalize_college(value: Optional[str]) -> str:
     return normalized or DEFAULT_COLLEGE
 
 
-def _render_pdf_preview_images(pdf_bytes: bytes, max_pages: int) -> List[bytes]:
-    if not pdfium:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="PDF preview dependency missing (install pypdfium2)",
-        )
-    try:
-        doc = pdfium.PdfDocument(pdf_bytes)
-    except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid PDF file") from exc
-
-    page_count = len(doc)
-    target_pages = min(max_pages, PDF_PREVIEW_MAX_PAGES, page_count)
-    images: List[bytes] = []
-
-    for idx in range(target_pages):
-        page = doc[idx]
-        bitmap = None
-        pil_image = None
-        output = BytesIO()
-        try:
-            bitmap = page.render(scale=PDF_PREVIEW_RENDER_SCALE)
-            pil_image = bitmap.to_pil()
-            pil_image.save(output, format="WEBP", quality=84, method=6)
-            images.append(output.getvalue())
-        finally:
-            output.close()
-            if pil_image is not None:
-                try:
-                    pil_image.close()
-                except Exception:
-                    pass
-            if bitmap is not None and hasattr(bitmap, "close"):
-                try:
-                    bitmap.close()
-                except Exception:
-                    pass
-            if hasattr(page, "close"):
-                try:
-                    page.close()
-                except Exception:
-                    pass
-
-    if hasattr(doc, "close"):
-        doc.close()
-    return images
-
 def _build_team_response(member: PdaTeam, user: Optional[PdaUser], resume_url: Optional[str] = None) -> PdaTeamResponse:
     return PdaTeamResponse(
         id=member.id,
@@ -525,6 +469,12 @@ def list_team_members(
 def list_pda_users(
     page: Optional[int] = Query(default=None, ge=1),
     page_size: Optional[int] = Query(default=None, ge=1),
+    cursor: Optional[str] = None,
+    search: Optional[str] = None,
+    is_member: Optional[bool] = None,
+    applied: Optional[bool] = None,
+    exact_count: bool = False,
+    response: Response = None,
     admin: PdaUser = Depends(require_pda_home_admin),
     db: Session = Depends(get_db),
 ):
@@ -533,11 +483,32 @@ def list_pda_users(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"page_size must be <= {ADMIN_LIST_MAX_PAGE_SIZE}",
         )
-    users_query = db.query(PdaUser).order_by(PdaUser.name.asc().nullslast(), PdaUser.regno.asc())
-    if page_size is not None:
-        current_page = page or 1
-        users_query = users_query.offset((current_page - 1) * page_size).limit(page_size)
+    users_query = db.query(PdaUser)
+    matches = search_filter(search, PdaUser.name, PdaUser.regno, PdaUser.profile_name)
+    if matches is not None:
+        users_query = users_query.filter(matches)
+    if is_member is not None:
+        users_query = users_query.filter(PdaUser.is_member == is_member)
+    if applied is not None:
+        applied_clause = recruitment_applied_filter(db)
+        users_query = users_query.filter(applied_clause if applied else ~applied_clause)
+    paged = page_size is not None or cursor is not None
+    if paged:
+        page_size = page_size or ADMIN_LIST_MAX_PAGE_SIZE
+        total, estimated = count_rows(db, users_query, exact=exact_count)
+        set_page_headers(response, total=total, estimated=estimated, page_size=page_size)
+    # name is NOT NULL and regno unique, so (name, regno) is a total order usable as a keyset.
+    users_query = users_query.order_by(PdaUser.name.asc(), PdaUser.regno.asc())
+    if cursor is not None:
+        users_query = users_query.filter(tuple_(PdaUser.name, PdaUser.regno) > tuple_(*decode_cursor(cursor, 2)))
+        users_query = users_query.limit(page_size)
+    elif paged:
+        users_query = users_query.offset(((page or 1) - 1) * page_size).limit(page_size)
     users = users_query.all()
+    if paged:
+        set_page_headers(response, next_cursor=next_cursor_for(users, page_size, lambda user: (user.name, user.regno)))
+        if cursor is None and response is not None:
+            response.headers["X-Page"] = str(page or 1)
     user_ids = [user.id for user in users]
     team_rows = (
         db.query(PdaTeam)
@@ -1268,33 +1239,7 @@ def generate_pda_pdf_preview_images(
     if not source_key.lower().endswith(".pdf"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only PDF files are supported")
 
-    try:
-        source_obj = S3_CLIENT.get_object(Bucket=S3_BUCKET_NAME, Key=source_key)
-        pdf_bytes = source_obj["Body"].read()
-    except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to read source PDF") from exc
-
-    preview_bytes = _render_pdf_preview_images(pdf_bytes, max_pages=payload.max_pages)
-    if not preview_bytes:
-        return PdaPdfPreviewGenerateResponse(preview_image_urls=[], pages_generated=0)
-
-    source_stem = Path(source_key).stem
-    run_token = os.urandom(6).hex()
-    preview_urls: List[str] = []
-    for idx, image_bytes in enumerate(preview_bytes, start=1):
-        preview_key = f"posters/previews/{source_stem}-{run_token}/page_{idx:03d}.webp"
-        try:
-            S3_CLIENT.put_object(
-                Bucket=S3_BUCKET_NAME,
-                Key=preview_key,
-                Body=image_bytes,
-                ContentType="image/webp",
-                CacheControl="public, max-age=31536000, immutable",
-            )
-        except Exception as exc:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to upload preview image") from exc
-        preview_urls.append(_build_s3_url(preview_key))
-
+    preview_urls = generate_pdf_previews(source_key, preview_prefix="posters/previews", max_pages=payload.max_pages)
     return PdaPdfPreviewGenerateResponse(
         preview_image_urls=preview_urls,
         pages_generated=len(preview_urls),
@@ -5,8 +5,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response,
 from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from auth import verify_password
+from password_hashing import verify_password_async
 from database import get_db
 from emailer import send_email_async
 from models import (
@@ -59,9 +60,10 @@ from schemas import (
     PresignRequest,
     PresignResponse,
 )
+from search_service import contains_filter
 from security import require_superadmin
 from utils import _generate_presigned_put_url, log_admin_action
-from badge_service import create_badge_assignment, get_or_create_badge
+from badge_service import bulk_create_badge_assignments, create_badge_assignment, find_missing_badge_targets, get_or_create_badge
 
 router = APIRouter()
 
@@ -807,21 +809,16 @@ def bulk_create_cc_badge_assignments(
     badge = db.query(Badge).filter(Badge.id == payload.badge_id).first()
     if not badge:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Badge not found")
-    created_ids: List[int] = []
-    for user_id in payload.user_ids:
-        _validate_cc_badge_assignment_refs(
-            db,
-            user_id=user_id,
-        )
-        row = create_badge_assignment(
-            db,
-            badge_name=badge.badge_name,
-            image_url=badge.image_url,
-            reveal_video_url=badge.reveal_video_url,
-            user_id=int(user_id),
-            meta=payload.meta if isinstance(payload.meta, dict) else {},
-        )
-        created_ids.append(int(row.id))
+    missing_user_ids = find_missing_badge_targets(db, "user", payload.user_ids)
+    if missing_user_ids:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"User {missing_user_ids[0]} not found")
+    created_ids = bulk_create_badge_assignments(
+        db,
+        badge_id=badge.id,
+        target_type="user",
+        target_ids=payload.user_ids,
+        meta=payload.meta if isinstance(payload.meta, dict) else {},
+    )
 
     db.commit()
     log_admin_action(
@@ -1547,14 +1544,14 @@ def list_cc_persohub_event_options(
         .outerjoin(PersohubSympo, PersohubSympo.id == PersohubSympoEvent.sympo_id)
     )
     if q and q.strip():
-        keyword = f"%{q.strip()}%"
         query = query.filter(
-            or_(
-                PersohubEvent.title.ilike(keyword),
-                PersohubEvent.slug.ilike(keyword),
-                PersohubEvent.event_code.ilike(keyword),
-                PersohubCommunity.name.ilike(keyword),
-                PersohubClub.name.ilike(keyword),
+            contains_filter(
+                q.strip(),
+                PersohubEvent.title,
+                PersohubEvent.slug,
+                PersohubEvent.event_code,
+                PersohubCommunity.name,
+                PersohubClub.name,
             )
         )
 
@@ -1779,14 +1776,7 @@ def list_cc_payments(
     return paged_items
 
 
-@router.post("/pda-admin/cc/payments/{payment_id}/confirm", response_model=CcPersohubPaymentReviewListItem)
-def confirm_cc_payment(
-    payment_id: int,
-    payload: CcPersohubPaymentConfirmRequest,
-    admin: PdaUser = Depends(require_superadmin),
-    db: Session = Depends(get_db),
-    request: Request = None,
-):
+def _pending_payment_row(db: Session, payment_id: int):
     row = (
         db.query(PersohubPayment, PersohubEvent, PdaUser, PersohubClub)
         .join(PersohubEvent, PersohubEvent.id == PersohubPayment.event_id)
@@ -1797,14 +1787,15 @@ def confirm_cc_payment(
     )
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment not found")
-    payment, event, participant, club = row
+    payment = row[0]
     current_status = _payment_status(payment)
     if current_status != "pending":
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Payment is already {current_status}")
+    return row
 
-    if not admin.hashed_password or not verify_password(payload.password, admin.hashed_password):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password")
 
+def _approve_cc_payment(db: Session, admin: PdaUser, row, request: Optional[Request]):
+    payment, event, participant, club = row
     content = _payment_content_dict(payment)
     content["status"] = "approved"
     content["review"] = {
@@ -1827,11 +1818,25 @@ def confirm_cc_payment(
         "Confirm Persohub payment",
         request.method if request else None,
         request.url.path if request else None,
-        {"payment_id": payment_id, "event_id": event.id},
+        {"payment_id": payment.id, "event_id": event.id},
     )
     return _build_payment_list_item(payment, event, participant, club)
 
 
+@router.post("/pda-admin/cc/payments/{payment_id}/confirm", response_model=CcPersohubPaymentReviewListItem)
+async def confirm_cc_payment(
+    payment_id: int,
+    payload: CcPersohubPaymentConfirmRequest,
+    admin: PdaUser = Depends(require_superadmin),
+    db: Session = Depends(get_db),
+    request: Request = None,
+):
+    row = await run_in_threadpool(_pending_payment_row, db, payment_id)
+    if not admin.hashed_password or not await verify_password_async(payload.password, admin.hashed_password):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password")
+    return await run_in_threadpool(_approve_cc_payment, db, admin, row, request)
+
+
 @router.post("/pda-admin/cc/payments/{payment_id}/decline", response_model=CcPersohubPaymentReviewListItem)
 def decline_cc_payment(
     payment_id: int,
@@ -1920,14 +1925,7 @@ def list_cc_badge_user_options(
     )
 
     if q and q.strip():
-        keyword = f"%{q.strip()}%"
-        query = query.filter(
-            or_(
-                PdaUser.name.ilike(keyword),
-                PdaUser.regno.ilike(keyword),
-                PdaUser.profile_name.ilike(keyword),
-            )
-        )
+        query = query.filter(contains_filter(q.strip(), PdaUser.name, PdaUser.regno, PdaUser.profile_name))
     if normalized_college == "mit":
         query = query.filter(func.lower(func.trim(func.coalesce(PdaUser.college, ""))) == "mit")
     elif normalized_college == "non_mit":
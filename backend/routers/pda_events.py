@@ -2,14 +2,16 @@ from datetime import datetime, timedelta, timezone
 import os
 import random
 import string
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text, or_
+from sqlalchemy import case, func, or_
 
 from auth import create_access_token
-from database import get_db
+from certificate_service import certificate_download_url, get_event_certificate
+from database import get_async_db, get_db
 from emailer import send_email_async
 from badge_service import count_event_badges, get_user_achievements, delete_badges_for_pda_event_team
 from models import (
@@ -139,6 +141,53 @@ def _resolve_attendance_metrics(
     return int(present_entry_count), bool(present_entry_count > 0)
 
 
+def _entity_event_metrics(
+    db: Session,
+    keys: Set[Tuple[int, int]],
+    *,
+    by_team: bool,
+) -> Dict[Tuple[int, int], Tuple[int, float]]:
+    """Batched ``_resolve_attendance_metrics`` count plus summed total_score for (event_id, entity_id) keys."""
+    if not keys:
+        return {}
+    score_entity = PdaEventScore.team_id if by_team else PdaEventScore.user_id
+    attendance_entity = PdaEventAttendance.team_id if by_team else PdaEventAttendance.user_id
+    event_ids = {event_id for event_id, _ in keys}
+    entity_ids = {entity_id for _, entity_id in keys}
+    score_rows = (
+        db.query(
+            PdaEventScore.event_id,
+            score_entity,
+            func.count(PdaEventScore.id),
+            func.count(func.distinct(case((PdaEventScore.is_present == True, PdaEventScore.round_id)))),  # noqa: E712
+            func.coalesce(func.sum(PdaEventScore.total_score), 0),
+        )
+        .filter(PdaEventScore.event_id.in_(event_ids), score_entity.in_(entity_ids))
+        .group_by(PdaEventScore.event_id, score_entity)
+        .all()
+    )
+    attendance_rows = (
+        db.query(PdaEventAttendance.event_id, attendance_entity, func.count(PdaEventAttendance.id))
+        .filter(
+            PdaEventAttendance.event_id.in_(event_ids),
+            attendance_entity.in_(entity_ids),
+            PdaEventAttendance.is_present == True,  # noqa: E712
+        )
+        .group_by(PdaEventAttendance.event_id, attendance_entity)
+        .all()
+    )
+    present_entries = {(int(event_id), int(entity_id)): int(count) for event_id, entity_id, count in attendance_rows}
+    metrics: Dict[Tuple[int, int], Tuple[int, float]] = {
+        key: (present_entries.get(key, 0), 0.0) for key in keys
+    }
+    for event_id, entity_id, row_count, present_rounds, total_score in score_rows:
+        key = (int(event_id), int(entity_id))
+        if key in metrics and int(row_count) > 0:
+            # Round-level attendance in the score table wins over entry-level attendance rows.
+            metrics[key] = (int(present_rounds or 0), float(total_score or 0.0))
+    return metrics
+
+
 def _build_team_response(db: Session, team: PdaEventTeam) -> PdaManagedTeamResponse:
     members = (
         db.query(PdaEventTeamMember, PdaUser)
@@ -392,8 +441,7 @@ def _send_registration_email(user: PdaUser, event: PdaEvent, details: str) -> No
         pass
 
 
-@router.get("/pda/events/ongoing", response_model=List[PdaManagedEventResponse])
-def list_ongoing_events(db: Session = Depends(get_db)):
+def _ongoing_events_payload(db: Session) -> List[PdaManagedEventResponse]:
     events = (
         db.query(PdaEvent)
         .filter(PdaEvent.status == PdaEventStatus.OPEN, PdaEvent.is_visible == True)  # noqa: E712
@@ -403,12 +451,21 @@ def list_ongoing_events(db: Session = Depends(get_db)):
     return [PdaManagedEventResponse.model_validate(event) for event in events]
 
 
-@router.get("/pda/events/all", response_model=List[PdaManagedEventResponse])
-def list_all_managed_events(db: Session = Depends(get_db)):
+def _all_events_payload(db: Session) -> List[PdaManagedEventResponse]:
     events = db.query(PdaEvent).filter(PdaEvent.is_visible == True).order_by(PdaEvent.created_at.desc()).all()  # noqa: E712
     return [PdaManagedEventResponse.model_validate(event) for event in events]
 
 
+@router.get("/pda/events/ongoing", response_model=List[PdaManagedEventResponse])
+async def list_ongoing_events(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(_ongoing_events_payload)
+
+
+@router.get("/pda/events/all", response_model=List[PdaManagedEventResponse])
+async def list_all_managed_events(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(_all_events_payload)
+
+
 @router.get("/pda/events/{slug}", response_model=PdaManagedEventResponse)
 def get_event(slug: str, db: Session = Depends(get_db)):
     event = _get_event_or_404(db, slug)
@@ -1148,38 +1205,33 @@ def my_events(user: PdaUser = Depends(require_pda_user), db: Session = Depends(g
             db.query(PdaEventRegistration).filter(PdaEventRegistration.team_id.in_(team_ids)).all()
         )
 
-    results: List[PdaManagedMyEvent] = []
+    event_ids = {reg.event_id for reg in registrations}
+    events = {event.id: event for event in db.query(PdaEvent).filter(PdaEvent.id.in_(event_ids)).all()} if event_ids else {}
+    entries: List[Tuple[PdaEvent, PdaEventRegistration]] = []
     seen: set[Tuple[int, Optional[int], Optional[int]]] = set()
     for reg in registrations:
-        event = db.query(PdaEvent).filter(PdaEvent.id == reg.event_id).first()
+        event = events.get(reg.event_id)
         if not event:
             continue
         key = (event.id, reg.user_id, reg.team_id)
         if key in seen:
             continue
         seen.add(key)
+        entries.append((event, reg))
 
-        attendance_count, _ = _resolve_attendance_metrics(
-            db,
-            event.id,
-            user_id=reg.user_id,
-            team_id=reg.team_id,
-        )
+    user_metrics = _entity_event_metrics(
+        db, {(event.id, reg.user_id) for event, reg in entries if reg.user_id}, by_team=False
+    )
+    team_metrics = _entity_event_metrics(
+        db, {(event.id, reg.team_id) for event, reg in entries if not reg.user_id}, by_team=True
+    )
 
-        cumulative_score = 0.0
+    results: List[PdaManagedMyEvent] = []
+    for event, reg in entries:
         if reg.user_id:
-            score_rows = db.execute(
-                text("SELECT COALESCE(SUM(total_score), 0) AS total FROM pda_event_scores WHERE event_id = :event_id AND user_id = :user_id"),
-                {"event_id": event.id, "user_id": reg.user_id},
-            ).fetchone()
+            attendance_count, cumulative_score = user_metrics.get((event.id, reg.user_id), (0, 0.0))
         else:
-            score_rows = db.execute(
-                text("SELECT COALESCE(SUM(total_score), 0) AS total FROM pda_event_scores WHERE event_id = :event_id AND team_id = :team_id"),
-                {"event_id": event.id, "team_id": reg.team_id},
-            ).fetchone()
-        if score_rows:
-            cumulative_score = float(score_rows[0] or 0.0)
-
+            attendance_count, cumulative_score = team_metrics.get((event.id, reg.team_id), (0, 0.0))
         entity_type = PdaManagedEntityTypeEnum.USER if reg.user_id else PdaManagedEntityTypeEnum.TEAM
         entity_id = reg.user_id if reg.user_id else reg.team_id
         results.append(
@@ -1416,12 +1468,20 @@ def get_certificate(
     )
     eligible = bool(event.status == PdaEventStatus.CLOSED and attended)
     text = None
+    generated_at = None
+    download_url = None
     if eligible:
         text = f"This certifies that {user.name} actively participated in {event.title} ({event.event_code})."
+        generated_at = datetime.now(timezone.utc)
+        certificate = get_event_certificate(db, platform="pda", event_id=event.id, user_id=user.id)
+        if certificate:
+            generated_at = certificate.generated_at or generated_at
+            download_url = certificate_download_url(certificate.storage_key)
     return PdaManagedCertificateResponse(
         event_slug=event.slug,
         event_title=event.title,
         eligible=eligible,
         certificate_text=text,
-        generated_at=datetime.now(timezone.utc) if eligible else None,
+        generated_at=generated_at,
+        download_url=download_url,
     )
@@ -4,7 +4,7 @@ from sqlalchemy import or_, func
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone
 
-from database import get_db
+from database import get_read_db
 from models import PdaItem, PdaTeam, PdaGallery, PdaUser
 from schemas import ProgramResponse, EventResponse, PdaTeamResponse, PdaGalleryResponse, PdaBirthdayWishResponse
 
@@ -33,7 +33,7 @@ def _build_team_response(member: PdaTeam, user: Optional[PdaUser]) -> PdaTeamRes
 
 @router.get("/pda/programs", response_model=List[ProgramResponse])
 def get_pda_programs(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(default=200, ge=1, le=500)
 ):
     programs = (
@@ -48,7 +48,7 @@ def get_pda_programs(
 
 @router.get("/pda/events", response_model=List[EventResponse])
 def get_pda_events(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(default=200, ge=1, le=500)
 ):
     events = (
@@ -62,7 +62,7 @@ def get_pda_events(
 
 
 @router.get("/pda/featured-event", response_model=EventResponse)
-def get_featured_event(db: Session = Depends(get_db)):
+def get_featured_event(db: Session = Depends(get_read_db)):
     event = db.query(PdaItem).filter(PdaItem.type == "event", PdaItem.is_featured == True).order_by(PdaItem.updated_at.desc()).first()
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No featured event")
@@ -70,7 +70,7 @@ def get_featured_event(db: Session = Depends(get_db)):
 
 
 @router.get("/pda/team", response_model=List[PdaTeamResponse])
-def get_pda_team(db: Session = Depends(get_db)):
+def get_pda_team(db: Session = Depends(get_read_db)):
     rows = (
         db.query(PdaTeam, PdaUser)
         .join(PdaUser, PdaTeam.user_id == PdaUser.id, isouter=True)
@@ -87,7 +87,7 @@ def get_pda_team(db: Session = Depends(get_db)):
 
 @router.get("/pda/gallery", response_model=List[PdaGalleryResponse])
 def get_pda_gallery(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = Query(default=200, ge=1, le=500)
 ):
     gallery = (
@@ -100,7 +100,7 @@ def get_pda_gallery(
 
 
 @router.get("/pda/birthdays/today", response_model=List[PdaBirthdayWishResponse])
-def get_pda_birthdays_today(db: Session = Depends(get_db)):
+def get_pda_birthdays_today(db: Session = Depends(get_read_db)):
     ist_now = datetime.now(timezone(timedelta(hours=5, minutes=30)))
     month = ist_now.month
     day = ist_now.day
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
-from sqlalchemy import case, func, or_
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
 from badge_service import delete_badges_for_persohub_event, delete_badges_for_persohub_teams
@@ -25,7 +25,6 @@ from models import (
     PersohubClub,
     PersohubCommunity,
     PersohubEvent,
-    PersohubHashtag,
     PersohubEventAttendance,
     PersohubEventInvite,
     PersohubEventLog,
@@ -70,7 +69,15 @@ from security import (
     is_persohub_club_superadmin,
     require_persohub_community,
 )
-from persohub_service import generate_unique_post_slug, infer_attachment_kind, slugify_hashtag
+from persohub_service import (
+    adjust_hashtag_counts,
+    extract_hashtags,
+    generate_unique_post_slug,
+    infer_attachment_kind,
+    slugify_hashtag,
+    sync_post_hashtags,
+)
+from search_service import contains_filter, match_rank
 
 router = APIRouter()
 
@@ -275,40 +282,6 @@ def _parse_event_poster_assets(poster_url: Optional[str]) -> List[dict]:
     return [{"url": raw, "aspect_ratio": None}]
 
 
-def _sync_post_hashtags_only(db: Session, post: PersohubPost) -> None:
-    raw_text = str(post.description or "")
-    hashtag_values = {
-        token.strip().lower()
-        for token in re.findall(r"(?<!\w)#([A-Za-z0-9_-]{1,80})", raw_text)
-        if str(token or "").strip()
-    }
-
-    existing_links = (
-        db.query(PersohubPostHashtag, PersohubHashtag)
-        .join(PersohubHashtag, PersohubPostHashtag.hashtag_id == PersohubHashtag.id)
-        .filter(PersohubPostHashtag.post_id == int(post.id))
-        .all()
-    )
-    existing = {tag.hashtag_text: (link, tag) for link, tag in existing_links}
-
-    for hashtag_text, (link, tag) in existing.items():
-        if hashtag_text in hashtag_values:
-            continue
-        db.delete(link)
-        tag.count = max(0, int(tag.count or 0) - 1)
-
-    for hashtag_text in sorted(hashtag_values):
-        if hashtag_text in existing:
-            continue
-        tag = db.query(PersohubHashtag).filter(PersohubHashtag.hashtag_text == hashtag_text).first()
-        if not tag:
-            tag = PersohubHashtag(hashtag_text=hashtag_text, count=0)
-            db.add(tag)
-            db.flush()
-        tag.count = int(tag.count or 0) + 1
-        db.add(PersohubPostHashtag(post_id=int(post.id), hashtag_id=int(tag.id)))
-
-
 def _build_event_post_description(event: PersohubEvent, sympo_name: Optional[str]) -> str:
     event_tag = slugify_hashtag(event.title) or slugify_hashtag(event.slug)
     sympo_tag = slugify_hashtag(sympo_name) if sympo_name else ""
@@ -373,7 +346,7 @@ def _sync_event_post(db: Session, event: PersohubEvent) -> None:
                 order_no=idx,
             )
         )
-    _sync_post_hashtags_only(db, post)
+    sync_post_hashtags(db, post.id, extract_hashtags(post.description))
     db.query(PersohubPostMention).filter(PersohubPostMention.post_id == int(post.id)).delete(synchronize_session=False)
 
 
@@ -394,11 +367,7 @@ def _delete_event_post(db: Session, event_id: int) -> None:
         .group_by(PersohubPostHashtag.hashtag_id)
         .all()
     )
-    for hashtag_id, used_count in hashtag_usage:
-        tag = db.query(PersohubHashtag).filter(PersohubHashtag.id == int(hashtag_id)).first()
-        if not tag:
-            continue
-        tag.count = max(0, int(tag.count or 0) - int(used_count or 0))
+    adjust_hashtag_counts(db, {int(hashtag_id): -int(used_count or 0) for hashtag_id, used_count in hashtag_usage})
     db.query(PersohubPostMention).filter(PersohubPostMention.post_id.in_(post_ids)).delete(synchronize_session=False)
     db.query(PersohubPostAttachment).filter(PersohubPostAttachment.post_id.in_(post_ids)).delete(synchronize_session=False)
     db.query(PersohubPostHashtag).filter(PersohubPostHashtag.post_id.in_(post_ids)).delete(synchronize_session=False)
@@ -720,13 +689,8 @@ def list_admin_events(
         query = query.filter(PersohubEvent.slug.in_(allowed_slugs))
 
     if q and q.strip():
-        keyword = f"%{q.strip()}%"
         query = query.filter(
-            or_(
-                PersohubEvent.title.ilike(keyword),
-                PersohubEvent.slug.ilike(keyword),
-                PersohubEvent.event_code.ilike(keyword),
-            )
+            contains_filter(q.strip(), PersohubEvent.title, PersohubEvent.slug, PersohubEvent.event_code)
         )
     open_for_key = str(open_for or "").strip().upper()
     if open_for_key:
@@ -1155,18 +1119,8 @@ def list_owner_payment_suggestions(
     if not normalized_query:
         return PersohubAdminPaymentSearchSuggestionResponse(items=[])
 
-    query_lc = normalized_query.lower()
-    contains_term = f"%{query_lc}%"
-    prefix_term = f"{query_lc}%"
-    regno_rank = case(
-        (func.lower(func.coalesce(PdaUser.regno, "")) == query_lc, 0),
-        (func.lower(func.coalesce(PdaUser.regno, "")).like(prefix_term), 1),
-        else_=2,
-    )
-    name_rank = case(
-        (func.lower(func.coalesce(PdaUser.name, "")).like(prefix_term), 0),
-        else_=1,
-    )
+    regno_rank = match_rank(normalized_query, PdaUser.regno)
+    name_rank = match_rank(normalized_query, PdaUser.name)
     rows = (
         db.query(
             PdaUser.id.label("user_id"),
@@ -1180,10 +1134,7 @@ def list_owner_payment_suggestions(
         .join(PersohubEvent, PersohubEvent.id == PersohubPayment.event_id)
         .filter(
             PersohubEvent.club_id == club_id,
-            or_(
-                func.lower(func.coalesce(PdaUser.name, "")).like(contains_term),
-                func.lower(func.coalesce(PdaUser.regno, "")).like(contains_term),
-            ),
+            contains_filter(normalized_query, PdaUser.name, PdaUser.regno),
         )
         .group_by(PdaUser.id, PdaUser.name, PdaUser.regno, regno_rank, name_rank)
         .order_by(regno_rank.asc(), name_rank.asc(), func.max(PersohubPayment.created_at).desc(), PdaUser.id.desc())
@@ -14,7 +14,6 @@ from models import (
     PersohubCommunity,
     PersohubCommunityFollow,
     PersohubEvent,
-    PersohubHashtag,
     PersohubPost,
     PersohubPostAttachment,
     PersohubPostComment,
@@ -35,6 +34,7 @@ from persohub_schemas import (
     PersohubAdminEventResponse,
     PersohubAdminUserOption,
 )
+from persohub_service import adjust_hashtag_counts
 from security import (
     get_persohub_actor_club_id,
     get_persohub_actor_user_id,
@@ -516,11 +516,10 @@ def delete_owner_community(
             .delete(synchronize_session=False)
         )
 
-        for hashtag_id, removed_count in hashtag_usage_rows:
-            tag = db.query(PersohubHashtag).filter(PersohubHashtag.id == int(hashtag_id)).first()
-            if not tag:
-                continue
-            tag.count = max(0, int(tag.count or 0) - int(removed_count or 0))
+        adjust_hashtag_counts(
+            db,
+            {int(hashtag_id): -int(removed_count or 0) for hashtag_id, removed_count in hashtag_usage_rows},
+        )
 
     deleted_counts = {
         "community_id": int(row.id),
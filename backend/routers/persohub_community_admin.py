@@ -1,5 +1,4 @@
 import os
-from io import BytesIO
 from pathlib import Path
 from typing import List
 
@@ -25,6 +24,7 @@ from persohub_schemas import (
     PersohubUploadPresignRequest,
     PersohubUploadPresignResponse,
 )
+from pdf_preview_service import generate_pdf_previews
 from persohub_service import generate_unique_post_slug
 from routers.persohub_shared import (
     build_post_response,
@@ -40,17 +40,10 @@ from utils import (
     _generate_presigned_put_url,
 )
 
-try:
-    import pypdfium2 as pdfium
-except Exception:  # pragma: no cover
-    pdfium = None
-
 router = APIRouter()
 
 MAX_SINGLE_UPLOAD_BYTES = 100 * 1024 * 1024
 PART_SIZE = 10 * 1024 * 1024
-PDF_PREVIEW_MAX_PAGES = 20
-PDF_PREVIEW_RENDER_SCALE = 1.5
 
 
 def _is_global_feed_superadmin(user: PdaUser) -> bool:
@@ -76,53 +69,6 @@ def _validate_content_type(content_type: str) -> None:
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported content type")
 
 
-def _render_pdf_preview_images(pdf_bytes: bytes, max_pages: int) -> List[bytes]:
-    if not pdfium:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="PDF preview dependency missing (install pypdfium2)",
-        )
-    try:
-        doc = pdfium.PdfDocument(pdf_bytes)
-    except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid PDF file") from exc
-
-    page_count = len(doc)
-    target_pages = min(max_pages, PDF_PREVIEW_MAX_PAGES, page_count)
-    images: List[bytes] = []
-
-    for idx in range(target_pages):
-        page = doc[idx]
-        bitmap = None
-        pil_image = None
-        output = BytesIO()
-        try:
-            bitmap = page.render(scale=PDF_PREVIEW_RENDER_SCALE)
-            pil_image = bitmap.to_pil()
-            pil_image.save(output, format="WEBP", quality=84, method=6)
-            images.append(output.getvalue())
-        finally:
-            output.close()
-            if pil_image is not None:
-                try:
-                    pil_image.close()
-                except Exception:
-                    pass
-            if bitmap is not None and hasattr(bitmap, "close"):
-                try:
-                    bitmap.close()
-                except Exception:
-                    pass
-            if hasattr(page, "close"):
-                try:
-                    page.close()
-                except Exception:
-                    pass
-    if hasattr(doc, "close"):
-        doc.close()
-    return images
-
-
 @router.post("/persohub/community/posts", response_model=PersohubPostResponse)
 def create_community_post(
     payload: PersohubPostCreateRequest,
@@ -374,32 +320,11 @@ def generate_pdf_preview_images(
     if not source_key.lower().endswith(".pdf"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only PDF attachments are supported")
 
-    try:
-        source_obj = S3_CLIENT.get_object(Bucket=S3_BUCKET_NAME, Key=source_key)
-        pdf_bytes = source_obj["Body"].read()
-    except Exception as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to read source PDF") from exc
-
-    preview_bytes = _render_pdf_preview_images(pdf_bytes, max_pages=payload.max_pages)
-    if not preview_bytes:
-        return PersohubPdfPreviewGenerateResponse(preview_image_urls=[], pages_generated=0)
-
-    source_stem = Path(source_key).stem
-    preview_urls: List[str] = []
-    for idx, image_bytes in enumerate(preview_bytes, start=1):
-        preview_key = f"persohub/community/{community.profile_id}/previews/{source_stem}/page_{idx:03d}.webp"
-        try:
-            S3_CLIENT.put_object(
-                Bucket=S3_BUCKET_NAME,
-                Key=preview_key,
-                Body=image_bytes,
-                ContentType="image/webp",
-                CacheControl="public, max-age=31536000, immutable",
-            )
-        except Exception as exc:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to upload preview image") from exc
-        preview_urls.append(_build_s3_url(preview_key))
-
+    preview_urls = generate_pdf_previews(
+        source_key,
+        preview_prefix=f"persohub/community/{community.profile_id}/previews",
+        max_pages=payload.max_pages,
+    )
     return PersohubPdfPreviewGenerateResponse(
         preview_image_urls=preview_urls,
         pages_generated=len(preview_urls),
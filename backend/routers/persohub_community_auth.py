@@ -109,10 +109,21 @@ def _build_community_auth_response(
     persohub_events_access_approved: bool,
     persohub_events_access_review_note: Optional[str],
     event_policy: Optional[dict],
+    clubs_by_id: Optional[Dict[int, PersohubClub]] = None,
+    users_by_id: Optional[Dict[int, PdaUser]] = None,
 ) -> PersohubCommunityAuthResponse:
-    club = db.query(PersohubClub).filter(PersohubClub.id == community.club_id).first() if community.club_id else None
-    owner_user = db.query(PdaUser).filter(PdaUser.id == community.admin_id).first() if community.admin_id else None
-    actor_user = db.query(PdaUser).filter(PdaUser.id == actor_user_id).first() if actor_user_id else None
+    """``clubs_by_id``/``users_by_id`` let callers building many rows pass what they already loaded."""
+
+    def _lookup(model, preloaded, ident):
+        if not ident:
+            return None
+        if preloaded is not None and int(ident) in preloaded:
+            return preloaded[int(ident)]
+        return db.get(model, int(ident))
+
+    club = _lookup(PersohubClub, clubs_by_id, community.club_id)
+    owner_user = _lookup(PdaUser, users_by_id, community.admin_id)
+    actor_user = _lookup(PdaUser, users_by_id, actor_user_id)
 
     return PersohubCommunityAuthResponse(
         id=community.id,
@@ -368,42 +379,65 @@ def persohub_session_options(
 ):
     user_id = int(user.id)
     options = _club_options_for_user(db, user_id)
+    if not options:
+        return {"items": []}
+    club_ids = [int(option.club_id) for option in options]
+    full_access_club_ids = [int(option.club_id) for option in options if option.role in {"owner", "superadmin"}]
+
+    # One query per kind for every club, instead of resolving the admin context club by club.
+    memberships_by_club: Dict[int, List[tuple]] = {}
+    memberships = (
+        db.query(PersohubAdmin, PersohubCommunity)
+        .join(PersohubCommunity, PersohubCommunity.id == PersohubAdmin.community_id)
+        .filter(
+            PersohubCommunity.club_id.in_(club_ids),
+            PersohubCommunity.is_active == True,  # noqa: E712
+            PersohubAdmin.user_id == user_id,
+            PersohubAdmin.is_active == True,  # noqa: E712
+        )
+        .order_by(PersohubCommunity.id.asc(), PersohubAdmin.id.asc())
+        .all()
+    )
+    for admin_row, community in memberships:
+        memberships_by_club.setdefault(int(community.club_id), []).append((admin_row, community))
+
+    communities_by_club: Dict[int, List[PersohubCommunity]] = {}
+    if full_access_club_ids:
+        club_communities = (
+            db.query(PersohubCommunity)
+            .filter(
+                PersohubCommunity.club_id.in_(full_access_club_ids),
+                PersohubCommunity.is_active == True,  # noqa: E712
+            )
+            .order_by(PersohubCommunity.id.asc())
+            .all()
+        )
+        for community in club_communities:
+            communities_by_club.setdefault(int(community.club_id), []).append(community)
+
+    clubs_by_id = {int(club.id): club for club in db.query(PersohubClub).filter(PersohubClub.id.in_(club_ids))}
+    user_ids = {int(community.admin_id) for items in communities_by_club.values() for community in items if community.admin_id}
+    user_ids.update(int(community.admin_id) for _admin_row, community in memberships if community.admin_id)
+    user_ids.add(user_id)
+    users_by_id = {int(row.id): row for row in db.query(PdaUser).filter(PdaUser.id.in_(user_ids))}
+
     rows: List[PersohubCommunityAuthResponse] = []
     seen_community_ids: set[int] = set()
 
     for option in options:
         club_id = int(option.club_id)
-        context = _resolve_club_admin_context(db, user_id=user_id, club_id=club_id)
-        is_owner = bool(context["is_owner"])
-        is_club_superadmin = bool(context["is_club_superadmin"])
+        club = clubs_by_id.get(club_id)
+        club_memberships = memberships_by_club.get(club_id, [])
+        is_owner = option.role == "owner"
+        is_club_superadmin = option.role == "superadmin"
         role = "owner" if is_owner else ("superadmin" if is_club_superadmin else "admin")
-        event_policy = context["event_policy"]
-        can_access_events = bool(context["can_access_events"])
+        event_policy = _merge_admin_policy([item[0] for item in club_memberships])
+        can_access_events = bool(is_owner or is_club_superadmin or any(bool(value) for value in event_policy["events"].values()))
 
         if is_owner or is_club_superadmin:
-            communities = (
-                db.query(PersohubCommunity)
-                .filter(
-                    PersohubCommunity.club_id == club_id,
-                    PersohubCommunity.is_active == True,  # noqa: E712
-                )
-                .order_by(PersohubCommunity.id.asc())
-                .all()
-            )
+            communities = communities_by_club.get(club_id, [])
         else:
-            memberships = (
-                db.query(PersohubAdmin, PersohubCommunity)
-                .join(PersohubCommunity, PersohubCommunity.id == PersohubAdmin.community_id)
-                .filter(
-                    PersohubCommunity.club_id == club_id,
-                    PersohubCommunity.is_active == True,  # noqa: E712
-                    PersohubAdmin.user_id == user_id,
-                    PersohubAdmin.is_active == True,  # noqa: E712
-                )
-                .order_by(PersohubCommunity.id.asc(), PersohubAdmin.id.asc())
-                .all()
-            )
-            communities = [item[1] for item in memberships]
+            communities = [item[1] for item in club_memberships]
 
         for community in communities:
             community_id = int(community.id)
@@ -419,10 +453,12 @@ def persohub_session_options(
                     is_owner=is_owner,
                     is_club_superadmin=is_club_superadmin,
                     can_access_events=can_access_events,
-                    persohub_events_access_status=str(context.get("persohub_events_access_status") or "rejected"),
-                    persohub_events_access_approved=bool(context.get("persohub_events_access_approved")),
-                    persohub_events_access_review_note=(str(context.get("persohub_events_access_review_note") or "").strip() or None),
+                    persohub_events_access_status=str(get_persohub_club_events_access_status(club) or "rejected"),
+                    persohub_events_access_approved=bool(is_persohub_club_events_access_approved(club)),
+                    persohub_events_access_review_note=(str(getattr(club, "persohub_events_access_review_note", "") or "").strip() or None),
                     event_policy=event_policy,
+                    clubs_by_id=clubs_by_id,
+                    users_by_id=users_by_id,
                 )
             )
 
@@ -2,15 +2,17 @@ from datetime import date, datetime, timedelta, timezone
 import os
 import random
 import string
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text, or_
+from sqlalchemy import and_, case, func, text, or_
 
 from auth import create_access_token
-from database import get_db
+from certificate_service import certificate_download_url, get_event_certificate
+from database import get_async_db, get_db
 from emailer import send_email_async
 from badge_service import count_event_badges, get_user_achievements, delete_badges_for_persohub_event_team
 from models import (
@@ -98,7 +100,8 @@ def _auto_close_event_if_past_grace(db: Session, event: PersohubEvent) -> bool:
         event.registration_open = False
         changed = True
 
-    if changed:
+    # On a replica session the response reflects the closed state; the primary persists it on next write access.
+    if changed and not db.info.get("read_only"):
         db.commit()
         db.refresh(event)
     return changed
@@ -192,12 +195,20 @@ def _results_entity_lookup(db: Session, event: PersohubEvent) -> Dict[Tuple[str,
     return lookup
 
 
-def _winner_performance_payload(db: Session, event: PersohubEvent, *, entity_type: str, entity_id: int) -> Dict[str, Any]:
+def _winner_performance_payload(
+    db: Session,
+    event: PersohubEvent,
+    *,
+    entity_type: str,
+    entity_id: int,
+    round_rows: Optional[List[PersohubEventRound]] = None,
+) -> Dict[str, Any]:
     raw_payload = build_participant_results_payload(
         db,
         event,
         entity_type=entity_type,
         entity_id=entity_id,
+        round_rows=round_rows,
     )
     wrapped_summary = raw_payload.get("wrapped_summary") if isinstance(raw_payload, dict) else {}
     wrapped_summary = wrapped_summary if isinstance(wrapped_summary, dict) else {}
@@ -274,33 +285,92 @@ def _resolve_attendance_metrics(
     return int(present_entry_count), bool(present_entry_count > 0)
 
 
-def _registration_effective_cumulative_score(
+def _attendance_counts_by_entity(
     db: Session,
-    event: PersohubEvent,
-    registration: PersohubEventRegistration,
-) -> float:
-    query = db.query(PersohubEventScore, PersohubEventRound.round_no).join(
-        PersohubEventRound,
-        PersohubEventRound.id == PersohubEventScore.round_id,
-    ).filter(
-        PersohubEventScore.event_id == event.id,
-        PersohubEventScore.entity_type == registration.entity_type,
+    keys: Set[Tuple[int, int]],
+    *,
+    by_team: bool,
+) -> Dict[Tuple[int, int], int]:
+    """Batched ``_resolve_attendance_metrics`` count for (event_id, entity_id) keys."""
+    if not keys:
+        return {}
+    score_entity = PersohubEventScore.team_id if by_team else PersohubEventScore.user_id
+    attendance_entity = PersohubEventAttendance.team_id if by_team else PersohubEventAttendance.user_id
+    event_ids = {event_id for event_id, _ in keys}
+    entity_ids = {entity_id for _, entity_id in keys}
+    round_rows = (
+        db.query(
+            PersohubEventScore.event_id,
+            score_entity,
+            func.count(PersohubEventScore.id),
+            func.count(func.distinct(case((PersohubEventScore.is_present == True, PersohubEventScore.round_id)))),  # noqa: E712
+        )
+        .filter(PersohubEventScore.event_id.in_(event_ids), score_entity.in_(entity_ids))
+        .group_by(PersohubEventScore.event_id, score_entity)
+        .all()
     )
-    if registration.entity_type == PersohubEventEntityType.USER:
-        query = query.filter(PersohubEventScore.user_id == registration.user_id)
-    else:
-        query = query.filter(PersohubEventScore.team_id == registration.team_id)
+    entry_rows = (
+        db.query(PersohubEventAttendance.event_id, attendance_entity, func.count(PersohubEventAttendance.id))
+        .filter(
+            PersohubEventAttendance.event_id.in_(event_ids),
+            attendance_entity.in_(entity_ids),
+            PersohubEventAttendance.is_present == True,  # noqa: E712
+        )
+        .group_by(PersohubEventAttendance.event_id, attendance_entity)
+        .all()
+    )
+    counts = {(int(event_id), int(entity_id)): int(count) for event_id, entity_id, count in entry_rows}
+    for event_id, entity_id, row_count, present_rounds in round_rows:
+        if int(row_count) > 0:
+            # Round-level attendance in the score table wins over entry-level attendance rows.
+            counts[(int(event_id), int(entity_id))] = int(present_rounds or 0)
+    return {key: counts.get(key, 0) for key in keys}
 
-    cumulative_score = float(getattr(registration, "wildcard_seed_score", 0.0) or 0.0)
-    wildcard_start_round_no = int(getattr(registration, "wildcard_start_round_no", 0) or 0) or None
-    for score_row, round_no in query.all():
-        if wildcard_start_round_no is not None and int(round_no or 0) < wildcard_start_round_no:
-            continue
-        if registration.entity_type == PersohubEventEntityType.USER:
-            cumulative_score += float(score_row.normalized_score or 0.0)
-        else:
-            cumulative_score += float(score_row.total_score or 0.0)
-    return float(cumulative_score)
+
+def _effective_cumulative_scores(
+    db: Session,
+    registrations: List[PersohubEventRegistration],
+) -> Dict[int, float]:
+    """Cumulative score per registration id: normalized scores for users, totals for teams, counted from the
+    wildcard start round and seeded with the wildcard score."""
+    if not registrations:
+        return {}
+    event_ids = {reg.event_id for reg in registrations}
+    user_ids = {reg.user_id for reg in registrations if reg.entity_type == PersohubEventEntityType.USER}
+    team_ids = {reg.team_id for reg in registrations if reg.entity_type != PersohubEventEntityType.USER}
+    rows = (
+        db.query(PersohubEventScore, PersohubEventRound.round_no)
+        .join(PersohubEventRound, PersohubEventRound.id == PersohubEventScore.round_id)
+        .filter(
+            PersohubEventScore.event_id.in_(event_ids),
+            or_(
+                and_(PersohubEventScore.entity_type == PersohubEventEntityType.USER, PersohubEventScore.user_id.in_(user_ids)),
+                and_(PersohubEventScore.entity_type == PersohubEventEntityType.TEAM, PersohubEventScore.team_id.in_(team_ids)),
+            ),
+        )
+        .all()
+    )
+    scores_by_entity: Dict[Tuple[int, Any, Optional[int]], List[Tuple[PersohubEventScore, Optional[int]]]] = {}
+    for score_row, round_no in rows:
+        is_user = score_row.entity_type == PersohubEventEntityType.USER
+        key = (score_row.event_id, score_row.entity_type, score_row.user_id if is_user else score_row.team_id)
+        scores_by_entity.setdefault(key, []).append((score_row, round_no))
+
+    cumulative: Dict[int, float] = {}
+    for registration in registrations:
+        is_user = registration.entity_type == PersohubEventEntityType.USER
+        entity_id = registration.user_id if is_user else registration.team_id
+        cumulative_score = float(getattr(registration, "wildcard_seed_score", 0.0) or 0.0)
+        wildcard_start_round_no = int(getattr(registration, "wildcard_start_round_no", 0) or 0) or None
+        for score_row, round_no in scores_by_entity.get((registration.event_id, registration.entity_type, entity_id), []):
+            if wildcard_start_round_no is not None and int(round_no or 0) < wildcard_start_round_no:
+                continue
+            if is_user:
+                cumulative_score += float(score_row.normalized_score or 0.0)
+            else:
+                cumulative_score += float(score_row.total_score or 0.0)
+        cumulative[registration.id] = float(cumulative_score)
+    return cumulative
 
 
 def _build_team_response(db: Session, team: PersohubEventTeam) -> PersohubManagedTeamResponse:
@@ -752,8 +822,7 @@ def _send_registration_email(user: PdaUser, event: PersohubEvent, details: str)
         pass
 
 
-@router.get("/persohub/persohub-events/ongoing", response_model=List[PersohubManagedEventResponse])
-def list_ongoing_events(db: Session = Depends(get_db)):
+def _ongoing_events_payload(db: Session) -> List[PersohubManagedEventResponse]:
     events = (
         db.query(PersohubEvent)
         .filter(PersohubEvent.status == PersohubEventStatus.OPEN, PersohubEvent.is_visible == True)  # noqa: E712
@@ -770,8 +839,7 @@ def list_ongoing_events(db: Session = Depends(get_db)):
     return payloads
 
 
-@router.get("/persohub/persohub-events/all", response_model=List[PersohubManagedEventResponse])
-def list_all_managed_events(db: Session = Depends(get_db)):
+def _all_events_payload(db: Session) -> List[PersohubManagedEventResponse]:
     events = db.query(PersohubEvent).filter(PersohubEvent.is_visible == True).order_by(PersohubEvent.created_at.desc()).all()  # noqa: E712
     payloads = []
     for event in events:
@@ -781,6 +849,16 @@ def list_all_managed_events(db: Session = Depends(get_db)):
     return payloads
 
 
+@router.get("/persohub/persohub-events/ongoing", response_model=List[PersohubManagedEventResponse])
+async def list_ongoing_events(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(_ongoing_events_payload)
+
+
+@router.get("/persohub/persohub-events/all", response_model=List[PersohubManagedEventResponse])
+async def list_all_managed_events(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(_all_events_payload)
+
+
 @router.get("/persohub/persohub-events/{slug}", response_model=PersohubManagedEventResponse)
 def get_event(slug: str, db: Session = Depends(get_db)):
     event = _get_event_or_404(db, slug)
@@ -1129,8 +1207,7 @@ def delete_my_round_submission(
     return _submission_payload(registration, round_row, entity_type, entity_user_id, entity_team_id, None)
 
 
-@router.get("/persohub/persohub-events/{slug}/results")
-def get_event_results(slug: str, db: Session = Depends(get_db)):
+def _event_results_payload(db: Session, slug: str) -> Dict[str, Any]:
     event = _get_event_or_404(db, slug)
     _ensure_event_visible_for_public_access(event)
     entity_lookup = _results_entity_lookup(db, event)
@@ -1149,6 +1226,30 @@ def get_event_results(slug: str, db: Session = Depends(get_db)):
         .order_by(PersohubEventResultFinalist.sort_order.asc(), PersohubEventResultFinalist.created_at.asc(), PersohubEventResultFinalist.id.asc())
         .all()
     )
+    # Finalists and title winners usually overlap; build each entity's performance once, from
+    # a single load of the event's rounds.
+    performance_by_entity: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    all_round_rows: List[PersohubEventRound] = []
+
+    def _performance(entity_type: str, entity_id: int) -> Dict[str, Any]:
+        key = (entity_type, entity_id)
+        if key not in performance_by_entity:
+            if not all_round_rows:
+                all_round_rows.extend(
+                    db.query(PersohubEventRound)
+                    .filter(PersohubEventRound.event_id == event.id)
+                    .order_by(PersohubEventRound.round_no.asc(), PersohubEventRound.id.asc())
+                    .all()
+                )
+            performance_by_entity[key] = _winner_performance_payload(
+                db,
+                event,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                round_rows=all_round_rows,
+            )
+        return performance_by_entity[key]
+
     finalists_by_entity: Dict[Tuple[str, int], Dict[str, Any]] = {}
     nominees: List[Dict[str, Any]] = []
     for row in finalist_rows:
@@ -1170,12 +1271,7 @@ def get_event_results(slug: str, db: Session = Depends(get_db)):
             "is_wildcard": bool(source.get("is_wildcard")),
             "wildcard_seed_score": float(source.get("wildcard_seed_score") or 0.0) if source.get("wildcard_seed_score") is not None else None,
             "wildcard_start_round_no": int(source.get("wildcard_start_round_no") or 0) or None,
-            "performance": _winner_performance_payload(
-                db,
-                event,
-                entity_type=entity_type,
-                entity_id=entity_id,
-            ),
+            "performance": _performance(entity_type, entity_id),
         }
         nominees.append(payload)
         finalists_by_entity[(entity_type, entity_id)] = payload
@@ -1250,12 +1346,7 @@ def get_event_results(slug: str, db: Session = Depends(get_db)):
                 "is_wildcard": bool(source.get("is_wildcard")),
                 "wildcard_seed_score": float(source.get("wildcard_seed_score") or 0.0) if source.get("wildcard_seed_score") is not None else None,
                 "wildcard_start_round_no": int(source.get("wildcard_start_round_no") or 0) or None,
-                "performance": _winner_performance_payload(
-                    db,
-                    event,
-                    entity_type=entity_type,
-                    entity_id=entity_id,
-                ),
+                "performance": _performance(entity_type, entity_id),
             }
     )
 
@@ -1289,6 +1380,11 @@ def get_event_results(slug: str, db: Session = Depends(get_db)):
     }
 
 
+@router.get("/persohub/persohub-events/{slug}/results")
+async def get_event_results(slug: str, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(_event_results_payload, slug)
+
+
 @router.get("/persohub/persohub-events/{slug}/my-results", response_model=PersohubParticipantResultsResponse)
 def get_my_event_results(
     slug: str,
@@ -1984,10 +2080,16 @@ def my_events(user: PdaUser = Depends(require_pda_user), db: Session = Depends(g
             db.query(PersohubEventRegistration).filter(PersohubEventRegistration.team_id.in_(team_ids)).all()
         )
 
-    results: List[PersohubManagedMyEvent] = []
+    event_ids = {reg.event_id for reg in registrations}
+    events = (
+        {event.id: event for event in db.query(PersohubEvent).filter(PersohubEvent.id.in_(event_ids)).all()}
+        if event_ids
+        else {}
+    )
+    entries: List[Tuple[PersohubEvent, PersohubEventRegistration]] = []
     seen: set[Tuple[int, Optional[int], Optional[int]]] = set()
     for reg in registrations:
-        event = db.query(PersohubEvent).filter(PersohubEvent.id == reg.event_id).first()
+        event = events.get(reg.event_id)
         if not event:
             continue
         _auto_close_event_if_past_grace(db, event)
@@ -1995,16 +2097,22 @@ def my_events(user: PdaUser = Depends(require_pda_user), db: Session = Depends(g
         if key in seen:
             continue
         seen.add(key)
+        entries.append((event, reg))
 
-        attendance_count, _ = _resolve_attendance_metrics(
-            db,
-            event.id,
-            user_id=reg.user_id,
-            team_id=reg.team_id,
-        )
-
-        cumulative_score = _registration_effective_cumulative_score(db, event, reg)
+    user_attendance = _attendance_counts_by_entity(
+        db, {(event.id, reg.user_id) for event, reg in entries if reg.user_id is not None}, by_team=False
+    )
+    team_attendance = _attendance_counts_by_entity(
+        db, {(event.id, reg.team_id) for event, reg in entries if reg.user_id is None}, by_team=True
+    )
+    cumulative_scores = _effective_cumulative_scores(db, [reg for _, reg in entries])
 
+    results: List[PersohubManagedMyEvent] = []
+    for event, reg in entries:
+        if reg.user_id is not None:
+            attendance_count = user_attendance.get((event.id, reg.user_id), 0)
+        else:
+            attendance_count = team_attendance.get((event.id, reg.team_id), 0)
         entity_type = PersohubManagedEntityTypeEnum.USER if reg.user_id else PersohubManagedEntityTypeEnum.TEAM
         entity_id = reg.user_id if reg.user_id else reg.team_id
         results.append(
@@ -2014,7 +2122,7 @@ def my_events(user: PdaUser = Depends(require_pda_user), db: Session = Depends(g
                 entity_id=entity_id,
                 is_registered=True,
                 attendance_count=int(attendance_count),
-                cumulative_score=float(cumulative_score),
+                cumulative_score=float(cumulative_scores.get(reg.id, 0.0)),
             )
         )
     return results
@@ -2257,12 +2365,20 @@ def get_certificate(
     reg_status = str(registration.status.value if hasattr(registration.status, "value") else registration.status or "").strip().lower()
     eligible = bool(event.status == PersohubEventStatus.CLOSED and attended and reg_status == "active")
     text = None
+    generated_at = None
+    download_url = None
     if eligible:
         text = f"This certifies that {user.name} actively participated in {event.title} ({event.event_code})."
+        generated_at = datetime.now(timezone.utc)
+        certificate = get_event_certificate(db, platform="persohub", event_id=event.id, user_id=user.id)
+        if certificate:
+            generated_at = certificate.generated_at or generated_at
+            download_url = certificate_download_url(certificate.storage_key)
     return PersohubManagedCertificateResponse(
         event_slug=event.slug,
         event_title=event.title,
         eligible=eligible,
         certificate_text=text,
-        generated_at=datetime.now(timezone.utc) if eligible else None,
+        generated_at=generated_at,
+        download_url=download_url,
     )
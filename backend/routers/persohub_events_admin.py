@@ -1,6 +1,5 @@
 import csv
 import io
-import math
 import mimetypes
 import os
 import re
@@ -18,20 +17,24 @@ from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
 from fastapi.responses import StreamingResponse
-from openpyxl import Workbook, load_workbook
-from sqlalchemy import func, text
-from sqlalchemy.orm import Session
+from openpyxl import Workbook
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.orm import Session, defer
 
-from auth import decode_token
 from badge_service import (
+    bulk_create_badge_assignments,
     count_event_badges,
-    create_badge_assignment,
     delete_badges_for_persohub_event,
     delete_badges_for_persohub_event_team,
     delete_badges_for_persohub_event_user,
     delete_badges_for_persohub_teams,
+    find_badge_assignment,
+    find_missing_badge_targets,
+    find_unregistered_badge_targets,
+    get_or_create_badge,
     list_event_badges,
 )
+from certificate_service import plan_certificate_jobs, run_certificate_batch
 from database import get_db, SessionLocal
 from models import (
     PdaAdmin,
@@ -70,7 +73,11 @@ from models import (
 )
 from schemas import (
     PersohubManagedAttendanceMarkRequest,
+    PersohubManagedAttendanceScanBulkRequest,
+    PersohubManagedAttendanceScanBulkResponse,
     PersohubManagedAttendanceScanRequest,
+    PersohubManagedBadgeBulkCreate,
+    PersohubManagedBadgeBulkCreateResponse,
     PersohubManagedBadgeCreate,
     PersohubManagedBadgeResponse,
     PresignRequest,
@@ -122,9 +129,20 @@ from schemas import (
     PersohubRoundPanelMemberResponse,
     PersohubRoundPanelAdminOption,
 )
+from attendance_scan import decode_attendance_qr, mark_scan_batch, recent_scans, scan_dedupe_key, upsert_attendance_marks
 from emailer import send_bulk_email, send_email_async
+from live_events import (
+    attendance_mark_groups,
+    create_live_stream_ticket,
+    live_event_stream,
+    publish_live_event,
+    score_delta_rows,
+    subscribe_live,
+    verify_live_stream_ticket,
+)
 from email_bulk import render_email_template, derive_text_from_html, extract_batch
 from persohub_result_analysis import build_event_results_snapshot, build_round_results_snapshot
+from score_service import bulk_upsert_scores, read_score_import, recompute_normalized_scores, score_import_response
 from security import (
     get_persohub_admin_context,
     require_persohub_event_admin,
@@ -347,27 +365,10 @@ def _round_admin_panel_scope(
             ).all()
             if row.panel_id is not None
         }
-    allowed_entities: Optional[Set[Tuple[str, int]]] = None
-    if panel_mode_enabled and not is_superadmin:
-        assignments = db.query(PersohubEventRoundPanelAssignment).filter(
-            PersohubEventRoundPanelAssignment.event_id == round_row.event_id,
-            PersohubEventRoundPanelAssignment.round_id == round_row.id,
-        )
-        if panel_ids:
-            assignments = assignments.filter(PersohubEventRoundPanelAssignment.panel_id.in_(panel_ids))
-        else:
-            assignments = assignments.filter(text("1=0"))
-        allowed_entities = set()
-        for assignment in assignments.all():
-            if assignment.entity_type == PersohubEventEntityType.USER and assignment.user_id is not None:
-                allowed_entities.add(_panel_entity_key("user", int(assignment.user_id)))
-            elif assignment.entity_type == PersohubEventEntityType.TEAM and assignment.team_id is not None:
-                allowed_entities.add(_panel_entity_key("team", int(assignment.team_id)))
     return {
         "panel_mode_enabled": panel_mode_enabled,
         "is_superadmin": is_superadmin,
         "panel_ids": panel_ids,
-        "allowed_entities": allowed_entities,
     }
 
 
@@ -375,20 +376,6 @@ def _is_entity_editable_by_admin(scope: Dict[str, object], entity_type: str, ent
     return True
 
 
-def _legacy_normalized(total_score: float, max_total: float, is_present: bool) -> float:
-    if not bool(is_present):
-        return 0.0
-    max_total_value = float(max_total or 0.0)
-    if max_total_value <= 0.0:
-        return 0.0
-    normalized = (float(total_score or 0.0) / max_total_value) * 100.0
-    if normalized < 0.0:
-        return 0.0
-    if normalized > 100.0:
-        return 100.0
-    return float(normalized)
-
-
 def _recompute_round_normalized_scores(
     db: Session,
     event: PersohubEvent,
@@ -399,23 +386,7 @@ def _recompute_round_normalized_scores(
     db.flush()
     criteria = _criteria_def(round_row)
     max_total = float(sum(float(item.get("max_marks", 0) or 0.0) for item in criteria) or 0.0)
-    score_rows = (
-        db.query(PersohubEventScore)
-        .filter(
-            PersohubEventScore.event_id == event.id,
-            PersohubEventScore.round_id == round_row.id,
-        )
-        .all()
-    )
-    if not score_rows:
-        return
-
-    for score_row in score_rows:
-        score_row.normalized_score = _legacy_normalized(
-            total_score=float(score_row.total_score or 0.0),
-            max_total=max_total,
-            is_present=bool(score_row.is_present),
-        )
+    recompute_normalized_scores(db, PersohubEventScore, event_id=event.id, round_id=round_row.id, max_total=max_total)
 
 
 def _round_submission_deadline_has_passed(round_row: PersohubEventRound) -> bool:
@@ -478,36 +449,6 @@ def _round_submission_payload_for_admin(
     )
 
 
-SCORE_RATIO_RE = re.compile(r"^\s*([+-]?\d+(?:\.\d+)?)\s*/\s*([+-]?\d+(?:\.\d+)?)\s*$")
-
-
-def _parse_import_score_value(raw_value, max_marks: float) -> float:
-    if raw_value is None:
-        return 0.0
-    if isinstance(raw_value, (int, float)):
-        value = float(raw_value)
-    else:
-        text = str(raw_value).strip()
-        if not text:
-            return 0.0
-        ratio_match = SCORE_RATIO_RE.match(text)
-        if ratio_match:
-            numerator = float(ratio_match.group(1))
-            denominator = float(ratio_match.group(2))
-            if denominator <= 0:
-                raise ValueError("invalid_denominator")
-            value = (numerator / denominator) * float(max_marks)
-        else:
-            value = float(text)
-    if not math.isfinite(value):
-        raise ValueError("invalid_number")
-    return float(value)
-
-
-def _normalize_compare_text(value) -> str:
-    return str(value or "").strip().lower()
-
-
 def _to_event_type(value) -> PersohubEventType:
     return PersohubEventType[value.name] if hasattr(value, "name") else PersohubEventType(value)
 
@@ -995,6 +936,10 @@ def _log_event_admin_action(
     )
 
 
+def _publish_live(event: PersohubEvent, event_type: str, data: Optional[dict] = None, round_id: Optional[int] = None) -> None:
+    publish_live_event("persohub", event.slug, event_type, data, round_id=round_id)
+
+
 def _audit_fragment(value: object, fallback: str = "na") -> str:
     raw = str(value or "").strip().lower()
     cleaned = re.sub(r"[^a-z0-9]+", "-", raw).strip("-")
@@ -1185,6 +1130,67 @@ def _send_bulk_event_email_background(
         db.close()
 
 
+def _wildcard_fields(reg: PersohubEventRegistration) -> Dict[str, Any]:
+    return {
+        "is_wildcard": bool(getattr(reg, "wildcard_start_round_no", None) is not None),
+        "wildcard_seed_score": float(getattr(reg, "wildcard_seed_score", 0.0) or 0.0),
+        "wildcard_start_round_no": int(getattr(reg, "wildcard_start_round_no", 0) or 0) or None,
+    }
+
+
+def _user_entity_payload(reg: PersohubEventRegistration, user: PdaUser) -> Dict[str, Any]:
+    college_value = str(getattr(user, "college", "") or "").strip()
+    is_mit_participant = college_value.lower() == "mit"
+    return {
+        "entity_type": "user",
+        "entity_id": user.id,
+        "participant_id": user.id,
+        "name": user.name,
+        "participant_name": user.name,
+        "regno_or_code": user.regno,
+        "register_number": user.regno,
+        "participant_register_number": user.regno,
+        "email": user.email,
+        "college": college_value or None,
+        "is_mit_participant": bool(is_mit_participant),
+        "department": user.dept,
+        "gender": user.gender,
+        "batch": _batch_from_regno(user.regno),
+        "profile_picture": user.image_url,
+        "status": _registration_status_label(reg.status),
+        "participant_status": _registration_status_label(reg.status),
+        "referral_code": reg.referral_code,
+        "referred_by": reg.referred_by,
+        "referral_count": int(reg.referral_count or 0),
+        **_wildcard_fields(reg),
+    }
+
+
+def _team_entity_payload(reg: PersohubEventRegistration, team: PersohubEventTeam, members_count: int) -> Dict[str, Any]:
+    return {
+        "entity_type": "team",
+        "entity_id": team.id,
+        "name": team.team_name,
+        "regno_or_code": team.team_code,
+        "members_count": int(members_count or 0),
+        "status": _registration_status_label(reg.status),
+        "participant_status": _registration_status_label(reg.status),
+        **_wildcard_fields(reg),
+    }
+
+
+def _team_member_count_map(db: Session, team_ids: List[int]) -> Dict[int, int]:
+    if not team_ids:
+        return {}
+    rows = (
+        db.query(PersohubEventTeamMember.team_id, func.count(PersohubEventTeamMember.id))
+        .filter(PersohubEventTeamMember.team_id.in_(team_ids))
+        .group_by(PersohubEventTeamMember.team_id)
+        .all()
+    )
+    return {int(team_id): int(count or 0) for team_id, count in rows}
+
+
 def _registered_entities(db: Session, event: PersohubEvent):
     if event.participant_mode == PersohubEventParticipantMode.INDIVIDUAL:
         query = (
@@ -1196,72 +1202,15 @@ def _registered_entities(db: Session, event: PersohubEvent):
                 PersohubEventRegistration.user_id.isnot(None),
             )
         )
-        rows = query.all()
-        payload = []
-        for reg, user in rows:
-            college_value = str(getattr(user, "college", "") or "").strip()
-            is_mit_participant = college_value.lower() == "mit"
-            payload.append(
-                {
-                    "entity_type": "user",
-                    "entity_id": user.id,
-                    "participant_id": user.id,
-                    "name": user.name,
-                    "participant_name": user.name,
-                    "regno_or_code": user.regno,
-                    "register_number": user.regno,
-                    "participant_register_number": user.regno,
-                    "email": user.email,
-                    "college": college_value or None,
-                    "is_mit_participant": bool(is_mit_participant),
-                    "department": user.dept,
-                    "gender": user.gender,
-                    "batch": _batch_from_regno(user.regno),
-                    "profile_picture": user.image_url,
-                    "status": _registration_status_label(reg.status),
-                    "participant_status": _registration_status_label(reg.status),
-                    "referral_code": reg.referral_code,
-                    "referred_by": reg.referred_by,
-                    "referral_count": int(reg.referral_count or 0),
-                    "is_wildcard": bool(getattr(reg, "wildcard_start_round_no", None) is not None),
-                    "wildcard_seed_score": float(getattr(reg, "wildcard_seed_score", 0.0) or 0.0),
-                    "wildcard_start_round_no": int(getattr(reg, "wildcard_start_round_no", 0) or 0) or None,
-                }
-            )
-        return payload
+        return [_user_entity_payload(reg, user) for reg, user in query.all()]
     rows = (
         db.query(PersohubEventRegistration, PersohubEventTeam)
         .join(PersohubEventTeam, PersohubEventRegistration.team_id == PersohubEventTeam.id)
         .filter(PersohubEventRegistration.event_id == event.id, PersohubEventRegistration.team_id.isnot(None))
         .all()
     )
-    team_ids = [int(team.id) for _, team in rows]
-    member_count_rows = (
-        db.query(PersohubEventTeamMember.team_id, func.count(PersohubEventTeamMember.id))
-        .filter(PersohubEventTeamMember.team_id.in_(team_ids))
-        .group_by(PersohubEventTeamMember.team_id)
-        .all()
-        if team_ids
-        else []
-    )
-    member_count_map = {int(team_id): int(count or 0) for team_id, count in member_count_rows}
-    payload = []
-    for reg, team in rows:
-        payload.append(
-            {
-                "entity_type": "team",
-                "entity_id": team.id,
-                "name": team.team_name,
-                "regno_or_code": team.team_code,
-                "members_count": int(member_count_map.get(int(team.id), 0)),
-                "status": _registration_status_label(reg.status),
-                "participant_status": _registration_status_label(reg.status),
-                "is_wildcard": bool(getattr(reg, "wildcard_start_round_no", None) is not None),
-                "wildcard_seed_score": float(getattr(reg, "wildcard_seed_score", 0.0) or 0.0),
-                "wildcard_start_round_no": int(getattr(reg, "wildcard_start_round_no", 0) or 0) or None,
-            }
-        )
-    return payload
+    member_count_map = _team_member_count_map(db, [int(team.id) for _, team in rows])
+    return [_team_entity_payload(reg, team, member_count_map.get(int(team.id), 0)) for reg, team in rows]
 
 
 def _entity_lookup_map(db: Session, event: PersohubEvent) -> Dict[Tuple[str, int], Dict[str, Any]]:
@@ -1344,6 +1293,100 @@ def _round_scoring_entities(db: Session, event: PersohubEvent, round_row: Persoh
     return entities
 
 
+ROUND_PARTICIPANTS_MAX_PAGE_SIZE = 500
+
+
+def _like_pattern(value: str) -> str:
+    escaped = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _round_participant_rows(
+    db: Session,
+    event: PersohubEvent,
+    round_row: PersohubEventRound,
+    *,
+    search: Optional[str] = None,
+    panel_ids: Optional[Set[int]] = None,
+    compact: bool = False,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Tuple[List[Tuple[Dict[str, Any], Optional[int], Optional[PersohubEventScore], Optional[PersohubEventRoundSubmission]]], int]:
+    """Same entities as ``_round_scoring_entities`` but filtered, searched and paged in SQL, joined with each
+    entity's panel id, score and submission. Returns (rows, total matching rows)."""
+    is_team = event.participant_mode == PersohubEventParticipantMode.TEAM
+    entity_model = PersohubEventTeam if is_team else PdaUser
+    entity_type = PersohubEventEntityType.TEAM if is_team else PersohubEventEntityType.USER
+
+    def _entity_fk(model):
+        return model.team_id if is_team else model.user_id
+
+    def _round_entity_join(model):
+        return and_(
+            model.round_id == round_row.id,
+            model.entity_type == entity_type,
+            _entity_fk(model) == entity_model.id,
+        )
+
+    query = (
+        db.query(
+            PersohubEventRegistration,
+            entity_model,
+            PersohubEventRoundPanelAssignment.panel_id,
+            PersohubEventScore,
+            PersohubEventRoundSubmission,
+        )
+        .join(entity_model, _entity_fk(PersohubEventRegistration) == entity_model.id)
+        .outerjoin(PersohubEventRoundPanelAssignment, _round_entity_join(PersohubEventRoundPanelAssignment))
+        .outerjoin(
+            PersohubEventScore,
+            and_(PersohubEventScore.event_id == event.id, _round_entity_join(PersohubEventScore)),
+        )
+        .outerjoin(
+            PersohubEventRoundSubmission,
+            and_(PersohubEventRoundSubmission.event_id == event.id, _round_entity_join(PersohubEventRoundSubmission)),
+        )
+        .filter(PersohubEventRegistration.event_id == event.id, _entity_fk(PersohubEventRegistration).isnot(None))
+    )
+    if not is_team:
+        query = query.filter(PersohubEventRegistration.entity_type == PersohubEventEntityType.USER)
+    if not (round_row.is_frozen or round_row.state in {PersohubEventRoundState.COMPLETED, PersohubEventRoundState.REVEAL}):
+        query = query.filter(PersohubEventRegistration.status == PersohubEventRegistrationStatus.ACTIVE)
+    needle = str(search or "").strip()
+    if needle:
+        pattern = _like_pattern(needle)
+        columns = (
+            [PersohubEventTeam.team_name, PersohubEventTeam.team_code]
+            if is_team
+            else [PdaUser.name, PdaUser.regno, PdaUser.email]
+        )
+        query = query.filter(or_(*[column.ilike(pattern, escape="\\") for column in columns]))
+    if panel_ids is not None:
+        if not panel_ids:
+            return [], 0
+        query = query.filter(PersohubEventRoundPanelAssignment.panel_id.in_(sorted(panel_ids)))
+    if compact:
+        query = query.options(defer(PersohubEventRoundSubmission.files), defer(PersohubEventRoundSubmission.notes))
+
+    query = query.order_by(PersohubEventRegistration.id.asc())
+    if limit is not None:
+        total = query.order_by(None).count()
+        rows = query.offset(offset).limit(limit).all()
+    else:
+        rows = query.all()
+        total = len(rows)
+
+    member_count_map = _team_member_count_map(db, [int(entity.id) for _, entity, _, _, _ in rows]) if is_team else {}
+    result = []
+    for reg, entity, panel_id, score_row, submission_row in rows:
+        if is_team:
+            payload = _team_entity_payload(reg, entity, member_count_map.get(int(entity.id), 0))
+        else:
+            payload = _user_entity_payload(reg, entity)
+        result.append((payload, int(panel_id) if panel_id is not None else None, score_row, submission_row))
+    return result, total
+
+
 def _unregistered_entities(db: Session, event: PersohubEvent):
     query = db.query(PdaUser).filter(PdaUser.regno != "0000000000")
     if event.participant_mode == PersohubEventParticipantMode.INDIVIDUAL:
@@ -3401,6 +3444,11 @@ def update_participant_status(
         row.status = PersohubEventRegistrationStatus.ELIMINATED
         row.eliminated_round_no = _event_manual_elimination_round_no(db, event.id)
     db.commit()
+    _publish_live(
+        event,
+        "registration_status",
+        {"updates": [{"entity_type": "user", "entity_id": int(user_id), "status": _registration_status_label(row.status)}]},
+    )
     _log_event_admin_action(
         db,
         admin,
@@ -3581,6 +3629,7 @@ def update_registration_status_bulk(
     rows = query.all()
 
     updated_count = 0
+    changed: List[Dict[str, Any]] = []
     for row in rows:
         target_id = int(row.team_id) if is_team_mode else int(row.user_id)
         target_status = deduped_updates.get(target_id)
@@ -3604,8 +3653,11 @@ def update_registration_status_bulk(
             row.status = next_status
         if row.status != previous_status or row.eliminated_round_no != previous_eliminated_round_no:
             updated_count += 1
+            changed.append({"entity_type": expected_entity_type, "entity_id": target_id, "status": target_status})
 
     db.commit()
+    if changed:
+        _publish_live(event, "registration_status", {"updates": changed})
     _log_event_admin_action(
         db,
         admin,
@@ -4121,6 +4173,17 @@ def mark_attendance(
             )
             db.add(row)
     db.commit()
+    _publish_live(
+        event,
+        "attendance_marked",
+        {
+            "entity_type": payload.entity_type.value,
+            "entity_id": payload.user_id if entity_type == PersohubEventEntityType.USER else payload.team_id,
+            "is_present": bool(payload.is_present),
+            "level": level,
+        },
+        round_id=payload.round_id,
+    )
     _log_event_admin_action(
         db,
         admin,
@@ -4148,21 +4211,38 @@ def scan_attendance(
     db: Session = Depends(get_db),
 ):
     event = _get_event_or_404(db, slug)
-    if payload.round_id is not None:
-        _get_event_round_or_404(db, event.id, int(payload.round_id))
-    decoded = decode_token(payload.token)
-    if decoded.get("qr") != "persohub_event_attendance" or decoded.get("event_slug") != event.slug:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid QR token")
-    entity_type = decoded.get("entity_type")
-    entity_id = int(decoded.get("entity_id"))
-    mark_payload = PersohubManagedAttendanceMarkRequest(
-        entity_type=PersohubManagedEntityTypeEnum.USER if entity_type == "user" else PersohubManagedEntityTypeEnum.TEAM,
-        user_id=entity_id if entity_type == "user" else None,
-        team_id=entity_id if entity_type == "team" else None,
-        round_id=payload.round_id,
-        is_present=True,
+    entity_type, entity_id = decode_attendance_qr(payload.token, "persohub_event_attendance", event.slug)
+    round_id = int(payload.round_id) if payload.round_id is not None else None
+    mark = (entity_type, entity_id, round_id)
+    response = {
+        "message": "Attendance updated",
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "round_id": round_id,
+        "duplicate": False,
+    }
+    dedupe_key = scan_dedupe_key("persohub", event.id, mark)
+    if recent_scans.is_recent(dedupe_key):
+        return {**response, "duplicate": True}
+    if round_id is not None:
+        _get_event_round_or_404(db, event.id, round_id)
+    upsert_attendance_marks(
+        db,
+        attendance_model=PersohubEventAttendance,
+        score_model=PersohubEventScore,
+        event_id=event.id,
+        marks=[mark],
+        marked_by_user_id=admin.id,
+    )
+    db.commit()
+    recent_scans.remember([dedupe_key])
+    level = "round" if round_id is not None else "entry"
+    _publish_live(
+        event,
+        "attendance_marked",
+        {"entity_type": entity_type, "entity_id": entity_id, "is_present": True, "level": level},
+        round_id=round_id,
     )
-    response = mark_attendance(slug=slug, payload=mark_payload, admin=admin, db=db)
     _log_event_admin_action(
         db,
         admin,
@@ -4170,11 +4250,53 @@ def scan_attendance(
         "scan_persohub_event_attendance",
         method="POST",
         path=f"/persohub/admin/persohub-events/{slug}/attendance/scan",
-        meta={"round_id": payload.round_id, "entity_type": entity_type, "entity_id": entity_id, "level": ("round" if payload.round_id is not None else "entry")},
+        meta={"round_id": round_id, "entity_type": entity_type, "entity_id": entity_id, "level": level},
     )
     return response
 
 
+@router.post("/persohub/admin/persohub-events/{slug}/attendance/scan-bulk", response_model=PersohubManagedAttendanceScanBulkResponse)
+def scan_attendance_bulk(
+    slug: str,
+    payload: PersohubManagedAttendanceScanBulkRequest,
+    admin: PdaUser = Depends(require_persohub_event_admin),
+    db: Session = Depends(get_db),
+):
+    event = _get_event_or_404(db, slug)
+    result, marks = mark_scan_batch(
+        db,
+        scope="persohub",
+        qr_kind="persohub_event_attendance",
+        event=event,
+        scans=payload.scans,
+        round_model=PersohubEventRound,
+        registration_model=PersohubEventRegistration,
+        attendance_model=PersohubEventAttendance,
+        score_model=PersohubEventScore,
+        marked_by_user_id=admin.id,
+    )
+    if marks:
+        db.commit()
+        recent_scans.remember(scan_dedupe_key("persohub", event.id, mark) for mark in marks)
+        for round_id, data in attendance_mark_groups(marks):
+            _publish_live(event, "attendance_marked", data, round_id=round_id)
+    _log_event_admin_action(
+        db,
+        admin,
+        event,
+        "bulk_scan_persohub_event_attendance",
+        method="POST",
+        path=f"/persohub/admin/persohub-events/{slug}/attendance/scan-bulk",
+        meta={
+            "received": len(payload.scans),
+            "marked": result["marked"],
+            "duplicates": result["duplicates"],
+            "invalid": result["invalid"],
+        },
+    )
+    return result
+
+
 @router.get("/persohub/admin/persohub-events/{slug}/rounds", response_model=List[PersohubManagedRoundResponse])
 def list_rounds(
     slug: str,
@@ -5395,11 +5517,48 @@ def round_stats(
     }
 
 
+@router.post("/persohub/admin/persohub-events/{slug}/live/ticket")
+def create_live_updates_ticket(
+    slug: str,
+    admin: PdaUser = Depends(require_persohub_event_admin),
+    db: Session = Depends(get_db),
+):
+    event = _get_event_or_404(db, slug)
+    return create_live_stream_ticket("persohub", event.slug, admin.regno)
+
+
+@router.get("/persohub/admin/persohub-events/{slug}/live")
+async def live_updates(
+    slug: str,
+    request: Request,
+    ticket: str = Query(...),
+    round_id: Optional[int] = None,
+):
+    verify_live_stream_ticket(ticket, "persohub", slug)
+    subscription = subscribe_live(
+        "persohub",
+        slug,
+        round_id=round_id,
+        last_event_id=request.headers.get("last-event-id"),
+    )
+    return StreamingResponse(
+        live_event_stream(subscription, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/persohub/admin/persohub-events/{slug}/rounds/{round_id}/participants")
 def round_participants(
     slug: str,
     round_id: int,
     search: Optional[str] = None,
+    panel_id: Optional[int] = None,
+    my_panels: bool = False,
+    compact: bool = False,
+    page: int = 1,
+    page_size: Optional[int] = None,
+    response: Response = None,
     admin: PdaUser = Depends(require_persohub_event_admin),
     db: Session = Depends(get_db),
 ):
@@ -5407,77 +5566,85 @@ def round_participants(
     round_row = db.query(PersohubEventRound).filter(PersohubEventRound.id == round_id, PersohubEventRound.event_id == event.id).first()
     if not round_row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Round not found")
+    # Plain defaults (not Query) so exports and audit snapshots can call this directly for the full list.
+    page = max(1, int(page or 1))
+    page_size = min(ROUND_PARTICIPANTS_MAX_PAGE_SIZE, max(1, int(page_size))) if page_size else None
     scope = _round_admin_panel_scope(db, round_row, admin)
-    panel_map, assignment_map = _round_panel_maps(db, round_row) if bool(round_row.panel_mode_enabled) else ({}, {})
-    entities = _round_scoring_entities(db, event, round_row)
-    if search:
-        needle = str(search).strip().lower()
-        entities = [
-            item
-            for item in entities
-            if needle in " ".join(
-                [
-                    str(item.get("name") or ""),
-                    str(item.get("regno_or_code") or ""),
-                    str(item.get("email") or ""),
-                ]
-            ).lower()
-        ]
-    score_rows = db.query(PersohubEventScore).filter(PersohubEventScore.event_id == event.id, PersohubEventScore.round_id == round_id).all()
-    score_map = {}
-    for row in score_rows:
-        key = ("user", row.user_id) if row.user_id else ("team", row.team_id)
-        score_map[key] = row
-    submission_rows = db.query(PersohubEventRoundSubmission).filter(
-        PersohubEventRoundSubmission.event_id == event.id,
-        PersohubEventRoundSubmission.round_id == round_id,
-    ).all()
-    submission_map = {}
-    for row in submission_rows:
-        key = ("user", row.user_id) if row.user_id else ("team", row.team_id)
-        submission_map[key] = row
+    panel_mode_enabled = bool(round_row.panel_mode_enabled)
+    panel_filter: Optional[Set[int]] = None
+    if panel_mode_enabled:
+        if panel_id is not None:
+            panel_filter = {int(panel_id)}
+        if my_panels and not scope["is_superadmin"]:
+            own_panel_ids = set(scope["panel_ids"])
+            panel_filter = own_panel_ids if panel_filter is None else panel_filter & own_panel_ids
+    panel_map = (
+        {
+            int(panel.id): panel
+            for panel in db.query(PersohubEventRoundPanel).filter(
+                PersohubEventRoundPanel.event_id == event.id,
+                PersohubEventRoundPanel.round_id == round_row.id,
+            ).all()
+        }
+        if panel_mode_enabled
+        else {}
+    )
+    rows, total = _round_participant_rows(
+        db,
+        event,
+        round_row,
+        search=search,
+        panel_ids=panel_filter,
+        compact=compact,
+        limit=page_size,
+        offset=(page - 1) * page_size if page_size else 0,
+    )
     result = []
-    for entity in entities:
-        key = (entity["entity_type"], entity["entity_id"])
-        row = score_map.get(key)
-        submission_row = submission_map.get(key)
-        submission_files = _submission_files_from_row(submission_row) if submission_row else []
-        first_submission_file = submission_files[0] if submission_files else None
-        panel_assignment = assignment_map.get(_panel_entity_key(entity.get("entity_type"), int(entity.get("entity_id"))))
-        panel_row = panel_map.get(int(panel_assignment.panel_id)) if panel_assignment and panel_assignment.panel_id is not None else None
-        panel_id = int(panel_assignment.panel_id) if panel_assignment and panel_assignment.panel_id is not None else None
-        is_present = bool(row.is_present) if row else False
+    for entity, assigned_panel_id, row, submission_row in rows:
+        panel_id_value = assigned_panel_id if panel_mode_enabled else None
+        panel_row = panel_map.get(panel_id_value) if panel_id_value is not None else None
+        if compact:
+            submission_files = None
+            submission_file_url = submission_row.file_url if submission_row else None
+        else:
+            submission_files = _submission_files_from_row(submission_row) if submission_row else []
+            submission_file_url = submission_files[0].get("file_url") if submission_files else None
         payload = {
             **entity,
             "score_id": row.id if row else None,
             "criteria_scores": row.criteria_scores if row else {},
             "total_score": float(row.total_score or 0.0) if row else 0.0,
             "normalized_score": float(row.normalized_score or 0.0) if row else 0.0,
-            "is_present": is_present,
+            "is_present": bool(row.is_present) if row else False,
             "submission_id": submission_row.id if submission_row else None,
             "submission_type": submission_row.submission_type if submission_row else None,
-            "submission_file_url": first_submission_file.get("file_url") if first_submission_file else None,
+            "submission_file_url": submission_file_url,
             "submission_link_url": submission_row.link_url if submission_row else None,
-            "submission_files": submission_files,
             "submission_submitted_at": submission_row.submitted_at if submission_row else None,
-            "submission_notes": submission_row.notes if submission_row else None,
             "submission_is_locked": bool(submission_row.is_locked) if submission_row else False,
-            "panel_id": panel_id,
+            "panel_id": panel_id_value,
             "panel_no": int(panel_row.panel_no) if panel_row and panel_row.panel_no is not None else None,
             "panel_name": (str(panel_row.name or "").strip() or None) if panel_row else None,
             "is_score_editable_by_current_admin": _is_entity_editable_by_admin(
                 scope,
                 str(entity.get("entity_type")),
                 int(entity.get("entity_id")),
-                panel_id,
+                panel_id_value,
             ),
         }
+        if not compact:
+            payload["submission_files"] = submission_files
+            payload["submission_notes"] = submission_row.notes if submission_row else None
         if event.participant_mode == PersohubEventParticipantMode.INDIVIDUAL:
             payload.setdefault("participant_id", entity["entity_id"])
             payload.setdefault("participant_name", entity.get("name"))
             payload.setdefault("participant_register_number", entity.get("regno_or_code"))
             payload.setdefault("participant_status", entity.get("status"))
         result.append(payload)
+    if response is not None and page_size:
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Page"] = str(page)
+        response.headers["X-Page-Size"] = str(page_size)
     return result
 
 
@@ -5702,9 +5869,6 @@ def save_scores(
 
     reg_user_map: Dict[int, PersohubEventRegistration] = {}
     reg_team_map: Dict[int, PersohubEventRegistration] = {}
-    score_user_map: Dict[int, PersohubEventScore] = {}
-    score_team_map: Dict[int, PersohubEventScore] = {}
-
     if user_ids:
         reg_user_map = {
             int(row.user_id): row
@@ -5715,17 +5879,6 @@ def save_scores(
             ).all()
             if row.user_id is not None
         }
-        score_user_map = {
-            int(row.user_id): row
-            for row in db.query(PersohubEventScore).filter(
-                PersohubEventScore.event_id == event.id,
-                PersohubEventScore.round_id == round_id,
-                PersohubEventScore.entity_type == PersohubEventEntityType.USER,
-                PersohubEventScore.user_id.in_(user_ids),
-            ).all()
-            if row.user_id is not None
-        }
-
     if team_ids:
         reg_team_map = {
             int(row.team_id): row
@@ -5736,17 +5889,8 @@ def save_scores(
             ).all()
             if row.team_id is not None
         }
-        score_team_map = {
-            int(row.team_id): row
-            for row in db.query(PersohubEventScore).filter(
-                PersohubEventScore.event_id == event.id,
-                PersohubEventScore.round_id == round_id,
-                PersohubEventScore.entity_type == PersohubEventEntityType.TEAM,
-                PersohubEventScore.team_id.in_(team_ids),
-            ).all()
-            if row.team_id is not None
-        }
 
+    score_rows = []
     for entry, entity_type, user_id, team_id in parsed_entries:
         is_user = entity_type == PersohubEventEntityType.USER
         entity_id_value = int(user_id) if is_user else int(team_id)
@@ -5760,7 +5904,6 @@ def save_scores(
             value = user_id if is_user else team_id
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{label} {value} is eliminated")
 
-        score_row = score_user_map.get(entity_id_value) if is_user else score_team_map.get(entity_id_value)
         raw_scores = entry.criteria_scores if isinstance(entry.criteria_scores, dict) else {}
         meta_scores: Dict[str, Any] = {}
         raw_feedback = raw_scores.get("__judge_feedback")
@@ -5782,33 +5925,22 @@ def save_scores(
                 safe_scores[name] = value
             total = float(sum(safe_scores.values()))
             normalized = float((total / max_total * 100) if max_total > 0 else 0.0)
-        persisted_scores = {**safe_scores, **meta_scores}
-
-        if score_row:
-            score_row.criteria_scores = persisted_scores
-            score_row.total_score = total
-            score_row.normalized_score = normalized
-            score_row.is_present = bool(entry.is_present)
-        else:
-            score_row = PersohubEventScore(
-                event_id=event.id,
-                round_id=round_id,
-                entity_type=entity_type,
-                user_id=user_id,
-                team_id=team_id,
-                criteria_scores=persisted_scores,
-                total_score=total,
-                normalized_score=normalized,
-                is_present=bool(entry.is_present),
-            )
-            db.add(score_row)
-            if is_user:
-                score_user_map[entity_id_value] = score_row
-            else:
-                score_team_map[entity_id_value] = score_row
+        score_rows.append(
+            {
+                "entity_type": "user" if is_user else "team",
+                "user_id": user_id,
+                "team_id": team_id,
+                "scores": {**safe_scores, **meta_scores},
+                "total": total,
+                "normalized": normalized,
+                "is_present": bool(entry.is_present),
+            }
+        )
 
+    bulk_upsert_scores(db, PersohubEventScore, event_id=event.id, round_id=round_id, rows=score_rows)
     _recompute_round_normalized_scores(db, event, round_row)
     db.commit()
+    _publish_live(event, "scores_saved", {"entries": score_delta_rows(score_rows)}, round_id=round_id)
     _log_event_admin_action(
         db,
         admin,
@@ -5839,277 +5971,37 @@ def import_scores(
     if not file.filename.endswith(".xlsx"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only .xlsx is supported")
 
-    wb = load_workbook(filename=io.BytesIO(file.file.read()))
-    ws = wb.active
-    headers = [str(cell.value or "").strip() for cell in ws[1]]
-    headers_norm = {h.lower(): idx for idx, h in enumerate(headers)}
     id_col_name = "register number" if event.participant_mode == PersohubEventParticipantMode.INDIVIDUAL else "team code"
     name_col_name = "name" if event.participant_mode == PersohubEventParticipantMode.INDIVIDUAL else "team name"
-    if id_col_name not in headers_norm:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing '{id_col_name}' column")
-
     criteria = _criteria_def(round_row)
     criteria_max = {c["name"]: float(c.get("max_marks", 0) or 0) for c in criteria}
-    missing_criteria_headers = [name for name in criteria_max.keys() if name.lower() not in headers_norm]
-    if missing_criteria_headers:
-        missing = ", ".join(missing_criteria_headers)
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing criteria columns: {missing}")
-    max_total = sum(criteria_max.values()) if criteria_max else 100
-    panel_assignment_map: Dict[Tuple[str, int], PersohubEventRoundPanelAssignment] = {}
+    panel_assigned_keys: Optional[Set[Tuple[str, int]]] = None
     if bool(round_row.panel_mode_enabled):
         _, panel_assignment_map = _round_panel_maps(db, round_row)
+        panel_assigned_keys = {key for key, row in panel_assignment_map.items() if row.panel_id is not None}
 
-    entities = _round_scoring_entities(db, event, round_row)
     entity_by_identifier = {}
-    for entity in entities:
+    for entity in _round_scoring_entities(db, event, round_row):
         identifier_key = str(entity.get("regno_or_code") or "").strip().upper()
         if identifier_key:
             entity_by_identifier[identifier_key] = entity
 
-    id_idx = headers_norm.get(id_col_name)
-    name_idx = headers_norm.get(name_col_name)
-    present_idx = headers_norm.get("present")
-    criteria_indices = {name: headers_norm.get(name.lower()) for name in criteria_max.keys()}
-
-    truthy_values = {"yes", "y", "1", "true", "present"}
-    falsy_values = {"no", "n", "0", "false", "absent"}
-
-    total_rows = 0
-    valid_rows = []
-    identified_rows = []
-    mismatched_rows = []
-    unidentified_rows = []
-    other_required_rows = []
-    errors = []
-
-    def _append_error(message: str) -> None:
-        if len(errors) < 50:
-            errors.append(message)
-
-    for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-        values = [row[idx] if idx < len(row) else None for idx in range(len(headers))]
-
-        has_data = False
-        for value in values:
-            if value is None:
-                continue
-            if isinstance(value, str):
-                if value.strip():
-                    has_data = True
-                    break
-            else:
-                has_data = True
-                break
-        if not has_data:
-            continue
-
-        total_rows += 1
-        raw_identifier = values[id_idx] if id_idx is not None else None
-        identifier = str(raw_identifier or "").strip().upper()
-        provided_name = str(values[name_idx] or "").strip() if name_idx is not None else ""
-
-        if not identifier:
-            reason = f"Missing {id_col_name.title()}"
-            other_required_rows.append({
-                "row": row_idx,
-                "identifier": "",
-                "name": provided_name,
-                "reason": reason,
-            })
-            _append_error(f"Row {row_idx}: {reason}")
-            continue
-
-        entity = entity_by_identifier.get(identifier)
-        if not entity:
-            reason = f"{id_col_name.title()} {identifier} not found in current round participants"
-            unidentified_rows.append({
-                "row": row_idx,
-                "identifier": identifier,
-                "name": provided_name,
-                "reason": reason,
-            })
-            _append_error(f"Row {row_idx}: {reason}")
-            continue
-
-        entity_type = PersohubEventEntityType.USER if entity.get("entity_type") == "user" else PersohubEventEntityType.TEAM
-        user_id = int(entity["entity_id"]) if entity_type == PersohubEventEntityType.USER else None
-        team_id = int(entity["entity_id"]) if entity_type == PersohubEventEntityType.TEAM else None
-        entity_type_key = "user" if entity_type == PersohubEventEntityType.USER else "team"
-        entity_id_value = int(user_id) if entity_type == PersohubEventEntityType.USER else int(team_id)
-        has_any_score_input = False
-        for name in criteria_max.keys():
-            idx = criteria_indices.get(name)
-            raw = values[idx] if idx is not None else None
-            if raw is not None and str(raw).strip() != "":
-                has_any_score_input = True
-                break
-
-        is_present = has_any_score_input
-        if present_idx is not None:
-            present_raw = values[present_idx]
-            present_text = str(present_raw or "").strip().lower()
-            if not present_text:
-                is_present = has_any_score_input
-            elif present_text in truthy_values:
-                is_present = True
-            elif present_text in falsy_values:
-                is_present = has_any_score_input
-            else:
-                reason = "Invalid Present value (use Yes/No)"
-                other_required_rows.append({
-                    "row": row_idx,
-                    "identifier": identifier,
-                    "name": provided_name,
-                    "reason": reason,
-                })
-                _append_error(f"Row {row_idx}: {reason}")
-                continue
-
-        if bool(round_row.panel_mode_enabled) and is_present:
-            assignment_row = panel_assignment_map.get(_panel_entity_key(entity_type_key, entity_id_value))
-            if assignment_row is None or assignment_row.panel_id is None:
-                reason = "Panel assignment required for present scoring in panel mode"
-                other_required_rows.append({
-                    "row": row_idx,
-                    "identifier": identifier,
-                    "name": provided_name or str(entity.get("name") or ""),
-                    "reason": reason,
-                })
-                _append_error(f"Row {row_idx}: {reason}")
-                continue
-
-        row_errors = []
-        scores = {}
-        if is_present:
-            for name, max_marks in criteria_max.items():
-                idx = criteria_indices.get(name)
-                raw = values[idx] if idx is not None else None
-                if raw is None or str(raw).strip() == "":
-                    row_errors.append(f"{name} is required")
-                    continue
-                try:
-                    score = _parse_import_score_value(raw, max_marks)
-                except ValueError as exc:
-                    if str(exc) == "invalid_denominator":
-                        row_errors.append(f"Invalid score for {name} (denominator must be > 0)")
-                    else:
-                        row_errors.append(f"Invalid score for {name}")
-                    continue
-                except Exception:
-                    row_errors.append(f"Invalid score for {name}")
-                    continue
-                if score < 0 or score > max_marks:
-                    row_errors.append(f"{name} must be between 0 and {max_marks}")
-                    continue
-                scores[name] = score
-        else:
-            scores = {name: 0.0 for name in criteria_max.keys()}
-
-        if row_errors:
-            reason = "; ".join(row_errors)
-            other_required_rows.append({
-                "row": row_idx,
-                "identifier": identifier,
-                "name": provided_name,
-                "reason": reason,
-            })
-            _append_error(f"Row {row_idx}: {reason}")
-            continue
-
-        total = float(sum(scores.values())) if is_present else 0.0
-        normalized = float((total / max_total * 100) if max_total > 0 and is_present else 0.0)
-        canonical_name = str(entity.get("name") or "").strip()
-        mismatch = bool(
-            provided_name
-            and canonical_name
-            and _normalize_compare_text(provided_name) != _normalize_compare_text(canonical_name)
-        )
-
-        row_payload = {
-            "row": row_idx,
-            "identifier": identifier,
-            "provided_name": provided_name,
-            "expected_name": canonical_name,
-            "is_present": is_present,
-            "entity_type": entity_type,
-            "user_id": user_id,
-            "team_id": team_id,
-            "scores": scores,
-            "total": total,
-            "normalized": normalized,
-        }
-        valid_rows.append(row_payload)
-
-        if mismatch:
-            mismatched_rows.append({
-                "row": row_idx,
-                "identifier": identifier,
-                "provided_name": provided_name,
-                "expected_name": canonical_name,
-                "reason": "Name does not match canonical record",
-            })
-        else:
-            identified_rows.append({
-                "row": row_idx,
-                "identifier": identifier,
-                "name": canonical_name or provided_name,
-            })
-
-    ready_to_import = len(valid_rows)
-
-    def _response_payload(imported_count: int):
-        return {
-            "preview": bool(preview),
-            "total_rows": total_rows,
-            "identified_count": len(identified_rows),
-            "mismatched_count": len(mismatched_rows),
-            "unidentified_count": len(unidentified_rows),
-            "other_required_count": len(other_required_rows),
-            "ready_to_import": ready_to_import,
-            "identified_rows": identified_rows[:200],
-            "mismatched_rows": mismatched_rows[:200],
-            "unidentified_rows": unidentified_rows[:200],
-            "other_required_rows": other_required_rows[:200],
-            "imported": imported_count,
-            "errors": errors[:50],
-        }
-
+    result = read_score_import(
+        file.file,
+        id_col_name=id_col_name,
+        name_col_name=name_col_name,
+        criteria_max=criteria_max,
+        entity_by_identifier=entity_by_identifier,
+        panel_assigned_keys=panel_assigned_keys,
+    )
     if preview:
-        return _response_payload(imported_count=0)
-
-    for item in valid_rows:
-        entity_type = item["entity_type"]
-        user_id = item["user_id"]
-        team_id = item["team_id"]
-        existing = db.query(PersohubEventScore).filter(
-            PersohubEventScore.event_id == event.id,
-            PersohubEventScore.round_id == round_id,
-            PersohubEventScore.entity_type == entity_type,
-            PersohubEventScore.user_id == user_id,
-            PersohubEventScore.team_id == team_id,
-        ).first()
-        if existing:
-            existing.criteria_scores = item["scores"]
-            existing.total_score = item["total"]
-            existing.normalized_score = item["normalized"]
-            existing.is_present = item["is_present"]
-        else:
-            db.add(
-                PersohubEventScore(
-                    event_id=event.id,
-                    round_id=round_id,
-                    entity_type=entity_type,
-                    user_id=user_id,
-                    team_id=team_id,
-                    criteria_scores=item["scores"],
-                    total_score=item["total"],
-                    normalized_score=item["normalized"],
-                    is_present=item["is_present"],
-                )
-            )
+        return score_import_response(result, preview=True, imported=0)
 
+    imported = bulk_upsert_scores(db, PersohubEventScore, event_id=event.id, round_id=round_id, rows=result["valid_rows"])
     _recompute_round_normalized_scores(db, event, round_row)
     db.commit()
+    _publish_live(event, "scores_imported", {"imported": imported}, round_id=round_id)
+    payload = score_import_response(result, preview=False, imported=imported)
     _log_event_admin_action(
         db,
         admin,
@@ -6119,15 +6011,15 @@ def import_scores(
         path=f"/persohub/admin/persohub-events/{slug}/rounds/{round_id}/import-scores",
         meta={
             "preview": False,
-            "total_rows": total_rows,
-            "ready_to_import": ready_to_import,
-            "imported": ready_to_import,
-            "unidentified": len(unidentified_rows),
-            "other_required": len(other_required_rows),
-            "mismatched": len(mismatched_rows),
+            "total_rows": payload["total_rows"],
+            "ready_to_import": payload["ready_to_import"],
+            "imported": imported,
+            "unidentified": payload["unidentified_count"],
+            "other_required": payload["other_required_count"],
+            "mismatched": payload["mismatched_count"],
         },
     )
-    return _response_payload(imported_count=ready_to_import)
+    return payload
 
 
 @router.get("/persohub/admin/persohub-events/{slug}/rounds/{round_id}/score-template")
@@ -6207,6 +6099,7 @@ def freeze_round(
         _recompute_round_normalized_scores(db, event, round_row)
     db.commit()
     db.refresh(round_row)
+    _publish_live(event, "round_frozen", {"is_frozen": True}, round_id=round_id)
     freeze_audit_meta = _upload_round_audit_snapshot(
         db=db,
         event=event,
@@ -6241,6 +6134,7 @@ def unfreeze_round(
     round_row.is_frozen = False
     round_row.state = PersohubEventRoundState.ACTIVE
     db.commit()
+    _publish_live(event, "round_unfrozen", {"is_frozen": False, "state": "Active"}, round_id=round_id)
     _log_event_admin_action(
         db,
         admin,
@@ -6721,8 +6615,10 @@ def event_logs(
     action: Optional[str] = None,
     method: Optional[str] = None,
     path_contains: Optional[str] = None,
+    before_id: Optional[int] = Query(None, ge=1),
     _: PdaUser = Depends(require_persohub_event_admin),
     db: Session = Depends(get_db),
+    response: Response = None,
 ):
     event = _get_event_or_404(db, slug)
     query = db.query(PersohubEventLog).filter(PersohubEventLog.event_slug == event.slug)
@@ -6732,7 +6628,11 @@ def event_logs(
         query = query.filter(func.lower(PersohubEventLog.method) == str(method).strip().lower())
     if path_contains:
         query = query.filter(PersohubEventLog.path.ilike(f"%{str(path_contains).strip()}%"))
-    logs = query.order_by(PersohubEventLog.created_at.desc()).offset(offset).limit(limit).all()
+    if before_id is not None:
+        query = query.filter(PersohubEventLog.id < before_id)
+    logs = query.order_by(PersohubEventLog.id.desc()).offset(offset).limit(limit).all()
+    if response is not None and len(logs) == limit:
+        response.headers["X-Next-Before-Id"] = str(logs[-1].id)
     return [PersohubEventLogResponse.model_validate(row) for row in logs]
 
 
@@ -7997,6 +7897,20 @@ def export_round_panel_wise(
     return StreamingResponse(io.BytesIO(content), media_type=media_type, headers={"Content-Disposition": f"attachment; filename={filename}"})
 
 
+def _validate_badge_targets(db: Session, event: PersohubEvent, target_type: str, target_ids: List[int]) -> None:
+    """Every target must exist and be registered for the event; otherwise the whole request is rejected."""
+    label = "User" if target_type == "user" else "Team"
+    missing_ids = find_missing_badge_targets(db, target_type, target_ids, event_id=event.id)
+    if missing_ids:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{label} {missing_ids[0]} not found")
+    unregistered_ids = find_unregistered_badge_targets(db, "persohub", target_type, target_ids, event_id=event.id)
+    if unregistered_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{label} {unregistered_ids[0]} is not registered for this event",
+        )
+
+
 def _normalize_badge_place_value(value: Optional[object]) -> str:
     raw = str(value or "").strip()
     if not raw:
@@ -8021,22 +7935,46 @@ def create_badge(
     event = _get_event_or_404(db, slug)
     if payload.user_id and payload.team_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only one of user_id or team_id is allowed")
-    assignment = create_badge_assignment(
+    if not payload.user_id and not payload.team_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="One of user_id or team_id is required")
+    target_type = "user" if payload.user_id else "persohub_team"
+    target_id = int(payload.user_id or payload.team_id)
+    _validate_badge_targets(db, event, target_type, [target_id])
+    badge = get_or_create_badge(
         db,
         badge_name=payload.title,
         image_url=payload.image_url,
         reveal_video_url=payload.reveal_video_url,
-        user_id=payload.user_id,
-        persohub_team_id=payload.team_id,
+    )
+    meta = {
+        "title": payload.title,
+        "place": payload.place.value,
+        "score": payload.score,
+    }
+    created_ids = bulk_create_badge_assignments(
+        db,
+        badge_id=badge.id,
+        target_type=target_type,
+        target_ids=[target_id],
         persohub_event_id=event.id,
-        meta={
-            "title": payload.title,
-            "place": payload.place.value,
-            "score": payload.score,
-        },
+        meta=meta,
     )
+    if created_ids:
+        assignment_id = created_ids[0]
+    else:
+        # Re-awarding an existing badge keeps the assignment and refreshes its meta.
+        existing = find_badge_assignment(
+            db,
+            badge_id=badge.id,
+            target_type=target_type,
+            target_id=target_id,
+            persohub_event_id=event.id,
+        )
+        if not existing:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to load created badge")
+        existing.meta = meta
+        assignment_id = int(existing.id)
     db.commit()
-    db.refresh(assignment)
     _log_event_admin_action(
         db,
         admin,
@@ -8044,10 +7982,10 @@ def create_badge(
         "create_persohub_event_badge",
         method="POST",
         path=f"/persohub/admin/persohub-events/{slug}/badges",
-        meta={"badge_id": assignment.badge_id, "assignment_id": assignment.id},
+        meta={"badge_id": badge.id, "assignment_id": assignment_id},
     )
     rows = list_event_badges(db, platform="persohub", event_id=event.id)
-    current = next((row for row in rows if int(row[0].id) == int(assignment.id)), None)
+    current = next((row for row in rows if int(row[0].id) == int(assignment_id)), None)
     if not current:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to load created badge")
     created_assignment, created_badge = current
@@ -8066,6 +8004,53 @@ def create_badge(
     )
 
 
+@router.post("/persohub/admin/persohub-events/{slug}/badges/bulk", response_model=PersohubManagedBadgeBulkCreateResponse)
+def create_badges_bulk(
+    slug: str,
+    payload: PersohubManagedBadgeBulkCreate,
+    admin: PdaUser = Depends(require_persohub_event_admin),
+    db: Session = Depends(get_db),
+):
+    event = _get_event_or_404(db, slug)
+    target_type = "user" if payload.user_ids else "persohub_team"
+    target_ids = payload.user_ids or payload.team_ids
+    _validate_badge_targets(db, event, target_type, target_ids)
+    badge = get_or_create_badge(
+        db,
+        badge_name=payload.title,
+        image_url=payload.image_url,
+        reveal_video_url=payload.reveal_video_url,
+    )
+    created_ids = bulk_create_badge_assignments(
+        db,
+        badge_id=badge.id,
+        target_type=target_type,
+        target_ids=target_ids,
+        persohub_event_id=event.id,
+        meta={
+            "title": payload.title,
+            "place": payload.place.value,
+            "score": payload.score,
+        },
+    )
+    db.commit()
+    requested_count = len(set(int(item) for item in target_ids))
+    _log_event_admin_action(
+        db,
+        admin,
+        event,
+        "create_persohub_event_badges_bulk",
+        method="POST",
+        path=f"/persohub/admin/persohub-events/{slug}/badges/bulk",
+        meta={"badge_id": badge.id, "target_type": target_type, "requested": requested_count, "created": len(created_ids)},
+    )
+    return PersohubManagedBadgeBulkCreateResponse(
+        created_count=len(created_ids),
+        skipped_count=requested_count - len(created_ids),
+        assignment_ids=created_ids,
+    )
+
+
 @router.post("/persohub/admin/persohub-events/{slug}/badges/presign", response_model=PresignResponse)
 def presign_badge_image_upload(
     slug: str,
@@ -8126,3 +8111,52 @@ def list_badges(
             )
         )
     return payload
+
+
+@router.get("/persohub/admin/persohub-events/{slug}/certificates")
+def certificate_status(
+    slug: str,
+    _: PdaUser = Depends(require_persohub_event_admin),
+    db: Session = Depends(get_db),
+):
+    event = _get_event_or_404(db, slug)
+    plan = plan_certificate_jobs(db, platform="persohub", event=event)
+    return {
+        "event_closed": event.status == PersohubEventStatus.CLOSED,
+        "registrations": plan["registrations"],
+        "eligible": plan["eligible"],
+        "generated": plan["already_generated"],
+        "pending": len(plan["jobs"]),
+    }
+
+
+@router.post("/persohub/admin/persohub-events/{slug}/certificates/generate")
+def generate_certificates(
+    slug: str,
+    background_tasks: BackgroundTasks,
+    force: bool = Query(False),
+    admin: PdaUser = Depends(require_persohub_event_admin),
+    db: Session = Depends(get_db),
+):
+    event = _get_event_or_404(db, slug)
+    if event.status != PersohubEventStatus.CLOSED:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Certificates can be generated only for closed events")
+    plan = plan_certificate_jobs(db, platform="persohub", event=event, force=force)
+    jobs = plan["jobs"]
+    if jobs:
+        background_tasks.add_task(run_certificate_batch, "persohub", int(event.id), jobs)
+    _log_event_admin_action(
+        db,
+        admin,
+        event,
+        "generate_persohub_event_certificates",
+        method="POST",
+        path=f"/persohub/admin/persohub-events/{slug}/certificates/generate",
+        meta={"eligible": plan["eligible"], "queued": len(jobs), "force": bool(force)},
+    )
+    return {
+        "registrations": plan["registrations"],
+        "eligible": plan["eligible"],
+        "already_generated": plan["already_generated"],
+        "queued": len(jobs),
+    }
@@ -4,9 +4,10 @@ from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import and_, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_async_db, get_db, get_read_db
 from models import (
     PersohubEvent,
     PersohubEventRegistration,
@@ -41,6 +42,7 @@ from persohub_schemas import (
     PersohubSearchSuggestion,
 )
 from persohub_service import phase_1_schema_check
+from search_service import typeahead_suggestions
 from routers.persohub_shared import (
     build_community_card,
     build_community_cards_bulk,
@@ -50,7 +52,8 @@ from routers.persohub_shared import (
 )
 from security import (
     get_optional_pda_user,
-    get_optional_persohub_community,
+    get_optional_pda_user_async,
+    get_optional_persohub_community_async,
     require_pda_user,
 )
 
@@ -90,7 +93,7 @@ def _normalize_chakravyuha_content(content: Optional[Dict[str, Any]]) -> Dict[st
 
 @router.get("/persohub/communities", response_model=List[PersohubCommunityCard])
 def list_communities(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: Optional[PdaUser] = Depends(get_optional_pda_user),
 ):
     communities = (
@@ -113,7 +116,7 @@ def list_communities(
 
 @router.get("/persohub/clubs", response_model=List[PersohubPublicClubCommunityInfo])
 def list_public_club_community_info(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     clubs = db.query(PersohubClub).order_by(PersohubClub.name.asc(), PersohubClub.id.asc()).all()
     rows = []
@@ -142,7 +145,7 @@ def list_public_club_community_info(
 
 @router.get("/persohub/chakravyuha-26", response_model=Dict[str, Any])
 def get_chakravyuha_public_content(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     sympo = (
         db.query(PersohubSympo)
@@ -186,7 +189,7 @@ def _serialize_chakravyuha_event(event: PersohubEvent) -> Dict[str, Any]:
 
 @router.get("/persohub/chakravyuha-26/events", response_model=List[Dict[str, Any]])
 def get_chakravyuha_public_events(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     sympo = (
         db.query(PersohubSympo)
@@ -262,15 +265,14 @@ def toggle_follow_community(
     return {"status": action}
 
 
-@router.get("/persohub/feed", response_model=PersohubFeedResponse)
-def get_feed(
-    limit: int = Query(default=20, ge=1, le=100),
-    cursor: Optional[str] = Query(default=None),
-    feed_type: PersohubFeedTypeEnum = Query(default=PersohubFeedTypeEnum.ALL),
-    db: Session = Depends(get_db),
-    user: Optional[PdaUser] = Depends(get_optional_pda_user),
-):
-    current_user_id = user.id if user else None
+def _build_feed(
+    db: Session,
+    *,
+    limit: int,
+    cursor: Optional[str],
+    feed_type: PersohubFeedTypeEnum,
+    current_user_id: Optional[int],
+) -> PersohubFeedResponse:
     offset = _parse_cursor_offset(cursor)
     posts: List[PersohubPost] = []
     total = 0
@@ -340,11 +342,11 @@ def get_feed(
         )
 
     tiers: List[Dict[str, Any]] = []
-    if user:
+    if current_user_id:
         followed_ids = [
             cid
             for (cid,) in db.query(PersohubCommunityFollow.community_id)
-            .filter(PersohubCommunityFollow.user_id == user.id)
+            .filter(PersohubCommunityFollow.user_id == current_user_id)
             .all()
         ]
         if followed_ids:
@@ -403,10 +405,27 @@ def get_feed(
     )
 
 
+@router.get("/persohub/feed", response_model=PersohubFeedResponse)
+async def get_feed(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    feed_type: PersohubFeedTypeEnum = Query(default=PersohubFeedTypeEnum.ALL),
+    db: AsyncSession = Depends(get_async_db),
+    user: Optional[PdaUser] = Depends(get_optional_pda_user_async),
+):
+    return await db.run_sync(
+        _build_feed,
+        limit=limit,
+        cursor=cursor,
+        feed_type=feed_type,
+        current_user_id=(user.id if user else None),
+    )
+
+
 @router.get("/persohub/posts/{slug_token}", response_model=PersohubPostResponse)
 def get_post_detail(
     slug_token: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: Optional[PdaUser] = Depends(get_optional_pda_user),
 ):
     post = db.query(PersohubPost).filter(PersohubPost.slug_token == slug_token).first()
@@ -445,7 +464,7 @@ def list_comments(
     slug_token: str,
     limit: int = Query(default=20, ge=1, le=100),
     cursor: Optional[str] = Query(default=None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     post = db.query(PersohubPost).filter(PersohubPost.slug_token == slug_token).first()
     if not post:
@@ -525,7 +544,7 @@ def create_comment(
 def get_hashtag_posts(
     hashtag: str,
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: Optional[PdaUser] = Depends(get_optional_pda_user),
 ):
     normalized = hashtag.strip().lower().lstrip("#")
@@ -556,100 +575,28 @@ def get_hashtag_posts(
 @router.get("/persohub/search/suggestions", response_model=PersohubSearchResponse)
 def search_suggestions(
     q: str = Query(..., min_length=1, max_length=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    needle = q.strip().lower()
-    hashtag_needle = needle.lstrip("#")
-    if not needle:
-        return PersohubSearchResponse(items=[])
+    items = typeahead_suggestions(db, q)
+    return PersohubSearchResponse(items=[PersohubSearchSuggestion(**item) for item in items])
 
-    communities = (
-        db.query(PersohubCommunity)
-        .filter(
-            or_(
-                PersohubCommunity.profile_id.ilike(f"%{needle}%"),
-                PersohubCommunity.name.ilike(f"%{needle}%"),
-            )
-        )
-        .order_by(PersohubCommunity.name.asc())
-        .limit(6)
-        .all()
-    )
-    users = (
-        db.query(PdaUser)
-        .filter(
-            or_(
-                PdaUser.profile_name.ilike(f"%{needle}%"),
-                PdaUser.name.ilike(f"%{needle}%"),
-            )
-        )
-        .order_by(PdaUser.name.asc())
-        .limit(6)
-        .all()
-    )
-    hashtags = (
-        db.query(PersohubHashtag)
-        .filter(PersohubHashtag.hashtag_text.ilike(f"%{hashtag_needle}%"))
-        .order_by(PersohubHashtag.count.desc(), PersohubHashtag.hashtag_text.asc())
-        .limit(6)
-        .all()
-    )
-
-    items: List[PersohubSearchSuggestion] = []
-    items.extend(
-        [
-            PersohubSearchSuggestion(
-                result_type="community",
-                profile_name=community.profile_id,
-                label=community.name,
-                meta="community",
-            )
-            for community in communities
-        ]
-    )
-    items.extend(
-        [
-            PersohubSearchSuggestion(
-                result_type="user",
-                profile_name=user.profile_name or "",
-                label=user.name,
-                meta="user",
-            )
-            for user in users
-            if user.profile_name
-        ]
-    )
-    items.extend(
-        [
-            PersohubSearchSuggestion(
-                result_type="hashtag",
-                profile_name=f"#{tag.hashtag_text}",
-                label=f"#{tag.hashtag_text}",
-                meta=f"{tag.count} posts",
-            )
-            for tag in hashtags
-        ]
-    )
-
-    return PersohubSearchResponse(items=items[:12])
 
-
-@router.get("/persohub/profile/{profile_name}", response_model=PersohubPublicProfileResponse)
-def get_public_profile(
+def _build_public_profile(
+    db: Session,
     profile_name: str,
-    limit: int = Query(default=20, ge=1, le=100),
-    cursor: Optional[str] = Query(default=None),
-    db: Session = Depends(get_db),
-    user: Optional[PdaUser] = Depends(get_optional_pda_user),
-    community_auth: Optional[PersohubCommunity] = Depends(get_optional_persohub_community),
-):
+    *,
+    limit: int,
+    cursor: Optional[str],
+    current_user_id: Optional[int],
+    community_auth_id: Optional[int],
+) -> PersohubPublicProfileResponse:
     key = profile_name.strip().lower()
     offset = _parse_cursor_offset(cursor)
 
     community = db.query(PersohubCommunity).filter(PersohubCommunity.profile_id == key).first()
     if community:
-        community_card = build_community_card(db, community, current_user_id=(user.id if user else None))
-        can_edit_community = bool(community_auth and community_auth.id == community.id)
+        community_card = build_community_card(db, community, current_user_id=current_user_id)
+        can_edit_community = bool(community_auth_id and community_auth_id == community.id)
         follower_count = int(
             db.query(func.count(PersohubCommunityFollow.id))
             .filter(PersohubCommunityFollow.community_id == community.id)
@@ -677,7 +624,7 @@ def get_public_profile(
             about=community.description,
             follower_count=follower_count,
             community=community_card,
-            posts=build_post_responses_bulk(db, posts, current_user_id=(user.id if user else None)),
+            posts=build_post_responses_bulk(db, posts, current_user_id=current_user_id),
             posts_next_cursor=str(next_offset) if has_more else None,
             posts_has_more=has_more,
             can_edit=can_edit_community,
@@ -741,15 +688,34 @@ def get_public_profile(
             }
             for assignment, badge in badges_rows
         ],
-        posts=build_post_responses_bulk(db, mentioned_posts, current_user_id=(user.id if user else None)),
+        posts=build_post_responses_bulk(db, mentioned_posts, current_user_id=current_user_id),
         posts_next_cursor=str(next_offset) if has_more else None,
         posts_has_more=has_more,
-        can_edit=bool(user and user.id == person.id),
+        can_edit=bool(current_user_id and current_user_id == person.id),
+    )
+
+
+@router.get("/persohub/profile/{profile_name}", response_model=PersohubPublicProfileResponse)
+async def get_public_profile(
+    profile_name: str,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    user: Optional[PdaUser] = Depends(get_optional_pda_user_async),
+    community_auth: Optional[PersohubCommunity] = Depends(get_optional_persohub_community_async),
+):
+    return await db.run_sync(
+        _build_public_profile,
+        profile_name,
+        limit=limit,
+        cursor=cursor,
+        current_user_id=(user.id if user else None),
+        community_auth_id=(community_auth.id if community_auth else None),
     )
 
 
 @router.get("/persohub/phase-gate/{phase}", response_model=PersohubPhaseGateStatus)
-def phase_gate_status(phase: str, db: Session = Depends(get_db)):
+def phase_gate_status(phase: str, db: Session = Depends(get_read_db)):
     phase_value = str(phase).strip().lower()
     checks = {}
 
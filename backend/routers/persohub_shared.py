@@ -27,7 +27,7 @@ from persohub_schemas import (
     PersohubPostEventInfo,
     PersohubPostResponse,
 )
-from persohub_service import extract_hashtags, infer_attachment_kind
+from persohub_service import extract_hashtags, infer_attachment_kind, sync_post_hashtags
 from utils import _generate_presigned_get_url_from_s3_url
 
 
@@ -137,32 +137,7 @@ def sync_post_tags_and_mentions(
     post: PersohubPost,
     mention_profile_names: Optional[List[str]],
 ) -> None:
-    hashtag_values = set(extract_hashtags(post.description))
-
-    existing_hashtag_links = (
-        db.query(PersohubPostHashtag, PersohubHashtag)
-        .join(PersohubHashtag, PersohubPostHashtag.hashtag_id == PersohubHashtag.id)
-        .filter(PersohubPostHashtag.post_id == post.id)
-        .all()
-    )
-    existing_hashtags = {tag.hashtag_text: (link, tag) for link, tag in existing_hashtag_links}
-
-    to_remove = [name for name in existing_hashtags.keys() if name not in hashtag_values]
-    to_add = [name for name in hashtag_values if name not in existing_hashtags]
-
-    for name in to_remove:
-        link, tag = existing_hashtags[name]
-        db.delete(link)
-        tag.count = max(0, int(tag.count or 0) - 1)
-
-    for name in to_add:
-        tag = db.query(PersohubHashtag).filter(PersohubHashtag.hashtag_text == name).first()
-        if not tag:
-            tag = PersohubHashtag(hashtag_text=name, count=0)
-            db.add(tag)
-            db.flush()
-        tag.count = int(tag.count or 0) + 1
-        db.add(PersohubPostHashtag(post_id=post.id, hashtag_id=tag.id))
+    sync_post_hashtags(db, post.id, extract_hashtags(post.description))
 
     if mention_profile_names is None:
         return
@@ -1,7 +1,20 @@
-from fastapi import APIRouter, Depends
+import hmac
+import os
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, PlainTextResponse
 from sqlalchemy.orm import Session
 
-from database import get_db
+from audit_log import audit_queue_depth
+from certificate_service import resolve_signed_certificate_path
+from database import engine, get_db, read_engine
+from emailer import email_queue_depth
+from jwt_verify import jwt_verify_stats
+from live_events import live_subscriber_count
+from metrics import render_prometheus
+from password_hashing import password_hash_stats
+from pdf_preview_service import preview_upload_queue_depth
 from models import SystemConfig
 from datetime import datetime
 
@@ -19,6 +32,41 @@ def health_check():
     return {"status": "healthy"}
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics(request: Request):
+    # Fail closed: without a configured token the endpoint does not exist.
+    expected = os.environ.get("METRICS_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    provided = request.headers.get("authorization") or ""
+    if not hmac.compare_digest(provided.encode("utf-8"), f"Bearer {expected}".encode("utf-8")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    limiter = anyio.to_thread.current_default_thread_limiter().statistics()
+    hashing = password_hash_stats()
+    jwt_stats = jwt_verify_stats()
+    pools = {"primary": engine.pool}
+    if read_engine is not engine:
+        pools["read"] = read_engine.pool
+    gauges = {
+        "threadpool_threads": {"busy": limiter.borrowed_tokens, "limit": limiter.total_tokens},
+        "threadpool_waiting_tasks": {"default": limiter.tasks_waiting},
+        "db_pool_connections": {
+            **{f"{name}_checked_out": pool.checkedout() for name, pool in pools.items()},
+            **{f"{name}_size": pool.size() for name, pool in pools.items()},
+        },
+        "background_queue_depth": {
+            "audit_log": audit_queue_depth(),
+            "email": email_queue_depth(),
+            "pdf_preview_upload": preview_upload_queue_depth(),
+            "password_hash": hashing["pending"],
+        },
+        "password_hash_jobs": {key: hashing[key] for key in ("completed", "rejected", "max_pending_seen")},
+        "jwt_verify_events": jwt_stats,
+        "live_event_streams": {"connected": live_subscriber_count()},
+    }
+    return PlainTextResponse(render_prometheus(gauges), media_type="text/plain; version=0.0.4")
+
+
 @router.get("/pda/recruitment-status")
 def get_pda_recruitment_status(db: Session = Depends(get_db)):
     reg_config = db.query(SystemConfig).filter(SystemConfig.key == "pda_recruitment_open").first()
@@ -27,6 +75,16 @@ def get_pda_recruitment_status(db: Session = Depends(get_db)):
     return {"recruitment_open": recruitment_open, "recruit_url": recruit_url}
 
 
+@router.get("/certificates/download")
+def download_certificate(
+    key: str = Query(...),
+    expires: int = Query(...),
+    signature: str = Query(...),
+):
+    path = resolve_signed_certificate_path(key, expires, signature)
+    return FileResponse(str(path), media_type="application/pdf", filename=path.name)
+
+
 @router.get("/routes")
 def list_routes():
     return {
@@ -34,6 +92,7 @@ def list_routes():
         "routes": [
             {"method": "GET", "path": "/"},
             {"method": "GET", "path": "/health"},
+            {"method": "GET", "path": "/metrics"},
             {"method": "GET", "path": "/pda/recruitment-status"},
             {"method": "GET", "path": "/routes"},
             {"method": "POST", "path": "/auth/register"},
@@ -63,6 +122,7 @@ def list_routes():
             {"method": "GET", "path": "/pda/me/events"},
             {"method": "GET", "path": "/pda/me/achievements"},
             {"method": "GET", "path": "/pda/me/certificates/{event_slug}"},
+            {"method": "GET", "path": "/certificates/download"},
             {"method": "GET", "path": "/pda/featured-event"},
             {"method": "GET", "path": "/pda/team"},
             {"method": "GET", "path": "/pda/gallery"},
@@ -104,7 +164,10 @@ def list_routes():
             {"method": "GET", "path": "/pda-admin/events/{slug}/export/leaderboard"},
             {"method": "GET", "path": "/pda-admin/events/{slug}/export/round/{round_id}"},
             {"method": "POST", "path": "/pda-admin/events/{slug}/badges"},
+            {"method": "POST", "path": "/pda-admin/events/{slug}/badges/bulk"},
             {"method": "GET", "path": "/pda-admin/events/{slug}/badges"},
+            {"method": "GET", "path": "/pda-admin/events/{slug}/certificates"},
+            {"method": "POST", "path": "/pda-admin/events/{slug}/certificates/generate"},
             {"method": "GET", "path": "/pda-admin/team"},
             {"method": "POST", "path": "/pda-admin/team"},
             {"method": "PUT", "path": "/pda-admin/team/{member_id}"},
@@ -177,6 +240,8 @@ def list_routes():
             {"method": "POST", "path": "/persohub/admin/persohub-events/{slug}/rounds"},
             {"method": "GET", "path": "/persohub/admin/persohub-events/{slug}/leaderboard"},
             {"method": "GET", "path": "/persohub/admin/persohub-events/{slug}/logs"},
+            {"method": "GET", "path": "/persohub/admin/persohub-events/{slug}/certificates"},
+            {"method": "POST", "path": "/persohub/admin/persohub-events/{slug}/certificates/generate"},
             {"method": "GET", "path": "/persohub/persohub-events/ongoing"},
             {"method": "GET", "path": "/persohub/persohub-events/all"},
             {"method": "GET", "path": "/persohub/persohub-events/{slug}"},
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, text
+from sqlalchemy import and_, or_
 from typing import Dict, List, Optional
 import json
 from sqlalchemy.engine import make_url
@@ -14,7 +14,8 @@ from urllib.request import urlopen
 from fastapi.responses import StreamingResponse
 from openpyxl import Workbook
 
-from database import get_db
+from admin_listing import count_rows, decode_cursor, next_cursor_for, search_filter, set_page_headers
+from database import SessionLocal, get_db
 from models import PdaAdmin, PdaUser, PdaTeam, AdminLog, SystemConfig
 from schemas import (
     PdaAdminCreate,
@@ -25,16 +26,23 @@ from schemas import (
     PdaRecruitmentConfigUpdateRequest,
     SuperadminMigrationStatusResponse,
 )
+from schema_introspection import schema_snapshot
 from security import require_superadmin
 from utils import log_admin_action, _upload_bytes_to_s3, S3_CLIENT, S3_BUCKET_NAME
-from recruitment_state import clear_legacy_recruitment_json, get_recruitment_state, get_recruitment_state_map
-from email_workflows import send_recruitment_review_email
+from recruitment_state import (
+    clear_legacy_recruitment_json,
+    get_recruitment_state,
+    get_recruitment_state_map,
+    recruitment_applied_filter,
+)
+from recruitment_notify import active_notify_job, create_notify_job, get_notify_job, run_notify_job
 
 router = APIRouter()
 DATABASE_URL = os.environ.get("DATABASE_URL")
 DB_RESTORE_CONFIRM_TEXT = "CONFIRM RESTORE"
 DEFAULT_PDA_RECRUIT_URL = "https://chat.whatsapp.com/ErThvhBS77kGJEApiABP2z"
 RECRUITMENT_NOTIFY_MARKER_KEY = "pda_recruitment_whatsapp_notified_once"
+RECRUITMENT_LIST_MAX_PAGE_SIZE = 100
 PERSOHUB_EVENT_NAMESPACE_STATUS_KEY = "migration_persohub_event_namespace_status_v1"
 PERSOHUB_EVENT_NAMESPACE_STATUS_LOG_MARKER_KEY = "migration_persohub_event_namespace_status_log_once_v1"
 PERSOHUB_EVENT_PARITY_STATUS_KEY = "migration_persohub_events_parity_v1"
@@ -55,55 +63,36 @@ def _get_or_create_recruitment_config(db: Session) -> SystemConfig:
     return reg_config
 
 
+def _recruitment_applicants_query(db: Session, *, search: Optional[str] = None):
+    # Newest applicants first; id breaks created_at ties so (created_at, id) works as a keyset.
+    # created_at is nullable, so those rows sort last and get their own branch in the cursor predicate.
+    query = db.query(PdaUser).filter(PdaUser.is_member == False, recruitment_applied_filter(db))
+    matches = search_filter(search, PdaUser.name, PdaUser.regno, PdaUser.profile_name)
+    if matches is not None:
+        query = query.filter(matches)
+    return query.order_by(PdaUser.created_at.desc().nullslast(), PdaUser.id.desc())
+
+
+def _after_recruitment_cursor(created_at, user_id: int):
+    if created_at is None:
+        return and_(PdaUser.created_at.is_(None), PdaUser.id < user_id)
+    return or_(
+        PdaUser.created_at < created_at,
+        and_(PdaUser.created_at == created_at, PdaUser.id < user_id),
+        PdaUser.created_at.is_(None),
+    )
+
+
 def _table_exists(db: Session, table_name: str) -> bool:
-    row = db.execute(
-        text(
-            """
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.tables
-                WHERE table_schema = 'public' AND table_name = :table_name
-            )
-            """
-        ),
-        {"table_name": table_name},
-    ).scalar()
-    return bool(row)
+    return schema_snapshot(db).has_table(table_name)
 
 
 def _column_exists(db: Session, table_name: str, column_name: str) -> bool:
-    row = db.execute(
-        text(
-            """
-            SELECT EXISTS (
-                SELECT 1
-                FROM information_schema.columns
-                WHERE table_schema = 'public'
-                  AND table_name = :table_name
-                  AND column_name = :column_name
-            )
-            """
-        ),
-        {"table_name": table_name, "column_name": column_name},
-    ).scalar()
-    return bool(row)
+    return schema_snapshot(db).has_column(table_name, column_name)
 
 
 def _index_exists(db: Session, index_name: str) -> bool:
-    row = db.execute(
-        text(
-            """
-            SELECT EXISTS (
-                SELECT 1
-                FROM pg_indexes
-                WHERE schemaname = 'public'
-                  AND indexname = :index_name
-            )
-            """
-        ),
-        {"index_name": index_name},
-    ).scalar()
-    return bool(row)
+    return schema_snapshot(db).has_index(index_name)
 
 def _resolve_pg_binary(kind: str) -> str:
     # Allow explicit override first for production/runtime control.
@@ -498,6 +487,8 @@ def get_homeadmin_logs(
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
     log_type: str = Query(default="any"),
+    before_id: Optional[int] = Query(default=None, ge=1),
+    response: Response = None,
 ):
     query = db.query(AdminLog).filter(
         AdminLog.path.like("/api/%"),
@@ -508,7 +499,12 @@ def get_homeadmin_logs(
     elif log_type == "action":
         query = query.filter(AdminLog.action != "Admin API Request")
 
+    if before_id is not None:
+        # Keyset paging: walks the id index instead of scanning past `offset` rows.
+        query = query.filter(AdminLog.id < before_id)
     logs = query.order_by(AdminLog.id.desc()).offset(offset).limit(limit).all()
+    if response is not None and len(logs) == limit:
+        response.headers["X-Next-Before-Id"] = str(logs[-1].id)
     return [AdminLogResponse.model_validate(l) for l in logs]
 
 
@@ -843,44 +839,59 @@ def update_recruitment_config(
     return {"recruitment_open": reg_config.value == "true", "recruit_url": reg_config.recruit_url, "notify_sent_once": notify_sent_once}
 
 
+def _run_recruitment_notify(job_id: str, recruit_url: str) -> None:
+    # The one-time marker is only set once every recipient was attempted; a job cut short by a
+    # restart or an SMTP outage leaves it unset so the admin can run it again, as does a run in
+    # which every attempted mail was rejected.
+    db = SessionLocal()
+    try:
+        job = run_notify_job(db, job_id, recruit_url)
+        if not job or job["status"] != "completed":
+            return
+        if job["sent"] == 0 and job["failed"] > 0:
+            return
+        marker = db.query(SystemConfig).filter(SystemConfig.key == RECRUITMENT_NOTIFY_MARKER_KEY).first()
+        if not marker:
+            db.add(SystemConfig(key=RECRUITMENT_NOTIFY_MARKER_KEY, value="done"))
+        else:
+            marker.value = "done"
+        db.commit()
+    finally:
+        db.close()
+
+
 @router.post("/pda-admin/superadmin/recruitment-notify-existing")
 def notify_existing_recruitment_applicants(
+    background_tasks: BackgroundTasks,
     superadmin: PdaUser = Depends(require_superadmin),
     db: Session = Depends(get_db),
     request: Request = None,
 ):
     marker = db.query(SystemConfig).filter(SystemConfig.key == RECRUITMENT_NOTIFY_MARKER_KEY).first()
     if marker and str(marker.value or "").strip().lower() == "done":
-        return {"already_sent": True, "sent": 0, "total_candidates": 0}
+        return {"already_sent": True, "job_id": None, "status": None, "total_candidates": 0}
 
     reg_config = _get_or_create_recruitment_config(db)
     recruit_url = str(reg_config.recruit_url or "").strip() or DEFAULT_PDA_RECRUIT_URL
 
-    pending_candidates = (
-        db.query(PdaUser)
-        .filter(PdaUser.is_member == False)
-        .order_by(PdaUser.created_at.desc())
-        .all()
-    )
-    recruit_map = get_recruitment_state_map(db, pending_candidates)
-    pending = [user for user in pending_candidates if recruit_map.get(user.id, {}).get("is_applied")]
-
-    sent = 0
-    for candidate in pending:
-        if not candidate.email:
-            continue
-        try:
-            send_recruitment_review_email(candidate.email, candidate.name, recruit_url)
-            sent += 1
-        except Exception:
-            continue
+    # A second click while any worker is still sending gets the running job back, not a new one.
+    running = active_notify_job(db)
+    if running:
+        return {"already_sent": False, "job_id": running["job_id"], "status": running["status"], "total_candidates": running["total"]}
 
-    if not marker:
-        marker = SystemConfig(key=RECRUITMENT_NOTIFY_MARKER_KEY, value="done")
-        db.add(marker)
-    else:
-        marker.value = "done"
-    db.commit()
+    pending = _recruitment_applicants_query(db).all()
+    job = create_notify_job(
+        db,
+        ({"user_id": user.id, "email": user.email, "name": user.name} for user in pending),
+        requested_by=superadmin.id,
+    )
+    if job is None:
+        # Another worker created a job between the check above and this insert.
+        running = active_notify_job(db)
+        if running is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A notification job is already starting")
+        return {"already_sent": False, "job_id": running["job_id"], "status": running["status"], "total_candidates": running["total"]}
+    background_tasks.add_task(_run_recruitment_notify, job["job_id"], recruit_url)
 
     log_admin_action(
         db,
@@ -888,26 +899,53 @@ def notify_existing_recruitment_applicants(
         "notify_existing_recruitment_applicants",
         request.method if request else None,
         request.url.path if request else None,
-        {"sent": sent, "total_candidates": len(pending)},
+        {"job_id": job["job_id"], "total_candidates": job["total"]},
     )
-    return {"already_sent": False, "sent": sent, "total_candidates": len(pending)}
+    return {"already_sent": False, "job_id": job["job_id"], "status": job["status"], "total_candidates": job["total"]}
+
+
+@router.get("/pda-admin/superadmin/recruitment-notify-existing/{job_id}")
+def get_recruitment_notify_job(
+    job_id: str,
+    _: PdaUser = Depends(require_superadmin),
+    db: Session = Depends(get_db),
+):
+    job = get_notify_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification job not found")
+    return job
 
 
 @router.get("/pda-admin/recruitments", response_model=List[PdaUserResponse])
 def list_recruitments(
+    page_size: Optional[int] = Query(default=None, ge=1, le=RECRUITMENT_LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    search: Optional[str] = None,
+    exact_count: bool = False,
+    response: Response = None,
     _: PdaUser = Depends(require_superadmin),
     db: Session = Depends(get_db),
 ):
-    pending_candidates = (
-        db.query(PdaUser)
-        .filter(PdaUser.is_member == False)
-        .order_by(PdaUser.created_at.desc())
-        .all()
-    )
-    recruit_map = get_recruitment_state_map(db, pending_candidates)
-    pending = [user for user in pending_candidates if recruit_map.get(user.id, {}).get("is_applied")]
+    query = _recruitment_applicants_query(db, search=search)
+    if page_size is not None or cursor is not None:
+        page_size = page_size or RECRUITMENT_LIST_MAX_PAGE_SIZE
+        total, estimated = count_rows(db, query, exact=exact_count)
+        if cursor is not None:
+            created_at, user_id = decode_cursor(cursor, 2)
+            query = query.filter(_after_recruitment_cursor(created_at, user_id))
+        pending = query.limit(page_size).all()
+        set_page_headers(
+            response,
+            total=total,
+            estimated=estimated,
+            page_size=page_size,
+            next_cursor=next_cursor_for(pending, page_size, lambda user: (user.created_at, user.id)),
+        )
+    else:
+        pending = query.all()
     if not pending:
         return []
+    recruit_map = get_recruitment_state_map(db, pending)
     pending_ids = [u.id for u in pending]
     team_map = {row.user_id: row for row in db.query(PdaTeam).filter(PdaTeam.user_id.in_(pending_ids)).all()}
     admin_map = {row.user_id: row for row in db.query(PdaAdmin).filter(PdaAdmin.user_id.in_(pending_ids)).all()}
@@ -920,14 +958,8 @@ def export_recruitments(
     db: Session = Depends(get_db),
     request: Request = None,
 ):
-    pending_candidates = (
-        db.query(PdaUser)
-        .filter(PdaUser.is_member == False)
-        .order_by(PdaUser.created_at.desc())
-        .all()
-    )
-    recruit_map = get_recruitment_state_map(db, pending_candidates)
-    pending = [user for user in pending_candidates if recruit_map.get(user.id, {}).get("is_applied")]
+    pending = _recruitment_applicants_query(db).all()
+    recruit_map = get_recruitment_state_map(db, pending)
     wb = Workbook()
     ws = wb.active
     ws.title = "Recruitments"
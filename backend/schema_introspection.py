@@ -0,0 +1,165 @@
+import os
+import re
+import threading
+import time
+import weakref
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+# DDL from this process invalidates immediately; the TTL bounds staleness from DDL run elsewhere.
+SCHEMA_SNAPSHOT_TTL_SECONDS = _int_env("SCHEMA_SNAPSHOT_TTL_SECONDS", 60)
+
+_DDL_RE = re.compile(r"^\s*(CREATE|ALTER|DROP|RENAME|TRUNCATE|COMMENT|DO)\b", re.IGNORECASE)
+
+_PG_TABLES_SQL = """
+    SELECT c.relname
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+      AND c.relkind IN ('r', 'p', 'v', 'm', 'f')
+"""
+_PG_COLUMNS_SQL = """
+    SELECT c.relname, a.attname, t.typname
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_type t ON t.oid = a.atttypid
+    WHERE n.nspname = current_schema()
+      AND c.relkind IN ('r', 'p', 'v', 'm', 'f')
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+"""
+_PG_INDEXES_SQL = "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"
+_PG_CONSTRAINTS_SQL = """
+    SELECT c.relname, con.conname
+    FROM pg_constraint con
+    JOIN pg_class c ON c.oid = con.conrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+"""
+
+
+class SchemaSnapshot:
+    """Tables, columns (with type names), indexes and constraints of the current schema."""
+
+    def __init__(
+        self,
+        tables: Set[str],
+        columns: Dict[str, Dict[str, str]],
+        indexes: Set[str],
+        constraints: Dict[str, Set[str]],
+    ):
+        self.tables = tables
+        self.columns = columns
+        self.indexes = indexes
+        self.constraints = constraints
+        self.loaded_at = time.monotonic()
+
+    def has_table(self, table_name: str) -> bool:
+        return table_name in self.tables
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return column_name in self.columns.get(table_name, {})
+
+    def column_type(self, table_name: str, column_name: str) -> Optional[str]:
+        return self.columns.get(table_name, {}).get(column_name)
+
+    def has_index(self, index_name: str) -> bool:
+        return index_name in self.indexes
+
+    def has_constraint(self, table_name: str, constraint_name: str) -> bool:
+        return constraint_name in self.constraints.get(table_name, set())
+
+
+def _load_postgres_snapshot(conn) -> SchemaSnapshot:
+    tables = {str(row[0]) for row in conn.execute(text(_PG_TABLES_SQL))}
+    columns: Dict[str, Dict[str, str]] = {}
+    for table_name, column_name, type_name in conn.execute(text(_PG_COLUMNS_SQL)):
+        columns.setdefault(str(table_name), {})[str(column_name)] = str(type_name)
+    indexes = {str(row[0]) for row in conn.execute(text(_PG_INDEXES_SQL))}
+    constraints: Dict[str, Set[str]] = {}
+    for table_name, constraint_name in conn.execute(text(_PG_CONSTRAINTS_SQL)):
+        constraints.setdefault(str(table_name), set()).add(str(constraint_name))
+    return SchemaSnapshot(tables, columns, indexes, constraints)
+
+
+def _load_inspector_snapshot(conn) -> SchemaSnapshot:
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    columns: Dict[str, Dict[str, str]] = {}
+    indexes: Set[str] = set()
+    constraints: Dict[str, Set[str]] = {}
+    for table_name in tables:
+        columns[table_name] = {item["name"]: str(item["type"]).lower() for item in inspector.get_columns(table_name)}
+        indexes.update(item["name"] for item in inspector.get_indexes(table_name) if item.get("name"))
+        constraints[table_name] = {
+            item["name"] for item in inspector.get_unique_constraints(table_name) if item.get("name")
+        }
+    return SchemaSnapshot(tables, columns, indexes, constraints)
+
+
+_snapshots: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_listening: "weakref.WeakSet" = weakref.WeakSet()
+_lock = threading.Lock()
+
+
+def invalidate_schema_snapshot(engine=None) -> None:
+    with _lock:
+        if engine is None:
+            _snapshots.clear()
+        else:
+            _snapshots.pop(engine, None)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _DDL_RE.match(statement or ""):
+        conn.info["schema_ddl_pending"] = True
+        invalidate_schema_snapshot(conn.engine)
+
+
+def _after_transaction_end(conn) -> None:
+    # A snapshot read meanwhile may have seen the DDL uncommitted (now rolled back) or not at all (now committed).
+    if conn.info.pop("schema_ddl_pending", False):
+        invalidate_schema_snapshot(conn.engine)
+
+
+def _watch(engine) -> None:
+    with _lock:
+        if engine in _listening:
+            return
+        _listening.add(engine)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "commit", _after_transaction_end)
+    event.listen(engine, "rollback", _after_transaction_end)
+
+
+def schema_snapshot(conn_or_session) -> SchemaSnapshot:
+    """Cached schema snapshot for the engine behind a Connection or Session."""
+    conn = conn_or_session.connection() if isinstance(conn_or_session, Session) else conn_or_session
+    engine = conn.engine
+    with _lock:
+        snapshot = _snapshots.get(engine)
+    if snapshot is not None and time.monotonic() - snapshot.loaded_at < SCHEMA_SNAPSHOT_TTL_SECONDS:
+        return snapshot
+    _watch(engine)
+    if conn.dialect.name == "postgresql":
+        snapshot = _load_postgres_snapshot(conn)
+    else:
+        snapshot = _load_inspector_snapshot(conn)
+    with _lock:
+        _snapshots[engine] = snapshot
+    return snapshot
@@ -342,7 +342,7 @@ class PdaUserResponse(BaseModel):
     is_admin: bool = False
     is_superadmin: bool = False
     policy: Optional[Dict[str, Any]] = None
-    created_at: datetime
+    created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -2136,6 +2136,30 @@ class PdaManagedAttendanceScanRequest(BaseModel):
     round_id: Optional[int] = None
 
 
+class PdaManagedAttendanceScanBulkItem(PdaManagedAttendanceScanRequest):
+    scanned_at: Optional[datetime] = None
+
+
+class PdaManagedAttendanceScanBulkRequest(BaseModel):
+    scans: List[PdaManagedAttendanceScanBulkItem] = Field(..., min_length=1)
+
+
+class PdaManagedAttendanceScanResult(BaseModel):
+    index: int
+    status: Literal["marked", "duplicate", "invalid"]
+    entity_type: Optional[PdaManagedEntityTypeEnum] = None
+    entity_id: Optional[int] = None
+    round_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class PdaManagedAttendanceScanBulkResponse(BaseModel):
+    marked: int
+    duplicates: int
+    invalid: int
+    results: List[PdaManagedAttendanceScanResult]
+
+
 class PdaManagedAttendanceResponse(BaseModel):
     id: int
     event_id: int
@@ -2294,6 +2318,28 @@ class PdaManagedBadgeCreate(BaseModel):
     team_id: Optional[int] = None
 
 
+class PdaManagedBadgeBulkCreate(BaseModel):
+    title: str = Field(..., min_length=2)
+    image_url: Optional[str] = None
+    reveal_video_url: Optional[str] = None
+    place: PdaManagedBadgePlaceEnum
+    score: Optional[float] = None
+    user_ids: List[int] = Field(default_factory=list)
+    team_ids: List[int] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def validate_targets(self):
+        if bool(self.user_ids) == bool(self.team_ids):
+            raise ValueError("Provide either user_ids or team_ids")
+        return self
+
+
+class PdaManagedBadgeBulkCreateResponse(BaseModel):
+    created_count: int
+    skipped_count: int
+    assignment_ids: List[int] = Field(default_factory=list)
+
+
 class PdaManagedBadgeResponse(BaseModel):
     id: int
     event_id: int
@@ -2355,6 +2401,7 @@ class PdaManagedCertificateResponse(BaseModel):
     eligible: bool
     certificate_text: Optional[str] = None
     generated_at: Optional[datetime] = None
+    download_url: Optional[str] = None
 
 
 class PdaManagedQrResponse(BaseModel):
@@ -2951,6 +2998,14 @@ class PersohubManagedAttendanceScanRequest(PdaManagedAttendanceScanRequest):
     pass
 
 
+class PersohubManagedAttendanceScanBulkRequest(PdaManagedAttendanceScanBulkRequest):
+    pass
+
+
+class PersohubManagedAttendanceScanBulkResponse(PdaManagedAttendanceScanBulkResponse):
+    pass
+
+
 class PersohubManagedAttendanceResponse(PdaManagedAttendanceResponse):
     pass
 
@@ -3023,10 +3078,18 @@ class PersohubManagedBadgeCreate(PdaManagedBadgeCreate):
     pass
 
 
+class PersohubManagedBadgeBulkCreate(PdaManagedBadgeBulkCreate):
+    pass
+
+
 class PersohubManagedBadgeResponse(PdaManagedBadgeResponse):
     pass
 
 
+class PersohubManagedBadgeBulkCreateResponse(PdaManagedBadgeBulkCreateResponse):
+    pass
+
+
 class PersohubManagedMyEvent(BaseModel):
     event: PersohubManagedEventResponse
     entity_type: Optional[PersohubManagedEntityTypeEnum] = None
@@ -0,0 +1,328 @@
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from openpyxl import load_workbook
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+
+from attendance_scan import _entity_predicate, _insert_for
+
+SCORE_RATIO_RE = re.compile(r"^\s*([+-]?\d+(?:\.\d+)?)\s*/\s*([+-]?\d+(?:\.\d+)?)\s*$")
+IMPORT_ROW_SAMPLE_LIMIT = 200
+IMPORT_ERROR_LIMIT = 50
+TRUTHY_PRESENT_VALUES = {"yes", "y", "1", "true", "present"}
+FALSY_PRESENT_VALUES = {"no", "n", "0", "false", "absent"}
+
+
+def parse_import_score_value(raw_value, max_marks: float) -> float:
+    if raw_value is None:
+        return 0.0
+    if isinstance(raw_value, (int, float)):
+        value = float(raw_value)
+    else:
+        text = str(raw_value).strip()
+        if not text:
+            return 0.0
+        ratio_match = SCORE_RATIO_RE.match(text)
+        if ratio_match:
+            numerator = float(ratio_match.group(1))
+            denominator = float(ratio_match.group(2))
+            if denominator <= 0:
+                raise ValueError("invalid_denominator")
+            value = (numerator / denominator) * float(max_marks)
+        else:
+            value = float(text)
+    if not math.isfinite(value):
+        raise ValueError("invalid_number")
+    return float(value)
+
+
+def normalize_compare_text(value) -> str:
+    return str(value or "").strip().lower()
+
+
+def _is_blank(value) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _cell(values: tuple, idx: Optional[int]):
+    return values[idx] if idx is not None and idx < len(values) else None
+
+
+def _score_error(name: str, raw, max_marks: float) -> Tuple[Optional[float], Optional[str]]:
+    if raw is None or str(raw).strip() == "":
+        return None, f"{name} is required"
+    try:
+        score = parse_import_score_value(raw, max_marks)
+    except ValueError as exc:
+        if str(exc) == "invalid_denominator":
+            return None, f"Invalid score for {name} (denominator must be > 0)"
+        return None, f"Invalid score for {name}"
+    except Exception:
+        return None, f"Invalid score for {name}"
+    if score < 0 or score > max_marks:
+        return None, f"{name} must be between 0 and {max_marks}"
+    return score, None
+
+
+def evaluate_score_rows(
+    rows: Iterable[tuple],
+    headers: List[str],
+    *,
+    id_col_name: str,
+    name_col_name: str,
+    criteria_max: Dict[str, float],
+    entity_by_identifier: Dict[str, dict],
+    panel_assigned_keys: Optional[Set[Tuple[str, int]]] = None,
+) -> Dict[str, Any]:
+    """Validate sheet rows in one pass; the result backs both preview and import."""
+    headers_norm = {h.lower(): idx for idx, h in enumerate(headers)}
+    id_idx = headers_norm.get(id_col_name)
+    name_idx = headers_norm.get(name_col_name)
+    present_idx = headers_norm.get("present")
+    criteria_columns = [(name, max_marks, headers_norm.get(name.lower())) for name, max_marks in criteria_max.items()]
+    header_count = len(headers)
+    max_total = sum(criteria_max.values()) if criteria_max else 100
+    zero_scores = {name: 0.0 for name in criteria_max.keys()}
+    id_label = id_col_name.title()
+
+    result: Dict[str, Any] = {
+        "total_rows": 0,
+        "valid_rows": [],
+        "identified_rows": [],
+        "mismatched_rows": [],
+        "unidentified_rows": [],
+        "other_required_rows": [],
+        "errors": [],
+    }
+    errors = result["errors"]
+
+    def _reject(bucket: str, row_idx: int, identifier: str, name: str, reason: str) -> None:
+        result[bucket].append({"row": row_idx, "identifier": identifier, "name": name, "reason": reason})
+        if len(errors) < IMPORT_ERROR_LIMIT:
+            errors.append(f"Row {row_idx}: {reason}")
+
+    for row_idx, row in enumerate(rows, start=2):
+        values = tuple(row[:header_count]) if row else ()
+        if all(_is_blank(value) for value in values):
+            continue
+
+        result["total_rows"] += 1
+        identifier = str(_cell(values, id_idx) or "").strip().upper()
+        provided_name = str(_cell(values, name_idx) or "").strip() if name_idx is not None else ""
+
+        if not identifier:
+            _reject("other_required_rows", row_idx, "", provided_name, f"Missing {id_label}")
+            continue
+
+        entity = entity_by_identifier.get(identifier)
+        if not entity:
+            _reject(
+                "unidentified_rows",
+                row_idx,
+                identifier,
+                provided_name,
+                f"{id_label} {identifier} not found in current round participants",
+            )
+            continue
+
+        entity_type_key = "user" if entity.get("entity_type") == "user" else "team"
+        entity_id_value = int(entity["entity_id"])
+        raw_scores = [(name, max_marks, _cell(values, idx)) for name, max_marks, idx in criteria_columns]
+        has_any_score_input = any(raw is not None and str(raw).strip() != "" for _, _, raw in raw_scores)
+
+        is_present = has_any_score_input
+        if present_idx is not None:
+            present_text = str(_cell(values, present_idx) or "").strip().lower()
+            if present_text in TRUTHY_PRESENT_VALUES:
+                is_present = True
+            elif present_text and present_text not in FALSY_PRESENT_VALUES:
+                _reject("other_required_rows", row_idx, identifier, provided_name, "Invalid Present value (use Yes/No)")
+                continue
+
+        if panel_assigned_keys is not None and is_present and (entity_type_key, entity_id_value) not in panel_assigned_keys:
+            _reject(
+                "other_required_rows",
+                row_idx,
+                identifier,
+                provided_name or str(entity.get("name") or ""),
+                "Panel assignment required for present scoring in panel mode",
+            )
+            continue
+
+        if is_present:
+            scores = {}
+            row_errors = []
+            for name, max_marks, raw in raw_scores:
+                score, error = _score_error(name, raw, max_marks)
+                if error:
+                    row_errors.append(error)
+                else:
+                    scores[name] = score
+            if row_errors:
+                _reject("other_required_rows", row_idx, identifier, provided_name, "; ".join(row_errors))
+                continue
+            total = float(sum(scores.values()))
+            normalized = float((total / max_total * 100) if max_total > 0 else 0.0)
+        else:
+            scores = dict(zero_scores)
+            total = 0.0
+            normalized = 0.0
+
+        canonical_name = str(entity.get("name") or "").strip()
+        result["valid_rows"].append(
+            {
+                "row": row_idx,
+                "identifier": identifier,
+                "entity_type": entity_type_key,
+                "user_id": entity_id_value if entity_type_key == "user" else None,
+                "team_id": entity_id_value if entity_type_key == "team" else None,
+                "is_present": is_present,
+                "scores": scores,
+                "total": total,
+                "normalized": normalized,
+            }
+        )
+        if provided_name and canonical_name and normalize_compare_text(provided_name) != normalize_compare_text(canonical_name):
+            result["mismatched_rows"].append(
+                {
+                    "row": row_idx,
+                    "identifier": identifier,
+                    "provided_name": provided_name,
+                    "expected_name": canonical_name,
+                    "reason": "Name does not match canonical record",
+                }
+            )
+        else:
+            result["identified_rows"].append(
+                {"row": row_idx, "identifier": identifier, "name": canonical_name or provided_name}
+            )
+    return result
+
+
+def read_score_import(
+    fileobj,
+    *,
+    id_col_name: str,
+    name_col_name: str,
+    criteria_max: Dict[str, float],
+    entity_by_identifier: Dict[str, dict],
+    panel_assigned_keys: Optional[Set[Tuple[str, int]]] = None,
+) -> Dict[str, Any]:
+    """Stream an uploaded score sheet without materialising the whole workbook."""
+    try:
+        wb = load_workbook(filename=fileobj, read_only=True, data_only=True)
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Excel file") from exc
+    try:
+        ws = wb.active
+        rows = ws.iter_rows(values_only=True)
+        header_row = next(rows, None) or ()
+        headers = [str(value or "").strip() for value in header_row]
+        headers_norm = {h.lower() for h in headers}
+        if id_col_name not in headers_norm:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing '{id_col_name}' column")
+        missing_criteria_headers = [name for name in criteria_max.keys() if name.lower() not in headers_norm]
+        if missing_criteria_headers:
+            missing = ", ".join(missing_criteria_headers)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing criteria columns: {missing}")
+        return evaluate_score_rows(
+            rows,
+            headers,
+            id_col_name=id_col_name,
+            name_col_name=name_col_name,
+            criteria_max=criteria_max,
+            entity_by_identifier=entity_by_identifier,
+            panel_assigned_keys=panel_assigned_keys,
+        )
+    finally:
+        wb.close()
+
+
+def score_import_response(result: Dict[str, Any], *, preview: bool, imported: int) -> Dict[str, Any]:
+    return {
+        "preview": bool(preview),
+        "total_rows": result["total_rows"],
+        "identified_count": len(result["identified_rows"]),
+        "mismatched_count": len(result["mismatched_rows"]),
+        "unidentified_count": len(result["unidentified_rows"]),
+        "other_required_count": len(result["other_required_rows"]),
+        "ready_to_import": len(result["valid_rows"]),
+        "identified_rows": result["identified_rows"][:IMPORT_ROW_SAMPLE_LIMIT],
+        "mismatched_rows": result["mismatched_rows"][:IMPORT_ROW_SAMPLE_LIMIT],
+        "unidentified_rows": result["unidentified_rows"][:IMPORT_ROW_SAMPLE_LIMIT],
+        "other_required_rows": result["other_required_rows"][:IMPORT_ROW_SAMPLE_LIMIT],
+        "imported": int(imported),
+        "errors": result["errors"][:IMPORT_ERROR_LIMIT],
+    }
+
+
+def bulk_upsert_scores(db: Session, score_model, *, event_id: int, round_id: int, rows: List[dict]) -> int:
+    """Write score rows with INSERT .. ON CONFLICT DO UPDATE, one statement per entity type.
+
+    Rows carry ``entity_type`` as "user"/"team" plus ``user_id``/``team_id``,
+    ``scores``, ``total``, ``normalized`` and ``is_present``. Concurrent saves of the
+    same entity resolve on the uq_*_score_entity_user/team partial unique indexes.
+    """
+    if not rows:
+        return 0
+    insert = _insert_for(db)
+    entity_enum = score_model.__table__.c.entity_type.type.enum_class
+    # Last row wins when a sheet lists the same participant twice, matching row-by-row writes.
+    values_by_type: Dict[str, Dict[int, dict]] = {"user": {}, "team": {}}
+    for item in rows:
+        entity_type = item["entity_type"]
+        entity_id = int(item["user_id"] if entity_type == "user" else item["team_id"])
+        values_by_type[entity_type][entity_id] = {
+            "event_id": event_id,
+            "round_id": round_id,
+            "entity_type": entity_enum.USER if entity_type == "user" else entity_enum.TEAM,
+            "user_id": entity_id if entity_type == "user" else None,
+            "team_id": entity_id if entity_type == "team" else None,
+            "criteria_scores": item["scores"],
+            "total_score": item["total"],
+            "normalized_score": item["normalized"],
+            "is_present": bool(item["is_present"]),
+        }
+    db.flush()
+    for entity_type, values in values_by_type.items():
+        if not values:
+            continue
+        id_column = score_model.user_id if entity_type == "user" else score_model.team_id
+        stmt = insert(score_model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[score_model.event_id, score_model.round_id, id_column],
+            index_where=_entity_predicate(entity_type),
+            set_={
+                "criteria_scores": stmt.excluded.criteria_scores,
+                "total_score": stmt.excluded.total_score,
+                "normalized_score": stmt.excluded.normalized_score,
+                "is_present": stmt.excluded.is_present,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt, list(values.values()))
+    return len(rows)
+
+
+def recompute_normalized_scores(db: Session, score_model, *, event_id: int, round_id: int, max_total: float) -> None:
+    """Rewrite ``normalized_score`` for a whole round in one UPDATE (0-100, absentees 0)."""
+    max_total_value = float(max_total or 0.0)
+    if max_total_value <= 0.0:
+        normalized = 0.0
+    else:
+        ratio = func.coalesce(score_model.total_score, 0.0) * (100.0 / max_total_value)
+        normalized = case(
+            (score_model.is_present.is_(False), 0.0),
+            (ratio < 0.0, 0.0),
+            (ratio > 100.0, 100.0),
+            else_=ratio,
+        )
+    db.execute(
+        update(score_model)
+        .where(score_model.event_id == event_id, score_model.round_id == round_id)
+        .values(normalized_score=normalized)
+        .execution_options(synchronize_session="fetch")
+    )
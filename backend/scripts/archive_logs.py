@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Archive old admin/event log rows to gzip JSONL (S3 when configured, else LOG_ARCHIVE_DIR)
+and delete them from the database. Without --apply only counts what would move.
+
+Usage:
+  python3 backend/scripts/archive_logs.py --days 90
+  python3 backend/scripts/archive_logs.py --days 90 --apply
+  python3 backend/scripts/archive_logs.py --table admin_logs --days 30 --apply
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+load_dotenv(ROOT / ".env")
+
+from database import SessionLocal  # noqa: E402
+from log_archive import LOG_TABLES, archive_log_table  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Archive old log rows")
+    parser.add_argument("--days", type=int, default=90, help="Archive rows older than this many days")
+    parser.add_argument("--table", choices=LOG_TABLES, action="append", help="Limit to one or more log tables")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--apply", action="store_true", help="Write archives and delete rows")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        for table_name in args.table or LOG_TABLES:
+            summary = archive_log_table(
+                db,
+                table_name,
+                older_than_days=args.days,
+                chunk_size=args.chunk_size,
+                apply=args.apply,
+            )
+            verb = "archived" if args.apply else "would archive"
+            print(f"{table_name}: {verb} {summary['archived']} rows older than {summary['cutoff']}")
+            for location in summary["files"]:
+                print(f"  {location}")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
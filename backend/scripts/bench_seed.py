@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Seed a large benchmark dataset with PostgreSQL COPY.
+
+Rows carry the existing mock markers (MOCKPDA_ / MOCKPH_), so the regular cleanup
+scripts remove them:
+  python3 backend/scripts/cleanup_full_scale_mock_data.py --include-users
+
+Usage:
+  python3 backend/scripts/bench_seed.py
+  python3 backend/scripts/bench_seed.py --users 100000 --events 200 --participants-per-event 5000 --posts 50000
+  python3 backend/scripts/bench_seed.py --users 2000 --events 5 --participants-per-event 500 --posts 1000
+
+Writes backend/benchmarks/bench_dataset.json describing the seeded slugs and
+credentials for bench_workload.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+load_dotenv(ROOT / ".env")
+
+from sqlalchemy import text  # noqa: E402
+
+from auth import get_password_hash  # noqa: E402
+from database import SessionLocal  # noqa: E402
+from models import (  # noqa: E402
+    PdaAdmin,
+    PdaEvent,
+    PdaEventEntityType,
+    PdaEventFormat,
+    PdaEventParticipantMode,
+    PdaEventRegistration,
+    PdaEventRegistrationStatus,
+    PdaEventRound,
+    PdaEventRoundMode,
+    PdaEventRoundState,
+    PdaEventScore,
+    PdaEventStatus,
+    PdaEventTemplate,
+    PdaEventType,
+    PdaUser,
+    PersohubClub,
+    PersohubCommunity,
+    PersohubCommunityFollow,
+    PersohubPost,
+)
+
+PDA_MARKER = "MOCKPDA_"
+PERSOHUB_MARKER = "MOCKPH_"
+BENCH_PASSWORD = "password"
+DATASET_PATH = ROOT / "benchmarks" / "bench_dataset.json"
+COPY_NULL = "\\N"
+
+
+def _column_default(column):
+    default = column.default
+    if default is None or column.server_default is not None:
+        return None
+    if default.is_callable:
+        return default.arg(None)
+    if default.is_scalar:
+        return default.arg
+    return None
+
+
+def copy_rows(db, model, rows: Iterable[Dict[str, object]], *, batch_size: int = 50000) -> int:
+    """COPY dict rows into ``model``'s table, applying column types and Python-side defaults like the ORM would."""
+    table = model.__table__
+    conn = db.connection()
+    dialect = conn.dialect
+    raw = conn.connection.dbapi_connection
+    columns = None
+    processors = {}
+    defaults = {}
+    written = 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+
+    def _flush() -> None:
+        nonlocal buffer, writer, pending
+        if not pending:
+            return
+        buffer.seek(0)
+        column_sql = ", ".join(f'"{name}"' for name in columns)
+        with raw.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table.name} ({column_sql}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                buffer,
+            )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        pending = 0
+
+    for row in rows:
+        if columns is None:
+            columns = [col.name for col in table.columns if col.name in row or _column_default(col) is not None]
+            for name in columns:
+                col = table.columns[name]
+                processors[name] = col.type.bind_processor(dialect)
+                if name not in row:
+                    defaults[name] = _column_default(col)
+        values = []
+        for name in columns:
+            value = row[name] if name in row else defaults[name]
+            processor = processors[name]
+            if processor is not None and value is not None:
+                value = processor(value)
+            values.append(COPY_NULL if value is None else value)
+        writer.writerow(values)
+        pending += 1
+        written += 1
+        if pending >= batch_size:
+            _flush()
+    _flush()
+    return written
+
+
+def _ids_by(db, sql: str, params: Dict[str, object]) -> Dict[str, int]:
+    return {str(key): int(row_id) for key, row_id in db.execute(text(sql), params).all()}
+
+
+def seed_benchmark(
+    *,
+    users: int,
+    events: int,
+    participants_per_event: int,
+    rounds_per_event: int,
+    communities: int,
+    posts: int,
+    seed: int,
+) -> Dict[str, object]:
+    rng = random.Random(seed)
+    stamp = datetime.now(timezone.utc).strftime("%m%d%H%M%S")
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    counts: Dict[str, int] = {}
+    timings: Dict[str, float] = {}
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        counts["users"] = copy_rows(
+            db,
+            PdaUser,
+            (
+                {
+                    "regno": f"B{stamp}{idx:07d}",
+                    "email": f"mockpda_user_b{stamp}_{idx}@example.local",
+                    "hashed_password": hashed_password,
+                    "name": f"{PDA_MARKER}Bench_{idx}",
+                    "profile_name": f"mockpda_u_b{stamp}_{idx}",
+                    "dept": rng.choice(["Information Technology", "Computer Science", "Electronics", "Mechanical"]),
+                    "gender": rng.choice(["Male", "Female"]),
+                    "is_member": idx == 0,
+                    "json_content": {"marker": PDA_MARKER, "stamp": stamp, "bench": True},
+                }
+                for idx in range(users)
+            ),
+        )
+        user_ids_by_regno = _ids_by(
+            db,
+            "SELECT regno, id FROM users WHERE regno LIKE :prefix",
+            {"prefix": f"B{stamp}%"},
+        )
+        user_ids = [user_ids_by_regno[f"B{stamp}{idx:07d}"] for idx in range(users)]
+        admin_user_id = user_ids[0]
+        db.add(PdaAdmin(user_id=admin_user_id, policy={"home": True, "superAdmin": True, "events": {}}))
+        db.flush()
+        timings["users"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        today = date.today()
+        counts["events"] = copy_rows(
+            db,
+            PdaEvent,
+            (
+                {
+                    "slug": f"mockpda-bench-{stamp}-{idx}",
+                    "event_code": f"MOCKPDA{stamp[-6:]}{idx:04d}"[:20],
+                    "title": f"{PDA_MARKER}Bench_Event_{idx}",
+                    "description": f"{PDA_MARKER}Benchmark event",
+                    "start_date": today + timedelta(days=idx % 30),
+                    "end_date": today + timedelta(days=idx % 30 + 1),
+                    "event_type": PdaEventType.TECHNICAL,
+                    "format": PdaEventFormat.OFFLINE,
+                    "template_option": PdaEventTemplate.ATTENDANCE_SCORING,
+                    "participant_mode": PdaEventParticipantMode.INDIVIDUAL,
+                    "round_mode": PdaEventRoundMode.MULTI,
+                    "round_count": rounds_per_event,
+                    "status": PdaEventStatus.OPEN,
+                    "open_for": "ALL",
+                }
+                for idx in range(events)
+            ),
+        )
+        event_ids_by_slug = _ids_by(
+            db,
+            "SELECT slug, id FROM pda_events WHERE slug LIKE :prefix",
+            {"prefix": f"mockpda-bench-{stamp}-%"},
+        )
+        event_slugs = [f"mockpda-bench-{stamp}-{idx}" for idx in range(events)]
+        criteria = [{"name": "Design", "max_marks": 50}, {"name": "Logic", "max_marks": 50}]
+        counts["rounds"] = copy_rows(
+            db,
+            PdaEventRound,
+            (
+                {
+                    "event_id": event_ids_by_slug[slug],
+                    "round_no": round_no,
+                    "name": f"{PDA_MARKER}Round_{round_no}",
+                    "state": PdaEventRoundState.ACTIVE if round_no == 1 else PdaEventRoundState.DRAFT,
+                    "evaluation_criteria": criteria,
+                }
+                for slug in event_slugs
+                for round_no in range(1, rounds_per_event + 1)
+            ),
+        )
+        first_round_ids = {
+            int(event_id): int(round_id)
+            for event_id, round_id in db.execute(
+                text("SELECT event_id, id FROM pda_event_rounds WHERE round_no = 1 AND event_id = ANY(:ids)"),
+                {"ids": list(event_ids_by_slug.values())},
+            ).all()
+        }
+        timings["events"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        per_event = min(participants_per_event, max(0, users - 1))
+        # Leave the last users unregistered everywhere so the workload can register them.
+        registrant_pool = user_ids[1 : max(1, users - max(1, users // 20))]
+        participants: Dict[int, List[int]] = {
+            event_id: rng.sample(registrant_pool, min(per_event, len(registrant_pool)))
+            for event_id in event_ids_by_slug.values()
+        }
+        counts["registrations"] = copy_rows(
+            db,
+            PdaEventRegistration,
+            (
+                {
+                    "event_id": event_id,
+                    "user_id": user_id,
+                    "entity_type": PdaEventEntityType.USER,
+                    "status": PdaEventRegistrationStatus.ACTIVE,
+                }
+                for event_id, user_ids_for_event in participants.items()
+                for user_id in user_ids_for_event
+            ),
+        )
+        counts["scores"] = copy_rows(
+            db,
+            PdaEventScore,
+            (
+                {
+                    "event_id": event_id,
+                    "round_id": first_round_ids[event_id],
+                    "entity_type": PdaEventEntityType.USER,
+                    "user_id": user_id,
+                    "criteria_scores": {"Design": design, "Logic": logic},
+                    "total_score": design + logic,
+                    "normalized_score": design + logic,
+                    "is_present": True,
+                }
+                for event_id, user_ids_for_event in participants.items()
+                for user_id in user_ids_for_event
+                for design, logic in [(float(rng.randint(0, 50)), float(rng.randint(0, 50)))]
+            ),
+        )
+        timings["registrations_and_scores"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        club = PersohubClub(name=f"{PERSOHUB_MARKER}Club_bench_{stamp}", profile_id=f"mockph-club-b{stamp}")
+        db.add(club)
+        db.flush()
+        counts["communities"] = copy_rows(
+            db,
+            PersohubCommunity,
+            (
+                {
+                    "name": f"{PERSOHUB_MARKER}Community_bench_{idx}",
+                    "profile_id": f"mockph-bench-{stamp}-{idx}",
+                    "club_id": club.id,
+                    "admin_id": admin_user_id,
+                    "description": f"{PERSOHUB_MARKER}Benchmark community",
+                }
+                for idx in range(communities)
+            ),
+        )
+        community_ids = list(
+            _ids_by(
+                db,
+                "SELECT profile_id, id FROM persohub_communities WHERE profile_id LIKE :prefix",
+                {"prefix": f"mockph-bench-{stamp}-%"},
+            ).values()
+        )
+        now = datetime.now(timezone.utc)
+        counts["posts"] = copy_rows(
+            db,
+            PersohubPost,
+            (
+                {
+                    "community_id": community_ids[idx % len(community_ids)],
+                    "admin_id": admin_user_id,
+                    "slug_token": f"bench{stamp}{idx:08d}",
+                    "description": f"{PERSOHUB_MARKER}Benchmark post {idx} #bench",
+                    "like_count": rng.randint(0, 500),
+                    "created_at": now - timedelta(minutes=idx),
+                }
+                for idx in range(posts)
+            ),
+        )
+        counts["follows"] = copy_rows(
+            db,
+            PersohubCommunityFollow,
+            (
+                {"community_id": community_ids[idx % len(community_ids)], "user_id": user_id}
+                for idx, user_id in enumerate(user_ids)
+            ),
+        ) if community_ids else 0
+        timings["persohub"] = time.perf_counter() - started
+
+        db.commit()
+        for table in ("users", "pda_events", "pda_event_rounds", "pda_event_registrations", "pda_event_scores", "persohub_posts"):
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    dataset = {
+        "stamp": stamp,
+        "password": BENCH_PASSWORD,
+        "admin_regno": f"B{stamp}{0:07d}",
+        "unregistered_regnos": [f"B{stamp}{idx:07d}" for idx in range(max(1, users - max(1, users // 20)), users)],
+        "events": [
+            {"slug": slug, "round_id": first_round_ids[event_ids_by_slug[slug]]} for slug in event_slugs
+        ],
+        "counts": counts,
+        "seconds": {key: round(value, 2) for key, value in timings.items()},
+    }
+    DATASET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    DATASET_PATH.write_text(json.dumps(dataset, indent=2))
+    return dataset
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Seed a large benchmark dataset with COPY")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--participants-per-event", type=int, default=5000)
+    parser.add_argument("--rounds-per-event", type=int, default=3)
+    parser.add_argument("--communities", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=26)
+    args = parser.parse_args(argv)
+
+    dataset = seed_benchmark(
+        users=max(2, args.users),
+        events=max(1, args.events),
+        participants_per_event=max(0, args.participants_per_event),
+        rounds_per_event=max(1, args.rounds_per_event),
+        communities=max(1, args.communities),
+        posts=max(0, args.posts),
+        seed=args.seed,
+    )
+    print("Benchmark seed summary")
+    for key, value in dataset["counts"].items():
+        print(f"- {key}: {value}")
+    for key, value in dataset["seconds"].items():
+        print(f"- {key}: {value}s")
+    print(f"Dataset description: {DATASET_PATH}")
+    print("Cleanup command: python backend/scripts/cleanup_full_scale_mock_data.py --include-users")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
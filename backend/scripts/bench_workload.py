@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Drive a scripted workload against a running API and report latency percentiles per endpoint.
+
+Seed first with bench_seed.py, then start the API (e.g. `uvicorn server:app --workers 4`).
+Queries per request come from the /api/metrics endpoint, which only answers when the server has
+METRICS_TOKEN set; export the same METRICS_TOKEN here.
+
+Usage:
+  python3 backend/scripts/bench_workload.py --base-url http://127.0.0.1:8000
+  python3 backend/scripts/bench_workload.py --duration 120 --concurrency 32 --save-baseline main
+  python3 backend/scripts/bench_workload.py --compare main --p95-tolerance 0.2
+
+Scenarios: feed scrolling, leaderboard paging, score saves, registrations, round
+freeze/unfreeze (results publish) and round stats.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DATASET_PATH = ROOT / "benchmarks" / "bench_dataset.json"
+BASELINE_DIR = ROOT / "benchmarks" / "baselines"
+
+# Relative weights of each scenario in the mix.
+SCENARIO_WEIGHTS = {
+    "feed_scroll": 40,
+    "leaderboard_page": 25,
+    "score_save": 15,
+    "round_stats": 10,
+    "registration": 7,
+    "results_publish": 3,
+}
+
+_METRIC_RE = re.compile(r'^(\w+)\{method="([^"]*)",route="([^"]*)"(?:,status="[^"]*")?\}\s+([0-9.eE+-]+)$')
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples: Dict[str, List[float]], errors: Dict[str, int], queries: Dict[str, float]) -> Dict[str, dict]:
+    report = {}
+    for name in sorted(set(samples) | set(errors)):
+        values = samples.get(name, [])
+        report[name] = {
+            "requests": len(values),
+            "errors": int(errors.get(name, 0)),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "queries_per_request": queries.get(name),
+        }
+    return report
+
+
+def compare_to_baseline(
+    current: Dict[str, dict],
+    baseline: Dict[str, dict],
+    *,
+    p95_tolerance: float,
+    query_tolerance: float = 0.0,
+) -> List[str]:
+    """Return human readable regressions of ``current`` against ``baseline``."""
+    regressions = []
+    for name, base in baseline.items():
+        row = current.get(name)
+        if row is None or not row.get("requests"):
+            continue
+        base_p95 = float(base.get("p95_ms") or 0.0)
+        if base_p95 and row["p95_ms"] > base_p95 * (1 + p95_tolerance):
+            regressions.append(f"{name}: p95 {row['p95_ms']}ms vs baseline {base_p95}ms")
+        base_queries = base.get("queries_per_request")
+        queries = row.get("queries_per_request")
+        if base_queries is not None and queries is not None and queries > base_queries * (1 + query_tolerance) + 0.05:
+            regressions.append(f"{name}: {queries} queries/request vs baseline {base_queries}")
+        base_error_rate = base.get("errors", 0) / max(1, base.get("requests", 0) + base.get("errors", 0))
+        error_rate = row["errors"] / max(1, row["requests"] + row["errors"])
+        if error_rate > base_error_rate + 0.01:
+            regressions.append(f"{name}: error rate {error_rate:.1%} vs baseline {base_error_rate:.1%}")
+    return regressions
+
+
+class Client:
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, *, token: Optional[str] = None, body=None) -> Tuple[int, bytes]:
+        data = None
+        headers = {"Accept": "application/json"}
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        req = urllib.request.Request(f"{self.base_url}{path}", data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return resp.status, resp.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+    def login(self, regno: str, password: str) -> str:
+        status_code, payload = self.request("POST", "/api/auth/login", body={"regno": regno, "password": password})
+        if status_code != 200:
+            raise RuntimeError(f"Login failed for {regno}: {status_code} {payload[:200]!r}")
+        return json.loads(payload)["access_token"]
+
+
+def scrape_route_queries(client: Client, token: Optional[str]) -> Dict[Tuple[str, str], Tuple[float, float]]:
+    """Map (method, route) -> (queries, requests) from the Prometheus endpoint."""
+    status_code, payload = client.request("GET", "/api/metrics", token=token)
+    if status_code != 200:
+        return {}
+    queries: Dict[Tuple[str, str], float] = {}
+    requests: Dict[Tuple[str, str], float] = {}
+    for line in payload.decode("utf-8").splitlines():
+        match = _METRIC_RE.match(line)
+        if not match:
+            continue
+        name, method, route, value = match.groups()
+        if name == "http_request_db_queries_total":
+            queries[(method, route)] = float(value)
+        elif name == "http_request_duration_seconds_count":
+            requests[(method, route)] = requests.get((method, route), 0.0) + float(value)
+    return {key: (queries.get(key, 0.0), requests.get(key, 0.0)) for key in set(queries) | set(requests)}
+
+
+# Scenario name -> route template reported by the server metrics.
+SCENARIO_ROUTES = {
+    "feed_scroll": ("GET", "/api/persohub/feed"),
+    "leaderboard_page": ("GET", "/api/pda-admin/events/{slug}/leaderboard"),
+    "score_save": ("POST", "/api/pda-admin/events/{slug}/rounds/{round_id}/scores"),
+    "round_stats": ("GET", "/api/pda-admin/events/{slug}/rounds/{round_id}/stats"),
+    "registration": ("POST", "/api/pda/events/{slug}/register"),
+    "results_publish": ("POST", "/api/pda-admin/events/{slug}/rounds/{round_id}/freeze"),
+}
+
+
+def queries_per_scenario(before, after) -> Dict[str, float]:
+    result = {}
+    for scenario, key in SCENARIO_ROUTES.items():
+        q_after, n_after = after.get(key, (0.0, 0.0))
+        q_before, n_before = before.get(key, (0.0, 0.0))
+        if n_after - n_before > 0:
+            result[scenario] = round((q_after - q_before) / (n_after - n_before), 2)
+    return result
+
+
+class Workload:
+    def __init__(self, client: Client, dataset: dict, admin_token: str, rng: random.Random):
+        self.client = client
+        self.dataset = dataset
+        self.admin_token = admin_token
+        self.rng = rng
+        self.events = dataset["events"]
+        self.unregistered = list(dataset.get("unregistered_regnos") or [])
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._participants: Dict[str, List[int]] = {}
+
+    def _timed(self, name: str, method: str, path: str, *, token=None, body=None, ok=(200,)) -> Optional[bytes]:
+        start = time.perf_counter()
+        status_code, payload = self.client.request(method, path, token=token, body=body)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            if status_code in ok:
+                self.samples.setdefault(name, []).append(elapsed)
+            else:
+                self.errors[name] = self.errors.get(name, 0) + 1
+        return payload if status_code in ok else None
+
+    def _event(self) -> dict:
+        return self.rng.choice(self.events)
+
+    def feed_scroll(self) -> None:
+        cursor = None
+        for _ in range(3):
+            path = "/api/persohub/feed?limit=20" + (f"&cursor={cursor}" if cursor else "")
+            payload = self._timed("feed_scroll", "GET", path)
+            if payload is None:
+                return
+            cursor = json.loads(payload).get("next_cursor")
+            if not cursor:
+                return
+
+    def leaderboard_page(self) -> None:
+        event = self._event()
+        page = self.rng.randint(1, 20)
+        payload = self._timed(
+            "leaderboard_page",
+            "GET",
+            f"/api/pda-admin/events/{event['slug']}/leaderboard?page={page}&page_size=50",
+            token=self.admin_token,
+        )
+        if payload is not None and event["slug"] not in self._participants:
+            data = json.loads(payload)
+            rows = data.get("items") if isinstance(data, dict) else data
+            ids = [int(row["entity_id"]) for row in rows or [] if row.get("entity_id")]
+            if ids:
+                self._participants[event["slug"]] = ids
+
+    def score_save(self) -> None:
+        event = self._event()
+        participants = self._participants.get(event["slug"])
+        if not participants:
+            self.leaderboard_page()
+            participants = self._participants.get(event["slug"])
+            if not participants:
+                return
+        body = [
+            {
+                "entity_type": "user",
+                "user_id": user_id,
+                "team_id": None,
+                "criteria_scores": {"Design": self.rng.randint(0, 50), "Logic": self.rng.randint(0, 50)},
+                "is_present": True,
+            }
+            for user_id in self.rng.sample(participants, min(10, len(participants)))
+        ]
+        self._timed(
+            "score_save",
+            "POST",
+            f"/api/pda-admin/events/{event['slug']}/rounds/{event['round_id']}/scores",
+            token=self.admin_token,
+            body=body,
+        )
+
+    def round_stats(self) -> None:
+        event = self._event()
+        self._timed(
+            "round_stats",
+            "GET",
+            f"/api/pda-admin/events/{event['slug']}/rounds/{event['round_id']}/stats",
+            token=self.admin_token,
+        )
+
+    def registration(self) -> None:
+        with self._lock:
+            if not self.unregistered:
+                return
+            regno = self.unregistered.pop()
+        try:
+            token = self.client.login(regno, self.dataset["password"])
+        except RuntimeError:
+            with self._lock:
+                self.errors["registration"] = self.errors.get("registration", 0) + 1
+            return
+        event = self._event()
+        self._timed("registration", "POST", f"/api/pda/events/{event['slug']}/register", token=token, body={})
+
+    def results_publish(self) -> None:
+        event = self._event()
+        base = f"/api/pda-admin/events/{event['slug']}/rounds/{event['round_id']}"
+        if self._timed("results_publish", "POST", f"{base}/freeze", token=self.admin_token) is not None:
+            # Unfreeze so later score saves keep exercising the write path.
+            self.client.request("POST", f"{base}/unfreeze", token=self.admin_token)
+
+    def run_one(self) -> None:
+        names = list(SCENARIO_WEIGHTS)
+        name = self.rng.choices(names, weights=[SCENARIO_WEIGHTS[item] for item in names])[0]
+        getattr(self, name)()
+
+
+def run(args) -> Dict[str, dict]:
+    dataset = json.loads(Path(args.dataset).read_text())
+    client = Client(args.base_url, args.timeout)
+    admin_token = client.login(dataset["admin_regno"], dataset["password"])
+    metrics_token = os.environ.get("METRICS_TOKEN") or None
+    workload = Workload(client, dataset, admin_token, random.Random(args.seed))
+
+    for _ in range(args.warmup):
+        workload.run_one()
+    workload.samples.clear()
+    workload.errors.clear()
+
+    before = scrape_route_queries(client, metrics_token)
+    deadline = time.monotonic() + args.duration if args.duration else None
+    counter = {"done": 0}
+    counter_lock = threading.Lock()
+
+    def _worker() -> None:
+        while True:
+            with counter_lock:
+                if deadline is None and counter["done"] >= args.iterations:
+                    return
+                counter["done"] += 1
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            workload.run_one()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for future in [pool.submit(_worker) for _ in range(args.concurrency)]:
+            future.result()
+    after = scrape_route_queries(client, metrics_token)
+    return summarize(workload.samples, workload.errors, queries_per_scenario(before, after))
+
+
+def print_report(report: Dict[str, dict]) -> None:
+    print(f"{'scenario':<18}{'reqs':>8}{'errs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q/req':>8}")
+    for name, row in report.items():
+        queries = row["queries_per_request"]
+        print(
+            f"{name:<18}{row['requests']:>8}{row['errors']:>6}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+            f"{row['p99_ms']:>10}{queries if queries is not None else '-':>8}"
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark workload against a running API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--dataset", default=str(DATASET_PATH))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run; 0 uses --iterations")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=26)
+    parser.add_argument("--save-baseline", metavar="NAME", help="Store the report as a named baseline")
+    parser.add_argument("--compare", metavar="NAME", help="Fail when results regress against a named baseline")
+    parser.add_argument("--p95-tolerance", type=float, default=0.2, help="Allowed relative p95 growth")
+    args = parser.parse_args(argv)
+    args.concurrency = max(1, args.concurrency)
+
+    report = run(args)
+    print_report(report)
+
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        path = BASELINE_DIR / f"{args.save_baseline}.json"
+        path.write_text(json.dumps({"created_at": time.time(), "args": vars(args), "report": report}, indent=2))
+        print(f"Saved baseline: {path}")
+
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+        regressions = compare_to_baseline(report, baseline["report"], p95_tolerance=args.p95_tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"- {line}")
+            return 1
+        print(f"No regressions against baseline '{args.compare}'")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Run the chunked data backfills from migrations.py outside of alembic, e.g. to time them first.
+Without --apply every chunk is executed and rolled back (dry run) and nothing is recorded.
+
+Usage:
+  python3 backend/scripts/run_backfills.py
+  python3 backend/scripts/run_backfills.py --only persohub_eliminated_round --chunk-size 2000
+  python3 backend/scripts/run_backfills.py --apply
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+load_dotenv(ROOT / ".env")
+
+from database import engine  # noqa: E402
+from migrations import (  # noqa: E402
+    backfill_persohub_event_eliminated_round_once,
+    backfill_persohub_event_round_numbers_once,
+    enforce_pda_event_entity_uniqueness_once,
+    migrate_event_attendance_to_entry_scope_once,
+)
+
+# Same order as the baseline revision.
+BACKFILLS = {
+    "persohub_round_numbers": backfill_persohub_event_round_numbers_once,
+    "persohub_eliminated_round": backfill_persohub_event_eliminated_round_once,
+    "attendance_entry_scope": migrate_event_attendance_to_entry_scope_once,
+    "pda_entity_uniqueness": enforce_pda_event_entity_uniqueness_once,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run or time chunked data backfills")
+    parser.add_argument("--only", choices=sorted(BACKFILLS), action="append", help="Limit to one or more backfills")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--apply", action="store_true", help="Commit chunks and record progress markers")
+    args = parser.parse_args()
+
+    for name in args.only or BACKFILLS:
+        result = BACKFILLS[name](engine, chunk_size=args.chunk_size, dry_run=not args.apply)
+        reports = result if isinstance(result, list) else [result]
+        if not reports:
+            print(f"{name}: already done")
+        for report in reports:
+            print(
+                f"{name}: {report['status']} {report['marker']} "
+                f"chunks={report['chunks']} rows={report['rows']} seconds={report['seconds']}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
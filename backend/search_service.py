@@ -0,0 +1,183 @@
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
+
+import typeahead_index
+from models import PdaUser, PersohubCommunity, PersohubHashtag
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+# Typeahead answers are short-lived: a new community or hashtag shows up within this many seconds.
+SEARCH_TYPEAHEAD_CACHE_SECONDS = _int_env("SEARCH_TYPEAHEAD_CACHE_SECONDS", 15)
+SEARCH_TYPEAHEAD_CACHE_MAX_ENTRIES = max(1, _int_env("SEARCH_TYPEAHEAD_CACHE_MAX_ENTRIES", 2048))
+SUGGESTIONS_PER_KIND = 6
+SUGGESTIONS_LIMIT = 12
+
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_SUBSTRING = 2
+
+
+def normalize_query(value: Optional[str]) -> str:
+    return " ".join(str(value or "").split()).lower()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains_filter(needle: str, *columns):
+    """ILIKE '%needle%' over ``columns``; served by the pg_trgm GIN indexes on those columns."""
+    pattern = f"%{_escape_like(needle)}%"
+    return or_(*[column.ilike(pattern, escape="\\") for column in columns])
+
+
+def match_rank(needle: str, *columns):
+    """Best of exact (0), prefix (1) or substring (2) match of ``needle`` across ``columns``."""
+    prefix = f"{_escape_like(needle)}%"
+    exact = or_(*[func.lower(column) == needle.lower() for column in columns])
+    starts = or_(*[column.ilike(prefix, escape="\\") for column in columns])
+    return case((exact, RANK_EXACT), (starts, RANK_PREFIX), else_=RANK_SUBSTRING)
+
+
+def search_communities(db: Session, needle: str, limit: int = SUGGESTIONS_PER_KIND) -> List[PersohubCommunity]:
+    columns = (PersohubCommunity.profile_id, PersohubCommunity.name)
+    return (
+        db.query(PersohubCommunity)
+        .filter(contains_filter(needle, *columns))
+        .order_by(match_rank(needle, *columns), PersohubCommunity.name.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+def search_users(db: Session, needle: str, limit: int = SUGGESTIONS_PER_KIND) -> List[PdaUser]:
+    columns = (PdaUser.profile_name, PdaUser.name)
+    return (
+        db.query(PdaUser)
+        .filter(PdaUser.profile_name.isnot(None), contains_filter(needle, *columns))
+        .order_by(match_rank(needle, *columns), PdaUser.name.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+def search_hashtags(db: Session, needle: str, limit: int = SUGGESTIONS_PER_KIND) -> List[PersohubHashtag]:
+    return (
+        db.query(PersohubHashtag)
+        .filter(contains_filter(needle, PersohubHashtag.hashtag_text))
+        .order_by(
+            match_rank(needle, PersohubHashtag.hashtag_text),
+            PersohubHashtag.count.desc(),
+            PersohubHashtag.hashtag_text.asc(),
+        )
+        .limit(limit)
+        .all()
+    )
+
+
+def _community_item(profile_id: str, name: str) -> Dict[str, str]:
+    return {"result_type": "community", "profile_name": profile_id, "label": name, "meta": "community"}
+
+
+def _user_item(profile_name: str, name: str) -> Dict[str, str]:
+    return {"result_type": "user", "profile_name": profile_name, "label": name, "meta": "user"}
+
+
+def _hashtag_item(hashtag_text: str, count: int) -> Dict[str, str]:
+    return {"result_type": "hashtag", "profile_name": f"#{hashtag_text}", "label": f"#{hashtag_text}", "meta": f"{count} posts"}
+
+
+def _index_suggestions(needle: str) -> List[Dict[str, str]]:
+    index = typeahead_index.typeahead_index
+    items: List[Dict[str, str]] = []
+    for record in index.lookup("community", needle, SUGGESTIONS_PER_KIND):
+        items.append(_community_item(record["profile_name"], record["label"]))
+    for record in index.lookup("user", needle, SUGGESTIONS_PER_KIND):
+        items.append(_user_item(record["profile_name"], record["label"]))
+    hashtag_needle = needle.lstrip("#")
+    if hashtag_needle:
+        for record in index.lookup("hashtag", hashtag_needle, SUGGESTIONS_PER_KIND):
+            items.append(_hashtag_item(record["profile_name"], record["count"]))
+    return items[:SUGGESTIONS_LIMIT]
+
+
+def _query_suggestions(db: Session, needle: str) -> List[Dict[str, str]]:
+    items: List[Dict[str, str]] = []
+    for community in search_communities(db, needle):
+        items.append(_community_item(community.profile_id, community.name))
+    for user in search_users(db, needle):
+        items.append(_user_item(user.profile_name, user.name))
+    hashtag_needle = needle.lstrip("#")
+    if hashtag_needle:
+        for tag in search_hashtags(db, hashtag_needle):
+            items.append(_hashtag_item(tag.hashtag_text, tag.count))
+    return items[:SUGGESTIONS_LIMIT]
+
+
+_lock = threading.Lock()
+_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _cached(needle: str) -> Optional[List[Dict[str, str]]]:
+    with _lock:
+        entry = _cache.get(needle)
+        if entry is None:
+            return None
+        expires_at, items = entry
+        if expires_at <= time.monotonic():
+            _cache.pop(needle, None)
+            return None
+        _cache.move_to_end(needle)
+    return copy.deepcopy(items)
+
+
+def _remember(needle: str, items: List[Dict[str, str]]) -> None:
+    with _lock:
+        _cache[needle] = (time.monotonic() + SEARCH_TYPEAHEAD_CACHE_SECONDS, copy.deepcopy(items))
+        _cache.move_to_end(needle)
+        while len(_cache) > SEARCH_TYPEAHEAD_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def clear_search_cache() -> None:
+    with _lock:
+        _cache.clear()
+
+
+def typeahead_suggestions(db: Session, query: Optional[str]) -> List[Dict[str, str]]:
+    """Ranked community, user and hashtag suggestions for a typeahead query.
+
+    With SEARCH_TYPEAHEAD_INDEX_ENABLED the answer comes from the in-process prefix index once it
+    is warm; until then (or while a bulk change has it rebuilding) the DB path below is used.
+    """
+    needle = normalize_query(query)
+    if not needle:
+        return []
+    if typeahead_index.TYPEAHEAD_INDEX_ENABLED:
+        if typeahead_index.typeahead_index.is_warm():
+            return _index_suggestions(needle)
+        typeahead_index.schedule_rebuild()
+    if SEARCH_TYPEAHEAD_CACHE_SECONDS <= 0:
+        return _query_suggestions(db, needle)
+    items = _cached(needle)
+    if items is None:
+        items = _query_suggestions(db, needle)
+        _remember(needle, items)
+    return items
@@ -3,10 +3,12 @@ from typing import Optional, Dict
 from fastapi import Depends, HTTPException, status
 from fastapi import Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_async_db, get_db
 from auth import decode_token, get_current_pda_user
+from principal_cache import cache_principal, get_cached_principal, permission_version
 from models import (
     PdaUser,
     PdaAdmin,
@@ -23,12 +25,45 @@ from models import (
 logger = logging.getLogger(__name__)
 
 
-def _get_team_and_policy(db: Session, user: PdaUser):
-    team = db.query(PdaTeam).filter(PdaTeam.user_id == user.id).first()
-    admin_row = db.query(PdaAdmin).filter(PdaAdmin.user_id == user.id).first()
-    policy: Optional[Dict[str, bool]] = admin_row.policy if admin_row else None
-    is_superadmin = bool(admin_row and policy and policy.get("superAdmin"))
-    return team, admin_row, policy, is_superadmin
+def _auth_token_id(request: Optional[Request]) -> Optional[str]:
+    return getattr(getattr(request, "state", None), "auth_token_id", None)
+
+
+def _admin_principal(db: Session, user: PdaUser, request: Optional[Request] = None) -> dict:
+    """PDA admin flags for the caller, resolved once per token while permissions are unchanged."""
+    token_id = _auth_token_id(request)
+    cached = get_cached_principal(token_id, "pda_admin")
+    if cached is not None:
+        return cached
+    version = permission_version()
+    row = (
+        db.query(
+            PdaAdmin.id.label("admin_id"),
+            PdaAdmin.policy.label("policy"),
+            PdaTeam.id.label("team_id"),
+            PdaTeam.team.label("team"),
+            PdaTeam.designation.label("designation"),
+        )
+        .select_from(PdaUser)
+        .outerjoin(PdaAdmin, PdaAdmin.user_id == PdaUser.id)
+        .outerjoin(PdaTeam, PdaTeam.user_id == PdaUser.id)
+        .filter(PdaUser.id == user.id)
+        .first()
+    )
+    has_admin_row = bool(row and row.admin_id is not None)
+    policy = row.policy if has_admin_row and isinstance(row.policy, dict) else None
+    principal = {
+        "has_admin_row": has_admin_row,
+        "policy": policy,
+        "is_superadmin": bool(has_admin_row and policy and policy.get("superAdmin")),
+        "team": (
+            {"id": row.team_id, "team": row.team, "designation": row.designation}
+            if row and row.team_id is not None
+            else None
+        ),
+    }
+    cache_principal(token_id, "pda_admin", principal, version=version)
+    return principal
 
 
 def _can_access_event_policy(policy: Optional[Dict[str, bool]], event_slug: str) -> bool:
@@ -46,13 +81,15 @@ def require_pda_user(user: PdaUser = Depends(get_current_pda_user)) -> PdaUser:
 
 def require_pda_admin_policy(policy_key: str):
     def _checker(
+        request: Request,
         user: PdaUser = Depends(get_current_pda_user),
         db: Session = Depends(get_db)
     ) -> PdaUser:
-        team, admin_row, policy, is_superadmin = _get_team_and_policy(db, user)
-        if is_superadmin:
+        principal = _admin_principal(db, user, request)
+        if principal["is_superadmin"]:
             return user
-        if not admin_row or not policy or not policy.get(policy_key):
+        policy = principal["policy"]
+        if not principal["has_admin_row"] or not policy or not policy.get(policy_key):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin policy does not allow access")
         return user
 
@@ -64,11 +101,12 @@ def require_pda_home_admin(user: PdaUser = Depends(require_pda_admin_policy("hom
 
 
 def require_superadmin(
+    request: Request,
     user: PdaUser = Depends(get_current_pda_user),
     db: Session = Depends(get_db)
 ) -> PdaUser:
-    _, admin_row, policy, is_superadmin = _get_team_and_policy(db, user)
-    if not admin_row or not policy or not is_superadmin:
+    principal = _admin_principal(db, user, request)
+    if not principal["has_admin_row"] or not principal["policy"] or not principal["is_superadmin"]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Superadmin access required")
     return user
 
@@ -78,40 +116,32 @@ def require_pda_event_admin(
     user: PdaUser = Depends(get_current_pda_user),
     db: Session = Depends(get_db)
 ) -> PdaUser:
-    _, admin_row, policy, is_superadmin = _get_team_and_policy(db, user)
-    if is_superadmin:
+    principal = _admin_principal(db, user, request)
+    if principal["is_superadmin"]:
         return user
 
     event_slug = request.path_params.get("event_slug") or request.path_params.get("slug")
     if not event_slug:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing event slug")
 
-    if not admin_row or not _can_access_event_policy(policy, event_slug):
+    if not principal["has_admin_row"] or not _can_access_event_policy(principal["policy"], event_slug):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin policy does not allow access to this event")
     return user
 
 
 def get_admin_context(
+    request: Request,
     user: PdaUser = Depends(get_current_pda_user),
     db: Session = Depends(get_db)
 ):
-    team, admin_row, policy, is_superadmin = _get_team_and_policy(db, user)
-    return {
-        "team": team,
-        "admin_row": admin_row,
-        "policy": policy,
-        "is_superadmin": is_superadmin
-    }
+    return _admin_principal(db, user, request)
 
 
 optional_bearer = HTTPBearer(auto_error=False)
 community_bearer = HTTPBearer(auto_error=False)
 
 
-def get_optional_pda_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
-    db: Session = Depends(get_db),
-) -> Optional[PdaUser]:
+def _optional_pda_regno(credentials: Optional[HTTPAuthorizationCredentials]) -> Optional[str]:
     if not credentials:
         return None
     try:
@@ -120,10 +150,34 @@ def get_optional_pda_user(
         return None
     if payload.get("type") != "access" or payload.get("user_type") != "pda":
         return None
-    regno = payload.get("sub")
+    return payload.get("sub") or None
+
+
+def _pda_user_by_regno(db: Session, regno: str) -> Optional[PdaUser]:
+    return db.query(PdaUser).filter(PdaUser.regno == regno).first()
+
+
+def get_optional_pda_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+    db: Session = Depends(get_db),
+) -> Optional[PdaUser]:
+    regno = _optional_pda_regno(credentials)
+    if not regno:
+        return None
+    return _pda_user_by_regno(db, regno)
+
+
+async def get_optional_pda_user_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[PdaUser]:
+    """``get_optional_pda_user`` for async routes: the lookup shares the route's ``get_async_db`` session,
+    so with the asyncpg engine on the request never touches the sync pool. The user comes back
+    detached; read its columns only."""
+    regno = _optional_pda_regno(credentials)
     if not regno:
         return None
-    return db.query(PdaUser).filter(PdaUser.regno == regno).first()
+    return await db.run_sync(_pda_user_by_regno, regno)
 
 
 def _normalize_persohub_event_policy(policy: Optional[dict]) -> dict:
@@ -204,6 +258,9 @@ def _resolve_persohub_actor_user(
         actor_user_id = int(community.admin_id or 0)
     if actor_user_id <= 0:
         return None
+    request_user = getattr(getattr(request, "state", None), "pda_user", None)
+    if request_user is not None and int(request_user.id) == actor_user_id:
+        return request_user
     return db.query(PdaUser).filter(PdaUser.id == actor_user_id).first()
 
 
@@ -288,6 +345,48 @@ def is_persohub_actor_events_access_approved(request: Optional[Request] = None)
     return bool(getattr(getattr(request, "state", None), "persohub_events_access_approved", False))
 
 
+def _resolve_persohub_principal(
+    db: Session,
+    community: PersohubCommunity,
+    user_id: int,
+    request: Optional[Request] = None,
+) -> dict:
+    if not community.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Community account is inactive")
+
+    resolved_club_id = int(community.club_id or 0)
+    if resolved_club_id <= 0:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Community not linked to a club")
+
+    club = db.query(PersohubClub).filter(PersohubClub.id == resolved_club_id).first()
+    if not club:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Club not found")
+    if request is not None:
+        request.state.persohub_actor_club = club
+
+    membership_rows = _club_memberships_for_user(db, club_id=resolved_club_id, user_id=user_id)
+    membership_community_ids = {int(row[1].id) for row in membership_rows}
+    is_pda_superadmin = _is_pda_superadmin_user(db, user_id)
+    is_club_owner = int(club.owner_user_id or 0) == user_id or is_pda_superadmin
+    is_club_superadmin_user = _is_persohub_club_superadmin_user(db, int(club.id), user_id)
+    if not is_club_owner and not is_club_superadmin_user and not membership_rows:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Community admin access revoked")
+    if not is_club_owner and not is_club_superadmin_user and int(community.id) not in membership_community_ids:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Community admin access revoked")
+    event_policy = _merge_persohub_admin_policy([row[0] for row in membership_rows])
+    return {
+        "club_id": resolved_club_id,
+        "actor_role": "owner" if is_club_owner else ("superadmin" if is_club_superadmin_user else "admin"),
+        "is_club_owner": bool(is_club_owner),
+        "is_club_superadmin": bool(is_club_superadmin_user),
+        "event_policy": _normalize_persohub_event_policy(event_policy),
+        "can_access_events": bool(is_club_owner or is_club_superadmin_user or any(bool(value) for value in event_policy["events"].values())),
+        "events_access_status": get_persohub_club_events_access_status(club),
+        "events_access_approved": bool(is_persohub_club_events_access_approved(club)),
+        "events_access_review_note": (str(getattr(club, "persohub_events_access_review_note", "") or "").strip() or None),
+    }
+
+
 def require_persohub_community(
     request: Request,
     user: PdaUser = Depends(get_current_pda_user),
@@ -310,52 +409,35 @@ def require_persohub_community(
     )
     if not community:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Community account not found")
-    if not community.is_active:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Community account is inactive")
-
-    resolved_club_id = int(community.club_id or 0)
-    if resolved_club_id <= 0:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Community not linked to a club")
-
-    user_id = int(user.id)
-    club = db.query(PersohubClub).filter(PersohubClub.id == resolved_club_id).first()
-    if not club:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Club not found")
 
-    membership_rows = _club_memberships_for_user(db, club_id=resolved_club_id, user_id=user_id)
-    membership_community_ids = {int(row[1].id) for row in membership_rows}
-    is_pda_superadmin = _is_pda_superadmin_user(db, user_id)
-    is_club_owner = int(club.owner_user_id or 0) == user_id or is_pda_superadmin
-    is_club_superadmin_user = _is_persohub_club_superadmin_user(db, int(club.id), user_id)
-    if not is_club_owner and not is_club_superadmin_user and not membership_rows:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Community admin access revoked")
-    if not is_club_owner and not is_club_superadmin_user and int(community.id) not in membership_community_ids:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Community admin access revoked")
-    event_policy = _merge_persohub_admin_policy([row[0] for row in membership_rows])
-    can_access_events = bool(is_club_owner or is_club_superadmin_user or any(bool(value) for value in event_policy["events"].values()))
+    token_id = _auth_token_id(request)
+    cache_scope = f"persohub_community:{int(community.id)}"
+    principal = get_cached_principal(token_id, cache_scope)
+    if principal is None:
+        version = permission_version()
+        principal = _resolve_persohub_principal(db, community, int(user.id), request)
+        cache_principal(token_id, cache_scope, principal, version=version)
+
+    is_club_owner = principal["is_club_owner"]
+    is_club_superadmin_user = principal["is_club_superadmin"]
+    can_access_events = principal["can_access_events"]
     path = str(getattr(request.url, "path", "") or "")
     if path.startswith("/api/persohub/admin/") and not (is_club_owner or is_club_superadmin_user):
         is_events_admin_path = path.startswith("/api/persohub/admin/persohub-events")
         if not (is_events_admin_path and can_access_events):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Club admin access required")
 
-    actor_user_id = user_id
-    actor_role = "owner" if is_club_owner else ("superadmin" if is_club_superadmin_user else "admin")
-    actor_club_id = resolved_club_id
-    events_access_status = get_persohub_club_events_access_status(club)
-    events_access_approved = is_persohub_club_events_access_approved(club)
-
-    request.state.persohub_actor_user_id = actor_user_id
-    request.state.persohub_actor_role = actor_role
+    request.state.persohub_actor_user_id = int(user.id)
+    request.state.persohub_actor_role = principal["actor_role"]
     request.state.persohub_actor_community_id = int(community.id)
-    request.state.persohub_actor_club_id = int(actor_club_id or int(community.club_id or 0) or 0)
+    request.state.persohub_actor_club_id = principal["club_id"]
     request.state.persohub_is_club_owner = bool(is_club_owner)
     request.state.persohub_is_club_superadmin = bool(is_club_superadmin_user)
-    request.state.persohub_event_policy = _normalize_persohub_event_policy(event_policy)
+    request.state.persohub_event_policy = principal["event_policy"]
     request.state.persohub_can_access_events = bool(can_access_events)
-    request.state.persohub_events_access_status = events_access_status
-    request.state.persohub_events_access_approved = bool(events_access_approved)
-    request.state.persohub_events_access_review_note = (str(getattr(club, "persohub_events_access_review_note", "") or "").strip() or None)
+    request.state.persohub_events_access_status = principal["events_access_status"]
+    request.state.persohub_events_access_approved = bool(principal["events_access_approved"])
+    request.state.persohub_events_access_review_note = principal["events_access_review_note"]
     request.state.persohub_token_user_type = "pda"
     return community
 
@@ -398,7 +480,9 @@ def require_persohub_event_admin(
         actor_club_id = get_persohub_actor_club_id(request) or int(community.club_id or 0)
         if actor_club_id <= 0 or not event or int(event.club_id or 0) != int(actor_club_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
-        club = db.query(PersohubClub).filter(PersohubClub.id == int(event.club_id or 0)).first()
+        club = getattr(request.state, "persohub_actor_club", None)
+        if club is None or int(club.id) != int(event.club_id or 0):
+            club = db.query(PersohubClub).filter(PersohubClub.id == int(event.club_id or 0)).first()
         if not is_persohub_event_access_approved(event, club):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Event access pending C&C approval")
         if not (is_persohub_club_owner(request) or is_persohub_club_superadmin(request)):
@@ -434,13 +518,7 @@ def get_persohub_admin_context(
     }
 
 
-def get_optional_persohub_community(
-    request: Request,
-    user: Optional[PdaUser] = Depends(get_optional_pda_user),
-    db: Session = Depends(get_db),
-) -> Optional[PersohubCommunity]:
-    if not user:
-        return None
+def _selected_persohub_community_id(request: Request) -> Optional[int]:
     raw_community_id = str(request.headers.get("X-Persohub-Community-Id") or "").strip()
     if not raw_community_id:
         return None
@@ -450,7 +528,10 @@ def get_optional_persohub_community(
         return None
     if selected_community_id <= 0:
         return None
+    return selected_community_id
+
 
+def _optional_persohub_community(db: Session, selected_community_id: int, user_id: int) -> Optional[PersohubCommunity]:
     community = (
         db.query(PersohubCommunity)
         .filter(
@@ -465,7 +546,6 @@ def get_optional_persohub_community(
     if club_id <= 0:
         return None
 
-    user_id = int(user.id)
     club = db.query(PersohubClub).filter(PersohubClub.id == club_id).first()
     if not club:
         return None
@@ -477,3 +557,26 @@ def get_optional_persohub_community(
         if int(member_community.id) == int(community.id):
             return community
     return None
+
+
+def get_optional_persohub_community(
+    request: Request,
+    user: Optional[PdaUser] = Depends(get_optional_pda_user),
+    db: Session = Depends(get_db),
+) -> Optional[PersohubCommunity]:
+    selected_community_id = _selected_persohub_community_id(request) if user else None
+    if selected_community_id is None:
+        return None
+    return _optional_persohub_community(db, selected_community_id, int(user.id))
+
+
+async def get_optional_persohub_community_async(
+    request: Request,
+    user: Optional[PdaUser] = Depends(get_optional_pda_user_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[PersohubCommunity]:
+    """Async-session counterpart of ``get_optional_persohub_community``."""
+    selected_community_id = _selected_persohub_community_id(request) if user else None
+    if selected_community_id is None:
+        return None
+    return await db.run_sync(_optional_persohub_community, selected_community_id, int(user.id))
@@ -7,10 +7,15 @@ import os
 import logging
 import time
 
-from database import SessionLocal
-from models import PdaUser
+from database import SessionLocal, dispose_async_engine
+from models import AdminLog, PdaUser
 from auth import decode_token
-from utils import log_admin_action
+from audit_log import enqueue_audit_record, shutdown_audit_writer
+from utils import admin_log_values
+from pdf_preview_service import shutdown_preview_executors
+from password_hashing import shutdown_password_executor
+from live_events import shutdown_live_events
+from metrics import begin_request, end_request, record_request
 
 from routers import public, auth_pda, pda_public, pda_admin, superadmin, pda_cc_admin
 from routers import pda_events, pda_events_admin
@@ -44,12 +49,47 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count", "X-Page", "X-Page-Size"],
+    expose_headers=["X-Total-Count", "X-Total-Count-Estimated", "X-Page", "X-Page-Size", "X-Next-Before-Id", "X-Next-Cursor", "Retry-After"],
 )
 
+@app.on_event("shutdown")
+def shutdown_background_executors():
+    shutdown_audit_writer()
+    shutdown_preview_executors()
+    shutdown_password_executor()
+    shutdown_live_events()
+
+
+@app.on_event("shutdown")
+async def shutdown_async_engine():
+    await dispose_async_engine()
+
+
 # Mount static files for uploads
 app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
+def _admin_request_actor(request):
+    # Only reached when no auth dependency ran (e.g. the request failed before the handler).
+    auth_header = request.headers.get("authorization") or ""
+    token = ""
+    if auth_header.lower().startswith("bearer "):
+        token = auth_header.split(" ", 1)[1].strip()
+    if not token:
+        return None
+    payload = decode_token(token)
+    if payload.get("type") != "access" or payload.get("user_type") != "pda":
+        return None
+    regno = payload.get("sub")
+    if not regno:
+        return None
+    db = SessionLocal()
+    try:
+        user = db.query(PdaUser).filter(PdaUser.regno == regno).first()
+        return {"id": user.id, "regno": user.regno, "name": user.name} if user else None
+    finally:
+        db.close()
+
+
 @app.middleware("http")
 async def admin_audit_middleware(request, call_next):
     start = time.perf_counter()
@@ -60,38 +100,52 @@ async def admin_audit_middleware(request, call_next):
         if method not in {"POST", "PUT", "PATCH", "DELETE"}:
             return response
         try:
-            auth_header = request.headers.get("authorization") or ""
-            token = ""
-            if auth_header.lower().startswith("bearer "):
-                token = auth_header.split(" ", 1)[1].strip()
-            if token:
-                payload = decode_token(token)
-                if payload.get("type") == "access" and payload.get("user_type") == "pda":
-                    regno = payload.get("sub")
-                    if regno:
-                        db = SessionLocal()
-                        try:
-                            user = db.query(PdaUser).filter(PdaUser.regno == regno).first()
-                            if user:
-                                duration_ms = int((time.perf_counter() - start) * 1000)
-                                log_admin_action(
-                                    db,
-                                    user,
-                                    "Admin API Request",
-                                    method=method,
-                                    path=path,
-                                    meta={
-                                        "kind": "request",
-                                        "status_code": response.status_code,
-                                        "duration_ms": duration_ms,
-                                    },
-                                )
-                        finally:
-                            db.close()
+            actor = getattr(request.state, "auth_actor", None)
+            if not actor:
+                actor = _admin_request_actor(request)
+            if actor:
+                duration_ms = int((time.perf_counter() - start) * 1000)
+                values = admin_log_values(
+                    actor["id"],
+                    actor["regno"],
+                    actor["name"],
+                    "Admin API Request",
+                    method=method,
+                    path=path,
+                    meta={
+                        "kind": "request",
+                        "status_code": response.status_code,
+                        "duration_ms": duration_ms,
+                    },
+                )
+                if not enqueue_audit_record(AdminLog, values):
+                    db = SessionLocal()
+                    try:
+                        db.add(AdminLog(**values))
+                        db.commit()
+                    finally:
+                        db.close()
         except Exception:
             logger.exception("Failed to log admin request")
     return response
 
+
+@app.middleware("http")
+async def request_metrics_middleware(request, call_next):
+    start = time.perf_counter()
+    stats, token = begin_request()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        end_request(token)
+        route = request.scope.get("route")
+        # Label by route template, never the raw path, to keep series bounded.
+        route_path = getattr(route, "path", None) or "unmatched"
+        record_request(request.method.upper(), route_path, status_code, time.perf_counter() - start, stats)
+
 # Routers
 app.include_router(public.router, prefix="/api")
 app.include_router(auth_pda.router, prefix="/api")
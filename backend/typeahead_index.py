@@ -0,0 +1,300 @@
+import bisect
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import PdaUser, PersohubCommunity, PersohubHashtag
+
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+def _bool_env(name: str, default: bool = False) -> bool:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+# Off by default. The index is per process and only sees commits made by this process, so
+# with several workers a change made elsewhere shows up here only after the next rebuild.
+TYPEAHEAD_INDEX_ENABLED = _bool_env("SEARCH_TYPEAHEAD_INDEX_ENABLED", False)
+# Above this many rows in any source table the index stays cold and search uses the DB.
+TYPEAHEAD_INDEX_MAX_ROWS = _int_env("SEARCH_TYPEAHEAD_INDEX_MAX_ROWS", 200000)
+# Upper bound on keys examined per lookup, so one-letter queries stay cheap.
+TYPEAHEAD_INDEX_SCAN_LIMIT = max(1, _int_env("SEARCH_TYPEAHEAD_INDEX_SCAN_LIMIT", 2000))
+
+KINDS = ("community", "user", "hashtag")
+_MODEL_KINDS = ((PersohubCommunity, "community"), (PdaUser, "user"), (PersohubHashtag, "hashtag"))
+
+_RANK_EXACT = 0
+_RANK_PREFIX = 1
+_RANK_WORD_PREFIX = 2
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join(str(value or "").split()).lower()
+
+
+def _record_for(obj) -> Optional[dict]:
+    """Indexable fields of a model row, or None when the row is not searchable."""
+    if isinstance(obj, PdaUser):
+        if not obj.profile_name:
+            return None
+        return {"profile_name": obj.profile_name, "label": obj.name or "", "fields": (obj.profile_name, obj.name), "count": 0}
+    if isinstance(obj, PersohubCommunity):
+        return {"profile_name": obj.profile_id, "label": obj.name or "", "fields": (obj.profile_id, obj.name), "count": 0}
+    if isinstance(obj, PersohubHashtag):
+        return {
+            "profile_name": obj.hashtag_text,
+            "label": obj.hashtag_text,
+            "fields": (obj.hashtag_text,),
+            "count": int(obj.count or 0),
+        }
+    return None
+
+
+def _keys_for(record: dict) -> List[str]:
+    keys = set()
+    for field in record["fields"]:
+        normalized = _normalize(field)
+        if not normalized:
+            continue
+        keys.add(normalized)
+        keys.update(normalized.split(" "))
+    return sorted(keys)
+
+
+class TypeaheadIndex:
+    """Sorted (key, id) arrays per kind; prefix lookups are a bisect plus a short scan."""
+
+    def __init__(self, max_rows: int = TYPEAHEAD_INDEX_MAX_ROWS, scan_limit: int = TYPEAHEAD_INDEX_SCAN_LIMIT):
+        self.max_rows = max_rows
+        self.scan_limit = scan_limit
+        self._lock = threading.Lock()
+        self._keys: Dict[str, List[Tuple[str, int]]] = {kind: [] for kind in KINDS}
+        self._records: Dict[str, Dict[int, dict]] = {kind: {} for kind in KINDS}
+        self._warm = False
+        self._stale = set()
+        self._building = False
+        self._journal: List[tuple] = []
+
+    def is_warm(self) -> bool:
+        with self._lock:
+            return self._warm and not self._stale
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = {kind: [] for kind in KINDS}
+            self._records = {kind: {} for kind in KINDS}
+            self._warm = False
+            self._stale = set()
+            self._journal = []
+
+    def _remove_locked(self, kind: str, ident: int) -> None:
+        record = self._records[kind].pop(ident, None)
+        if record is None:
+            return
+        keys = self._keys[kind]
+        for key in _keys_for(record):
+            position = bisect.bisect_left(keys, (key, ident))
+            if position < len(keys) and keys[position] == (key, ident):
+                keys.pop(position)
+
+    def _upsert_locked(self, kind: str, ident: int, record: Optional[dict]) -> None:
+        self._remove_locked(kind, ident)
+        if record is None:
+            return
+        self._records[kind][ident] = record
+        for key in _keys_for(record):
+            bisect.insort(self._keys[kind], (key, ident))
+
+    def _apply_locked(self, op: tuple) -> None:
+        if op[0] == "stale":
+            self._stale.add(op[1])
+        elif op[0] == "count":
+            _, kind, ident, delta, label = op
+            record = self._records[kind].get(ident)
+            if record is not None:
+                record["count"] = max(0, int(record["count"]) + int(delta))
+            elif label:
+                count = max(0, int(delta))
+                self._upsert_locked(kind, ident, {"profile_name": label, "label": label, "fields": (label,), "count": count})
+            else:
+                self._stale.add(kind)
+        else:
+            self._upsert_locked(op[1], op[2], op[3])
+
+    def apply(self, ops: List[tuple]) -> None:
+        """Apply committed changes: ("upsert", kind, id, record_or_None), ("count", kind, id, delta, label)
+        or ("stale", kind)."""
+        with self._lock:
+            if self._building:
+                self._journal.extend(ops)
+            if not self._warm:
+                return
+            for op in ops:
+                self._apply_locked(op)
+
+    def rebuild(self, db: Session) -> bool:
+        with self._lock:
+            if self._building:
+                return False
+            self._building = True
+            self._journal = []
+        try:
+            keys: Dict[str, List[Tuple[str, int]]] = {kind: [] for kind in KINDS}
+            records: Dict[str, Dict[int, dict]] = {kind: {} for kind in KINDS}
+            for model, kind in _MODEL_KINDS:
+                if db.query(model.id).count() > self.max_rows:
+                    logger.info("Typeahead index stays cold: more than %s %s rows", self.max_rows, kind)
+                    return False
+                for row in db.query(model).yield_per(1000):
+                    record = _record_for(row)
+                    if record is None:
+                        continue
+                    records[kind][int(row.id)] = record
+                    keys[kind].extend((key, int(row.id)) for key in _keys_for(record))
+            for kind in KINDS:
+                keys[kind].sort()
+            with self._lock:
+                self._keys = keys
+                self._records = records
+                self._warm = True
+                self._stale = set()
+                for op in self._journal:
+                    self._apply_locked(op)
+            return True
+        finally:
+            with self._lock:
+                self._building = False
+                self._journal = []
+
+    def lookup(self, kind: str, needle: str, limit: int) -> List[dict]:
+        needle = _normalize(needle)
+        if not needle:
+            return []
+        with self._lock:
+            keys = self._keys[kind]
+            records = self._records[kind]
+            position = bisect.bisect_left(keys, (needle, -1))
+            candidates: Dict[int, int] = {}
+            scanned = 0
+            while position < len(keys) and scanned < self.scan_limit:
+                key, ident = keys[position]
+                if not key.startswith(needle):
+                    break
+                record = records.get(ident)
+                if record is not None and ident not in candidates:
+                    fields = [_normalize(field) for field in record["fields"]]
+                    if needle in fields:
+                        candidates[ident] = _RANK_EXACT
+                    elif any(field.startswith(needle) for field in fields):
+                        candidates[ident] = _RANK_PREFIX
+                    else:
+                        candidates[ident] = _RANK_WORD_PREFIX
+                position += 1
+                scanned += 1
+            ranked = [(rank, records[ident]) for ident, rank in candidates.items()]
+        if kind == "hashtag":
+            ranked.sort(key=lambda item: (item[0], -item[1]["count"], item[1]["label"]))
+        else:
+            ranked.sort(key=lambda item: (item[0], item[1]["label"]))
+        return [record for _, record in ranked[:limit]]
+
+
+typeahead_index = TypeaheadIndex()
+
+_rebuild_lock = threading.Lock()
+_rebuild_thread: Optional[threading.Thread] = None
+
+
+def schedule_rebuild(session_factory=None) -> None:
+    """Warm the index in a background thread; search keeps using the DB until it is ready."""
+    global _rebuild_thread
+    if not TYPEAHEAD_INDEX_ENABLED:
+        return
+    with _rebuild_lock:
+        if _rebuild_thread is not None and _rebuild_thread.is_alive():
+            return
+
+        def _run() -> None:
+            if session_factory is None:
+                from database import ReadSessionLocal as factory
+            else:
+                factory = session_factory
+            db = factory()
+            try:
+                typeahead_index.rebuild(db)
+            except Exception as exc:
+                logger.warning("Typeahead index rebuild failed: %s", exc)
+            finally:
+                db.close()
+
+        _rebuild_thread = threading.Thread(target=_run, name="typeahead-index", daemon=True)
+        _rebuild_thread.start()
+
+
+def note_hashtag_count_changes(session: Session, deltas: Dict[int, int], texts: Optional[Dict[int, str]] = None) -> None:
+    """Queue hashtag count deltas applied with Core statements, which the ORM listeners cannot see."""
+    if not TYPEAHEAD_INDEX_ENABLED:
+        return
+    texts = texts or {}
+    ops = session.info.setdefault("typeahead_ops", [])
+    for hashtag_id, delta in deltas.items():
+        ops.append(("count", "hashtag", int(hashtag_id), int(delta), texts.get(int(hashtag_id))))
+
+
+@event.listens_for(Session, "after_flush")
+def _track_search_changes(session: Session, flush_context) -> None:
+    if not TYPEAHEAD_INDEX_ENABLED:
+        return
+    ops = session.info.setdefault("typeahead_ops", [])
+    for obj in (*session.new, *session.dirty):
+        for model, kind in _MODEL_KINDS:
+            if isinstance(obj, model):
+                ops.append(("upsert", kind, int(obj.id), _record_for(obj)))
+    for obj in session.deleted:
+        for model, kind in _MODEL_KINDS:
+            if isinstance(obj, model):
+                ops.append(("upsert", kind, int(obj.id), None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_search_changes(orm_execute_state) -> None:
+    if not TYPEAHEAD_INDEX_ENABLED:
+        return
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    for model, kind in _MODEL_KINDS:
+        if issubclass(mapper.class_, model):
+            orm_execute_state.session.info.setdefault("typeahead_ops", []).append(("stale", kind))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_search_changes(session: Session) -> None:
+    ops = session.info.pop("typeahead_ops", None)
+    if ops:
+        typeahead_index.apply(ops)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_search_changes(session: Session) -> None:
+    session.info.pop("typeahead_ops", None)
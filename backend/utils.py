@@ -5,6 +5,7 @@ from typing import Optional, List, Dict
 from urllib.parse import unquote, urlparse
 from fastapi import HTTPException, status, UploadFile
 from sqlalchemy.orm import Session
+from audit_log import enqueue_audit_record
 from models import AdminLog, PdaEventLog, PersohubEventLog, PdaUser
 import boto3
 from botocore.config import Config
@@ -27,22 +28,73 @@ if AWS_REGION and S3_BUCKET_NAME and S3_ACCESS_KEY and S3_SECRET_KEY:
     )
 
 
-def log_admin_action(db: Session, admin: PdaUser, action: str, method: Optional[str] = None, path: Optional[str] = None, meta: Optional[dict] = None):
+def _write_audit_row(db: Session, model, values: dict) -> None:
+    # Handlers that still hold unsaved changes have always relied on the log call to commit them,
+    # so those keep the old in-transaction write; everything else goes to the background writer.
+    if not (db.new or db.dirty or db.deleted) and enqueue_audit_record(model, values):
+        return
+    db.add(model(**values))
+    db.commit()
+
+
+def admin_log_values(
+    admin_id: Optional[int],
+    admin_regno: Optional[str],
+    admin_name: Optional[str],
+    action: str,
+    method: Optional[str] = None,
+    path: Optional[str] = None,
+    meta: Optional[dict] = None,
+) -> dict:
     if meta is None:
         meta = {}
     if isinstance(meta, dict):
         meta = dict(meta)
         meta.setdefault("kind", "action")
-    db.add(AdminLog(
-        admin_id=admin.id if admin else None,
-        admin_register_number=admin.regno if admin else "",
-        admin_name=admin.name if admin else "",
-        action=action,
+    return {
+        "admin_id": admin_id,
+        "admin_register_number": admin_regno or "",
+        "admin_name": admin_name or "",
+        "action": action,
+        "method": method,
+        "path": path,
+        "meta": meta,
+    }
+
+
+def log_admin_action(db: Session, admin: PdaUser, action: str, method: Optional[str] = None, path: Optional[str] = None, meta: Optional[dict] = None):
+    values = admin_log_values(
+        admin.id if admin else None,
+        admin.regno if admin else "",
+        admin.name if admin else "",
+        action,
         method=method,
         path=path,
-        meta=meta
-    ))
-    db.commit()
+        meta=meta,
+    )
+    _write_audit_row(db, AdminLog, values)
+
+
+def _event_log_values(
+    event_slug: str,
+    admin: PdaUser,
+    action: str,
+    event_id: Optional[int],
+    method: Optional[str],
+    path: Optional[str],
+    meta: Optional[dict],
+) -> dict:
+    return {
+        "event_id": event_id,
+        "event_slug": event_slug,
+        "admin_id": admin.id if admin else None,
+        "admin_register_number": admin.regno if admin else "",
+        "admin_name": admin.name if admin else "",
+        "action": action,
+        "method": method,
+        "path": path,
+        "meta": meta,
+    }
 
 
 def log_pda_event_action(
@@ -55,20 +107,7 @@ def log_pda_event_action(
     path: Optional[str] = None,
     meta: Optional[dict] = None,
 ):
-    db.add(
-        PdaEventLog(
-            event_id=event_id,
-            event_slug=event_slug,
-            admin_id=admin.id if admin else None,
-            admin_register_number=admin.regno if admin else "",
-            admin_name=admin.name if admin else "",
-            action=action,
-            method=method,
-            path=path,
-            meta=meta,
-        )
-    )
-    db.commit()
+    _write_audit_row(db, PdaEventLog, _event_log_values(event_slug, admin, action, event_id, method, path, meta))
 
 
 def log_persohub_event_action(
@@ -81,20 +120,7 @@ def log_persohub_event_action(
     path: Optional[str] = None,
     meta: Optional[dict] = None,
 ):
-    db.add(
-        PersohubEventLog(
-            event_id=event_id,
-            event_slug=event_slug,
-            admin_id=admin.id if admin else None,
-            admin_register_number=admin.regno if admin else "",
-            admin_name=admin.name if admin else "",
-            action=action,
-            method=method,
-            path=path,
-            meta=meta,
-        )
-    )
-    db.commit()
+    _write_audit_row(db, PersohubEventLog, _event_log_values(event_slug, admin, action, event_id, method, path, meta))
 
 
 def _build_s3_url(key: str) -> str:
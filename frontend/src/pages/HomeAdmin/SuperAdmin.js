@@ -13,6 +13,7 @@ const emptyAdmin = {
     user_id: ''
 };
 const RESTORE_CONFIRM_TEXT = 'CONFIRM RESTORE';
+const NOTIFY_POLL_INTERVAL_MS = 2000;
 
 const getErrorMessage = (error, fallback) => {
     const detail = error?.response?.data?.detail;
@@ -223,6 +224,20 @@ export default function SuperAdmin() {
         }
     };
 
+    const waitForNotifyJob = async (jobId) => {
+        for (;;) {
+            await new Promise((resolve) => setTimeout(resolve, NOTIFY_POLL_INTERVAL_MS));
+            const response = await axios.get(
+                `${API}/pda-admin/superadmin/recruitment-notify-existing/${jobId}`,
+                { headers: getAuthHeader() }
+            );
+            const job = response.data || {};
+            if (job.status === 'completed' || job.status === 'failed') {
+                return job;
+            }
+        }
+    };
+
     const notifyExistingApplicants = async () => {
         setNotifyRecruitmentLoading(true);
         try {
@@ -234,9 +249,19 @@ export default function SuperAdmin() {
             if (response.data?.already_sent) {
                 setNotifyAlreadySent(true);
                 toast.message('Notification mail was already sent once.');
-            } else {
+                return;
+            }
+            toast.message(`Sending recruitment update mail to ${response.data?.total_candidates || 0} applicant(s)...`);
+            const job = await waitForNotifyJob(response.data.job_id);
+            if (job.status === 'completed') {
                 setNotifyAlreadySent(true);
-                toast.success(`Sent recruitment update mail to ${response.data?.sent || 0} applicant(s).`);
+                if (job.failed) {
+                    toast.warning(`Sent ${job.sent} mail(s); ${job.failed} failed.`);
+                } else {
+                    toast.success(`Sent recruitment update mail to ${job.sent} applicant(s).`);
+                }
+            } else {
+                toast.error(`Mail job stopped after ${job.processed || 0} of ${job.total || 0}: ${job.error || 'unknown error'}. You can retry.`);
             }
         } catch (error) {
             console.error('Failed to notify existing applicants:', error);
@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+from pathlib import Path
+import sys
+from typing import Optional
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def assert_max_queries():
+    """``with assert_max_queries(3): ...`` fails if the block runs more than 3 SQL statements.
+
+    ``max_repeats`` additionally caps how often any single statement shape may run (N+1 guard).
+    """
+    from metrics import capture_queries
+
+    @contextmanager
+    def _assert_max_queries(limit: int, *, max_repeats: Optional[int] = None):
+        with capture_queries() as stats:
+            yield stats
+        report = "\n".join(f"  {count}x {shape}" for shape, count in stats.repeated_shapes(1))
+        assert stats.queries <= limit, f"Expected at most {limit} queries, ran {stats.queries}:\n{report}"
+        if max_repeats is not None:
+            repeated = stats.repeated_shapes(max_repeats + 1)
+            assert not repeated, f"Statement shapes ran more than {max_repeats} times:\n{report}"
+
+    return _assert_max_queries
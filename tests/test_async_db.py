@@ -0,0 +1,112 @@
+from pathlib import Path
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import database
+import security
+from auth import create_access_token
+from database import Base
+from models import PdaUser, PersohubClub, PersohubCommunity
+
+
+def test_async_db_falls_back_to_threadpool_session(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+
+    def _read(db, value, *, plus):
+        return db.execute(text("SELECT :v + :p"), {"v": value, "p": plus}).scalar()
+
+    async def _run():
+        gen = database.get_async_db()
+        db = await gen.__anext__()
+        try:
+            return await db.run_sync(_read, 40, plus=2)
+        finally:
+            await gen.aclose()
+
+    assert asyncio.run(_run()) == 42
+
+
+async def _with_async_db(fn):
+    gen = database.get_async_db()
+    db = await gen.__anext__()
+    try:
+        return await fn(db)
+    finally:
+        await gen.aclose()
+
+
+class _Request:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def test_optional_auth_dependencies_resolve_through_the_async_session(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(database, "ReadSessionLocal", factory)
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+    with factory() as seed:
+        owner = PdaUser(regno="2024000001", email="owner@example.com", hashed_password="x", name="Owner")
+        seed.add(owner)
+        seed.flush()
+        club = PersohubClub(name="Club", profile_id="club", owner_user_id=owner.id)
+        seed.add(club)
+        seed.flush()
+        community = PersohubCommunity(name="Team", profile_id="team", club_id=club.id, admin_id=owner.id)
+        seed.add(community)
+        seed.commit()
+    token = create_access_token({"sub": "2024000001", "user_type": "pda"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    async def _resolve(db):
+        user = await security.get_optional_pda_user_async(credentials=credentials, db=db)
+        selected = await security.get_optional_persohub_community_async(
+            request=_Request({"X-Persohub-Community-Id": str(community.id)}), user=user, db=db
+        )
+        anonymous = await security.get_optional_pda_user_async(credentials=None, db=db)
+        return user, selected, anonymous
+
+    user, selected, anonymous = asyncio.run(_with_async_db(_resolve))
+    assert (user.regno, user.name) == ("2024000001", "Owner")
+    assert selected.profile_id == "team"
+    assert anonymous is None
+
+
+def test_async_db_runs_on_the_asyncpg_engine(monkeypatch):
+    pytest.importorskip("asyncpg")
+    url = os.environ.get("TEST_ASYNC_DATABASE_URL")
+    if not url:
+        pytest.skip("set TEST_ASYNC_DATABASE_URL (postgresql+asyncpg://...) to run against Postgres")
+    async_engine, factory = database._make_async_sessionmaker(url)
+    monkeypatch.setattr(database, "AsyncSessionLocal", factory)
+
+    def _read(db, value, *, plus):
+        return db.execute(text("SELECT CAST(:v AS integer) + CAST(:p AS integer)"), {"v": value, "p": plus}).scalar()
+
+    async def _run(db):
+        assert isinstance(db, AsyncSession)
+        return await db.run_sync(_read, 40, plus=2)
+
+    async def _run_and_dispose():
+        try:
+            return await _with_async_db(_run)
+        finally:
+            await async_engine.dispose()
+
+    assert asyncio.run(_run_and_dispose()) == 42
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import audit_log
+from attendance_scan import recent_scans
+from auth import create_access_token
+from database import Base
+from models import (
+    PdaEvent,
+    PdaEventAttendance,
+    PdaEventEntityType,
+    PdaEventFormat,
+    PdaEventLog,
+    PdaEventParticipantMode,
+    PdaEventRegistration,
+    PdaEventRound,
+    PdaEventRoundMode,
+    PdaEventRoundState,
+    PdaEventScore,
+    PdaEventTemplate,
+    PdaEventType,
+    PdaUser,
+)
+from routers.pda_events_admin import scan_attendance, scan_attendance_bulk
+from schemas import PdaManagedAttendanceScanBulkRequest, PdaManagedAttendanceScanRequest
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(audit_log, "AUDIT_LOG_ASYNC", False)
+    recent_scans.clear()
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        recent_scans.clear()
+        session.close()
+        engine.dispose()
+
+
+def _seed(db):
+    users = [
+        PdaUser(regno=f"2024{idx:06d}", email=f"user{idx}@example.com", hashed_password="x", name=f"User {idx}")
+        for idx in range(1, 5)
+    ]
+    db.add_all(users)
+    db.flush()
+    event = PdaEvent(
+        slug="quiz",
+        event_code="EVT001",
+        title="Quiz",
+        event_type=PdaEventType.TECHNICAL,
+        format=PdaEventFormat.OFFLINE,
+        template_option=PdaEventTemplate.ATTENDANCE_SCORING,
+        participant_mode=PdaEventParticipantMode.INDIVIDUAL,
+        round_mode=PdaEventRoundMode.MULTI,
+    )
+    db.add(event)
+    db.flush()
+    round_row = PdaEventRound(event_id=event.id, round_no=1, name="Prelims", state=PdaEventRoundState.ACTIVE)
+    db.add(round_row)
+    for user in users[:3]:
+        db.add(PdaEventRegistration(event_id=event.id, user_id=user.id, entity_type=PdaEventEntityType.USER))
+    db.commit()
+    return event, round_row, users
+
+
+def _qr(user, slug="quiz"):
+    return create_access_token(
+        {"sub": user.regno, "qr": "pda_event_attendance", "event_slug": slug, "entity_type": "user", "entity_id": user.id}
+    )
+
+
+def test_scan_upserts_in_place_and_dedupes_rescans(db, assert_max_queries):
+    event, round_row, users = _seed(db)
+    admin = users[3]
+    payload = PdaManagedAttendanceScanRequest(token=_qr(users[0]))
+
+    first = scan_attendance(slug="quiz", payload=payload, admin=admin, db=db)
+    assert first["duplicate"] is False and first["entity_id"] == users[0].id
+    with assert_max_queries(1):
+        again = scan_attendance(slug="quiz", payload=payload, admin=admin, db=db)
+    assert again["duplicate"] is True
+
+    recent_scans.clear()
+    db.query(PdaEventAttendance).update({"is_present": False})
+    db.commit()
+    scan_attendance(slug="quiz", payload=payload, admin=admin, db=db)
+    rows = db.query(PdaEventAttendance).all()
+    assert len(rows) == 1 and rows[0].is_present is True and rows[0].marked_by_user_id == admin.id
+
+    round_payload = PdaManagedAttendanceScanRequest(token=_qr(users[0]), round_id=round_row.id)
+    scan_attendance(slug="quiz", payload=round_payload, admin=admin, db=db)
+    score = db.query(PdaEventScore).one()
+    assert score.round_id == round_row.id and score.is_present is True and score.total_score == 0
+    assert db.query(PdaEventLog).filter(PdaEventLog.action == "scan_pda_event_attendance").count() == 3
+
+    with pytest.raises(HTTPException) as exc:
+        scan_attendance(slug="quiz", payload=PdaManagedAttendanceScanRequest(token=_qr(users[0], slug="other")), admin=admin, db=db)
+    assert exc.value.status_code == 400
+
+
+def test_bulk_scan_reports_each_item_and_writes_once(db):
+    event, round_row, users = _seed(db)
+    admin = users[3]
+    scanned_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    payload = PdaManagedAttendanceScanBulkRequest(
+        scans=[
+            {"token": _qr(users[0]), "scanned_at": scanned_at},
+            {"token": _qr(users[1])},
+            {"token": _qr(users[0])},
+            {"token": _qr(users[3])},
+            {"token": "not-a-token"},
+            {"token": _qr(users[2]), "round_id": 999},
+            {"token": _qr(users[2]), "round_id": round_row.id},
+        ]
+    )
+    result = scan_attendance_bulk(slug="quiz", payload=payload, admin=admin, db=db)
+
+    assert (result["marked"], result["duplicates"], result["invalid"]) == (3, 1, 3)
+    assert [item["status"] for item in result["results"]] == [
+        "marked",
+        "marked",
+        "duplicate",
+        "invalid",
+        "invalid",
+        "invalid",
+        "marked",
+    ]
+    assert result["results"][3]["detail"] == "Not registered for this event"
+    assert result["results"][5]["detail"] == "Round not found"
+    marked = {row.user_id: row for row in db.query(PdaEventAttendance).all()}
+    assert set(marked) == {users[0].id, users[1].id}
+    assert marked[users[0].id].marked_at.replace(tzinfo=timezone.utc) == scanned_at
+    assert db.query(PdaEventScore).filter(PdaEventScore.user_id == users[2].id).one().is_present is True
+
+    # A second upload of the same queue is acknowledged without new writes.
+    again = scan_attendance_bulk(slug="quiz", payload=payload, admin=admin, db=db)
+    assert again["marked"] == 0 and again["duplicates"] == 4
@@ -0,0 +1,70 @@
+from pathlib import Path
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import audit_log
+import utils
+from models import AdminLog, PdaEventLog, SystemConfig
+from utils import log_admin_action, log_pda_event_action
+
+
+class _Admin:
+    id = 7
+    regno = "2021000007"
+    name = "Asha"
+
+
+def _session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for table in (AdminLog.__table__, PdaEventLog.__table__, SystemConfig.__table__):
+        table.create(engine)
+    return sessionmaker(bind=engine)
+
+
+def test_log_calls_are_batched_by_background_writer(monkeypatch):
+    factory = _session_factory()
+    monkeypatch.setattr(audit_log, "SessionLocal", factory)
+    monkeypatch.setattr(audit_log, "AUDIT_LOG_ASYNC", True)
+    db = factory()
+
+    for idx in range(5):
+        log_admin_action(db, _Admin(), f"action-{idx}", method="POST", path="/api/x")
+    log_pda_event_action(db, "evt", _Admin(), "score", event_id=None, meta={"count": 3})
+    assert audit_log.flush_audit_log(timeout=5)
+
+    reader = factory()
+    actions = sorted(row.action for row in reader.query(AdminLog).all())
+    assert actions == [f"action-{idx}" for idx in range(5)]
+    assert reader.query(AdminLog).first().meta == {"kind": "action"}
+    assert reader.query(PdaEventLog).one().meta == {"count": 3}
+    audit_log.shutdown_audit_writer()
+
+
+def test_pending_handler_changes_are_committed_with_the_log(monkeypatch):
+    factory = _session_factory()
+    monkeypatch.setattr(audit_log, "SessionLocal", factory)
+    db = factory()
+    db.add(SystemConfig(key="marker", value="done"))
+
+    log_admin_action(db, _Admin(), "view_status")
+
+    reader = factory()
+    assert reader.query(SystemConfig).filter(SystemConfig.key == "marker").count() == 1
+    assert reader.query(AdminLog).filter(AdminLog.action == "view_status").count() == 1
+
+
+def test_full_queue_falls_back_to_sync_write(monkeypatch):
+    factory = _session_factory()
+    monkeypatch.setattr(audit_log, "SessionLocal", factory)
+    monkeypatch.setattr(utils, "enqueue_audit_record", lambda model, values: False)
+    db = factory()
+    log_admin_action(db, _Admin(), "sync")
+    assert factory().query(AdminLog).filter(AdminLog.action == "sync").count() == 1
@@ -0,0 +1,145 @@
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import audit_log
+from badge_service import bulk_create_badge_assignments, get_or_create_badge
+from database import Base
+from models import (
+    BadgeAssignment,
+    PdaEvent,
+    PdaEventEntityType,
+    PdaEventFormat,
+    PdaEventParticipantMode,
+    PdaEventRegistration,
+    PdaEventRoundMode,
+    PdaEventTeam,
+    PdaEventTeamMember,
+    PdaEventTemplate,
+    PdaEventType,
+    PdaUser,
+)
+from routers.pda_cc_admin import bulk_create_cc_badge_assignments
+from routers.pda_events_admin import create_badge, create_badges_bulk
+from schemas import CcBadgeAssignmentBulkCreateRequest, PdaManagedBadgeBulkCreate, PdaManagedBadgeCreate
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(audit_log, "AUDIT_LOG_ASYNC", False)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _users(db, count):
+    users = [
+        PdaUser(regno=f"2024{idx:06d}", email=f"user{idx}@example.com", hashed_password="x", name=f"User {idx}")
+        for idx in range(1, count + 1)
+    ]
+    db.add_all(users)
+    db.flush()
+    return users
+
+
+def _event(db, participant_mode=PdaEventParticipantMode.INDIVIDUAL):
+    event = PdaEvent(
+        slug="quiz",
+        event_code="QUIZ",
+        title="Quiz",
+        event_type=PdaEventType.TECHNICAL,
+        format=PdaEventFormat.OFFLINE,
+        template_option=PdaEventTemplate.ATTENDANCE_ONLY,
+        participant_mode=participant_mode,
+        round_mode=PdaEventRoundMode.SINGLE,
+    )
+    db.add(event)
+    db.flush()
+    return event
+
+
+def _assignment_count(db):
+    return db.query(BadgeAssignment).count()
+
+
+def test_bulk_insert_skips_existing_assignments(db):
+    users = _users(db, 3)
+    badge = get_or_create_badge(db, "Winner")
+    first = bulk_create_badge_assignments(db, badge_id=badge.id, target_type="user", target_ids=[users[0].id, users[0].id])
+    again = bulk_create_badge_assignments(db, badge_id=badge.id, target_type="user", target_ids=[user.id for user in users])
+    assert len(first) == 1
+    assert len(again) == 2 and first[0] not in again
+    assert _assignment_count(db) == 3
+
+
+def test_event_bulk_badges_reject_the_batch_when_a_user_is_not_registered(db):
+    admin, registered, member, outsider = _users(db, 4)
+    event = _event(db)
+    db.add(PdaEventRegistration(event_id=event.id, user_id=registered.id, entity_type=PdaEventEntityType.USER))
+    team = PdaEventTeam(event_id=event.id, team_code="ABCDE", team_name="Team", team_lead_user_id=member.id)
+    db.add(team)
+    db.flush()
+    db.add(PdaEventTeamMember(team_id=team.id, user_id=member.id))
+    db.add(PdaEventRegistration(event_id=event.id, team_id=team.id, entity_type=PdaEventEntityType.TEAM))
+    db.commit()
+
+    def payload(user_ids):
+        return PdaManagedBadgeBulkCreate(title="Finalist", place="Winner", user_ids=user_ids)
+
+    with pytest.raises(HTTPException) as exc:
+        create_badges_bulk(slug="quiz", payload=payload([registered.id, outsider.id]), admin=admin, db=db)
+    assert exc.value.status_code == 400
+    assert exc.value.detail == f"User {outsider.id} is not registered for this event"
+    db.rollback()
+    assert _assignment_count(db) == 0
+
+    # Team members count as registered through their team.
+    result = create_badges_bulk(slug="quiz", payload=payload([registered.id, member.id]), admin=admin, db=db)
+    assert (result.created_count, result.skipped_count) == (2, 0)
+
+
+def test_single_event_badge_goes_through_the_bulk_path(db):
+    admin, registered, outsider = _users(db, 3)
+    event = _event(db)
+    db.add(PdaEventRegistration(event_id=event.id, user_id=registered.id, entity_type=PdaEventEntityType.USER))
+    db.commit()
+
+    created = create_badge(
+        slug="quiz", payload=PdaManagedBadgeCreate(title="Winner", place="Winner", score=9, user_id=registered.id), admin=admin, db=db
+    )
+    again = create_badge(
+        slug="quiz", payload=PdaManagedBadgeCreate(title="Winner", place="Runner", score=7, user_id=registered.id), admin=admin, db=db
+    )
+    assert again.id == created.id
+    assert (again.place, again.score) == ("Runner", 7)
+    assert _assignment_count(db) == 1
+
+    with pytest.raises(HTTPException) as exc:
+        create_badge(slug="quiz", payload=PdaManagedBadgeCreate(title="Winner", place="Winner", user_id=outsider.id), admin=admin, db=db)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("count", [3, 30])
+def test_cc_bulk_badge_assignment_has_a_fixed_query_budget(db, assert_max_queries, count):
+    admin, *users = _users(db, count + 1)
+    badge = get_or_create_badge(db, "Volunteer")
+    db.commit()
+    payload = CcBadgeAssignmentBulkCreateRequest(badge_id=badge.id, user_ids=[user.id for user in users])
+    with assert_max_queries(4, max_repeats=1):
+        result = bulk_create_cc_badge_assignments(payload=payload, admin=admin, db=db, request=None)
+    assert result["created_count"] == count
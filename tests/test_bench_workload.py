@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1] / "backend"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.bench_workload import compare_to_baseline, percentile, queries_per_scenario, summarize  # noqa: E402
+
+
+def test_percentile_nearest_rank():
+    samples = [float(value) for value in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_flags_latency_and_query_regressions():
+    baseline = summarize({"feed_scroll": [0.010] * 100}, {}, {"feed_scroll": 3.0})
+    same = summarize({"feed_scroll": [0.011] * 100}, {}, {"feed_scroll": 3.0})
+    slower = summarize({"feed_scroll": [0.020] * 100}, {}, {"feed_scroll": 3.0})
+    chattier = summarize({"feed_scroll": [0.010] * 100}, {}, {"feed_scroll": 12.0})
+
+    assert compare_to_baseline(same, baseline, p95_tolerance=0.2) == []
+    assert any("p95" in line for line in compare_to_baseline(slower, baseline, p95_tolerance=0.2))
+    assert any("queries/request" in line for line in compare_to_baseline(chattier, baseline, p95_tolerance=0.2))
+
+
+def test_queries_per_scenario_uses_metric_deltas():
+    key = ("GET", "/api/persohub/feed")
+    before = {key: (30.0, 10.0)}
+    after = {key: (90.0, 30.0)}
+    assert queries_per_scenario(before, after) == {"feed_scroll": 3.0}
@@ -0,0 +1,70 @@
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+import re
+import sys
+import time
+
+import pytest
+from fastapi import HTTPException
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import certificate_service
+from certificate_service import (
+    build_certificate_context,
+    certificate_download_url,
+    certificate_storage_key,
+    render_certificate_pdf,
+    resolve_signed_certificate_path,
+)
+
+
+def test_build_certificate_context_uses_event_and_recipient():
+    event = SimpleNamespace(title="Crestora", event_code="EVT007", start_date=date(2026, 2, 14))
+    context = build_certificate_context(event, {"name": "Asha Rao"})
+    assert context["recipient_name"] == "ASHA RAO"
+    assert context["achievement_text"] == "For active participation in Crestora (EVT007)"
+    assert context["academic_year"] == "2025-2026"
+
+
+def test_render_certificate_pdf_produces_pdf_bytes():
+    pdf_bytes = render_certificate_pdf(
+        {"recipient_name": "ASHA RAO", "achievement_text": "For active participation in Crestora", "academic_year": "2025-2026"}
+    )
+    assert pdf_bytes.startswith(b"%PDF")
+    assert b"/Subtype /Image" in pdf_bytes
+
+
+def test_certificate_template_images_resolve_to_shipped_files():
+    template = (certificate_service.TEMPLATE_DIR / certificate_service.TEMPLATE_NAME).read_text()
+    sources = re.findall(r'<img[^>]*\ssrc="([^"]+)"', template)
+    assert sources
+    for source in sources:
+        assert Path(certificate_service._resolve_template_asset(source)).is_file(), source
+
+
+def test_local_download_link_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(certificate_service, "CERTIFICATE_DIR", tmp_path)
+    monkeypatch.setattr("utils.S3_CLIENT", None)
+    key = certificate_storage_key(platform="pda", event_slug="crestora", user_id=12)
+    target = tmp_path / key
+    target.parent.mkdir(parents=True)
+    target.write_bytes(b"%PDF-1.4")
+
+    url = certificate_download_url(key)
+    assert url.startswith("/api/certificates/download?")
+    params = dict(item.split("=", 1) for item in url.split("?", 1)[1].split("&"))
+    path = resolve_signed_certificate_path(key, int(params["expires"]), params["signature"])
+    assert path == target.resolve()
+
+    with pytest.raises(HTTPException) as exc_info:
+        resolve_signed_certificate_path(key, int(params["expires"]), "0" * 64)
+    assert exc_info.value.status_code == 403
+
+    with pytest.raises(HTTPException) as exc_info:
+        resolve_signed_certificate_path(key, int(time.time()) - 1, params["signature"])
+    assert exc_info.value.status_code == 403
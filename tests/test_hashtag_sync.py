@@ -0,0 +1,88 @@
+from pathlib import Path
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import typeahead_index
+from database import Base
+from models import PdaUser, PersohubCommunity, PersohubHashtag, PersohubPost, PersohubPostHashtag
+from routers.persohub_shared import sync_post_tags_and_mentions
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _posts(db, count):
+    admin = PdaUser(regno="2024000001", email="admin@example.com", hashed_password="x", name="Admin")
+    db.add(admin)
+    db.flush()
+    community = PersohubCommunity(name="Web Team", profile_id="webteam", admin_id=admin.id)
+    db.add(community)
+    db.flush()
+    posts = [
+        PersohubPost(community_id=community.id, admin_id=admin.id, slug_token=f"post-{idx}", description="")
+        for idx in range(count)
+    ]
+    db.add_all(posts)
+    db.commit()
+    return posts
+
+
+def _counts(db):
+    return {tag.hashtag_text: tag.count for tag in db.query(PersohubHashtag).order_by(PersohubHashtag.hashtag_text)}
+
+
+def test_tag_sync_moves_counts_in_sql_with_constant_queries(db, assert_max_queries):
+    first, second = _posts(db, 2)
+    first.description = "#web #Design #web"
+    sync_post_tags_and_mentions(db, first, None)
+    second.description = "#web #launch"
+    sync_post_tags_and_mentions(db, second, None)
+    db.commit()
+    assert _counts(db) == {"design": 1, "launch": 1, "web": 2}
+
+    first.description = "#launch #brand #new"
+    with assert_max_queries(7):
+        sync_post_tags_and_mentions(db, first, None)
+    db.commit()
+    db.expire_all()
+    assert _counts(db) == {"brand": 1, "design": 0, "launch": 2, "new": 1, "web": 1}
+    linked = {tag for (tag,) in db.query(PersohubHashtag.hashtag_text).join(PersohubPostHashtag).filter(PersohubPostHashtag.post_id == first.id)}
+    assert linked == {"launch", "brand", "new"}
+
+    # Re-saving unchanged text is a single read.
+    with assert_max_queries(1):
+        sync_post_tags_and_mentions(db, first, None)
+
+
+def test_tag_sync_keeps_a_warm_typeahead_index_current(db, monkeypatch):
+    monkeypatch.setattr(typeahead_index, "TYPEAHEAD_INDEX_ENABLED", True)
+    index = typeahead_index.typeahead_index
+    index.clear()
+    try:
+        (post,) = _posts(db, 1)
+        assert index.rebuild(db)
+        post.description = "#kumarfest"
+        sync_post_tags_and_mentions(db, post, None)
+        db.commit()
+        assert index.is_warm()
+        assert [(item["label"], item["count"]) for item in index.lookup("hashtag", "kum", 6)] == [("kumarfest", 1)]
+    finally:
+        index.clear()
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+import pytest
+from jose import JWTError, jwt
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import jwt_verify
+
+SECRET = "s" * 40
+
+
+def _token(**claims):
+    payload = {"sub": "2021000001", "user_type": "pda", "type": "access", "jti": "abc"}
+    payload["exp"] = datetime.now(timezone.utc) + timedelta(minutes=5)
+    payload.update(claims)
+    return jwt.encode(payload, SECRET, algorithm="HS256")
+
+
+def test_fast_path_matches_jose_and_caches():
+    jwt_verify.clear_jwt_cache()
+    token = _token(qr="pda_event_attendance", entity_id=4)
+    before = jwt_verify.jwt_verify_stats()
+
+    payload = jwt_verify.verify_jwt(token, SECRET, "HS256")
+    assert payload == jwt.decode(token, SECRET, algorithms=["HS256"])
+    assert jwt_verify.verify_jwt(token, SECRET, "HS256") == payload
+
+    after = jwt_verify.jwt_verify_stats()
+    assert after["hmac_fast_path"] == before["hmac_fast_path"] + 1
+    assert after["cache_hits"] == before["cache_hits"] + 1
+
+
+def test_rejects_tampered_expired_and_wrong_key_tokens():
+    jwt_verify.clear_jwt_cache()
+    head, body, sig = _token().split(".")
+    tampered = ".".join([head, body, ("A" if sig[0] != "A" else "B") + sig[1:]])
+    expired = _token(exp=datetime.now(timezone.utc) - timedelta(seconds=5))
+    for token, secret in ((tampered, SECRET), (expired, SECRET), (_token(), "t" * 40), ("not-a-token", SECRET)):
+        with pytest.raises(JWTError):
+            jwt_verify.verify_jwt(token, secret, "HS256")
+
+
+def test_tokens_with_jose_only_claims_use_jose():
+    jwt_verify.clear_jwt_cache()
+    before = jwt_verify.jwt_verify_stats()["jose_fallback"]
+    token = _token(iat=int(datetime.now(timezone.utc).timestamp()))
+    assert jwt_verify.verify_jwt(token, SECRET, "HS256")["sub"] == "2021000001"
+    assert jwt_verify.jwt_verify_stats()["jose_fallback"] == before + 1
@@ -0,0 +1,168 @@
+import asyncio
+import json
+from pathlib import Path
+import sys
+import types
+
+import pytest
+from fastapi import HTTPException
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import live_events
+from auth import create_access_token
+from live_events import (
+    LiveEventBroker,
+    MemoryLiveBackend,
+    RedisLiveBackend,
+    attendance_mark_groups,
+    create_live_stream_ticket,
+    format_sse,
+    score_delta_rows,
+    verify_live_stream_ticket,
+)
+
+
+def _message(message_id, event_type="scores_saved", round_id=None, channel="pda:quiz"):
+    return {"id": message_id, "type": event_type, "channel": channel, "round_id": round_id, "data": {}}
+
+
+async def _drain(subscription):
+    await asyncio.sleep(0)
+    items = []
+    while not subscription.queue.empty():
+        items.append(await subscription.get())
+    return items
+
+
+def test_broker_delivers_per_channel_and_round():
+    async def scenario():
+        broker = LiveEventBroker(replay_size=10)
+        all_rounds = broker.subscribe("pda:quiz")
+        round_two = broker.subscribe("pda:quiz", round_id=2)
+        other_event = broker.subscribe("pda:other")
+        broker.deliver(_message("1", round_id=1))
+        broker.deliver(_message("2", round_id=2))
+        broker.deliver(_message("3", event_type="registration_status"))
+        assert [m["id"] for m in await _drain(all_rounds)] == ["1", "2", "3"]
+        assert [m["id"] for m in await _drain(round_two)] == ["2", "3"]
+        assert await _drain(other_event) == []
+        assert broker.subscriber_count() == 3
+        broker.unsubscribe(other_event)
+        assert broker.subscriber_count() == 2
+
+    asyncio.run(scenario())
+
+
+def test_broker_replays_from_last_event_id_or_asks_for_resync():
+    async def scenario():
+        broker = LiveEventBroker(replay_size=2)
+        for message_id in ("1", "2", "3"):
+            broker.deliver(_message(message_id))
+        resumed = broker.subscribe("pda:quiz", last_event_id="2")
+        assert [m["id"] for m in await _drain(resumed)] == ["3"]
+        # "1" fell out of the replay window, so the client cannot be caught up with deltas.
+        stale = broker.subscribe("pda:quiz", last_event_id="1")
+        assert [m["type"] for m in await _drain(stale)] == ["resync"]
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_gets_single_resync_on_overflow(monkeypatch):
+    monkeypatch.setattr(live_events, "LIVE_EVENTS_QUEUE_SIZE", 2)
+
+    async def scenario():
+        broker = LiveEventBroker(replay_size=0)
+        subscription = broker.subscribe("pda:quiz")
+        for message_id in range(5):
+            broker.deliver(_message(str(message_id)))
+        items = await _drain(subscription)
+        assert [m["type"] for m in items] == ["resync"]
+        broker.deliver(_message("after"))
+        assert [m["id"] for m in await _drain(subscription)] == ["after"]
+
+    asyncio.run(scenario())
+
+
+def test_publish_goes_through_backend_and_formats_sse(monkeypatch):
+    broker = LiveEventBroker(replay_size=5)
+    monkeypatch.setattr(live_events, "broker", broker)
+    monkeypatch.setattr(live_events, "_backend", MemoryLiveBackend(broker))
+
+    async def scenario():
+        subscription = live_events.subscribe_live("persohub", "hack", round_id=4)
+        live_events.publish_live_event(
+            "persohub",
+            "hack",
+            "scores_saved",
+            {"entries": score_delta_rows([{"entity_type": "team", "team_id": 9, "scores": {"A": 5}, "total": 5, "is_present": True}])},
+            round_id=4,
+        )
+        (message,) = await _drain(subscription)
+        return message
+
+    message = asyncio.run(scenario())
+    assert message["channel"] == "persohub:hack" and message["round_id"] == 4
+    assert message["data"]["entries"] == [
+        {"entity_type": "team", "entity_id": 9, "criteria_scores": {"A": 5}, "total_score": 5.0, "is_present": True}
+    ]
+    frame = format_sse(message)
+    assert frame.startswith(f"id: {message['id']}\nevent: scores_saved\ndata: ")
+    assert json.loads(frame.split("data: ", 1)[1])["event_slug"] == "hack"
+
+
+class _FailingRedis:
+    created = []
+
+    def __init__(self, url, **kwargs):
+        self.url = url
+        self.kwargs = kwargs
+        _FailingRedis.created.append(self)
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        return cls(url, **kwargs)
+
+    def publish(self, channel, payload):
+        raise TimeoutError("Timeout writing to socket")
+
+
+def test_redis_publish_is_bounded_and_falls_back_to_in_process(monkeypatch):
+    _FailingRedis.created = []
+    monkeypatch.setitem(sys.modules, "redis", types.SimpleNamespace(Redis=_FailingRedis))
+    monkeypatch.setattr(live_events, "LIVE_EVENTS_REDIS_TIMEOUT_MS", 250)
+    broker = LiveEventBroker(replay_size=5)
+    backend = RedisLiveBackend(broker, "redis://cache:6379/0")
+    publisher, listener = _FailingRedis.created
+    assert publisher.kwargs == {"socket_timeout": 0.25, "socket_connect_timeout": 0.25}
+    assert listener.kwargs == {"socket_connect_timeout": 0.25}
+
+    async def scenario():
+        subscription = broker.subscribe("pda:quiz")
+        backend.publish(_message("1"))
+        return await _drain(subscription)
+
+    assert [m["id"] for m in asyncio.run(scenario())] == ["1"]
+
+
+def test_stream_ticket_is_scoped_and_not_an_access_token():
+    issued = create_live_stream_ticket("pda", "quiz", "2024000001")
+    assert verify_live_stream_ticket(issued["ticket"], "pda", "quiz")["sub"] == "2024000001"
+    with pytest.raises(HTTPException) as exc:
+        verify_live_stream_ticket(issued["ticket"], "persohub", "quiz")
+    assert exc.value.status_code == 403
+    with pytest.raises(HTTPException):
+        verify_live_stream_ticket(issued["ticket"], "pda", "other")
+    with pytest.raises(HTTPException):
+        verify_live_stream_ticket(create_access_token({"sub": "2024000001"}), "pda", "quiz")
+
+
+def test_bulk_attendance_marks_become_one_attendance_marked_per_round():
+    groups = attendance_mark_groups([("user", 1, 7), ("team", 2, None), ("user", 3, 7)])
+    assert groups == [
+        (7, {"entries": [{"entity_type": "user", "entity_id": 1}, {"entity_type": "user", "entity_id": 3}], "is_present": True, "level": "round"}),
+        (None, {"entries": [{"entity_type": "team", "entity_id": 2}], "is_present": True, "level": "entry"}),
+    ]
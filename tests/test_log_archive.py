@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import gzip
+import importlib.util
+import json
+import sys
+
+import pytest
+from fastapi import Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import log_archive
+from database import Base
+from models import AdminLog
+from routers.superadmin import get_homeadmin_logs
+
+NOW = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_archive, "S3_CLIENT", None)
+    monkeypatch.setattr(log_archive, "LOG_ARCHIVE_DIR", tmp_path)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    try:
+        yield sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _seed_logs(db, ages_in_days):
+    db.add_all(
+        [
+            AdminLog(
+                admin_id=1,
+                admin_register_number="0000000001",
+                admin_name="Admin",
+                action=f"Action {idx}",
+                method="POST",
+                path="/api/pda-admin/items",
+                meta={"idx": idx},
+                created_at=NOW - timedelta(days=age),
+            )
+            for idx, age in enumerate(ages_in_days, start=1)
+        ]
+    )
+    db.commit()
+
+
+def _page(db, before_id):
+    response = Response()
+    logs = get_homeadmin_logs(_=None, db=db, limit=2, offset=0, log_type="any", before_id=before_id, response=response)
+    return [log.id for log in logs], response.headers.get("X-Next-Before-Id")
+
+
+def test_admin_logs_page_by_before_id(db):
+    _seed_logs(db, [1] * 5)
+    assert _page(db, None) == ([5, 4], "4")
+    assert _page(db, 4) == ([3, 2], "2")
+    # A short page is the last one, so no cursor is handed out.
+    assert _page(db, 2) == ([1], None)
+
+
+def test_archive_writes_chunks_then_deletes_only_old_rows(db):
+    _seed_logs(db, [200, 150, 120, 10])
+    dry_run = log_archive.archive_log_table(db, "admin_logs", older_than_days=90, now=NOW)
+    assert dry_run["archived"] == 3 and dry_run["files"] == []
+    assert db.query(AdminLog).count() == 4
+
+    summary = log_archive.archive_log_table(db, "admin_logs", older_than_days=90, chunk_size=2, apply=True, now=NOW)
+    assert summary["archived"] == 3 and len(summary["files"]) == 2
+    archived = []
+    for location in summary["files"]:
+        with gzip.open(location, "rt", encoding="utf-8") as handle:
+            archived.extend(json.loads(line) for line in handle)
+    assert [row["id"] for row in archived] == [1, 2, 3]
+    assert archived[0]["meta"] == {"idx": 1}
+    assert [log.id for log in db.query(AdminLog).all()] == [4]
+
+    with pytest.raises(ValueError):
+        log_archive.archive_log_table(db, "users", apply=True)
+
+
+def test_archive_script_archives_and_prunes(db, session_factory, tmp_path, monkeypatch, capsys):
+    _seed_logs(db, [365, 1])
+    spec = importlib.util.spec_from_file_location("archive_logs_script", BACKEND_DIR / "scripts" / "archive_logs.py")
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    monkeypatch.setattr(script, "SessionLocal", session_factory)
+
+    monkeypatch.setattr(sys, "argv", ["archive_logs.py", "--table", "admin_logs", "--days", "90"])
+    assert script.main() == 0
+    assert "admin_logs: would archive 1 rows" in capsys.readouterr().out
+    assert db.query(AdminLog).count() == 2
+
+    monkeypatch.setattr(sys, "argv", ["archive_logs.py", "--table", "admin_logs", "--days", "90", "--apply"])
+    assert script.main() == 0
+    assert "admin_logs: archived 1 rows" in capsys.readouterr().out
+    db.expire_all()
+    assert [log.action for log in db.query(AdminLog).all()] == ["Action 2"]
+    assert len(list(tmp_path.rglob("*.jsonl.gz"))) == 1
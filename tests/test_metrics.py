@@ -0,0 +1,86 @@
+from pathlib import Path
+from types import SimpleNamespace
+import asyncio
+import logging
+import sys
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import metrics
+from routers.public import prometheus_metrics
+
+
+def test_queries_are_attributed_to_the_current_request():
+    metrics.reset_metrics()
+    engine = create_engine("sqlite://")
+    stats, token = metrics.begin_request()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    finally:
+        metrics.end_request(token)
+    assert stats.queries == 2
+    assert metrics.current_request_stats() is None
+
+    metrics.record_request("GET", "/api/things/{id}", 200, 0.02, stats)
+    body = metrics.render_prometheus({"background_queue_depth": {"email": 3}})
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/things/{id}",status="2xx"} 1' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/things/{id}",status="2xx",le="0.01"} 0' in body
+    assert 'http_request_db_queries_total{method="GET",route="/api/things/{id}"} 2' in body
+    assert 'background_queue_depth{source="email"} 3' in body
+
+
+def test_capture_queries_groups_repeated_statement_shapes():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        with metrics.capture_queries() as stats:
+            for value in range(4):
+                conn.execute(text("SELECT :v"), {"v": value})
+            conn.execute(text("SELECT 1, 2"))
+    assert stats.queries == 5
+    assert stats.repeated_shapes(3) == [("SELECT ?", 4)]
+
+
+def test_repeated_statement_shapes_are_logged_as_possible_n_plus_one(monkeypatch, caplog):
+    monkeypatch.setattr(metrics, "SQL_REPEAT_WARN_THRESHOLD", 3)
+    engine = create_engine("sqlite://")
+    stats, token = metrics.begin_request()
+    try:
+        with engine.connect() as conn:
+            for value in range(4):
+                conn.execute(text("SELECT :v"), {"v": value})
+            conn.execute(text("SELECT 1, 2"))
+    finally:
+        metrics.end_request(token)
+
+    with caplog.at_level(logging.WARNING, logger=metrics.logger.name):
+        metrics.record_request("GET", "/api/things", 200, 0.01, stats)
+    warnings = [record.getMessage() for record in caplog.records if "Possible N+1" in record.getMessage()]
+    assert warnings == ["Possible N+1 in GET /api/things: 4x SELECT ?"]
+
+
+def _scrape(authorization=None):
+    headers = {"authorization": authorization} if authorization else {}
+    return asyncio.run(prometheus_metrics(SimpleNamespace(headers=headers)))
+
+
+def test_metrics_endpoint_fails_closed_without_a_token(monkeypatch):
+    monkeypatch.delenv("METRICS_TOKEN", raising=False)
+    with pytest.raises(HTTPException) as exc:
+        _scrape("Bearer anything")
+    assert exc.value.status_code == 404
+
+    monkeypatch.setenv("METRICS_TOKEN", "s3cret")
+    for authorization in (None, "Bearer wrong", "Bearer s3cret-and-more"):
+        with pytest.raises(HTTPException) as exc:
+            _scrape(authorization)
+        assert exc.value.status_code == 401
+    assert b"threadpool_threads" in _scrape("Bearer s3cret").body
@@ -0,0 +1,355 @@
+"""Runs the set-based backfills on Postgres against the per-row code they replaced.
+
+Both run on the same seeded baseline, each in its own schema, and must leave the same data.
+"""
+from pathlib import Path
+import os
+import sys
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import migrations
+
+# Just the columns the backfills touch, in their pre-cutover shape (attendance still has round_id).
+BASELINE_SCHEMA = [
+    "CREATE TABLE system_config (id SERIAL PRIMARY KEY, key VARCHAR(100) UNIQUE NOT NULL, value VARCHAR(500) NOT NULL)",
+    "CREATE TABLE persohub_events (id SERIAL PRIMARY KEY)",
+    """
+    CREATE TABLE persohub_event_rounds (
+        id SERIAL PRIMARY KEY,
+        event_id INTEGER NOT NULL REFERENCES persohub_events(id),
+        round_no INTEGER NOT NULL,
+        state VARCHAR(30) NOT NULL DEFAULT 'DRAFT',
+        CONSTRAINT uq_persohub_event_round_event_round_no UNIQUE (event_id, round_no)
+    )
+    """,
+    """
+    CREATE TABLE persohub_event_registrations (
+        id SERIAL PRIMARY KEY,
+        event_id INTEGER NOT NULL REFERENCES persohub_events(id),
+        user_id INTEGER,
+        team_id INTEGER,
+        entity_type VARCHAR(10) NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'ACTIVE',
+        wildcard_start_round_no INTEGER,
+        eliminated_round_no INTEGER
+    )
+    """,
+    *[
+        f"""
+        CREATE TABLE {prefix}_event_scores (
+            id SERIAL PRIMARY KEY,
+            event_id INTEGER NOT NULL,
+            round_id INTEGER NOT NULL,
+            entity_type VARCHAR(10) NOT NULL,
+            user_id INTEGER,
+            team_id INTEGER,
+            criteria_scores JSONB,
+            total_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+            normalized_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+            is_present BOOLEAN NOT NULL DEFAULT FALSE,
+            CONSTRAINT uq_{prefix}_event_score_entity UNIQUE (event_id, round_id, entity_type, user_id, team_id)
+        )
+        """
+        for prefix in ("pda", "persohub")
+    ],
+    *[
+        f"""
+        CREATE TABLE {prefix}_event_attendance (
+            id SERIAL PRIMARY KEY,
+            event_id INTEGER NOT NULL,
+            round_id INTEGER,
+            entity_type VARCHAR(10) NOT NULL,
+            user_id INTEGER,
+            team_id INTEGER,
+            is_present BOOLEAN NOT NULL DEFAULT FALSE,
+            CONSTRAINT uq_{prefix}_event_attendance_entity UNIQUE (event_id, round_id, entity_type, user_id, team_id)
+        )
+        """
+        for prefix in ("pda", "persohub")
+    ],
+    "CREATE INDEX idx_pda_event_attendance_event_round ON pda_event_attendance(event_id, round_id)",
+]
+
+# Event 1 has gapped round numbers 2/5/9, event 2 has 3/4 with nothing completed, event 3 has no rounds.
+PERSOHUB_SEED = [
+    "INSERT INTO persohub_events DEFAULT VALUES",
+    "INSERT INTO persohub_events DEFAULT VALUES",
+    "INSERT INTO persohub_events DEFAULT VALUES",
+    """
+    INSERT INTO persohub_event_rounds (event_id, round_no, state) VALUES
+        (1, 5, 'COMPLETED'), (1, 2, 'DRAFT'), (1, 9, 'DRAFT'), (2, 4, 'DRAFT'), (2, 3, 'ACTIVE')
+    """,
+    """
+    INSERT INTO persohub_event_registrations (event_id, entity_type, user_id, team_id, status, wildcard_start_round_no, eliminated_round_no) VALUES
+        (1, 'USER', 1, NULL, 'ACTIVE', 5, NULL),
+        (1, 'USER', 2, NULL, 'ELIMINATED', NULL, 7),
+        (1, 'USER', 3, NULL, 'ELIMINATED', NULL, NULL),
+        (1, 'USER', 4, NULL, 'ELIMINATED', NULL, NULL),
+        (1, 'TEAM', NULL, 1, 'ELIMINATED', NULL, NULL),
+        (1, 'USER', 5, NULL, 'ACTIVE', 0, 9),
+        (2, 'USER', 6, NULL, 'ELIMINATED', NULL, NULL),
+        (3, 'USER', 7, NULL, 'ELIMINATED', NULL, 3),
+        (3, 'USER', 8, NULL, 'ELIMINATED', NULL, NULL)
+    """,
+    # User 3 was last active in the final round, team 1 scored (absent) in the first; user 4 has no activity.
+    """
+    INSERT INTO persohub_event_scores (event_id, round_id, entity_type, user_id, team_id, total_score, is_present) VALUES
+        (1, 2, 'USER', 3, NULL, 0, TRUE),
+        (1, 3, 'USER', 3, NULL, 4, TRUE),
+        (1, 2, 'TEAM', NULL, 1, 6, FALSE),
+        (1, 1, 'USER', 4, NULL, 0, FALSE)
+    """,
+]
+
+
+def _attendance_seed(prefix: str):
+    return [
+        # Round-level marks: one onto an existing score row, a duplicated one and a team with no score row.
+        f"""
+        INSERT INTO {prefix}_event_scores (event_id, round_id, entity_type, user_id, team_id, total_score, is_present)
+        VALUES (1, 1, 'USER', 11, NULL, 3, FALSE)
+        """,
+        f"""
+        INSERT INTO {prefix}_event_attendance (event_id, round_id, entity_type, user_id, team_id, is_present) VALUES
+            (1, 1, 'USER', 11, NULL, TRUE),
+            (1, 2, 'USER', 12, NULL, TRUE),
+            (1, 2, 'USER', 12, NULL, TRUE),
+            (1, 1, 'TEAM', NULL, 11, FALSE),
+            (1, NULL, 'USER', 11, NULL, FALSE),
+            (1, NULL, 'USER', 11, NULL, TRUE),
+            (1, NULL, 'TEAM', NULL, 11, TRUE)
+        """,
+    ]
+
+
+# Duplicate PDA score rows for one user and one team; the latest id must survive.
+PDA_SCORE_SEED = [
+    """
+    INSERT INTO pda_event_scores (event_id, round_id, entity_type, user_id, team_id, total_score, is_present) VALUES
+        (2, 5, 'USER', 21, NULL, 1, TRUE),
+        (2, 5, 'USER', 21, NULL, 2, TRUE),
+        (2, 5, 'TEAM', NULL, 21, 3, FALSE),
+        (2, 5, 'TEAM', NULL, 21, 4, TRUE)
+    """,
+]
+
+
+def _legacy_round_numbers(conn):
+    for event_id in conn.execute(text("SELECT id FROM persohub_events ORDER BY id")).scalars().all():
+        rounds = conn.execute(
+            text("SELECT id, round_no FROM persohub_event_rounds WHERE event_id = :e ORDER BY round_no, id"), {"e": event_id}
+        ).fetchall()
+        if not rounds:
+            continue
+        old_round_nos = [row.round_no for row in rounds]
+        for index, row in enumerate(rounds, start=1):
+            if row.round_no != index:
+                conn.execute(text("UPDATE persohub_event_rounds SET round_no = :n WHERE id = :id"), {"n": -row.id, "id": row.id})
+        for index, row in enumerate(rounds, start=1):
+            conn.execute(text("UPDATE persohub_event_rounds SET round_no = :n WHERE id = :id"), {"n": index, "id": row.id})
+
+        def mapped(value):
+            value = int(value or 0) or None
+            return None if value is None else sum(1 for no in old_round_nos if no < value) + 1
+
+        for reg in conn.execute(
+            text(
+                "SELECT id, wildcard_start_round_no, eliminated_round_no FROM persohub_event_registrations "
+                "WHERE event_id = :e AND (wildcard_start_round_no IS NOT NULL OR eliminated_round_no IS NOT NULL)"
+            ),
+            {"e": event_id},
+        ).fetchall():
+            conn.execute(
+                text("UPDATE persohub_event_registrations SET wildcard_start_round_no = :w, eliminated_round_no = :x WHERE id = :id"),
+                {"w": mapped(reg.wildcard_start_round_no), "x": mapped(reg.eliminated_round_no), "id": reg.id},
+            )
+
+
+def _legacy_eliminated_round(conn):
+    for event_id in conn.execute(text("SELECT id FROM persohub_events ORDER BY id")).scalars().all():
+        rounds = conn.execute(
+            text("SELECT id, round_no, state FROM persohub_event_rounds WHERE event_id = :e ORDER BY round_no, id"), {"e": event_id}
+        ).fetchall()
+        if not rounds:
+            continue
+        round_nos = [row.round_no for row in rounds]
+        revealed = next((row.round_no for row in rounds if str(row.state).split(".")[-1].lower() in {"completed", "reveal"}), None)
+        for reg in conn.execute(
+            text(
+                "SELECT id, entity_type, user_id, team_id FROM persohub_event_registrations "
+                "WHERE event_id = :e AND status = 'ELIMINATED' AND eliminated_round_no IS NULL ORDER BY id"
+            ),
+            {"e": event_id},
+        ).fetchall():
+            last_active = None
+            for score in conn.execute(
+                text(
+                    """
+                    SELECT r.round_no, COALESCE(s.normalized_score, 0) AS normalized, COALESCE(s.total_score, 0) AS total, s.is_present
+                    FROM persohub_event_scores s JOIN persohub_event_rounds r ON r.id = s.round_id
+                    WHERE s.event_id = :e AND s.entity_type = :et
+                      AND ((:et = 'USER' AND s.user_id = :u) OR (:et = 'TEAM' AND s.team_id = :t))
+                    ORDER BY r.round_no, r.id
+                    """
+                ),
+                {"e": event_id, "et": reg.entity_type, "u": reg.user_id, "t": reg.team_id},
+            ).fetchall():
+                if score.is_present or score.normalized > 0 or score.total > 0:
+                    last_active = score.round_no
+            if last_active is not None:
+                value = next((no for no in round_nos if no > last_active), None) or max(round_nos) + 1
+            else:
+                value = revealed or round_nos[0]
+            conn.execute(text("UPDATE persohub_event_registrations SET eliminated_round_no = :v WHERE id = :id"), {"v": value, "id": reg.id})
+
+
+def _legacy_keep_latest(conn, table, partition, entity_type, column):
+    conn.execute(
+        text(
+            f"""
+            WITH ranked AS (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY id DESC) AS rn
+                FROM {table}
+                WHERE entity_type = '{entity_type}' AND {column} IS NOT NULL
+            )
+            DELETE FROM {table} t USING ranked r WHERE t.id = r.id AND r.rn > 1
+            """
+        )
+    )
+
+
+def _legacy_entry_scope(conn, prefix):
+    conn.execute(
+        text(
+            f"""
+            UPDATE {prefix}_event_scores s SET is_present = a.is_present
+            FROM {prefix}_event_attendance a
+            WHERE a.round_id IS NOT NULL AND a.event_id = s.event_id AND a.round_id = s.round_id
+              AND a.entity_type = s.entity_type
+              AND ((a.entity_type = 'USER' AND a.user_id = s.user_id) OR (a.entity_type = 'TEAM' AND a.team_id = s.team_id))
+            """
+        )
+    )
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO {prefix}_event_scores (event_id, round_id, entity_type, user_id, team_id, criteria_scores, total_score, normalized_score, is_present)
+            SELECT a.event_id, a.round_id, a.entity_type, a.user_id, a.team_id, '{{}}'::jsonb, 0, 0, a.is_present
+            FROM {prefix}_event_attendance a
+            LEFT JOIN {prefix}_event_scores s
+              ON s.event_id = a.event_id AND s.round_id = a.round_id AND s.entity_type = a.entity_type
+             AND ((a.entity_type = 'USER' AND s.user_id = a.user_id) OR (a.entity_type = 'TEAM' AND s.team_id = a.team_id))
+            WHERE a.round_id IS NOT NULL AND s.id IS NULL
+            """
+        )
+    )
+    conn.execute(text(f"DELETE FROM {prefix}_event_attendance WHERE round_id IS NOT NULL"))
+    _legacy_keep_latest(conn, f"{prefix}_event_attendance", "event_id, entity_type, user_id", "USER", "user_id")
+    _legacy_keep_latest(conn, f"{prefix}_event_attendance", "event_id, entity_type, team_id", "TEAM", "team_id")
+    conn.execute(text(f"DROP INDEX IF EXISTS idx_{prefix}_event_attendance_event_round"))
+    conn.execute(text(f"ALTER TABLE {prefix}_event_attendance DROP CONSTRAINT IF EXISTS uq_{prefix}_event_attendance_entity"))
+    conn.execute(text(f"ALTER TABLE {prefix}_event_attendance DROP COLUMN round_id"))
+    for statement in migrations._entry_attendance_index_sql(prefix):
+        conn.execute(text(statement))
+
+
+def _legacy_pda_uniqueness(conn):
+    _legacy_keep_latest(conn, "pda_event_scores", "event_id, round_id, entity_type, user_id", "USER", "user_id")
+    _legacy_keep_latest(conn, "pda_event_scores", "event_id, round_id, entity_type, team_id", "TEAM", "team_id")
+    conn.execute(text("ALTER TABLE pda_event_scores DROP CONSTRAINT IF EXISTS uq_pda_event_score_entity"))
+
+
+def _snapshot(engine):
+    def rows(sql):
+        with engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(text(sql))]
+
+    score_columns = "event_id, round_id, entity_type, user_id, team_id, total_score, is_present"
+    return {
+        "rounds": rows("SELECT id, event_id, round_no FROM persohub_event_rounds ORDER BY id"),
+        "registrations": rows("SELECT id, wildcard_start_round_no, eliminated_round_no FROM persohub_event_registrations ORDER BY id"),
+        # The per-row code could insert one score row per duplicate mark; compare the distinct rows.
+        **{
+            f"{prefix}_scores": sorted(set(rows(f"SELECT {score_columns} FROM {prefix}_event_scores")), key=repr)
+            for prefix in ("pda", "persohub")
+        },
+        **{
+            f"{prefix}_attendance": rows(f"SELECT event_id, entity_type, user_id, team_id, is_present FROM {prefix}_event_attendance ORDER BY id")
+            for prefix in ("pda", "persohub")
+        },
+    }
+
+
+@pytest.fixture
+def pg_engines():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("set TEST_DATABASE_URL (postgresql://...) to run the backfills against Postgres")
+    admin = create_engine(url)
+    schemas = [f"backfill_{kind}_{uuid.uuid4().hex[:8]}" for kind in ("legacy", "current")]
+    with admin.begin() as conn:
+        for schema in schemas:
+            conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engines = [create_engine(url, connect_args={"options": f"-csearch_path={schema}"}) for schema in schemas]
+    for engine in engines:
+        with engine.begin() as conn:
+            for statement in [*BASELINE_SCHEMA, *PERSOHUB_SEED, *_attendance_seed("pda"), *_attendance_seed("persohub"), *PDA_SCORE_SEED]:
+                conn.execute(text(statement))
+    try:
+        yield engines
+    finally:
+        for engine in engines:
+            engine.dispose()
+        with admin.begin() as conn:
+            for schema in schemas:
+                conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+def test_set_based_backfills_match_the_per_row_implementation(pg_engines, chunk_size):
+    legacy, current = pg_engines
+    with legacy.begin() as conn:
+        _legacy_round_numbers(conn)
+        _legacy_eliminated_round(conn)
+        _legacy_entry_scope(conn, "pda")
+        _legacy_entry_scope(conn, "persohub")
+        _legacy_pda_uniqueness(conn)
+
+    # One-id chunks put every duplicate and every event in a chunk of its own; 1000 runs everything in one.
+    dry = migrations.backfill_persohub_event_round_numbers_once(current, chunk_size=chunk_size, dry_run=True)
+    assert dry["status"] == "dry_run"
+    for backfill in (
+        migrations.backfill_persohub_event_round_numbers_once,
+        migrations.backfill_persohub_event_eliminated_round_once,
+        migrations.migrate_event_attendance_to_entry_scope_once,
+        migrations.enforce_pda_event_entity_uniqueness_once,
+    ):
+        backfill(current, chunk_size=chunk_size, dry_run=False)
+
+    expected, actual = _snapshot(legacy), _snapshot(current)
+    assert actual == expected
+    assert actual["rounds"] == [(1, 1, 2), (2, 1, 1), (3, 1, 3), (4, 2, 2), (5, 2, 1)]
+    assert actual["registrations"] == [
+        (1, 2, None), (2, None, 3), (3, None, 4), (4, None, 2), (5, None, 2), (6, None, 3), (7, None, 1), (8, None, 3), (9, None, None),
+    ]
+    assert ("USER", 21, None, 2.0, True) in [row[2:] for row in actual["pda_scores"]]
+    with current.connect() as conn:
+        duplicates = conn.execute(
+            text(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM persohub_event_scores "
+                "GROUP BY event_id, round_id, entity_type, user_id, team_id HAVING COUNT(*) > 1) d"
+            )
+        ).scalar()
+        indexes = set(conn.execute(text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")).scalars())
+    assert duplicates == 0
+    assert {"uq_pda_event_score_entity_user", "uq_pda_event_attendance_entity_user", "uq_persohub_event_attendance_entity_team"} <= indexes
+    assert "idx_pda_event_attendance_event_round" not in indexes
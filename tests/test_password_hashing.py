@@ -0,0 +1,98 @@
+from pathlib import Path
+import asyncio
+import sys
+import threading
+
+import anyio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import password_hashing
+from database import Base
+from models import PdaUser
+from routers.auth_pda import pda_login
+from schemas import PdaUserLogin
+
+
+def test_pooled_hash_round_trip_and_rehash_detection(monkeypatch):
+    monkeypatch.setattr(password_hashing, "BCRYPT_ROUNDS", 4)
+    hashed = password_hashing.hash_password_pooled("s3cret")
+    assert hashed.startswith("$2b$04$")
+    assert password_hashing.verify_password_pooled("s3cret", hashed)
+    assert not password_hashing.verify_password_pooled("wrong", hashed)
+    assert not password_hashing.password_needs_rehash(hashed)
+
+    monkeypatch.setattr(password_hashing, "BCRYPT_ROUNDS", 5)
+    assert password_hashing.password_needs_rehash(hashed)
+    assert not password_hashing.password_needs_rehash("not-a-bcrypt-hash")
+
+
+def test_full_queue_is_shed_with_retry_after(monkeypatch):
+    monkeypatch.setattr(password_hashing, "PASSWORD_HASH_MAX_PENDING", 0)
+    rejected = password_hashing.password_hash_stats()["rejected"]
+    with pytest.raises(HTTPException) as exc:
+        password_hashing.verify_password_pooled("x", "$2b$04$invalid")
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == str(password_hashing.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+    assert password_hashing.password_hash_stats()["rejected"] == rejected + 1
+
+
+def test_async_hashes_wait_without_holding_request_threads(monkeypatch):
+    release = threading.Event()
+
+    def slow_hash(password, rounds):
+        release.wait(5)
+        return f"hashed:{password}"
+
+    monkeypatch.setattr(password_hashing, "hash_password", slow_hash)
+    monkeypatch.setattr(password_hashing, "PASSWORD_HASH_MAX_PENDING", 64)
+
+    async def burst():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        jobs = [asyncio.ensure_future(password_hashing.hash_password_async(f"pw{idx}")) for idx in range(12)]
+        await asyncio.sleep(0.05)
+        # Every hash is queued or running on the hashing pool, yet no request thread is borrowed.
+        assert password_hashing.password_hash_stats()["pending"] == 12
+        assert limiter.borrowed_tokens == 0
+        release.set()
+        return await asyncio.gather(*jobs)
+
+    assert asyncio.run(burst()) == [f"hashed:pw{idx}" for idx in range(12)]
+    assert password_hashing.password_hash_stats()["pending"] == 0
+
+
+def test_login_awaits_the_hashing_pool_and_upgrades_the_cost(monkeypatch):
+    monkeypatch.setattr(password_hashing, "BCRYPT_ROUNDS", 4)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        user = PdaUser(
+            regno="2024000001",
+            email="user@example.com",
+            hashed_password=password_hashing.hash_password("s3cret", rounds=5),
+            name="User",
+        )
+        db.add(user)
+        db.commit()
+
+        response = asyncio.run(pda_login(PdaUserLogin(regno="2024000001", password="s3cret"), db=db))
+        assert response.user.regno == "2024000001"
+        assert response.password_reset_required is False
+        db.refresh(user)
+        assert user.hashed_password.startswith("$2b$04$")
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(pda_login(PdaUserLogin(regno="2024000001", password="wrong"), db=db))
+        assert exc.value.status_code == 401
+    finally:
+        db.close()
+        engine.dispose()
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from database import Base
+from models import PdaResume, PdaUser
+from recruitment_state import get_recruitment_state
+from routers.pda_admin import list_pda_users
+from routers.superadmin import list_recruitments
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _seed(db):
+    payloads = [
+        {"is_applied": True, "preferred_team_1": "Design"},
+        {"preferred_team": "Web"},
+        {"preferred_team_1": "   "},
+        None,
+        {"is_applied": False},
+        {"is_applied": True},
+    ]
+    users = []
+    created_at = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    for idx, payload in enumerate(payloads, start=1):
+        users.append(
+            PdaUser(
+                regno=f"2024{idx:06d}",
+                email=f"user{idx}@example.com",
+                hashed_password="x",
+                name=f"User {idx % 3}",
+                profile_name=f"handle_{idx}",
+                json_content=payload,
+                is_member=idx == 6,
+                created_at=created_at + timedelta(hours=idx),
+            )
+        )
+    db.add_all(users)
+    db.flush()
+    db.add(PdaResume(user_id=users[0].id, s3_url="https://example.com/r.pdf"))
+    db.commit()
+    return users
+
+
+def test_users_list_pages_by_cursor_with_sql_filters(db):
+    users = _seed(db)
+    admin = users[5]
+    first_response = Response()
+    first = list_pda_users(page=None, page_size=4, cursor=None, response=first_response, admin=admin, db=db)
+    assert [item.regno for item in first] == [users[2].regno, users[5].regno, users[0].regno, users[3].regno]
+    assert first_response.headers["X-Total-Count"] == "6"
+    assert first_response.headers["X-Total-Count-Estimated"] == "false"
+
+    rest_response = Response()
+    rest = list_pda_users(page=None, page_size=4, cursor=first_response.headers["X-Next-Cursor"], response=rest_response, admin=admin, db=db)
+    assert [item.regno for item in rest] == [users[1].regno, users[4].regno]
+    assert "X-Next-Cursor" not in rest_response.headers
+
+    applied = list_pda_users(page=None, page_size=None, applied=True, is_member=False, response=Response(), admin=admin, db=db)
+    assert {item.regno for item in applied} == {users[0].regno, users[1].regno}
+    searched = list_pda_users(page=None, page_size=None, search="handle_4", response=Response(), admin=admin, db=db)
+    assert [item.regno for item in searched] == [users[3].regno]
+    assert list_pda_users(page=None, page_size=None, search="100%", response=Response(), admin=admin, db=db) == []
+
+    with pytest.raises(HTTPException) as exc:
+        list_pda_users(page=None, page_size=4, cursor="not-a-cursor", response=Response(), admin=admin, db=db)
+    assert exc.value.status_code == 400
+
+
+def test_recruitments_filter_applicants_in_sql(db, assert_max_queries):
+    users = _seed(db)
+    response = Response()
+    with assert_max_queries(5):
+        page = list_recruitments(page_size=1, cursor=None, search=None, response=response, _=users[5], db=db)
+    assert len(page) == 1 and response.headers["X-Total-Count"] == "2"
+    rest = list_recruitments(page_size=1, cursor=response.headers["X-Next-Cursor"], search=None, response=Response(), _=users[5], db=db)
+    assert [page[0].regno, rest[0].regno] == [users[1].regno, users[0].regno]
+    everyone = list_recruitments(page_size=None, cursor=None, search=None, response=None, _=users[5], db=db)
+    assert {item.regno for item in everyone} == {users[0].regno, users[1].regno}
+
+
+def test_applied_filter_only_counts_json_true_like_the_python_rule(db):
+    payloads = [
+        {"is_applied": True},
+        {"is_applied": "true"},
+        {"is_applied": "1"},
+        {"is_applied": 1},
+        {"is_applied": "not-a-bool"},
+        {"is_applied": None},
+        {"is_applied": False, "preferred_team": " Web "},
+        {},
+        None,
+    ]
+    users = [
+        PdaUser(regno=f"2024{idx:06d}", email=f"user{idx}@example.com", hashed_password="x", name=f"User {idx}",
+                json_content=payload, is_member=False)
+        for idx, payload in enumerate(payloads, start=1)
+    ]
+    db.add_all(users)
+    db.commit()
+
+    expected = {user.regno for user in users if get_recruitment_state(db, user.id, user=user)["is_applied"]}
+    assert expected == {users[0].regno, users[6].regno}
+    applied = list_pda_users(page=None, page_size=None, applied=True, response=Response(), admin=users[0], db=db)
+    assert {item.regno for item in applied} == expected
+    # The clause is never NULL, so its negation returns every other row, including NULL payloads.
+    not_applied = list_pda_users(page=None, page_size=None, applied=False, response=Response(), admin=users[0], db=db)
+    assert {item.regno for item in not_applied} == {user.regno for user in users} - expected
+
+
+def test_recruitment_pages_cross_rows_without_created_at(db):
+    created_at = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    stamps = [created_at + timedelta(hours=2), None, created_at + timedelta(hours=1), None, created_at + timedelta(hours=1)]
+    users = [
+        PdaUser(regno=f"2024{idx:06d}", email=f"user{idx}@example.com", hashed_password="x", name=f"User {idx}",
+                json_content={"is_applied": True}, is_member=False)
+        for idx in range(1, len(stamps) + 1)
+    ]
+    db.add_all(users)
+    db.flush()
+    for user, stamp in zip(users, stamps):
+        user.created_at = stamp
+    db.commit()
+    assert db.query(PdaUser).filter(PdaUser.created_at.is_(None)).count() == 2
+
+    seen, cursor = [], None
+    for _ in range(len(users)):
+        response = Response()
+        page = list_recruitments(page_size=2, cursor=cursor, search=None, response=response, _=users[0], db=db)
+        seen.extend(item.regno for item in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    # Dated rows newest first (id breaks the tie), then undated rows by id, each exactly once.
+    assert seen == [users[0].regno, users[4].regno, users[2].regno, users[3].regno, users[1].regno]
@@ -0,0 +1,64 @@
+import io
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import pdf_preview_service
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = dict(objects)
+        self.downloads = 0
+
+    def head_object(self, Bucket, Key):
+        return {"ETag": '"abc123"'}
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise KeyError(Key)
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def download_fileobj(self, Bucket, Key, fileobj):
+        self.downloads += 1
+        fileobj.write(self.objects[Key])
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+
+def _make_pdf(pages):
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(200, 200))
+    for index in range(pages):
+        pdf.drawString(20, 100, f"Page {index + 1}")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_generate_pdf_previews_reuses_manifest_for_same_content(monkeypatch):
+    fake = FakeS3({"posters/flyer.pdf": _make_pdf(3)})
+    monkeypatch.setattr(pdf_preview_service, "S3_CLIENT", fake)
+    monkeypatch.setattr(pdf_preview_service, "S3_BUCKET_NAME", "bucket")
+    monkeypatch.setattr(pdf_preview_service, "_build_s3_url", lambda key: f"https://cdn/{key}")
+    monkeypatch.setenv("PDF_PREVIEW_RENDER_WORKERS", "1")
+    pdf_preview_service._PREVIEW_CACHE.clear()
+
+    urls = pdf_preview_service.generate_pdf_previews("posters/flyer.pdf", "posters/previews", max_pages=2)
+    assert urls == [
+        "https://cdn/posters/previews/flyer-abc123-p2/page_001.webp",
+        "https://cdn/posters/previews/flyer-abc123-p2/page_002.webp",
+    ]
+    assert fake.objects["posters/previews/flyer-abc123-p2/page_001.webp"][:4] == b"RIFF"
+    assert "posters/previews/flyer-abc123-p2/manifest.json" in fake.objects
+
+    pdf_preview_service._PREVIEW_CACHE.clear()
+    assert pdf_preview_service.generate_pdf_previews("posters/flyer.pdf", "posters/previews", max_pages=2) == urls
+    assert fake.downloads == 1
@@ -11,7 +11,7 @@ if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
 from models import PersohubEventParticipantMode, PersohubEventRoundState
-from routers.persohub_events import get_event_results
+from routers.persohub_events import _event_results_payload
 from routers.persohub_events_admin import update_managed_event_results
 from schemas import PersohubManagedEventResultsUpdate
 
@@ -120,7 +120,7 @@ def test_public_results_payload_exposes_locked_and_unlocked_round_cards(monkeypa
     monkeypatch.setattr("routers.persohub_events._get_event_or_404", lambda db, slug: event)
     monkeypatch.setattr("routers.persohub_events._ensure_event_visible_for_public_access", lambda event: None)
 
-    payload = get_event_results(slug="demo", db=db)
+    payload = _event_results_payload(db, "demo")
 
     assert payload["title"] == "Demo Event"
     assert payload["final_event_snapshot"] is None
@@ -0,0 +1,89 @@
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import principal_cache
+from database import Base
+from models import PdaAdmin, PdaTeam, PdaUser
+from principal_cache import (
+    bump_permission_version,
+    cache_principal,
+    get_cached_principal,
+    permission_version,
+    token_cache_id,
+)
+from security import get_admin_context
+
+
+def test_token_cache_id_prefers_jti():
+    assert token_cache_id({"jti": "abc"}, "token") == "abc"
+    assert len(token_cache_id({}, "token")) == 64
+
+
+def test_cache_disabled_without_ttl(monkeypatch):
+    monkeypatch.setattr(principal_cache, "PRINCIPAL_CACHE_TTL_SECONDS", 0.0)
+    cache_principal("jti-1", "pda_admin", {"is_superadmin": True})
+    assert get_cached_principal("jti-1", "pda_admin") is None
+
+
+def test_version_bump_retires_entries(monkeypatch):
+    monkeypatch.setattr(principal_cache, "PRINCIPAL_CACHE_TTL_SECONDS", 60.0)
+    cache_principal("jti-2", "pda_admin", {"policy": {"home": True}})
+    cached = get_cached_principal("jti-2", "pda_admin")
+    assert cached == {"policy": {"home": True}}
+    cached["policy"]["home"] = False
+    assert get_cached_principal("jti-2", "pda_admin") == {"policy": {"home": True}}
+
+    stale_version = permission_version()
+    bump_permission_version()
+    assert get_cached_principal("jti-2", "pda_admin") is None
+    cache_principal("jti-2", "pda_admin", {"policy": {}}, version=stale_version)
+    assert get_cached_principal("jti-2", "pda_admin") is None
+
+
+def test_committing_admin_changes_bumps_version():
+    engine = create_engine("sqlite://")
+    PdaAdmin.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    before = permission_version()
+    db.add(PdaAdmin(user_id=1, policy={"home": True}))
+    db.commit()
+    assert permission_version() == before + 1
+
+    db.query(PdaAdmin).filter(PdaAdmin.user_id == 1).update({"policy": {"home": False}}, synchronize_session=False)
+    db.commit()
+    assert permission_version() == before + 2
+
+
+def test_admin_context_resolves_admin_and_team_in_one_query(monkeypatch, assert_max_queries):
+    monkeypatch.setattr(principal_cache, "PRINCIPAL_CACHE_TTL_SECONDS", 60.0)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    user = PdaUser(regno="2024000001", email="admin@example.com", hashed_password="x", name="Admin")
+    db.add(user)
+    db.flush()
+    db.add_all([PdaAdmin(user_id=user.id, policy={"events": {"quiz": True}}), PdaTeam(user_id=user.id, team="Design", designation="Head")])
+    db.commit()
+    request = SimpleNamespace(state=SimpleNamespace(auth_token_id="jti-admin-context"))
+
+    with assert_max_queries(1):
+        context = get_admin_context(request=request, user=user, db=db)
+    assert context["has_admin_row"] is True and context["is_superadmin"] is False
+    assert context["policy"] == {"events": {"quiz": True}}
+    assert context["team"] == {"id": 1, "team": "Design", "designation": "Head"}
+    with assert_max_queries(0):
+        assert get_admin_context(request=request, user=user, db=db) == context
+
+    # Moving the admin to another team retires the cached principal.
+    db.query(PdaTeam).update({"team": "Events"}, synchronize_session=False)
+    db.commit()
+    assert get_admin_context(request=request, user=user, db=db)["team"]["team"] == "Events"
@@ -0,0 +1,267 @@
+from pathlib import Path
+import asyncio
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from database import Base
+from models import (
+    PdaAdmin,
+    PdaEvent,
+    PdaEventAttendance,
+    PdaEventEntityType,
+    PdaEventFormat,
+    PdaEventParticipantMode,
+    PdaEventRegistration,
+    PdaEventRound,
+    PdaEventRoundMode,
+    PdaEventRoundState,
+    PdaEventScore,
+    PdaEventTeam,
+    PdaEventTeamMember,
+    PdaEventTemplate,
+    PdaEventType,
+    PdaUser,
+    PersohubAdmin,
+    PersohubClub,
+    PersohubClubAdmin,
+    PersohubCommunity,
+    PersohubEvent,
+    PersohubEventAttendance,
+    PersohubEventRegistration,
+    PersohubEventResultFinalist,
+    PersohubEventResultTitle,
+    PersohubEventRound,
+    PersohubEventScore,
+)
+from routers import pda_events, persohub_community_auth, persohub_events
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _event_fields(idx, participant_mode=PdaEventParticipantMode.INDIVIDUAL):
+    return dict(
+        slug=f"event-{idx}",
+        event_code=f"EV{idx:03d}",
+        title=f"Event {idx}",
+        event_type=PdaEventType.TECHNICAL,
+        format=PdaEventFormat.OFFLINE,
+        template_option=PdaEventTemplate.ATTENDANCE_SCORING,
+        participant_mode=participant_mode,
+        round_mode=PdaEventRoundMode.MULTI,
+    )
+
+
+def _user(idx):
+    return PdaUser(regno=f"2024{idx:06d}", email=f"user{idx}@example.com", hashed_password="x", name=f"User {idx}")
+
+
+def _seed_pda(db, count):
+    me, lead = _user(1), _user(2)
+    db.add_all([me, lead])
+    db.flush()
+    for idx in range(count):
+        event = PdaEvent(**_event_fields(idx))
+        db.add(event)
+        db.flush()
+        rounds = [PdaEventRound(event_id=event.id, round_no=no, name=f"Round {no}") for no in (1, 2)]
+        db.add_all(rounds)
+        db.flush()
+        db.add(PdaEventRegistration(event_id=event.id, user_id=me.id, entity_type=PdaEventEntityType.USER))
+        if idx % 2 == 0:
+            db.add_all(
+                PdaEventScore(event_id=event.id, round_id=round_row.id, entity_type=PdaEventEntityType.USER,
+                              user_id=me.id, total_score=10.0 + idx, is_present=round_row.round_no == 1)
+                for round_row in rounds
+            )
+        else:
+            db.add(PdaEventAttendance(event_id=event.id, entity_type=PdaEventEntityType.USER, user_id=me.id, is_present=True))
+    team_event = PdaEvent(**_event_fields(count, PdaEventParticipantMode.TEAM))
+    db.add(team_event)
+    db.flush()
+    team = PdaEventTeam(event_id=team_event.id, team_code="ABCDE", team_name="Team", team_lead_user_id=lead.id)
+    db.add(team)
+    db.flush()
+    db.add(PdaEventTeamMember(team_id=team.id, user_id=me.id))
+    db.add(PdaEventRegistration(event_id=team_event.id, team_id=team.id, entity_type=PdaEventEntityType.TEAM))
+    db.add(PdaEventAttendance(event_id=team_event.id, entity_type=PdaEventEntityType.TEAM, team_id=team.id, is_present=True))
+    db.commit()
+    return me
+
+
+@pytest.mark.parametrize("count", [2, 6])
+def test_pda_my_events_has_a_fixed_query_budget(db, assert_max_queries, count):
+    me = _seed_pda(db, count)
+    with assert_max_queries(8, max_repeats=2):
+        items = pda_events.my_events(user=me, db=db)
+    assert len(items) == count + 1
+    for item in items:
+        kwargs = {"user_id": item.entity_id} if item.entity_type.value == "user" else {"team_id": item.entity_id}
+        expected_attendance, _ = pda_events._resolve_attendance_metrics(db, item.event.id, **kwargs)
+        assert item.attendance_count == expected_attendance
+    scored = {item.event.slug: item.cumulative_score for item in items if item.cumulative_score}
+    assert scored == {f"event-{idx}": 2 * (10.0 + idx) for idx in range(0, count, 2)}
+
+
+def _seed_persohub(db, count):
+    me = _user(1)
+    db.add(me)
+    db.flush()
+    club = PersohubClub(name="Club", profile_id="club")
+    db.add(club)
+    db.flush()
+    for idx in range(count):
+        event = PersohubEvent(club_id=club.id, **_event_fields(idx))
+        db.add(event)
+        db.flush()
+        rounds = [PersohubEventRound(event_id=event.id, round_no=no, name=f"Round {no}") for no in (1, 2)]
+        db.add_all(rounds)
+        db.flush()
+        # Every other registration is a wildcard that only counts from round 2.
+        wildcard = idx % 2 == 1
+        db.add(
+            PersohubEventRegistration(
+                event_id=event.id,
+                user_id=me.id,
+                entity_type=PdaEventEntityType.USER,
+                wildcard_seed_score=5.0 if wildcard else None,
+                wildcard_start_round_no=2 if wildcard else None,
+            )
+        )
+        db.add_all(
+            PersohubEventScore(event_id=event.id, round_id=round_row.id, entity_type=PdaEventEntityType.USER,
+                               user_id=me.id, total_score=50.0, normalized_score=float(round_row.round_no),
+                               is_present=True)
+            for round_row in rounds
+        )
+        db.add(PersohubEventAttendance(event_id=event.id, entity_type=PdaEventEntityType.USER, user_id=me.id, is_present=True))
+    db.commit()
+    return me
+
+
+@pytest.mark.parametrize("count", [2, 6])
+def test_persohub_my_events_has_a_fixed_query_budget(db, assert_max_queries, count):
+    me = _seed_persohub(db, count)
+    with assert_max_queries(6, max_repeats=2):
+        items = persohub_events.my_events(user=me, db=db)
+    assert len(items) == count
+    by_slug = {item.event.slug: item for item in items}
+    for idx in range(count):
+        item = by_slug[f"event-{idx}"]
+        assert item.attendance_count == 2
+        # Normalized round scores 1 + 2; a wildcard keeps round 2 plus its seed.
+        assert item.cumulative_score == (5.0 + 2.0 if idx % 2 else 3.0)
+
+
+def _seed_session_clubs(db, count):
+    me, other = _user(1), _user(2)
+    db.add_all([me, other])
+    db.flush()
+    db.add(PdaAdmin(user_id=other.id, policy={"superAdmin": False}))
+    for idx in range(count):
+        # Cycle through owned, club-superadmin and delegated-admin clubs.
+        kind = idx % 3
+        club = PersohubClub(name=f"Club {idx}", profile_id=f"club{idx}", owner_user_id=me.id if kind == 0 else other.id)
+        db.add(club)
+        db.flush()
+        communities = [
+            PersohubCommunity(name=f"Club {idx} Team {no}", profile_id=f"club{idx}team{no}", club_id=club.id, admin_id=other.id)
+            for no in (1, 2)
+        ]
+        db.add_all(communities)
+        db.flush()
+        if kind == 1:
+            db.add(PersohubClubAdmin(club_id=club.id, user_id=me.id))
+        elif kind == 2:
+            db.add(PersohubAdmin(community_id=communities[0].id, user_id=me.id, policy={"events": {f"event-{idx}": True}}))
+    db.commit()
+    return me
+
+
+@pytest.mark.parametrize("count", [3, 9])
+def test_session_options_has_a_fixed_query_budget(db, assert_max_queries, count):
+    me = _seed_session_clubs(db, count)
+    db.expunge_all()
+    with assert_max_queries(10, max_repeats=2):
+        payload = persohub_community_auth.persohub_session_options(user=me, db=db)
+    items = payload["items"]
+    # Owned and club-superadmin clubs list both communities; delegated admins see their one.
+    assert len(items) == sum(1 if idx % 3 == 2 else 2 for idx in range(count))
+    roles = {item.club_profile_id: item.current_admin_role for item in items}
+    assert roles == {f"club{idx}": ("owner", "superadmin", "admin")[idx % 3] for idx in range(count)}
+    delegated = next(item for item in items if item.current_admin_role == "admin")
+    assert delegated.can_access_events is True
+    assert delegated.event_policy == {"events": {"event-2": True}}
+    assert {item.admin_regno for item in items} == {"2024000002"}
+    assert {item.current_admin_regno for item in items} == {"2024000001"}
+
+
+class _RunSync:
+    """The part of AsyncSession that get_event_results uses, over a sync session."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args):
+        return fn(self.session, *args)
+
+
+def _seed_results(db, count):
+    club = PersohubClub(name="Club", profile_id="club")
+    db.add(club)
+    db.flush()
+    event = PersohubEvent(
+        club_id=club.id,
+        results_published=True,
+        results_winners_revealed=True,
+        **_event_fields(0),
+    )
+    db.add(event)
+    db.flush()
+    db.add_all(
+        PersohubEventRound(event_id=event.id, round_no=no, name=f"Round {no}", state=PdaEventRoundState.COMPLETED)
+        for no in (1, 2)
+    )
+    users = [_user(idx) for idx in range(1, count + 1)]
+    db.add_all(users)
+    db.flush()
+    leaderboard = []
+    for rank, user in enumerate(users, start=1):
+        db.add(PersohubEventRegistration(event_id=event.id, user_id=user.id, entity_type=PdaEventEntityType.USER))
+        db.add(PersohubEventResultFinalist(event_id=event.id, entity_type=PdaEventEntityType.USER, user_id=user.id, sort_order=rank))
+        db.add(
+            PersohubEventResultTitle(event_id=event.id, title_name=f"Title {rank}", precedence_rank=rank,
+                                     entity_type=PdaEventEntityType.USER, user_id=user.id)
+        )
+        leaderboard.append({"entity_type": "user", "entity_id": user.id, "rank": rank, "cumulative_score": 100.0 - rank})
+    event.event_results_snapshot = {"leaderboard": leaderboard}
+    db.commit()
+    return event
+
+
+@pytest.mark.parametrize("count", [2, 6])
+def test_event_results_has_a_fixed_query_budget(db, assert_max_queries, count):
+    event = _seed_results(db, count)
+    with assert_max_queries(7, max_repeats=1):
+        payload = asyncio.run(persohub_events.get_event_results(event.slug, db=_RunSync(db)))
+    assert [item["performance"]["overall_rank"] for item in payload["nominees"]] == list(range(1, count + 1))
+    assert [item["performance"]["total_score"] for item in payload["title_winners"]] == [100.0 - rank for rank in range(1, count + 1)]
+    assert [item["round_no"] for item in payload["rounds"]] == [1, 2]
@@ -0,0 +1,192 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import smtplib
+import sys
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import audit_log
+import emailer
+import recruitment_notify
+import routers.superadmin as superadmin_router
+from database import Base
+from models import PdaUser, RecruitmentNotifyJob, SystemConfig
+from routers.superadmin import RECRUITMENT_NOTIFY_MARKER_KEY, get_recruitment_notify_job, notify_existing_recruitment_applicants
+
+
+class FakeSMTP:
+    opened = []
+
+    def __init__(self, config):
+        self.config = config
+        self.messages = []
+        FakeSMTP.opened.append(self)
+
+    def send_message(self, message):
+        if message["To"] == "bad@example.com":
+            raise smtplib.SMTPRecipientsRefused({message["To"]: (550, b"no such user")})
+        self.messages.append(message["To"])
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(audit_log, "AUDIT_LOG_ASYNC", False)
+    monkeypatch.setenv("SMTP_PRIMARY_HOST", "smtp.example.com")
+    monkeypatch.setenv("SMTP_PRIMARY_PORT", "587")
+    monkeypatch.setenv("SMTP_PRIMARY_FROM", "noreply@example.com")
+    monkeypatch.setattr(emailer, "_open_smtp", FakeSMTP)
+    FakeSMTP.opened = []
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(superadmin_router, "SessionLocal", factory)
+    session = factory()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _seed(db, emails):
+    users = [
+        PdaUser(regno=f"2024{idx:06d}", email=email, hashed_password="x", name=f"User {idx}", is_member=False,
+                json_content={"is_applied": True})
+        for idx, email in enumerate(emails, start=1)
+    ]
+    admin = PdaUser(regno="0000000001", email="admin@example.com", hashed_password="x", name="Admin", is_member=True)
+    db.add_all(users + [admin])
+    db.commit()
+    return admin
+
+
+def _marker(db):
+    db.expire_all()
+    marker = db.query(SystemConfig).filter(SystemConfig.key == RECRUITMENT_NOTIFY_MARKER_KEY).first()
+    return marker.value if marker else None
+
+
+def _run(tasks):
+    for task in tasks.tasks:
+        task.func(*task.args, **task.kwargs)
+
+
+def test_notify_returns_a_job_and_sends_over_one_connection(db):
+    admin = _seed(db, ["a@example.com", "bad@example.com", "c@example.com"])
+
+    tasks = BackgroundTasks()
+    queued = notify_existing_recruitment_applicants(background_tasks=tasks, superadmin=admin, db=db, request=None)
+    assert queued["already_sent"] is False and queued["total_candidates"] == 3
+    job_id = queued["job_id"]
+    assert get_recruitment_notify_job(job_id=job_id, _=admin, db=db)["status"] == "queued"
+    assert FakeSMTP.opened == []
+    # Nothing is marked as sent until the job has actually run.
+    assert _marker(db) is None
+    repeat = notify_existing_recruitment_applicants(background_tasks=BackgroundTasks(), superadmin=admin, db=db, request=None)
+    assert repeat["job_id"] == job_id
+
+    _run(tasks)
+    assert _marker(db) == "done"
+    job = get_recruitment_notify_job(job_id=job_id, _=admin, db=db)
+    assert (job["status"], job["sent"], job["failed"], job["processed"]) == ("completed", 2, 1, 3)
+    assert {item["email"]: item["status"] for item in job["recipients"]} == {
+        "a@example.com": "sent",
+        "bad@example.com": "failed",
+        "c@example.com": "sent",
+    }
+    # A refused recipient does not cost the batch its connection.
+    assert len(FakeSMTP.opened) == 1
+    assert FakeSMTP.opened[0].messages == ["c@example.com", "a@example.com"]
+
+    again = notify_existing_recruitment_applicants(background_tasks=BackgroundTasks(), superadmin=admin, db=db, request=None)
+    assert again["already_sent"] is True
+
+
+def test_aborted_job_leaves_the_one_time_mail_retryable(db, monkeypatch):
+    admin = _seed(db, ["a@example.com"])
+
+    def unreachable(config):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(emailer, "_open_smtp", unreachable)
+    tasks = BackgroundTasks()
+    queued = notify_existing_recruitment_applicants(background_tasks=tasks, superadmin=admin, db=db, request=None)
+    _run(tasks)
+    job = get_recruitment_notify_job(job_id=queued["job_id"], _=admin, db=db)
+    assert job["status"] == "failed" and job["sent"] == 0
+    assert _marker(db) is None
+
+    monkeypatch.setattr(emailer, "_open_smtp", FakeSMTP)
+    retry_tasks = BackgroundTasks()
+    retry = notify_existing_recruitment_applicants(background_tasks=retry_tasks, superadmin=admin, db=db, request=None)
+    assert retry["already_sent"] is False and retry["job_id"] != queued["job_id"]
+    _run(retry_tasks)
+    assert get_recruitment_notify_job(job_id=retry["job_id"], _=admin, db=db)["sent"] == 1
+    assert _marker(db) == "done"
+
+
+def test_missing_smtp_config_fails_the_job_without_marking_it_sent(db, monkeypatch):
+    admin = _seed(db, ["a@example.com", "c@example.com"])
+    monkeypatch.delenv("SMTP_PRIMARY_HOST")
+    tasks = BackgroundTasks()
+    queued = notify_existing_recruitment_applicants(background_tasks=tasks, superadmin=admin, db=db, request=None)
+    _run(tasks)
+    job = get_recruitment_notify_job(job_id=queued["job_id"], _=admin, db=db)
+    assert (job["status"], job["sent"], job["failed"]) == ("failed", 0, 0)
+    assert job["error"] == "SMTP_PRIMARY configuration missing"
+    assert _marker(db) is None
+
+
+def test_job_where_every_mail_was_refused_stays_retryable(db):
+    admin = _seed(db, ["bad@example.com"])
+    tasks = BackgroundTasks()
+    queued = notify_existing_recruitment_applicants(background_tasks=tasks, superadmin=admin, db=db, request=None)
+    _run(tasks)
+    job = get_recruitment_notify_job(job_id=queued["job_id"], _=admin, db=db)
+    assert (job["status"], job["sent"], job["failed"]) == ("completed", 0, 1)
+    assert _marker(db) is None
+
+
+def test_job_state_is_shared_across_workers(db):
+    admin = _seed(db, ["a@example.com"])
+    other_worker = superadmin_router.SessionLocal()
+    tasks = BackgroundTasks()
+    queued = notify_existing_recruitment_applicants(background_tasks=tasks, superadmin=admin, db=db, request=None)
+
+    # Another worker sees the job and cannot start a second one.
+    assert get_recruitment_notify_job(job_id=queued["job_id"], _=admin, db=other_worker)["status"] == "queued"
+    assert recruitment_notify.create_notify_job(other_worker, [{"user_id": 1, "email": "x@example.com"}]) is None
+    repeat = notify_existing_recruitment_applicants(background_tasks=BackgroundTasks(), superadmin=admin, db=other_worker, request=None)
+    assert repeat["job_id"] == queued["job_id"]
+
+    _run(tasks)
+    assert get_recruitment_notify_job(job_id=queued["job_id"], _=admin, db=other_worker)["sent"] == 1
+    assert recruitment_notify.active_notify_job(other_worker) is None
+    other_worker.close()
+
+
+def test_a_job_abandoned_by_its_worker_is_released(db):
+    admin = _seed(db, ["a@example.com"])
+    queued = notify_existing_recruitment_applicants(background_tasks=BackgroundTasks(), superadmin=admin, db=db, request=None)
+    db.query(RecruitmentNotifyJob).update({"heartbeat_at": datetime.now(timezone.utc) - timedelta(hours=1)})
+    db.commit()
+
+    tasks = BackgroundTasks()
+    retry = notify_existing_recruitment_applicants(background_tasks=tasks, superadmin=admin, db=db, request=None)
+    assert retry["job_id"] != queued["job_id"]
+    abandoned = get_recruitment_notify_job(job_id=queued["job_id"], _=admin, db=db)
+    assert (abandoned["status"], abandoned["error"]) == ("failed", "Abandoned by its worker")
+    _run(tasks)
+    assert _marker(db) == "done"
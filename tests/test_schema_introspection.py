@@ -0,0 +1,52 @@
+from pathlib import Path
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import migrations
+from schema_introspection import invalidate_schema_snapshot, schema_snapshot
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name VARCHAR(20), CONSTRAINT uq_items_name UNIQUE (name))"))
+        conn.execute(text("CREATE INDEX ix_items_name ON items (name)"))
+    yield engine
+    invalidate_schema_snapshot(engine)
+    engine.dispose()
+
+
+def test_migration_helpers_read_one_cached_snapshot(engine, assert_max_queries):
+    with engine.begin() as conn:
+        assert migrations._table_exists(conn, "items")
+        with assert_max_queries(0):
+            assert migrations._column_exists(conn, "items", "name")
+            assert not migrations._column_exists(conn, "items", "missing")
+            assert migrations._column_udt_name(conn, "items", "name") == "varchar(20)"
+            assert migrations._index_exists(conn, "ix_items_name")
+            assert migrations._constraint_exists(conn, "items", "uq_items_name")
+            assert not migrations._table_exists(conn, "other")
+
+
+def test_ddl_invalidates_the_snapshot(engine):
+    with engine.begin() as conn:
+        assert not migrations._column_exists(conn, "items", "slug")
+        conn.execute(text("ALTER TABLE items ADD COLUMN slug VARCHAR(40)"))
+        assert migrations._column_exists(conn, "items", "slug")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE extra (id INTEGER PRIMARY KEY)"))
+    session = sessionmaker(bind=engine)()
+    try:
+        assert schema_snapshot(session).has_table("extra")
+    finally:
+        session.close()
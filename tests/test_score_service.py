@@ -0,0 +1,184 @@
+from io import BytesIO
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi import HTTPException
+from openpyxl import Workbook
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from models import PdaEventEntityType, PdaEventScore, PersohubEventScore
+from score_service import bulk_upsert_scores, read_score_import, recompute_normalized_scores, score_import_response
+
+ENTITIES = {
+    "REG001": {"entity_type": "user", "entity_id": 1, "name": "Asha Rao"},
+    "REG002": {"entity_type": "user", "entity_id": 2, "name": "Vikram"},
+    "REG003": {"entity_type": "user", "entity_id": 3, "name": "Meera"},
+}
+
+
+def _sheet(rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Register Number", "Name", "Present", "Design", "Code"])
+    for row in rows:
+        ws.append(row)
+    buffer = BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def _read(buffer, panel_assigned_keys=None):
+    return read_score_import(
+        buffer,
+        id_col_name="register number",
+        name_col_name="name",
+        criteria_max={"Design": 10.0, "Code": 20.0},
+        entity_by_identifier=ENTITIES,
+        panel_assigned_keys=panel_assigned_keys,
+    )
+
+
+def test_read_score_import_classifies_rows():
+    result = _read(
+        _sheet(
+            [
+                ["reg001", "Asha Rao", "Yes", 5, "10/20"],
+                ["REG002", "Someone Else", "", 4, 8],
+                ["REG003", "Meera", "No", None, None],
+                [None, None, None, None, None],
+                ["REG404", "Ghost", "Yes", 1, 1],
+                ["REG001", "Asha Rao", "maybe", 1, 1],
+                ["REG002", "Vikram", "Yes", 11, 1],
+                [None, "No Id", "Yes", 1, 1],
+            ]
+        )
+    )
+    payload = score_import_response(result, preview=True, imported=0)
+    assert payload["total_rows"] == 7
+    assert payload["ready_to_import"] == 3
+    assert payload["identified_count"] == 2
+    assert payload["mismatched_count"] == 1
+    assert payload["unidentified_count"] == 1
+    assert payload["other_required_count"] == 3
+    first, second, absent = result["valid_rows"]
+    assert first["scores"] == {"Design": 5.0, "Code": 10.0}
+    assert first["normalized"] == pytest.approx(15 / 30 * 100)
+    assert second["is_present"] is True
+    assert absent["is_present"] is False and absent["total"] == 0.0
+    assert "Row 8: Design must be between 0 and 10.0" in payload["errors"]
+    assert "Row 9: Missing Register Number" in payload["errors"]
+
+
+def test_read_score_import_requires_panel_assignment():
+    result = _read(_sheet([["REG001", "Asha Rao", "Yes", 1, 1], ["REG002", "Vikram", "Yes", 1, 1]]), {("user", 2)})
+    assert [row["user_id"] for row in result["valid_rows"]] == [2]
+    assert result["other_required_rows"][0]["reason"] == "Panel assignment required for present scoring in panel mode"
+
+
+def test_read_score_import_rejects_missing_columns():
+    wb = Workbook()
+    wb.active.append(["Register Number", "Design"])
+    buffer = BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    with pytest.raises(HTTPException) as exc:
+        _read(buffer)
+    assert exc.value.detail == "Missing criteria columns: Code"
+
+
+def _score_session():
+    engine = create_engine("sqlite://")
+    PdaEventScore.__table__.create(engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_bulk_upsert_scores_updates_and_inserts(assert_max_queries):
+    db = _score_session()
+    db.add(
+        PdaEventScore(
+            event_id=1,
+            round_id=1,
+            entity_type=PdaEventEntityType.USER,
+            user_id=1,
+            criteria_scores={"Design": 1.0},
+            total_score=1.0,
+            normalized_score=10.0,
+            is_present=True,
+        )
+    )
+    db.commit()
+
+    rows = [
+        {"entity_type": "user", "user_id": 1, "team_id": None, "scores": {"Design": 9.0}, "total": 9.0, "normalized": 90.0, "is_present": True},
+        {"entity_type": "team", "user_id": None, "team_id": 7, "scores": {"Design": 0.0}, "total": 0.0, "normalized": 0.0, "is_present": False},
+    ]
+    with assert_max_queries(3, max_repeats=1):
+        assert bulk_upsert_scores(db, PdaEventScore, event_id=1, round_id=1, rows=rows) == 2
+    db.commit()
+
+    stored = {(row.entity_type, row.user_id, row.team_id): row for row in db.query(PdaEventScore).all()}
+    assert len(stored) == 2
+    assert stored[(PdaEventEntityType.USER, 1, None)].total_score == 9.0
+    assert stored[(PdaEventEntityType.TEAM, None, 7)].is_present is False
+
+
+def _score_row(user_id, total):
+    return {"entity_type": "user", "user_id": user_id, "team_id": None, "scores": {"Design": total}, "total": total, "normalized": total * 10, "is_present": True}
+
+
+@pytest.mark.parametrize("score_model", [PdaEventScore, PersohubEventScore])
+def test_bulk_upsert_scores_keeps_one_row_per_entity(tmp_path, score_model):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scores.db'}")
+    score_model.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+
+    db = factory()
+    bulk_upsert_scores(db, score_model, event_id=1, round_id=1, rows=[_score_row(1, 2.0), _score_row(1, 4.0)])
+    db.commit()
+    assert [row.total_score for row in db.query(score_model).all()] == [4.0]
+
+    # Two judges saving the same participant: the second looked before the first committed.
+    first, second = factory(), factory()
+    assert second.query(score_model).filter(score_model.user_id == 2).count() == 0
+    bulk_upsert_scores(first, score_model, event_id=1, round_id=1, rows=[_score_row(2, 5.0)])
+    first.commit()
+    bulk_upsert_scores(second, score_model, event_id=1, round_id=1, rows=[_score_row(1, 6.0), _score_row(2, 7.0)])
+    second.commit()
+
+    stored = {row.user_id: row.total_score for row in db.query(score_model).all()}
+    assert stored == {1: 6.0, 2: 7.0}
+    for session in (db, first, second):
+        session.close()
+    engine.dispose()
+
+
+def test_recompute_normalized_scores_clamps_and_zeroes_absentees(assert_max_queries):
+    db = _score_session()
+    for user_id, total, present in [(1, 15.0, True), (2, 45.0, True), (3, 20.0, False), (4, -3.0, True)]:
+        db.add(
+            PdaEventScore(
+                event_id=1,
+                round_id=1,
+                entity_type=PdaEventEntityType.USER,
+                user_id=user_id,
+                total_score=total,
+                normalized_score=0.0,
+                is_present=present,
+            )
+        )
+    db.commit()
+
+    with assert_max_queries(2):
+        recompute_normalized_scores(db, PdaEventScore, event_id=1, round_id=1, max_total=30.0)
+    db.commit()
+
+    normalized = {row.user_id: row.normalized_score for row in db.query(PdaEventScore).all()}
+    assert normalized == {1: pytest.approx(50.0), 2: 100.0, 3: 0.0, 4: 0.0}
@@ -0,0 +1,152 @@
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi import Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import search_service
+import typeahead_index
+from database import Base
+from models import (
+    PdaEventFormat,
+    PdaEventParticipantMode,
+    PdaEventRoundMode,
+    PdaEventTemplate,
+    PdaEventType,
+    PdaUser,
+    PersohubClub,
+    PersohubEvent,
+    PersohubHashtag,
+)
+from routers.pda_cc_admin import list_cc_persohub_event_options
+from routers.persohub_public import search_suggestions
+
+
+@pytest.fixture
+def db():
+    search_service.clear_search_cache()
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        search_service.clear_search_cache()
+        session.close()
+        engine.dispose()
+
+
+def _user(idx, name, profile_name):
+    return PdaUser(
+        regno=f"2024{idx:06d}",
+        email=f"user{idx}@example.com",
+        hashed_password="x",
+        name=name,
+        profile_name=profile_name,
+    )
+
+
+def test_suggestions_rank_exact_then_prefix_then_substring(db, assert_max_queries):
+    db.add_all(
+        [
+            _user(1, "Aaron Kumar", "aaron_kumar"),
+            _user(2, "Kumaran", "kumaran"),
+            _user(3, "Kumar", "kumar"),
+            _user(4, "No Handle Kumar", None),
+        ]
+    )
+    db.add_all(
+        [
+            PersohubHashtag(hashtag_text="hackkumar", count=50),
+            PersohubHashtag(hashtag_text="kumarfest", count=2),
+            PersohubHashtag(hashtag_text="kumartalks", count=9),
+        ]
+    )
+    db.commit()
+
+    response = search_suggestions(q="  Kumar ", db=db)
+    users = [item.profile_name for item in response.items if item.result_type == "user"]
+    tags = [item.profile_name for item in response.items if item.result_type == "hashtag"]
+    assert users == ["kumar", "kumaran", "aaron_kumar"]
+    assert tags == ["#kumartalks", "#kumarfest", "#hackkumar"]
+
+    with assert_max_queries(0):
+        again = search_suggestions(q="kumar", db=db)
+    assert again.items == response.items
+
+
+def test_like_wildcards_are_matched_literally(db):
+    db.add_all([_user(1, "Percent 100%", "percent_100"), _user(2, "Plain 1000", "plain1000")])
+    db.commit()
+    labels = [item["label"] for item in search_service.typeahead_suggestions(db, "100%")]
+    assert labels == ["Percent 100%"]
+
+
+def test_admin_event_search_matches_wildcards_literally(db):
+    club = PersohubClub(name="Quiz_Club", profile_id="quizclub")
+    db.add(club)
+    db.flush()
+    for idx, title in enumerate(["Quiz_2026", "Quiz 2026", "Quizzard"], start=1):
+        db.add(
+            PersohubEvent(
+                slug=f"event-{idx}",
+                event_code=f"EV{idx}",
+                club_id=club.id,
+                title=title,
+                event_type=PdaEventType.TECHNICAL,
+                format=PdaEventFormat.OFFLINE,
+                template_option=PdaEventTemplate.ATTENDANCE_ONLY,
+                participant_mode=PdaEventParticipantMode.INDIVIDUAL,
+                round_mode=PdaEventRoundMode.SINGLE,
+            )
+        )
+    db.commit()
+
+    def titles(q):
+        options = list_cc_persohub_event_options(response=Response(), page=1, page_size=20, q=q, _=None, db=db)
+        return [option.title for option in options]
+
+    assert titles("z_2") == ["Quiz_2026"]
+    assert titles("%") == []
+    # Club names are searched too.
+    assert titles("quiz_club") == ["Quiz 2026", "Quiz_2026", "Quizzard"]
+
+
+def test_prefix_index_answers_from_memory_and_follows_commits(db, monkeypatch, assert_max_queries):
+    monkeypatch.setattr(typeahead_index, "TYPEAHEAD_INDEX_ENABLED", True)
+    index = typeahead_index.typeahead_index
+    index.clear()
+    try:
+        db.add_all([_user(1, "Kumar Raj", "kraj"), PersohubHashtag(hashtag_text="kumarfest", count=3)])
+        db.commit()
+        assert index.rebuild(db)
+
+        with assert_max_queries(0):
+            items = search_service.typeahead_suggestions(db, "kum")
+        assert [(item["result_type"], item["profile_name"]) for item in items] == [
+            ("user", "kraj"),
+            ("hashtag", "#kumarfest"),
+        ]
+
+        renamed = db.query(PdaUser).filter(PdaUser.profile_name == "kraj").one()
+        renamed.name = "Raj Verma"
+        db.add(_user(2, "Kumaresan", "kumaresan"))
+        db.commit()
+        labels = [item["label"] for item in search_service.typeahead_suggestions(db, "kum") if item["result_type"] == "user"]
+        assert labels == ["Kumaresan"]
+        assert [item["label"] for item in search_service.typeahead_suggestions(db, "verma")] == ["Raj Verma"]
+
+        # Bulk statements cannot be followed row by row, so the index goes cold until rebuilt.
+        db.query(PersohubHashtag).update({"count": 10})
+        db.commit()
+        assert not index.is_warm()
+    finally:
+        index.clear()